@@ -1,16 +1,54 @@
 from django.apps import AppConfig
-from django.db.models.signals import post_delete
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_save
 
 
 class AccountAppConfig(AppConfig):
     name = "saleor.account"
 
     def ready(self):
+        from django.contrib.auth.models import Group
+
         from .models import User
-        from .signals import delete_avatar
+        from .signals import (
+            delete_avatar,
+            invalidate_permissions_of_principals,
+            invalidate_user_principal,
+            remember_user_email,
+        )
 
         post_delete.connect(
             delete_avatar,
             sender=User,
             dispatch_uid="delete_user_avatar",
         )
+        # cached JWT principals, see `saleor.core.jwt.get_active_user_by_email`
+        pre_save.connect(
+            remember_user_email,
+            sender=User,
+            dispatch_uid="remember_user_email",
+        )
+        post_save.connect(
+            invalidate_user_principal,
+            sender=User,
+            dispatch_uid="invalidate_user_principal_on_save",
+        )
+        post_delete.connect(
+            invalidate_user_principal,
+            sender=User,
+            dispatch_uid="invalidate_user_principal_on_delete",
+        )
+        for through in (
+            User.groups.through,
+            User.user_permissions.through,
+            Group.permissions.through,
+        ):
+            m2m_changed.connect(
+                invalidate_permissions_of_principals,
+                sender=through,
+                dispatch_uid=f"invalidate_principal_permissions_{through.__name__}",
+            )
+        post_delete.connect(
+            invalidate_permissions_of_principals,
+            sender=Group,
+            dispatch_uid="invalidate_principal_permissions_on_group_delete",
+        )
@@ -1,6 +1,26 @@
+from ..core.jwt import invalidate_principal_permissions, invalidate_principals
 from ..core.utils import delete_versatile_image
 
 
 def delete_avatar(sender, instance, **kwargs):
     if avatar := instance.avatar:
         delete_versatile_image(avatar)
+
+
+def remember_user_email(sender, instance, **kwargs):
+    instance._previous_email = None
+    if instance.pk:
+        instance._previous_email = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("email", flat=True)
+            .first()
+        )
+
+
+def invalidate_user_principal(sender, instance, **kwargs):
+    emails = {instance.email, getattr(instance, "_previous_email", None)}
+    invalidate_principals([email for email in emails if email])
+
+
+def invalidate_permissions_of_principals(sender, **kwargs):
+    invalidate_principal_permissions()
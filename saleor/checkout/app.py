@@ -0,0 +1,55 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class CheckoutAppConfig(AppConfig):
+    name = "saleor.checkout"
+
+    def ready(self):
+        from ..account.models import Address
+        from ..product.models import OptionValue, ProductVariantChannelListing
+        from .models import Checkout, CheckoutLine
+        from .signals import (
+            invalidate_checkout_cache_for_address,
+            invalidate_checkout_cache_for_checkout,
+            invalidate_checkout_cache_for_line,
+            invalidate_checkout_cache_for_line_options,
+            invalidate_checkout_cache_for_variant_channel_listing,
+        )
+
+        # preventing duplicate signals
+        post_save.connect(
+            invalidate_checkout_cache_for_checkout,
+            sender=Checkout,
+            dispatch_uid="invalidate_checkout_cache_on_checkout_save",
+        )
+        post_save.connect(
+            invalidate_checkout_cache_for_address,
+            sender=Address,
+            dispatch_uid="invalidate_checkout_cache_on_address_save",
+        )
+        post_save.connect(
+            invalidate_checkout_cache_for_line,
+            sender=CheckoutLine,
+            dispatch_uid="invalidate_checkout_cache_on_line_save",
+        )
+        post_delete.connect(
+            invalidate_checkout_cache_for_line,
+            sender=CheckoutLine,
+            dispatch_uid="invalidate_checkout_cache_on_line_delete",
+        )
+        m2m_changed.connect(
+            invalidate_checkout_cache_for_line_options,
+            sender=OptionValue.checkout_lines.through,
+            dispatch_uid="invalidate_checkout_cache_on_line_options_change",
+        )
+        post_save.connect(
+            invalidate_checkout_cache_for_variant_channel_listing,
+            sender=ProductVariantChannelListing,
+            dispatch_uid="invalidate_checkout_cache_on_variant_channel_listing_save",
+        )
+        post_delete.connect(
+            invalidate_checkout_cache_for_variant_channel_listing,
+            sender=ProductVariantChannelListing,
+            dispatch_uid="invalidate_checkout_cache_on_variant_channel_listing_delete",
+        )
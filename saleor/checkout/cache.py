@@ -0,0 +1,228 @@
+"""Cache of checkout lines and shipping data between checkout mutations.
+
+Most checkout mutations start by fetching the checkout lines with their
+variants, products, collections and channel listings, and by computing the
+shipping methods valid for the checkout. Successive mutations of the same
+checkout compute the same data again, so it is kept in the shared Django cache
+under a version per checkout. Signal handlers replace the version whenever
+lines, their options, addresses, the shipping method or other checkout fields
+the data depends on change.
+
+Changes of variant channel listings (prices) replace the catalogue version of
+their channel, which is a part of the keys of all checkouts in the channel.
+Other catalogue changes (publication, shipping zones) don't replace any
+version, they are picked up once the cached data expires.
+"""
+import hashlib
+import uuid
+from typing import TYPE_CHECKING, Iterable, List
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import DEFAULT_DB_ALIAS
+
+from .fetch import (
+    CheckoutInfo,
+    CheckoutLineInfo,
+    fetch_checkout_info,
+    fetch_checkout_lines,
+)
+from .models import CheckoutLine
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..discount import DiscountInfo
+    from ..plugins.manager import PluginsManager
+    from .models import Checkout
+
+VERSION_CACHE_KEY_PREFIX = "checkout_version:"
+CATALOGUE_VERSION_CACHE_KEY_PREFIX = "checkout_catalogue_version:"
+LINES_CACHE_KEY_PREFIX = "checkout_lines:"
+SHIPPING_CACHE_KEY_PREFIX = "checkout_shipping:"
+
+# Checkout fields the cached lines and shipping methods depend on, saving any
+# of them replaces the version.
+CACHED_CHECKOUT_FIELDS = {
+    "channel",
+    "user",
+    "billing_address",
+    "shipping_address",
+    "shipping_method",
+    "country",
+    "voucher_code",
+}
+
+
+def get_version_cache_key(token) -> str:
+    return "%s%s" % (VERSION_CACHE_KEY_PREFIX, token)
+
+
+def get_catalogue_version_cache_key(channel_id) -> str:
+    return "%s%s" % (CATALOGUE_VERSION_CACHE_KEY_PREFIX, channel_id)
+
+
+def _get_version(key) -> str:
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, settings.CHECKOUT_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def get_checkout_version(token) -> str:
+    return _get_version(get_version_cache_key(token))
+
+
+def get_catalogue_version(channel_id) -> str:
+    return _get_version(get_catalogue_version_cache_key(channel_id))
+
+
+def invalidate_checkout_cache(*tokens):
+    """Replace the versions of the given checkouts."""
+    cache.set_many(
+        {get_version_cache_key(token): uuid.uuid4().hex for token in tokens},
+        settings.CHECKOUT_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_checkout_catalogue_cache(*channel_ids):
+    """Replace the catalogue versions of the given channels."""
+    cache.set_many(
+        {
+            get_catalogue_version_cache_key(channel_id): uuid.uuid4().hex
+            for channel_id in channel_ids
+        },
+        settings.CHECKOUT_CACHE_TIMEOUT,
+    )
+
+
+def dump_line_info(line_info: CheckoutLineInfo) -> tuple:
+    # Checkout lines define their own pickling that keeps only the variant and
+    # quantity, the line is stored by its fields instead.
+    line = line_info.line
+    return (
+        line.pk,
+        line.quantity,
+        list(line.option_values.all()),
+        line_info.variant,
+        line_info.channel_listing,
+        line_info.product,
+        line_info.product_type,
+        line_info.collections,
+    )
+
+
+def load_line_info(checkout: "Checkout", data: tuple) -> CheckoutLineInfo:
+    (
+        line_id,
+        quantity,
+        option_values,
+        variant,
+        channel_listing,
+        product,
+        product_type,
+        collections,
+    ) = data
+    line = CheckoutLine(id=line_id, checkout=checkout, variant=variant)
+    line.quantity = quantity
+    line._state.adding = False
+    line._state.db = DEFAULT_DB_ALIAS
+    option_values_qs = line.option_values.all()
+    option_values_qs._result_cache = option_values
+    option_values_qs._prefetch_done = True
+    line._prefetched_objects_cache = {"option_values": option_values_qs}
+    return CheckoutLineInfo(
+        line=line,
+        variant=variant,
+        channel_listing=channel_listing,
+        product=product,
+        product_type=product_type,
+        collections=collections,
+    )
+
+
+def get_checkout_lines(checkout: "Checkout") -> List[CheckoutLineInfo]:
+    """Return checkout lines like `fetch_checkout_lines`, from the cache if possible."""
+    key = "%s%s:%s:%s" % (
+        LINES_CACHE_KEY_PREFIX,
+        checkout.pk,
+        get_checkout_version(checkout.pk),
+        get_catalogue_version(checkout.channel_id),
+    )
+    lines_data = cache.get(key)
+    if lines_data is None:
+        lines = list(fetch_checkout_lines(checkout))
+        cache.set(
+            key,
+            [dump_line_info(line_info) for line_info in lines],
+            settings.CHECKOUT_CACHE_TIMEOUT,
+        )
+        return lines
+    return [load_line_info(checkout, data) for data in lines_data]
+
+
+def get_discounts_signature(discounts: Iterable["DiscountInfo"]) -> str:
+    discounts_data = sorted(
+        (
+            info.sale.pk,
+            sorted(
+                (slug, str(listing.discount_value))
+                for slug, listing in info.channel_listings.items()
+            ),
+            sorted(info.product_ids),
+            sorted(info.category_ids),
+            sorted(info.collection_ids),
+        )
+        for info in discounts
+    )
+    return hashlib.md5(repr(discounts_data).encode()).hexdigest()
+
+
+def get_lines_signature(lines: Iterable[CheckoutLineInfo]) -> str:
+    lines_data = [(info.line.pk, info.line.quantity) for info in lines]
+    return hashlib.md5(repr(lines_data).encode()).hexdigest()
+
+
+def get_checkout_info(
+    checkout: "Checkout",
+    lines: Iterable[CheckoutLineInfo],
+    discounts: Iterable["DiscountInfo"],
+    manager: "PluginsManager",
+) -> CheckoutInfo:
+    """Return checkout info like `fetch_checkout_info`, from the cache if possible.
+
+    Only the shipping method channel listing and the valid shipping methods are
+    cached, the rest of the info comes from the given checkout.
+    """
+    key = "%s%s:%s:%s:%s:%s" % (
+        SHIPPING_CACHE_KEY_PREFIX,
+        checkout.pk,
+        get_checkout_version(checkout.pk),
+        get_catalogue_version(checkout.channel_id),
+        get_lines_signature(lines),
+        get_discounts_signature(discounts),
+    )
+    shipping_data = cache.get(key)
+    if shipping_data is None:
+        checkout_info = fetch_checkout_info(checkout, lines, discounts, manager)
+        cache.set(
+            key,
+            (
+                checkout_info.shipping_method_channel_listings,
+                checkout_info.valid_shipping_methods,
+            ),
+            settings.CHECKOUT_CACHE_TIMEOUT,
+        )
+        return checkout_info
+
+    shipping_channel_listings, valid_shipping_methods = shipping_data
+    return CheckoutInfo(
+        checkout=checkout,
+        user=checkout.user,
+        channel=checkout.channel,
+        billing_address=checkout.billing_address,
+        shipping_address=checkout.shipping_address,
+        shipping_method=checkout.shipping_method,
+        shipping_method_channel_listings=shipping_channel_listings,
+        valid_shipping_methods=valid_shipping_methods,
+    )
@@ -14,7 +14,7 @@ from prices import TaxedMoney
 from prices.money import Money
 
 from saleor.core.prices import quantize_price
-from saleor.core.utils.logging import log_info
+from saleor.core.utils.logging import log_event
 from saleor.graphql.notifications.schema import LiveNotification
 from saleor.views import sio
 
@@ -23,11 +23,11 @@ from ..account.models import User
 from ..account.utils import store_user_address
 from ..checkout import calculations
 from ..checkout.error_codes import CheckoutErrorCode
-from ..core.exceptions import InsufficientStock
+from ..core.exceptions import InsufficientStock, SlotCapacityExceeded
 from ..core.taxes import TaxError, zero_taxed_money
 from ..core.tracing import traced_atomic_transaction
 from ..core.utils.url import validate_storefront_url
-from ..delivery.models import Delivery
+from ..delivery.utils import get_delivery_quote
 from ..discount import DiscountInfo, DiscountValueType, OrderDiscountType
 from ..discount.models import NotApplicable
 from ..discount.utils import (add_voucher_usage_by_customer,
@@ -43,6 +43,7 @@ from ..payment import PaymentError, gateway
 from ..payment.models import Payment, Transaction
 from ..payment.utils import fetch_customer_id, store_customer_id
 from ..product.models import ProductTranslation, ProductVariantTranslation
+from ..servicetime.capacity import is_slot_full, reserve_slot
 from ..store.models import Store
 from ..warehouse.availability import check_stock_quantity_bulk
 from ..warehouse.management import allocate_stocks
@@ -282,10 +283,22 @@ def _prepare_order_data(
 ) -> dict:
     """Run checks and return all the data from a given checkout to create an order.
 
-    :raises NotApplicable InsufficientStock:
+    :raises NotApplicable InsufficientStock SlotCapacityExceeded:
     """
     checkout = checkout_info.checkout
     order_data = {}
+
+    # fail before the payment is processed, the slot is reserved with the order
+    if is_slot_full(
+        checkout.store,
+        checkout.order_type,
+        checkout.expected_date,
+        checkout.expected_time,
+    ):
+        raise SlotCapacityExceeded(
+            checkout.order_type, checkout.expected_date, checkout.expected_time
+        )
+
     address = (
         checkout_info.shipping_address or checkout_info.billing_address
     )  # FIXME: check which address we need here
@@ -305,51 +318,26 @@ def _prepare_order_data(
     undiscounted_total = taxed_total + checkout.discount
 
     # implement delivery fee
-    delivery_setting = Delivery.objects.all().first()
-    current_strore = Store.objects.all().first()
+    current_strore = get_current_tenant() or Store.objects.all().first()
     undiscount_checkout_total_amount = taxed_total.gross.amount + checkout.discount.amount
-    if delivery_setting and checkout.order_type == "delivery":
-        delivery_fee_by_postal_code = delivery_setting.delivery_fee
-        min_order_by_postal_code = delivery_setting.min_order
-        
-        # implement delivery fee when enable custom delivery fee
-        if delivery_setting.enable_custom_delivery_fee and (checkout_info.billing_address.postal_code is not None): 
-            current_postal_code = (checkout_info.billing_address.postal_code)[0:4]
-            delivery_areas = [] 
-            delivery_areas.extend(delivery_setting.delivery_area['areas'])
-            delivery_areas.sort(key=lambda area: area['from'] + area['to'])
-                
-            for x in delivery_areas:
-                if int(current_postal_code) >= x['from'] and int(current_postal_code) <= x['to']:
-                    delivery_fee_by_postal_code = round(x["customDeliveryFee"], 2)
-                    break
-            # delivery_fee = delivery_fee_by_postal_code   
-        # implement min order when enable custom delivery fee
-        if delivery_setting.enable_minimum_delivery_order_value and (checkout_info.billing_address.postal_code is not None):
-            current_postal_code = (checkout_info.billing_address.postal_code)[0:4]
-            delivery_areas = [] 
-            delivery_areas.extend(delivery_setting.delivery_area['areas'])
-            delivery_areas.sort(key=lambda area: area['from'] + area['to'])
-                
-            for x in delivery_areas:
-                if int(current_postal_code) >= x['from'] and int(current_postal_code) <= x['to']:
-                    min_order_by_postal_code = x["customMinOrder"] if x["customMinOrder"] != "" else delivery_setting.min_order
-                    break
-                
-
-        if min_order_by_postal_code > undiscount_checkout_total_amount and checkout.order_type == settings.ORDER_TYPES[0][0]:
-            raise ValidationError(
-                {
-                    "min_order": "The subtotal must be equal or greater than {min_order}".format(min_order=min_order_by_postal_code)
-                }
-            )
-        if checkout.order_type == settings.ORDER_TYPES[0][0] and \
-           (undiscount_checkout_total_amount < delivery_setting.from_delivery or (undiscount_checkout_total_amount >= delivery_setting.from_delivery and not delivery_setting.enable_for_big_order)):
-            delivery_fee = Money(amount=delivery_fee_by_postal_code,
-                                 currency=checkout.currency)
-            # print("dlf", delivery_fee)
+    if checkout.order_type == "delivery":
+        postal_code = (
+            checkout_info.billing_address.postal_code
+            if checkout_info.billing_address
+            else None
+        )
+        delivery_quote = get_delivery_quote(postal_code)
+    else:
+        delivery_quote = None
+    if delivery_quote:
+        delivery_quote.validate_min_order(undiscount_checkout_total_amount)
+        delivery_fee_amount = delivery_quote.get_delivery_fee(
+            undiscount_checkout_total_amount
+        )
+        if delivery_fee_amount:
+            delivery_fee = Money(amount=delivery_fee_amount, currency=checkout.currency)
             taxed_total = taxed_total + TaxedMoney(net=delivery_fee, gross=delivery_fee)
-            order_data["delivery_fee"] = delivery_fee_by_postal_code
+            order_data["delivery_fee"] = delivery_fee_amount
 
     # implement transaction fee
     payment_gateway = checkout.get_last_active_payment().gateway
@@ -506,9 +494,6 @@ def _create_order(
             order_line_instance.option_values.through.objects.bulk_create(
                 option_values_list)
 
-    country_code = checkout_info.get_country()
-    allocate_stocks(order_lines_info, country_code, checkout_info.channel.slug)
-
     # Add gift cards to the order
     for gift_card in checkout.gift_cards.select_for_update():
         total_price_left = add_gift_card_to_order(order, gift_card, total_price_left)
@@ -523,6 +508,21 @@ def _create_order(
     order.update_total_paid()
     order.save()
 
+    # allocated and reserved last to keep the stock and slot counters locked for
+    # the shortest time
+    country_code = checkout_info.get_country()
+    allocate_stocks(order_lines_info, country_code, checkout_info.channel.slug)
+    if reserve_slot(
+        checkout.store,
+        checkout.order_type,
+        checkout.expected_date,
+        checkout.expected_time,
+    ):
+        # Mark the order so only orders counted in the slot release it, an
+        # update doesn't trigger the order save signals.
+        order.slot_reserved = True
+        Order.objects.filter(pk=order.pk).update(slot_reserved=True)
+
     transaction.on_commit(
         lambda: order_created(order=order, user=user, manager=manager)
     )
@@ -586,6 +586,16 @@ def _prepare_checkout(
         checkout.save(update_fields=to_update)
 
 
+def prepare_slot_unavailable_checkout_validation_error(error: SlotCapacityExceeded):
+    return ValidationError(
+        {
+            "expected_time": ValidationError(
+                "The selected time slot is fully booked.", code=error.code.value
+            )
+        }
+    )
+
+
 def release_voucher_usage(order_data: dict):
     voucher = order_data.get("voucher")
     if voucher:
@@ -611,6 +621,8 @@ def _get_order_data(
     except InsufficientStock as e:
         error = prepare_insufficient_stock_checkout_validation_error(e)
         raise error
+    except SlotCapacityExceeded as e:
+        raise prepare_slot_unavailable_checkout_validation_error(e)
     except NotApplicable:
         raise ValidationError(
             "Voucher not applicable",
@@ -739,14 +751,21 @@ def complete_checkout(
                     graphene.Node.to_global_id("Store", order.store_id),
                     graphene.Node.to_global_id("Order", order.id))
                 
-            # write log
-            log_info('Order', 'Order', content={
-                "order": order.__dict__,
-                "address": vars(order.billing_address)})
+            log_event(
+                "order.create",
+                order_id=order.pk,
+                total_gross_amount=str(order.total_gross_amount),
+                currency=order.currency,
+                lines_count=len(order_data["lines"]),
+            )
         except InsufficientStock as e:
             release_voucher_usage(order_data)
             gateway.payment_refund_or_void(payment, manager, channel_slug=channel_slug)
             error = prepare_insufficient_stock_checkout_validation_error(e)
             raise error
+        except SlotCapacityExceeded as e:
+            release_voucher_usage(order_data)
+            gateway.payment_refund_or_void(payment, manager, channel_slug=channel_slug)
+            raise prepare_slot_unavailable_checkout_validation_error(e)
 
     return order, action_required, action_data, checkout.redirect_url
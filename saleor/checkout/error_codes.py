@@ -25,3 +25,4 @@ class CheckoutErrorCode(Enum):
     MISSING_CHANNEL_SLUG = "missing_channel_slug"
     CHANNEL_INACTIVE = "channel_inactive"
     UNAVAILABLE_VARIANT_IN_CHANNEL = "unavailable_variant_in_channel"
+    SLOT_UNAVAILABLE = "slot_unavailable"
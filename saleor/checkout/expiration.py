@@ -0,0 +1,124 @@
+"""Deletion of checkouts abandoned by customers.
+
+Checkouts are deleted once they haven't changed for `CHECKOUT_TTL`, or for the
+TTL set by their store. They are deleted in batches of the oldest first, found
+through the indexes on the last change, so a run holds locks on a bounded
+number of rows and can stop after `CHECKOUT_DELETE_MAX_BATCHES` batches.
+"""
+from collections import defaultdict
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import QuerySet
+from django.utils import timezone
+from django_multitenant.utils import (
+    get_current_tenant,
+    set_current_tenant,
+    unset_current_tenant,
+)
+
+from ..account.models import Address
+from ..core.utils.logging import log_duration
+from ..store.models import Store
+from .models import Checkout
+
+
+def get_expired_checkouts(now: datetime) -> List[QuerySet]:
+    """Return querysets of expired checkouts, each ordered by the last change.
+
+    Checkouts of stores with their own TTL are returned by separate querysets,
+    so every one of them is filtered by a single index range.
+    """
+    checkouts = Checkout._base_manager.order_by("last_change")
+    store_ttls = dict(
+        Store._base_manager.filter(checkout_ttl__isnull=False).values_list(
+            "pk", "checkout_ttl"
+        )
+    )
+    expired = checkouts.filter(last_change__lt=now - settings.CHECKOUT_TTL)
+    if store_ttls:
+        expired = expired.exclude(store_id__in=store_ttls)
+    return [expired] + [
+        checkouts.filter(store_id=store_id, last_change__lt=now - ttl)
+        for store_id, ttl in store_ttls.items()
+    ]
+
+
+def delete_expired_checkouts(
+    now: Optional[datetime] = None,
+) -> Tuple[Dict[str, int], bool]:
+    """Delete expired checkouts with their lines and addresses.
+
+    Return the number of deleted objects per model label and whether expired
+    checkouts are left because the batches limit was reached.
+    """
+    now = now or timezone.now()
+    deleted: Dict[str, int] = defaultdict(int)
+    # Deletes of tenant models are filtered by the current tenant, checkouts of
+    # all stores are deleted here.
+    tenant = get_current_tenant()
+    unset_current_tenant()
+    try:
+        with log_duration("checkout.delete_expired") as fields:
+            has_more = _delete_in_batches(get_expired_checkouts(now), deleted)
+            fields.update(deleted=dict(deleted), has_more=has_more)
+    finally:
+        if tenant is not None:
+            set_current_tenant(tenant)
+    return dict(deleted), has_more
+
+
+def _delete_in_batches(querysets: Iterable[QuerySet], deleted: Dict[str, int]):
+    batch_size = settings.CHECKOUT_DELETE_BATCH_SIZE
+    batches_left = settings.CHECKOUT_DELETE_MAX_BATCHES
+    for checkouts in querysets:
+        while True:
+            if not batches_left:
+                return checkouts.exists()
+            pks = list(checkouts.values_list("pk", flat=True)[:batch_size])
+            if not pks:
+                break
+            batches_left -= 1
+            # Filtering by the expiration again skips checkouts changed since.
+            for label, count in _delete_checkouts(checkouts.filter(pk__in=pks)):
+                deleted[label] += count
+            if len(pks) < batch_size:
+                break
+    return False
+
+
+def _delete_checkouts(checkouts: QuerySet) -> Iterable[Tuple[str, int]]:
+    with transaction.atomic():
+        address_ids = set()
+        for billing_address_id, shipping_address_id in checkouts.values_list(
+            "billing_address_id", "shipping_address_id"
+        ):
+            address_ids.update((billing_address_id, shipping_address_id))
+        address_ids.discard(None)
+        _, deleted = checkouts.delete()
+        address_ids -= _get_referenced_address_ids(address_ids)
+        if address_ids:
+            _, deleted_addresses = Address.objects.filter(pk__in=address_ids).delete()
+            deleted.update(deleted_addresses)
+    return deleted.items()
+
+
+def _get_referenced_address_ids(address_ids: Set[int]) -> Set[int]:
+    """Return IDs of the addresses that are still used, e.g. by orders or users."""
+    referenced: Set[int] = set()
+    if not address_ids:
+        return referenced
+    # Most relations to addresses are hidden, query them from the forward side.
+    for relation in Address._meta.get_fields(include_hidden=True):
+        if not relation.auto_created or relation.concrete:
+            continue
+        field = relation.field
+        lookup = f"{field.name}__in"
+        referenced.update(
+            field.model._base_manager.filter(**{lookup: address_ids}).values_list(
+                field.name, flat=True
+            )
+        )
+    return referenced
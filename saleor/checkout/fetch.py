@@ -1,6 +1,7 @@
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Iterable, List, Optional
 
+from ..product.utils.options import get_option_values_prefetch
 from ..shipping.models import ShippingMethodChannelListing
 
 if TYPE_CHECKING:
@@ -57,6 +58,7 @@ def fetch_checkout_lines(checkout: "Checkout") -> Iterable[CheckoutLineInfo]:
         "variant__product__collections",
         "variant__channel_listings__channel",
         "variant__product__product_type",
+        get_option_values_prefetch(),
     )
     lines_info = []
 
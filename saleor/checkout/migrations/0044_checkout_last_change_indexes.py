@@ -0,0 +1,23 @@
+# Generated by Django 3.2.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("checkout", "0043_alter_checkout_order_type"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="checkout",
+            index=models.Index(fields=["last_change"], name="checkout_last_change_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="checkout",
+            index=models.Index(
+                fields=["store", "last_change"], name="checkout_store_change_idx"
+            ),
+        ),
+    ]
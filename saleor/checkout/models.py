@@ -123,6 +123,14 @@ class Checkout(MultitenantModelWithMetadata):
         permissions = (
             (CheckoutPermissions.MANAGE_CHECKOUTS.codename, "Manage checkouts"),
         )
+        indexes = [
+            *ModelWithMetadata.Meta.indexes,
+            # Deleting expired checkouts in batches, for all and for single stores.
+            models.Index(fields=["last_change"], name="checkout_last_change_idx"),
+            models.Index(
+                fields=["store", "last_change"], name="checkout_store_change_idx"
+            ),
+        ]
 
     def __iter__(self):
         return iter(self.lines.all())
@@ -0,0 +1,68 @@
+from django.db import transaction
+from django.db.models import Q
+
+from .cache import (
+    CACHED_CHECKOUT_FIELDS,
+    invalidate_checkout_cache,
+    invalidate_checkout_catalogue_cache,
+)
+from .models import Checkout, CheckoutLine
+
+
+def _invalidate_checkout_cache(*tokens):
+    if not tokens:
+        return
+    # Invalidate once more after commit, so data cached by a concurrent request
+    # from the rows that were not committed yet is not kept.
+    invalidate_checkout_cache(*tokens)
+    transaction.on_commit(lambda: invalidate_checkout_cache(*tokens))
+
+
+def invalidate_checkout_cache_for_checkout(
+    sender, instance, update_fields=None, **kwargs
+):
+    if update_fields is None or CACHED_CHECKOUT_FIELDS.intersection(update_fields):
+        _invalidate_checkout_cache(instance.pk)
+
+
+def invalidate_checkout_cache_for_address(sender, instance, created, **kwargs):
+    """Handle addresses of checkouts updated in place."""
+    if created:
+        return
+    tokens = Checkout._base_manager.filter(
+        Q(shipping_address=instance) | Q(billing_address=instance)
+    ).values_list("token", flat=True)
+    _invalidate_checkout_cache(*tokens)
+
+
+def invalidate_checkout_cache_for_line(sender, instance, **kwargs):
+    _invalidate_checkout_cache(instance.checkout_id)
+
+
+def invalidate_checkout_cache_for_line_options(
+    sender, instance, action, reverse, pk_set, **kwargs
+):
+    """Handle option values assigned to or removed from checkout lines.
+
+    The instance is a checkout line, or an option value when the lines are
+    changed from the option value side.
+    """
+    if isinstance(instance, CheckoutLine):
+        if action in ("post_add", "post_remove", "post_clear"):
+            _invalidate_checkout_cache(instance.checkout_id)
+        return
+
+    if action == "pre_clear":
+        lines = instance.checkout_lines.all()
+    elif action in ("post_add", "post_remove"):
+        lines = CheckoutLine.objects.filter(pk__in=pk_set)
+    else:
+        return
+    _invalidate_checkout_cache(*set(lines.values_list("checkout_id", flat=True)))
+
+
+def invalidate_checkout_cache_for_variant_channel_listing(sender, instance, **kwargs):
+    """Handle prices of variants changed in a channel."""
+    channel_id = instance.channel_id
+    invalidate_checkout_catalogue_cache(channel_id)
+    transaction.on_commit(lambda: invalidate_checkout_catalogue_cache(channel_id))
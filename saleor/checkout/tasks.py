@@ -0,0 +1,9 @@
+from ..celeryconf import app
+from .expiration import delete_expired_checkouts
+
+
+@app.task
+def delete_expired_checkouts_task():
+    _, has_more = delete_expired_checkouts()
+    if has_more:
+        delete_expired_checkouts_task.delay()
@@ -0,0 +1,59 @@
+from decimal import Decimal
+
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...product.models import OptionValue
+from ..base_calculations import base_checkout_line_total
+from ..fetch import fetch_checkout_lines
+from ..models import Checkout, CheckoutLine
+
+
+def _create_checkout_with_options(products, channel):
+    checkout = Checkout.objects.create(currency=channel.currency_code, channel=channel)
+    option_values = list(OptionValue.objects.all())
+    for product in products:
+        line = CheckoutLine.objects.create(
+            checkout=checkout, variant=product.variants.get(), quantity=2
+        )
+        line.option_values.add(*option_values)
+    return checkout
+
+
+def _get_line_totals(checkout, channel):
+    with CaptureQueriesContext(connection) as queries:
+        lines = fetch_checkout_lines(checkout)
+        totals = [base_checkout_line_total(line_info, channel) for line_info in lines]
+    return totals, len(queries)
+
+
+def test_base_checkout_line_total_with_option_values(
+    products_with_options, channel_USD
+):
+    # given
+    checkout = _create_checkout_with_options(products_with_options[:1], channel_USD)
+
+    # when
+    totals, _ = _get_line_totals(checkout, channel_USD)
+
+    # then
+    # variant price 10 and option values 0 + 1 + 2 of both options
+    assert totals[0].gross.amount == Decimal("2") * (10 + 2 * 3)
+
+
+def test_base_checkout_line_total_with_option_values_query_count(
+    products_with_options, channel_USD
+):
+    # given
+    single_line_checkout = _create_checkout_with_options(
+        products_with_options[:1], channel_USD
+    )
+    checkout = _create_checkout_with_options(products_with_options, channel_USD)
+
+    # when
+    _, single_line_queries = _get_line_totals(single_line_checkout, channel_USD)
+    totals, queries = _get_line_totals(checkout, channel_USD)
+
+    # then
+    assert len(totals) == len(products_with_options)
+    assert queries == single_line_queries
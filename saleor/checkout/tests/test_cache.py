@@ -0,0 +1,188 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+
+from ...plugins.manager import get_plugins_manager
+from ...product.models import OptionValue, ProductVariantChannelListing
+from ..cache import (
+    get_checkout_info,
+    get_checkout_lines,
+    invalidate_checkout_catalogue_cache,
+)
+from ..fetch import fetch_checkout_info
+from ..models import Checkout, CheckoutLine
+
+
+@pytest.fixture
+def checkout_with_options(checkout, store, products_with_options):
+    # The fixture checkout has no store, it must belong to the current tenant to
+    # be saved.
+    Checkout._base_manager.filter(pk=checkout.pk).update(store=store)
+    checkout.store = store
+    for product in products_with_options[:2]:
+        CheckoutLine.objects.create(
+            checkout=checkout, variant=product.variants.get(), quantity=1
+        )
+    return checkout
+
+
+def test_get_checkout_lines(checkout_with_options):
+    # when
+    lines = get_checkout_lines(checkout_with_options)
+
+    # then
+    assert [info.variant.sku for info in lines] == ["pizza-0", "pizza-1"]
+    assert all(info.line.checkout is checkout_with_options for info in lines)
+
+
+def test_get_checkout_lines_reuses_cache(
+    checkout_with_options, django_assert_num_queries
+):
+    # given
+    get_checkout_lines(checkout_with_options)
+
+    # when
+    with django_assert_num_queries(0):
+        lines = get_checkout_lines(checkout_with_options)
+
+    # then
+    assert len(lines) == 2
+    assert all(info.line.checkout is checkout_with_options for info in lines)
+
+
+def test_get_checkout_lines_after_line_update(checkout_with_options):
+    # given
+    get_checkout_lines(checkout_with_options)
+    line = checkout_with_options.lines.first()
+
+    # when
+    line.quantity = 5
+    line.save(update_fields=["quantity"])
+
+    # then
+    lines = get_checkout_lines(checkout_with_options)
+    assert [info.line.quantity for info in lines] == [5, 1]
+
+
+def test_get_checkout_lines_after_line_delete(checkout_with_options):
+    # given
+    get_checkout_lines(checkout_with_options)
+
+    # when
+    checkout_with_options.lines.first().delete()
+
+    # then
+    assert [info.variant.sku for info in get_checkout_lines(checkout_with_options)] == [
+        "pizza-1"
+    ]
+
+
+def test_get_checkout_lines_after_line_options_change(checkout_with_options):
+    # given
+    get_checkout_lines(checkout_with_options)
+    option_value = OptionValue.objects.first()
+
+    # when
+    checkout_with_options.lines.first().option_values.add(option_value)
+
+    # then
+    lines = get_checkout_lines(checkout_with_options)
+    assert list(lines[0].line.option_values.all()) == [option_value]
+
+
+def test_get_checkout_info_reuses_shipping_data(checkout_with_options):
+    # given
+    manager = get_plugins_manager()
+    lines = get_checkout_lines(checkout_with_options)
+    checkout_info = get_checkout_info(checkout_with_options, lines, [], manager)
+
+    # when
+    with patch(
+        "saleor.checkout.cache.fetch_checkout_info", wraps=fetch_checkout_info
+    ) as fetch_checkout_info_mock:
+        cached_checkout_info = get_checkout_info(
+            checkout_with_options, lines, [], manager
+        )
+
+    # then
+    fetch_checkout_info_mock.assert_not_called()
+    assert cached_checkout_info.checkout is checkout_with_options
+    assert (
+        cached_checkout_info.valid_shipping_methods
+        == checkout_info.valid_shipping_methods
+    )
+
+
+@pytest.mark.parametrize(
+    "update_fields, invalidated",
+    [(["shipping_address", "last_change"], True), (["last_change"], False)],
+)
+def test_get_checkout_info_after_checkout_save(
+    update_fields, invalidated, checkout_with_options, address
+):
+    # given
+    manager = get_plugins_manager()
+    lines = get_checkout_lines(checkout_with_options)
+    get_checkout_info(checkout_with_options, lines, [], manager)
+
+    # when
+    checkout_with_options.shipping_address = address
+    checkout_with_options.save(update_fields=update_fields)
+
+    # then
+    with patch(
+        "saleor.checkout.cache.fetch_checkout_info", wraps=fetch_checkout_info
+    ) as fetch_checkout_info_mock:
+        get_checkout_info(checkout_with_options, lines, [], manager)
+    assert fetch_checkout_info_mock.called is invalidated
+
+
+def test_get_checkout_info_after_address_update(checkout_with_options, address):
+    # given
+    manager = get_plugins_manager()
+    checkout_with_options.shipping_address = address
+    checkout_with_options.save(update_fields=["shipping_address"])
+    lines = get_checkout_lines(checkout_with_options)
+    get_checkout_info(checkout_with_options, lines, [], manager)
+
+    # when
+    address.country = "DE"
+    address.save(update_fields=["country"])
+
+    # then
+    with patch(
+        "saleor.checkout.cache.fetch_checkout_info", wraps=fetch_checkout_info
+    ) as fetch_checkout_info_mock:
+        get_checkout_info(checkout_with_options, lines, [], manager)
+    fetch_checkout_info_mock.assert_called_once()
+
+
+def test_get_checkout_lines_after_variant_price_update(checkout_with_options):
+    # given
+    lines = get_checkout_lines(checkout_with_options)
+    channel_listing = ProductVariantChannelListing.objects.get(
+        variant=lines[0].variant, channel_id=checkout_with_options.channel_id
+    )
+
+    # when
+    channel_listing.price_amount = Decimal("99.00")
+    channel_listing.save(update_fields=["price_amount"])
+
+    # then
+    lines = get_checkout_lines(checkout_with_options)
+    assert lines[0].channel_listing.price_amount == Decimal("99.00")
+
+
+def test_get_checkout_lines_after_variant_price_update_in_other_channel(
+    checkout_with_options, channel_PLN, django_assert_num_queries
+):
+    # given
+    get_checkout_lines(checkout_with_options)
+
+    # when
+    invalidate_checkout_catalogue_cache(channel_PLN.pk)
+
+    # then
+    with django_assert_num_queries(0):
+        get_checkout_lines(checkout_with_options)
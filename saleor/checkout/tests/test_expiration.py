@@ -0,0 +1,219 @@
+from datetime import timedelta
+from unittest.mock import patch
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ...account.models import Address
+from ...product.models import OptionValue
+from ..expiration import delete_expired_checkouts, get_expired_checkouts
+from ..models import Checkout, CheckoutLine
+from ..tasks import delete_expired_checkouts_task
+
+
+def _create_checkout(channel, last_change, store=None, **kwargs):
+    checkout = Checkout.objects.create(
+        currency=channel.currency_code, channel=channel, **kwargs
+    )
+    # `last_change` is set on every save, and checkouts with a store must belong
+    # to the current tenant to be saved.
+    Checkout._base_manager.filter(pk=checkout.pk).update(
+        last_change=last_change, store=store
+    )
+    return checkout
+
+
+@pytest.fixture
+def expired_checkout(channel_USD, products_with_options, address):
+    checkout = _create_checkout(
+        channel_USD,
+        timezone.now() - timedelta(days=31),
+        billing_address=address,
+        shipping_address=address.get_copy(),
+    )
+    line = CheckoutLine.objects.create(
+        checkout=checkout, variant=products_with_options[0].variants.get(), quantity=1
+    )
+    line.option_values.add(OptionValue.objects.first())
+    return checkout
+
+
+def test_delete_expired_checkouts(expired_checkout, channel_USD):
+    # given
+    recent_checkout = _create_checkout(channel_USD, timezone.now() - timedelta(days=29))
+    address_ids = [
+        expired_checkout.billing_address_id,
+        expired_checkout.shipping_address_id,
+    ]
+
+    # when
+    deleted, has_more = delete_expired_checkouts()
+
+    # then
+    assert not has_more
+    assert deleted["checkout.Checkout"] == 1
+    assert deleted["checkout.CheckoutLine"] == 1
+    assert deleted["product.OptionValue_checkout_lines"] == 1
+    assert deleted["account.Address"] == 2
+    assert list(Checkout._base_manager.all()) == [recent_checkout]
+    assert not Address.objects.filter(pk__in=address_ids).exists()
+
+
+def test_delete_expired_checkouts_keeps_addresses_in_use(channel_USD, warehouse):
+    # given
+    _create_checkout(
+        channel_USD,
+        timezone.now() - timedelta(days=31),
+        shipping_address=warehouse.address,
+    )
+
+    # when
+    deleted, _ = delete_expired_checkouts()
+
+    # then
+    assert deleted == {"checkout.Checkout": 1}
+    assert Address.objects.filter(pk=warehouse.address_id).exists()
+
+
+def test_delete_expired_checkouts_with_store_ttl(channel_USD, store):
+    # given
+    store.checkout_ttl = timedelta(days=1)
+    store.save(update_fields=["checkout_ttl"])
+    two_days_ago = timezone.now() - timedelta(days=2)
+    store_checkout = _create_checkout(channel_USD, two_days_ago, store=store)
+    checkout = _create_checkout(channel_USD, two_days_ago)
+
+    # when
+    deleted, _ = delete_expired_checkouts()
+
+    # then
+    assert deleted == {"checkout.Checkout": 1}
+    assert not Checkout._base_manager.filter(pk=store_checkout.pk).exists()
+    assert Checkout._base_manager.filter(pk=checkout.pk).exists()
+
+
+def test_delete_expired_checkouts_with_store_ttl_longer_than_default(
+    channel_USD, store
+):
+    # given
+    store.checkout_ttl = timedelta(days=60)
+    store.save(update_fields=["checkout_ttl"])
+    _create_checkout(channel_USD, timezone.now() - timedelta(days=40), store=store)
+
+    # when
+    deleted, _ = delete_expired_checkouts()
+
+    # then
+    assert deleted == {}
+    assert Checkout._base_manager.exists()
+
+
+def test_delete_expired_checkouts_stops_after_max_batches(channel_USD, settings):
+    # given
+    settings.CHECKOUT_DELETE_BATCH_SIZE = 2
+    settings.CHECKOUT_DELETE_MAX_BATCHES = 2
+    last_change = timezone.now() - timedelta(days=31)
+    for _ in range(5):
+        _create_checkout(channel_USD, last_change)
+
+    # when
+    deleted, has_more = delete_expired_checkouts()
+
+    # then
+    assert has_more
+    assert deleted == {"checkout.Checkout": 4}
+    assert Checkout._base_manager.count() == 1
+
+
+@patch("saleor.checkout.tasks.delete_expired_checkouts_task.delay")
+def test_delete_expired_checkouts_task_enqueues_next_run(
+    mocked_delay, channel_USD, settings
+):
+    # given
+    settings.CHECKOUT_DELETE_BATCH_SIZE = 1
+    settings.CHECKOUT_DELETE_MAX_BATCHES = 1
+    last_change = timezone.now() - timedelta(days=31)
+    for _ in range(2):
+        _create_checkout(channel_USD, last_change)
+
+    # when
+    delete_expired_checkouts_task()
+
+    # then
+    mocked_delay.assert_called_once_with()
+    assert Checkout._base_manager.count() == 1
+
+
+def _seed_checkouts(template, count, last_change):
+    """Copy the checkout and its lines `count` times with SQL."""
+    columns = [
+        field.column
+        for field in Checkout._meta.concrete_fields
+        if field.column not in ("token", "last_change")
+    ]
+    line_columns = [
+        field.column
+        for field in CheckoutLine._meta.concrete_fields
+        if field.column not in ("id", "checkout_id")
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            INSERT INTO checkout_checkout (token, last_change, {", ".join(columns)})
+            SELECT md5(random()::text || i::text)::uuid, %s, {", ".join(columns)}
+            FROM checkout_checkout, generate_series(1, %s) AS i
+            WHERE token = %s
+            """,
+            [last_change, count, template.pk],
+        )
+        cursor.execute(
+            f"""
+            INSERT INTO checkout_checkoutline (checkout_id, {", ".join(line_columns)})
+            SELECT checkout.token, {", ".join(f"line.{c}" for c in line_columns)}
+            FROM checkout_checkout checkout, checkout_checkoutline line
+            WHERE line.checkout_id = %s AND checkout.token != %s
+            """,
+            [template.pk, template.pk],
+        )
+        cursor.execute("ANALYZE checkout_checkout, checkout_checkoutline")
+
+
+@pytest.mark.performance
+def test_delete_expired_checkouts_benchmark(
+    transactional_db, expired_checkout, channel_USD, store, settings
+):
+    # given
+    settings.CHECKOUT_DELETE_BATCH_SIZE = 5000
+    settings.CHECKOUT_DELETE_MAX_BATCHES = 1000
+    count = 200000
+    _seed_checkouts(expired_checkout, count, timezone.now() - timedelta(days=31))
+    checkout = _create_checkout(channel_USD, timezone.now(), store=store)
+    CheckoutLine.objects.create(
+        checkout=checkout, variant=expired_checkout.lines.get().variant, quantity=1
+    )
+    (expired,) = get_expired_checkouts(timezone.now())
+    batch_plan = expired.values_list("pk", flat=True)[
+        : settings.CHECKOUT_DELETE_BATCH_SIZE
+    ].explain()
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        deleted, has_more = delete_expired_checkouts()
+
+    # then
+    assert not has_more
+    assert deleted["checkout.Checkout"] == count + 1
+    assert list(Checkout._base_manager.all()) == [checkout]
+    assert CheckoutLine.objects.count() == 1
+    # Every batch of the oldest checkouts is read from the last change index.
+    assert "checkout_last_change_idx" in batch_plan
+    assert "Sort" not in batch_plan
+    batches = [
+        query
+        for query in queries
+        if query["sql"].startswith('SELECT "checkout_checkout"."token"')
+        and "LIMIT 5000" in query["sql"]
+    ]
+    assert len(batches) == -(-(count + 1) // settings.CHECKOUT_DELETE_BATCH_SIZE)
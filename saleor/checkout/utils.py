@@ -32,6 +32,7 @@ from ..product import models as product_models
 from ..shipping.models import ShippingMethod
 from ..warehouse.availability import check_stock_quantity, check_stock_quantity_bulk
 from . import AddressType, calculations
+from .cache import invalidate_checkout_cache
 from .error_codes import CheckoutErrorCode
 from .fetch import (
     update_checkout_info_shipping_address,
@@ -170,6 +171,8 @@ def add_variants_to_checkout(checkout, variants, quantities, option_values, chan
                     option_value_list_to_create.append(option_value_checkout_line)
             line_instance.option_values.through.objects.bulk_create(option_value_list_to_create)
 
+    # Bulk inserts don't send signals.
+    invalidate_checkout_cache(checkout.pk)
     return checkout
 
 
@@ -38,7 +38,7 @@ class JSONWebTokenBackend(ModelBackend):
             return set()
 
         perm_cache_name = "_effective_permissions_cache"
-        if not getattr(user_obj, perm_cache_name, None):
+        if getattr(user_obj, perm_cache_name, None) is None:
             perms = getattr(self, "_get_%s_permissions" % from_name)(user_obj)
             perms = perms.values_list("content_type__app_label", "codename").order_by()
             setattr(
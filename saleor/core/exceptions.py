@@ -31,6 +31,17 @@ class AllocationError(Exception):
         self.order_lines = order_lines
 
 
+class SlotCapacityExceeded(Exception):
+    def __init__(self, order_type: str, expected_date: str, expected_time: str):
+        super().__init__(
+            f"No capacity left for {order_type} at {expected_date} {expected_time}"
+        )
+        self.order_type = order_type
+        self.expected_date = expected_date
+        self.expected_time = expected_time
+        self.code = CheckoutErrorCode.SLOT_UNAVAILABLE
+
+
 class ReadOnlyException(Exception):
     def __init__(self, msg=None):
         if msg is None:
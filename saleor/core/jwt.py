@@ -1,10 +1,13 @@
+import uuid
 from datetime import datetime, timedelta
-from typing import Any, Dict, Optional
+from typing import Any, Dict, Iterable, Optional
 
 import graphene
 import jwt
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
+from django_multitenant.utils import get_current_tenant
 
 from ..account.models import User
 from ..app.models import App
@@ -29,6 +32,9 @@ PERMISSIONS_FIELD = "permissions"
 JWT_SALEOR_OWNER_NAME = "saleor"
 JWT_OWNER_FIELD = "owner"
 
+PRINCIPAL_CACHE_KEY_PREFIX = "jwt_principal:"
+PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY = "jwt_principal_permissions_version"
+
 
 def jwt_base_payload(
     exp_delta: Optional[timedelta], token_owner: str
@@ -135,8 +141,69 @@ def get_domain_from_request(request: WSGIRequest) -> Optional[str]:
     return domain
 
 
+def get_principal_cache_key(email: str) -> str:
+    return PRINCIPAL_CACHE_KEY_PREFIX + email
+
+
+def _get_permissions_version(cached_version: Optional[str]) -> str:
+    if cached_version is None:
+        cache.add(PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        cached_version = cache.get(PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY)
+    return cached_version
+
+
+def _fetch_principal(email: str, permissions_version: str) -> Optional[Dict[str, Any]]:
+    user = User.objects.filter(email=email, is_active=True).first()
+    if not user:
+        return None
+    permissions = user.effective_permissions.values_list(
+        "content_type__app_label", "codename"
+    ).order_by()
+    # don't store the permission queryset, only the resolved codenames
+    user._effective_permissions = None
+    return {
+        "user": user,
+        "permissions": {"%s.%s" % (ct, name) for ct, name in permissions},
+        "permissions_version": permissions_version,
+    }
+
+
+def get_active_user_by_email(email: str) -> Optional[User]:
+    """Return an active user with resolved permissions, cached between requests.
+
+    The cached principal is dropped whenever the user is saved or deleted; a change
+    of any user's groups or permissions invalidates all cached permission sets.
+    """
+    key = get_principal_cache_key(email)
+    cached = cache.get_many([key, PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY])
+    permissions_version = _get_permissions_version(
+        cached.get(PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY)
+    )
+    principal = cached.get(key)
+    if not principal or principal["permissions_version"] != permissions_version:
+        principal = _fetch_principal(email, permissions_version)
+        if not principal:
+            return None
+        cache.set(key, principal, settings.JWT_PRINCIPAL_CACHE_TIMEOUT)
+
+    user = principal["user"]
+    tenant = get_current_tenant()
+    if not user.is_active or (tenant and user.store_id != tenant.id):
+        return None
+    user._effective_permissions_cache = principal["permissions"]
+    return user
+
+
+def invalidate_principals(emails: Iterable[str]):
+    cache.delete_many([get_principal_cache_key(email) for email in emails])
+
+
+def invalidate_principal_permissions():
+    cache.set(PRINCIPAL_PERMISSIONS_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+
+
 def get_user_from_payload(payload: Dict[str, Any]) -> Optional[User]:
-    user = User.objects.filter(email=payload["email"], is_active=True).first()
+    user = get_active_user_by_email(payload["email"])
     user_jwt_token = payload.get("token")
     if not user_jwt_token or not user:
         raise jwt.InvalidTokenError(
@@ -1,6 +1,13 @@
+import atexit
+import logging
+import os
 import platform
+import queue
+import threading
 import time
+from logging.handlers import QueueHandler, QueueListener
 
+from django.utils.module_loading import import_string
 from pythonjsonlogger.jsonlogger import JsonFormatter as BaseFormatter
 
 
@@ -10,3 +17,74 @@ class JsonFormatter(BaseFormatter):
     def add_fields(self, log_record, record, message_dict):
         super().add_fields(log_record, record, message_dict)
         log_record["hostname"] = platform.node()
+
+
+class QueueingHandler(QueueHandler):
+    """Hand records over to a background thread that formats and writes them.
+
+    Records are passed to a handler of `target_class` created with
+    `target_kwargs`. The queue is bounded by `maxsize`, records logged while it's
+    full are dropped and counted in `dropped` instead of blocking the caller.
+    """
+
+    def __init__(self, target_class, target_kwargs=None, maxsize=10000):
+        super().__init__(queue.Queue(maxsize))
+        if isinstance(target_class, str):
+            target_class = import_string(target_class)
+        self.target = target_class(**(target_kwargs or {}))
+        self.dropped = 0
+        self._listener = None
+        self._listener_pid = None
+        self._listener_lock = threading.Lock()
+
+    def setFormatter(self, fmt):
+        # Records are formatted in the listener thread, by the target handler.
+        self.target.setFormatter(fmt)
+
+    def setLevel(self, level):
+        super().setLevel(level)
+        self.target.setLevel(level)
+
+    def prepare(self, record):
+        # Unlike `QueueHandler.prepare` don't format the record here, it's left
+        # to the target handler. Only resolve what may change before it's handled.
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record):
+        self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def _ensure_listener(self):
+        # Threads don't survive forking, worker processes start their own.
+        pid = os.getpid()
+        if self._listener_pid == pid:
+            return
+        with self._listener_lock:
+            if self._listener_pid != pid:
+                self._listener = QueueListener(
+                    self.queue, self.target, respect_handler_level=True
+                )
+                self._listener.start()
+                self._listener_pid = pid
+                atexit.register(self.flush_queue)
+
+    def flush_queue(self):
+        """Wait until queued records are written."""
+        with self._listener_lock:
+            if self._listener is not None and self._listener_pid == os.getpid():
+                self._listener.stop()
+                self._listener = None
+                self._listener_pid = None
+
+    def close(self):
+        self.flush_queue()
+        self.target.close()
+        super().close()
@@ -1,4 +1,5 @@
 import logging
+import uuid
 from datetime import datetime
 
 from django.conf import settings
@@ -8,16 +9,19 @@ from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
 from django.utils.translation import get_language
 
-from saleor.store import models
 from django_multitenant.utils import set_current_tenant, unset_current_tenant
 
-from ..discount.utils import fetch_discounts
-from ..plugins.manager import get_plugins_manager
+from ..discount.snapshot import get_discounts
+from ..plugins.manager import get_pooled_plugins_manager
+from ..store.tenant_cache import get_store_for_host
 from . import analytics
 from .jwt import JWT_REFRESH_TOKEN_COOKIE_NAME, get_domain_from_request, jwt_decode_with_exception_handler
+from .utils.logging import log_duration, request_id_var
 
 logger = logging.getLogger(__name__)
 
+REQUEST_ID_HEADER = "X-Request-ID"
+
 
 def google_analytics(get_response):
     """Report a page view to Google Analytics."""
@@ -41,6 +45,31 @@ def google_analytics(get_response):
     return _google_analytics_middleware
 
 
+def request_id(get_response):
+    """Tag the request and events logged while handling it with an ID.
+
+    The ID of the `X-Request-ID` header is used if a proxy set it. Handled
+    requests are logged as sampled events.
+    """
+
+    def _request_id_middleware(request):
+        request_id = request.headers.get(REQUEST_ID_HEADER) or uuid.uuid4().hex
+        request.request_id = request_id
+        token = request_id_var.set(request_id)
+        try:
+            with log_duration(
+                "request", sampled=True, method=request.method, path=request.path
+            ) as fields:
+                response = get_response(request)
+                fields["status"] = response.status_code
+        finally:
+            request_id_var.reset(token)
+        response[REQUEST_ID_HEADER] = request_id
+        return response
+
+    return _request_id_middleware
+
+
 def request_time(get_response):
     def _stamp_request(request):
         request.request_time = timezone.now()
@@ -53,18 +82,9 @@ def request_set_tenant(get_response):
         domain = get_domain_from_request(request)
         if domain:
             unset_current_tenant()
-            # check if this domain is custom domain? 
-            custom_domain = models.CustomDomain.objects.filter(domain_custom = domain, status = True).first()
-            s_domain = models.Store.objects.filter(domain=domain).first()
-
-            # if enable_custom_domain:
-            if s_domain:
-                set_current_tenant(s_domain)
-            elif custom_domain:
-                 # find store by custom domain ----------------
-                s_custom_domain = models.Store.objects.filter(id=custom_domain.store_id,custom_domain_enable=True).first()
-                if s_custom_domain:
-                    set_current_tenant(s_custom_domain)
+            store = get_store_for_host(domain)
+            if store:
+                set_current_tenant(store)
         return get_response(request)
 
     return _request_set_tenant
@@ -74,7 +94,7 @@ def discounts(get_response):
 
     def _discounts_middleware(request):
         request.discounts = SimpleLazyObject(
-            lambda: fetch_discounts(request.request_time)
+            lambda: get_discounts(request.request_time)
         )
         return get_response(request)
 
@@ -105,7 +125,7 @@ def plugins(get_response):
     """Assign plugins manager."""
 
     def _get_manager():
-        return get_plugins_manager()
+        return get_pooled_plugins_manager()
 
     def _plugins_middleware(request):
         request.plugins = SimpleLazyObject(lambda: _get_manager())
@@ -218,3 +218,55 @@ def test_user_payload_doesnt_have_user_token(prefix, rf, staff_user, settings):
     backend = JSONWebTokenBackend()
     with pytest.raises(InvalidTokenError):
         backend.authenticate(request)
+
+
+def test_user_authenticated_from_cached_principal(
+    rf, staff_user, permission_manage_orders, django_assert_num_queries
+):
+    # given
+    staff_user.user_permissions.add(permission_manage_orders)
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    # when
+    with django_assert_num_queries(0):
+        user = backend.authenticate(request)
+        has_perm = user.has_perm("order.manage_orders")
+
+    # then
+    assert user == staff_user
+    assert has_perm
+
+
+def test_cached_principal_invalidated_on_token_key_change(rf, staff_user):
+    # given
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    backend.authenticate(request)
+
+    # when
+    staff_user.jwt_token_key = "new-key"
+    staff_user.save(update_fields=["jwt_token_key"])
+
+    # then
+    with pytest.raises(InvalidTokenError):
+        backend.authenticate(request)
+
+
+def test_cached_principal_invalidated_on_permission_change(
+    rf, staff_user, permission_manage_orders
+):
+    # given
+    access_token = create_access_token(staff_user)
+    request = rf.request(HTTP_AUTHORIZATION=f"JWT {access_token}")
+    backend = JSONWebTokenBackend()
+    assert not backend.authenticate(request).has_perm("order.manage_orders")
+
+    # when
+    staff_user.user_permissions.add(permission_manage_orders)
+
+    # then
+    assert backend.authenticate(request).has_perm("order.manage_orders")
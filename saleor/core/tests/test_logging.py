@@ -0,0 +1,167 @@
+import io
+import json
+import logging
+from unittest.mock import patch
+
+import pytest
+from django.http import HttpResponse
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
+
+from ..logging import JsonFormatter, QueueingHandler
+from ..middleware import REQUEST_ID_HEADER, request_id
+from ..utils.logging import get_request_id, log_duration, log_event, request_id_var
+
+
+class ListHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.records = []
+
+    def emit(self, record):
+        self.records.append(record)
+
+
+@pytest.fixture
+def event_records():
+    handler = ListHandler()
+    logger = logging.getLogger("saleor.events")
+    logger.addHandler(handler)
+    yield handler.records
+    logger.removeHandler(handler)
+
+
+def test_log_event(event_records, store):
+    # given
+    set_current_tenant(store)
+    token = request_id_var.set("request-1")
+
+    # when
+    try:
+        log_event("order.create", order_id=1, duration=0.25)
+    finally:
+        request_id_var.reset(token)
+        unset_current_tenant()
+
+    # then
+    (record,) = event_records
+    assert record.getMessage() == "order.create"
+    assert record.operation == "order.create"
+    assert record.tenant_id == store.pk
+    assert record.request_id == "request-1"
+    assert record.order_id == 1
+    assert record.duration_ms == 250.0
+    assert not hasattr(record, "sample_rate")
+
+
+def test_log_event_sampled(event_records, settings):
+    # given
+    settings.LOG_EVENTS_SAMPLE_RATE = 0
+
+    # when
+    log_event("request", sampled=True)
+    log_event("order.create")
+
+    # then
+    assert [record.operation for record in event_records] == ["order.create"]
+
+
+def test_log_event_sampled_records_sample_rate(event_records, settings):
+    # given
+    settings.LOG_EVENTS_SAMPLE_RATE = 0.5
+
+    # when
+    with patch("saleor.core.utils.logging.random.random", return_value=0.1):
+        log_event("request", sampled=True)
+
+    # then
+    (record,) = event_records
+    assert record.sample_rate == 0.5
+
+
+def test_log_duration(event_records):
+    # when
+    with log_duration("checkout.complete", checkout_token="123") as fields:
+        fields["order_id"] = 1
+
+    # then
+    (record,) = event_records
+    assert record.checkout_token == "123"
+    assert record.order_id == 1
+    assert record.duration_ms >= 0
+
+
+def test_queueing_handler_writes_json_in_background():
+    # given
+    stream = io.StringIO()
+    handler = QueueingHandler(logging.StreamHandler, {"stream": stream})
+    handler.setFormatter(JsonFormatter("%(levelname)s %(message)s"))
+    logger = logging.getLogger("saleor.tests.queueing")
+    logger.addHandler(handler)
+
+    # when
+    try:
+        logger.warning("Order %s failed", 1, extra={"operation": "order.create"})
+    finally:
+        logger.removeHandler(handler)
+        handler.close()
+
+    # then
+    record = json.loads(stream.getvalue())
+    assert record["levelname"] == "WARNING"
+    assert record["message"] == "Order 1 failed"
+    assert record["operation"] == "order.create"
+
+
+def test_queueing_handler_drops_records_when_queue_is_full():
+    # given
+    stream = io.StringIO()
+    handler = QueueingHandler(logging.StreamHandler, {"stream": stream}, maxsize=1)
+    record = logging.makeLogRecord({"msg": "event"})
+
+    # when
+    with patch.object(QueueingHandler, "_ensure_listener"):
+        handler.handle(record)
+        handler.handle(record)
+
+    # then
+    assert handler.queue.qsize() == 1
+    assert handler.dropped == 1
+
+
+def test_queueing_handler_resolves_target_class_path():
+    # when
+    handler = QueueingHandler(
+        "logging.StreamHandler", {"stream": io.StringIO()}, maxsize=5
+    )
+
+    # then
+    assert isinstance(handler.target, logging.StreamHandler)
+    handler.close()
+
+
+def test_request_id_middleware(rf, settings, event_records):
+    # given
+    settings.LOG_EVENTS_SAMPLE_RATE = 1
+    request_ids = []
+
+    def view(request):
+        request_ids.append(get_request_id())
+        return HttpResponse()
+
+    middleware = request_id(view)
+
+    # when
+    response = middleware(rf.get("/", HTTP_X_REQUEST_ID="abc"))
+    generated_response = middleware(rf.get("/"))
+
+    # then
+    assert request_ids[0] == "abc"
+    assert response[REQUEST_ID_HEADER] == "abc"
+    assert generated_response[REQUEST_ID_HEADER] == request_ids[1]
+    assert len(request_ids[1]) == 32
+    assert get_request_id() is None
+    record = event_records[0]
+    assert record.operation == "request"
+    assert record.request_id == "abc"
+    assert record.status == 200
+    assert record.path == "/"
@@ -1,6 +1,11 @@
+from django.core.cache import cache
 from django.core.handlers.base import BaseHandler
+from django_multitenant.utils import get_current_tenant
 from freezegun import freeze_time
 
+from ...store.models import Store
+from ...store.tenant_cache import clear_local_cache, get_version_cache_key
+
 from ..jwt import (
     JWT_REFRESH_TOKEN_COOKIE_NAME,
     JWT_REFRESH_TYPE,
@@ -46,3 +51,109 @@ def test_jwt_refresh_token_middleware_token_without_expire(rf, customer_user, se
     response = handler.get_response(request)
     cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
     assert cookie.value == refresh_token
+
+
+def _get_tenant_from_middleware(rf, settings, **headers):
+    settings.MIDDLEWARE = [
+        "saleor.core.middleware.request_set_tenant",
+    ]
+    request = rf.request(**headers)
+    handler = BaseHandler()
+    handler.load_middleware()
+    handler.get_response(request)
+    return get_current_tenant()
+
+
+def test_request_set_tenant_middleware_by_store_domain(rf, store, settings):
+    tenant = _get_tenant_from_middleware(rf, settings, HTTP_HOST=store.domain)
+    assert tenant.pk == store.pk
+
+
+def test_request_set_tenant_middleware_by_custom_domain(
+    rf, store, custom_domain, settings
+):
+    tenant = _get_tenant_from_middleware(
+        rf, settings, HTTP_HOST=custom_domain.domain_custom
+    )
+    assert tenant.pk == store.pk
+
+
+def test_request_set_tenant_middleware_host_is_case_insensitive(rf, store, settings):
+    # given
+    mixed_case_host = store.domain.capitalize()
+    assert mixed_case_host != store.domain
+
+    # when
+    mixed_case_tenant = _get_tenant_from_middleware(
+        rf, settings, HTTP_HOST=mixed_case_host
+    )
+    tenant = _get_tenant_from_middleware(rf, settings, HTTP_HOST=store.domain)
+
+    # then
+    assert mixed_case_tenant.pk == store.pk
+    assert tenant.pk == store.pk
+
+
+def test_request_set_tenant_middleware_warm_host_skips_database(
+    rf, store, settings, django_assert_num_queries
+):
+    # given
+    clear_local_cache()
+    _get_tenant_from_middleware(rf, settings, HTTP_HOST=store.domain)
+
+    # when
+    with django_assert_num_queries(0):
+        tenant = _get_tenant_from_middleware(rf, settings, HTTP_HOST=store.domain)
+
+    # then
+    assert tenant.pk == store.pk
+
+
+def test_request_set_tenant_middleware_invalidated_on_domain_change(
+    rf, store, settings
+):
+    # given
+    old_domain = store.domain
+    _get_tenant_from_middleware(rf, settings, HTTP_HOST=old_domain)
+
+    # when
+    store.domain = "new-pizzeria.example.com"
+    store.save(update_fields=["domain"])
+
+    # then
+    assert _get_tenant_from_middleware(rf, settings, HTTP_HOST=old_domain) is None
+    tenant = _get_tenant_from_middleware(rf, settings, HTTP_HOST=store.domain)
+    assert tenant.pk == store.pk
+
+
+def test_request_set_tenant_middleware_invalidated_on_custom_domain_status(
+    rf, store, custom_domain, settings
+):
+    # given
+    _get_tenant_from_middleware(rf, settings, HTTP_HOST=custom_domain.domain_custom)
+
+    # when
+    custom_domain.status = False
+    custom_domain.save(update_fields=["status"])
+
+    # then
+    tenant = _get_tenant_from_middleware(
+        rf, settings, HTTP_HOST=custom_domain.domain_custom
+    )
+    assert tenant is None
+
+
+def test_request_set_tenant_middleware_invalidated_by_other_process(
+    rf, store, settings
+):
+    # given
+    old_domain = store.domain
+    _get_tenant_from_middleware(rf, settings, HTTP_HOST=old_domain)
+    Store._base_manager.filter(pk=store.pk).update(domain="new-pizzeria.example.com")
+
+    # when
+    # another process replaces the version, the local entry is still there
+    cache.set(get_version_cache_key(old_domain), "new-version")
+
+    # then
+    assert _get_tenant_from_middleware(rf, settings, HTTP_HOST=old_domain) is None
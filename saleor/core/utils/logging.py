@@ -1,15 +1,72 @@
+"""Structured logging of operations for high-volume code paths.
+
+`log_event` emits a single record with the operation name, the current tenant,
+the ID of the request being handled and the given fields. Records go to the
+`saleor.events` logger, which settings route through a queue so formatting and
+writing them don't block the request.
+"""
 import logging
+import random
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+from django.conf import settings
 from django_multitenant.utils import get_current_tenant
 
-# Get an instance of a logger
-logger = logging.getLogger('django')
+logger = logging.getLogger("saleor.events")
+
+request_id_var: ContextVar[Optional[str]] = ContextVar("request_id", default=None)
+
+
+def get_request_id() -> Optional[str]:
+    return request_id_var.get()
+
 
-def log_info(component, message=None, content=None):
-    logger.info('--{component}--'.format(component=component))
+def is_sampled(sample_rate: float) -> bool:
+    return sample_rate >= 1 or random.random() < sample_rate
+
+
+def log_event(
+    operation: str,
+    duration: Optional[float] = None,
+    sampled: bool = False,
+    level: int = logging.INFO,
+    **fields,
+):
+    """Log the operation as one structured record.
+
+    Operations of high-volume paths should be `sampled`, only the
+    `LOG_EVENTS_SAMPLE_RATE` fraction of them is logged then.
+    """
+    sample_rate = settings.LOG_EVENTS_SAMPLE_RATE if sampled else 1
+    if not logger.isEnabledFor(level) or not is_sampled(sample_rate):
+        return
     store = get_current_tenant()
-    if store:
-        logger.info('--Strore_Id: {store}--'.format(store=store.id))
-    if message:
-        logger.info(message)
-    if content:
-        logger.info(content)
\ No newline at end of file
+    extra = {
+        "operation": operation,
+        "tenant_id": store.pk if store else None,
+        "request_id": request_id_var.get(),
+        **fields,
+    }
+    if duration is not None:
+        extra["duration_ms"] = round(duration * 1000, 3)
+    if sample_rate < 1:
+        extra["sample_rate"] = sample_rate
+    logger.log(level, operation, extra=extra)
+
+
+@contextmanager
+def log_duration(operation: str, sampled: bool = False, **fields):
+    """Log the operation with the duration of the wrapped block."""
+    started_at = time.perf_counter()
+    try:
+        yield fields
+    finally:
+        log_event(
+            operation,
+            duration=time.perf_counter() - started_at,
+            sampled=sampled,
+            **fields,
+        )
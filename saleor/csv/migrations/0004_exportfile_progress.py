@@ -0,0 +1,28 @@
+# Generated by Django 3.2.4 on 2021-08-24 09:31
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("csv", "0003_auto_20200810_1415"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="exportfile",
+            name="processed_count",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name="exportfile",
+            name="throughput",
+            field=models.FloatField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="exportfile",
+            name="total_count",
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+    ]
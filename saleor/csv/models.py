@@ -6,6 +6,7 @@ from ..account.models import User
 from ..app.models import App
 from ..core.models import Job
 from ..core.utils.json_serializer import CustomJsonEncoder
+from ..store.models import Store
 from . import ExportEvents
 
 
@@ -17,6 +18,9 @@ class ExportFile(Job):
         App, related_name="export_files", on_delete=models.CASCADE, null=True
     )
     content_file = models.FileField(upload_to="export_files", null=True)
+    total_count = models.PositiveIntegerField(null=True, blank=True)
+    processed_count = models.PositiveIntegerField(default=0)
+    throughput = models.FloatField(null=True, blank=True)
 
 
 class ExportEvent(models.Model):
@@ -34,3 +38,18 @@ class ExportEvent(models.Model):
     app = models.ForeignKey(
         App, related_name="export_csv_events", on_delete=models.CASCADE, null=True
     )
+
+
+class ImportFile(Job):
+    user = models.ForeignKey(
+        User, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    app = models.ForeignKey(
+        App, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    store = models.ForeignKey(
+        Store, related_name="import_files", on_delete=models.CASCADE, null=True
+    )
+    content_file = models.FileField(upload_to="import_files")
+    total_count = models.PositiveIntegerField(null=True, blank=True)
+    errors = JSONField(blank=True, default=list, encoder=CustomJsonEncoder)
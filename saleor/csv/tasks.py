@@ -1,11 +1,14 @@
 from typing import Dict, Union
 
+from django_multitenant.utils import set_current_tenant
+
 from ..celeryconf import app
 from ..core import JobStatus
 from . import events
-from .models import ExportFile
+from .models import ExportFile, ImportFile
 from .notifications import send_export_failed_info
 from .utils.export import export_products
+from .utils.products_import import import_products
 
 
 def on_task_failure(self, exc, task_id, args, kwargs, einfo):
@@ -48,3 +51,31 @@ def export_products_task(
 ):
     export_file = ExportFile.objects.get(pk=export_file_id)
     export_products(export_file, scope, export_info, file_type, delimiter)
+
+
+def on_import_task_failure(self, exc, task_id, args, kwargs, einfo):
+    import_file_id = args[0]
+    import_file = ImportFile.objects.get(pk=import_file_id)
+
+    import_file.status = JobStatus.FAILED
+    import_file.message = str(exc)[:255]
+    import_file.save(update_fields=["status", "message", "updated_at"])
+
+
+def on_import_task_success(self, retval, task_id, args, kwargs):
+    import_file_id = args[0]
+
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    if import_file.errors:
+        import_file.status = JobStatus.FAILED
+        import_file.message = "The file contains invalid rows."
+    else:
+        import_file.status = JobStatus.SUCCESS
+    import_file.save(update_fields=["status", "message", "updated_at"])
+
+
+@app.task(on_success=on_import_task_success, on_failure=on_import_task_failure)
+def import_products_task(import_file_id: int, delimiter: str = ";"):
+    import_file = ImportFile.objects.get(pk=import_file_id)
+    set_current_tenant(import_file.store)
+    import_products(import_file, delimiter)
@@ -1,3 +1,4 @@
+import csv
 import json
 import shutil
 from tempfile import NamedTemporaryFile
@@ -8,14 +9,22 @@ import openpyxl
 import petl as etl
 import pytest
 from django.core.files import File
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django_multitenant.utils import set_current_tenant
 from freezegun import freeze_time
 
 from ....core import JobStatus
 from ....graphql.csv.enums import ProductFieldEnum
-from ....product.models import Product, ProductChannelListing
+from ....product.models import (
+    Category,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+)
 from ... import FileTypes
 from ...utils.export import (
-    append_to_file,
     create_file_with_headers,
     export_products,
     export_products_in_batches,
@@ -377,82 +386,6 @@ def test_save_csv_file_in_export_file(user_export_file, tmpdir, media_root):
     shutil.rmtree(tmpdir)
 
 
-def test_append_to_file_for_csv(user_export_file, tmpdir, media_root):
-    # given
-    export_data = [
-        {"id": "123", "name": "test1", "collections": "coll1"},
-        {"id": "345", "name": "test2"},
-    ]
-    headers = ["id", "name", "collections"]
-    delimiter = ";"
-
-    table = etl.fromdicts([{"id": "1", "name": "A"}], header=headers, missing=" ")
-
-    temp_file = NamedTemporaryFile()
-    etl.tocsv(table, temp_file.name, delimiter=delimiter)
-
-    # when
-    append_to_file(export_data, headers, temp_file, FileTypes.CSV, delimiter)
-
-    # then
-    user_export_file.refresh_from_db()
-
-    file_content = temp_file.read().decode().split("\r\n")
-    assert ";".join(headers) in file_content
-    assert ";".join(export_data[0].values()) in file_content
-    assert (";".join(export_data[1].values()) + "; ") in file_content
-
-    temp_file.close()
-    shutil.rmtree(tmpdir)
-
-
-def test_append_to_file_for_xlsx(user_export_file, tmpdir, media_root):
-    # given
-    export_data = [
-        {"id": "123", "name": "test1", "collections": "coll1"},
-        {"id": "345", "name": "test2"},
-    ]
-    expected_headers = ["id", "name", "collections"]
-    delimiter = ";"
-
-    table = etl.fromdicts(
-        [{"id": "1", "name": "A"}], header=expected_headers, missing=" "
-    )
-
-    temp_file = NamedTemporaryFile(suffix=".xlsx")
-    etl.io.xlsx.toxlsx(table, temp_file.name)
-
-    # when
-    append_to_file(export_data, expected_headers, temp_file, FileTypes.XLSX, delimiter)
-
-    # then
-    user_export_file.refresh_from_db()
-
-    wb_obj = openpyxl.load_workbook(temp_file)
-
-    sheet_obj = wb_obj.active
-    max_col = sheet_obj.max_column
-    max_row = sheet_obj.max_row
-    expected_headers = expected_headers
-    headers = [sheet_obj.cell(row=1, column=i).value for i in range(1, max_col + 1)]
-    data = []
-    for i in range(2, max_row + 1):
-        row = []
-        for j in range(1, max_col + 1):
-            row.append(sheet_obj.cell(row=i, column=j).value)
-        data.append(row)
-
-    assert headers == expected_headers
-    assert list(export_data[0].values()) in data
-    row2 = list(export_data[1].values())
-    # add string with space for collections column
-    row2.append(" ")
-    assert row2 in data
-
-    temp_file.close()
-    shutil.rmtree(tmpdir)
-
-
 @patch("saleor.csv.utils.export.BATCH_SIZE", 1)
 def test_export_products_in_batches_for_csv(
     product_list,
@@ -592,3 +525,168 @@ def test_export_products_in_batches_for_xlsx(
         assert row in data
 
     shutil.rmtree(tmpdir)
+
+
+def _export_names_and_skus(queryset, export_file, file_type):
+    export_info = {
+        "fields": [ProductFieldEnum.NAME.value, ProductFieldEnum.VARIANT_SKU.value]
+    }
+    export_fields = ["id", "name", "variants__sku"]
+    temp_file = create_file_with_headers(["id", "name", "variant sku"], ";", file_type)
+    export_products_in_batches(
+        queryset,
+        export_info,
+        set(export_fields),
+        export_fields,
+        ";",
+        temp_file,
+        file_type,
+        export_file=export_file,
+    )
+    return temp_file
+
+
+def _read_csv_rows(temp_file):
+    with open(temp_file.name, encoding="utf-8", newline="") as csv_file:
+        return list(csv.reader(csv_file, delimiter=";"))
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 2)
+def test_export_products_in_batches_streams_csv_rows(
+    products_with_options, user_export_file
+):
+    # when
+    temp_file = _export_names_and_skus(
+        Product.objects.order_by("pk"), user_export_file, FileTypes.CSV
+    )
+
+    # then
+    rows = _read_csv_rows(temp_file)
+    assert rows[0] == ["id", "name", "variant sku"]
+    assert rows[1:] == [
+        [
+            graphene.Node.to_global_id("Product", product.pk),
+            product.name,
+            product.variants.get().sku,
+        ]
+        for product in products_with_options
+    ]
+    temp_file.close()
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 2)
+def test_export_products_in_batches_streams_xlsx_rows(
+    products_with_options, user_export_file
+):
+    # when
+    temp_file = _export_names_and_skus(
+        Product.objects.order_by("pk"), user_export_file, FileTypes.XLSX
+    )
+
+    # then
+    worksheet = openpyxl.load_workbook(temp_file.name).active
+    rows = [list(row) for row in worksheet.values]
+    assert rows[0] == ["id", "name", "variant sku"]
+    assert rows[1:] == [
+        [
+            graphene.Node.to_global_id("Product", product.pk),
+            product.name,
+            product.variants.get().sku,
+        ]
+        for product in products_with_options
+    ]
+    temp_file.close()
+
+
+@patch("saleor.csv.utils.export.BATCH_SIZE", 2)
+def test_export_products_in_batches_updates_progress(
+    products_with_options, user_export_file
+):
+    # when
+    temp_file = _export_names_and_skus(
+        Product.objects.order_by("pk"), user_export_file, FileTypes.CSV
+    )
+
+    # then
+    user_export_file.refresh_from_db()
+    assert user_export_file.total_count == len(products_with_options)
+    assert user_export_file.processed_count == len(products_with_options)
+    assert user_export_file.throughput > 0
+    temp_file.close()
+
+
+@pytest.mark.django_db(transaction=True)
+@patch("saleor.csv.utils.export.BATCH_SIZE", 2)
+def test_export_products_in_batches_with_workers(
+    products_with_options, user_export_file, settings
+):
+    # given
+    queryset = Product.objects.order_by("pk")
+    serial_file = _export_names_and_skus(queryset, None, FileTypes.CSV)
+    settings.CSV_EXPORT_WORKERS = 2
+
+    # when
+    temp_file = _export_names_and_skus(queryset, user_export_file, FileTypes.CSV)
+
+    # then
+    assert _read_csv_rows(temp_file) == _read_csv_rows(serial_file)
+    user_export_file.refresh_from_db()
+    assert user_export_file.processed_count == len(products_with_options)
+    serial_file.close()
+    temp_file.close()
+
+
+def _create_synthetic_catalogue(store, products_count, variants_per_product):
+    set_current_tenant(store)
+    category = Category.objects.create(name="Synthetic", slug="synthetic")
+    product_type = ProductType.objects.create(
+        name="Synthetic", slug="synthetic", has_variants=True
+    )
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Product {index}",
+                slug=f"product-{index}",
+                product_type=product_type,
+                category=category,
+            )
+            for index in range(products_count)
+        ]
+    )
+    ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"{product.slug}-{index}")
+            for product in products
+            for index in range(variants_per_product)
+        ],
+        batch_size=10000,
+    )
+
+
+@pytest.mark.performance
+@pytest.mark.django_db(transaction=True)
+@pytest.mark.parametrize("workers", [0, 4])
+@patch("saleor.csv.utils.export.BATCH_SIZE", 1000)
+def test_export_products_benchmark(store, user_export_file, settings, workers):
+    # given
+    products_count = 20000
+    variants_per_product = 5
+    _create_synthetic_catalogue(store, products_count, variants_per_product)
+    settings.CSV_EXPORT_WORKERS = workers
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        temp_file = _export_names_and_skus(
+            Product.objects.order_by("pk"), user_export_file, FileTypes.CSV
+        )
+
+    # then
+    rows = _read_csv_rows(temp_file)
+    assert len(rows) == products_count * variants_per_product + 1
+    user_export_file.refresh_from_db()
+    assert user_export_file.processed_count == products_count
+    # Every batch of products is read with a fixed number of queries, with
+    # workers they are run by the pool.
+    batches = products_count // 1000
+    assert len(queries) <= (batches + 1) * 3
+    temp_file.close()
@@ -0,0 +1,369 @@
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.files.base import ContentFile
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django_multitenant.utils import set_current_tenant
+
+from ...core import JobStatus
+from ...product.models import (
+    Category,
+    Option,
+    OptionValue,
+    OptionValueChannelListing,
+    Product,
+    ProductChannelListing,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...warehouse.models import Stock, Warehouse
+from ..error_codes import ImportErrorCode
+from ..models import ImportFile
+from ..tasks import import_products_task
+from ..utils.products_import import BATCH_SIZE, import_products
+
+HEADERS = (
+    "product name;product slug;product type;category;description;variant sku;"
+    "variant name;channel;price;cost price;warehouse;quantity;options"
+)
+
+
+@pytest.fixture
+def import_catalogue(store, channel_USD, address, media_root):
+    set_current_tenant(store)
+    category = Category.objects.create(name="Pizzas", slug="pizzas")
+    product_type = ProductType.objects.create(name="Pizza", slug="pizza")
+    warehouse = Warehouse.objects.create(
+        address=address, name="Kitchen", slug="kitchen", email="kitchen@example.com"
+    )
+    return category, product_type, warehouse
+
+
+def _create_import_file(store, staff_user, lines):
+    content = "\n".join([HEADERS, *lines]).encode()
+    return ImportFile.objects.create(
+        user=staff_user,
+        store=store,
+        content_file=ContentFile(content, name="products.csv"),
+    )
+
+
+@patch("saleor.csv.utils.products_import.update_products_discounted_prices_task")
+def test_import_products(
+    update_prices_task_mock,
+    store,
+    staff_user,
+    channel_USD,
+    import_catalogue,
+):
+    # given
+    _category, product_type, warehouse = import_catalogue
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [
+            "Margherita;;pizza;pizzas;Tomato and mozzarella;marg-s;Small;"
+            f"{channel_USD.slug};8.50;2;kitchen;10;Size: Small=0, Large=2",
+            "Margherita;;pizza;pizzas;;marg-l;Large;"
+            f"{channel_USD.slug};10.50;;kitchen;5;Size: Small=0, Large=2 | "
+            "Toppings: Cheese=1.25",
+            f"Diavola;diavola;Pizza;;;diav;;{channel_USD.slug};11;;;;",
+        ],
+    )
+
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert import_file.total_count == 3
+
+    margherita = Product.objects.get(slug="margherita")
+    assert margherita.product_type == product_type
+    assert margherita.category.slug == "pizzas"
+    assert margherita.store == store
+    assert margherita.description_plaintext == "Tomato and mozzarella"
+    assert [variant.sku for variant in margherita.variants.all()] == [
+        "marg-s",
+        "marg-l",
+    ]
+    assert margherita.default_variant.sku == "marg-s"
+    listing = ProductChannelListing.objects.get(product=margherita)
+    assert listing.is_published
+    assert listing.discounted_price_amount == Decimal("8.50")
+    variant_listing = ProductVariantChannelListing.objects.get(variant__sku="marg-s")
+    assert variant_listing.price_amount == Decimal("8.50")
+    assert variant_listing.cost_price_amount == Decimal(2)
+    assert variant_listing.currency == channel_USD.currency_code
+    assert Stock.objects.get(product_variant__sku="marg-l").quantity == 5
+    assert [option.name for option in margherita.options.all()] == [
+        "Size",
+        "Toppings",
+    ]
+    assert list(
+        OptionValue.objects.filter(option__name="Size").values_list("name", flat=True)
+    ) == ["Small", "Large"]
+    cheese_listing = OptionValueChannelListing.objects.get(option_value__name="Cheese")
+    assert cheese_listing.price_amount == Decimal("1.25")
+
+    diavola = Product.objects.get(slug="diavola")
+    assert diavola.category is None
+    assert not diavola.variants.get().stocks.exists()
+    assert not diavola.options.exists()
+
+    update_prices_task_mock.delay.assert_called_once()
+    assert set(update_prices_task_mock.delay.call_args[0][0]) == {
+        margherita.pk,
+        diavola.pk,
+    }
+
+
+def test_import_products_generates_unique_slugs(
+    store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    _category, product_type, _warehouse = import_catalogue
+    Product.objects.create(
+        name="Margherita", slug="margherita", product_type=product_type
+    )
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [f"Margherita;;pizza;;;marg;;{channel_USD.slug};8;;;;"],
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    assert Product.objects.get(variants__sku="marg").slug == "margherita-2"
+
+
+def test_import_products_reuses_options(
+    store, staff_user, channel_USD, import_catalogue, product_options
+):
+    # given
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [f"Calzone;;pizza;;;calzone;;{channel_USD.slug};9;;;;Size: Size 1=5, XL=3"],
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    size = Option.objects.get(name="Size")
+    assert list(size.products.values_list("slug", flat=True)) == ["calzone"]
+    assert list(size.option_values.values_list("name", "sort_order")) == [
+        ("Size 0", 0),
+        ("Size 1", 1),
+        ("Size 2", 2),
+        ("XL", 3),
+    ]
+    # Prices of existing option values are kept.
+    assert OptionValue.objects.get(name="Size 1").get_price_amount_by_channel(
+        channel_USD.slug
+    ) == Decimal(1)
+    assert OptionValue.objects.get(name="XL").get_price_amount_by_channel(
+        channel_USD.slug
+    ) == Decimal(3)
+
+
+def test_import_products_reports_row_errors(
+    store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    _category, product_type, _warehouse = import_catalogue
+    variant_product = Product.objects.create(
+        name="Existing", slug="existing", product_type=product_type
+    )
+    ProductVariant.objects.create(product=variant_product, sku="taken")
+    channel = channel_USD.slug
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [
+            f"Margherita;;pizza;;;marg-s;;{channel};abc;;;;",
+            "Margherita;;other;;;marg-l;;unknown;10;;missing;-1;",
+            f"Diavola;;pizza;;;taken;;{channel};10;;;;Size",
+            f"Funghi;;pizza;;;funghi;;{channel};10;;;;",
+            f"Funghi;;pizza;;;funghi;;{channel};10;;;;",
+            ";;pizza;;;;;;;;;;",
+        ],
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    errors = {
+        (error["row"], error["field"], error["code"]) for error in import_file.errors
+    }
+    assert errors == {
+        (2, "price", ImportErrorCode.INVALID.value),
+        (3, "quantity", ImportErrorCode.INVALID.value),
+        (4, "options", ImportErrorCode.INVALID.value),
+        (7, "product name", ImportErrorCode.REQUIRED.value),
+        (7, "variant sku", ImportErrorCode.REQUIRED.value),
+        (7, "channel", ImportErrorCode.REQUIRED.value),
+        (7, "price", ImportErrorCode.REQUIRED.value),
+    }
+    assert not Product.objects.exclude(pk=variant_product.pk).exists()
+
+
+@pytest.mark.parametrize("price", ["-1", "NaN", "Infinity", "1.23456", "abc"])
+def test_import_products_reports_invalid_option_value_price(
+    price, store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [f"Funghi;;pizza;;;funghi;;{channel_USD.slug};10;;;;Size: Small={price}"],
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert [
+        (error["row"], error["field"], error["code"]) for error in import_file.errors
+    ] == [(2, "options", ImportErrorCode.INVALID.value)]
+    assert not Product.objects.exists()
+    assert not OptionValue.objects.exists()
+
+
+def test_import_products_reports_invalid_references(
+    store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    _category, product_type, _warehouse = import_catalogue
+    variant_product = Product.objects.create(
+        name="Existing", slug="existing", product_type=product_type
+    )
+    ProductVariant.objects.create(product=variant_product, sku="taken")
+    channel = channel_USD.slug
+    import_file = _create_import_file(
+        store,
+        staff_user,
+        [
+            f"Margherita;;pizza;;;marg-s;;{channel};10;;;;",
+            "Margherita;;other;;;marg-l;;unknown;10;;missing;1;",
+            f"Diavola;existing;pizza;pastas;;taken;;{channel};10;;;;",
+            f"Funghi;;pizza;;;funghi;;{channel};10;;;;Size: Small=1",
+            f"Funghi;;pizza;;;funghi;;{channel};10;;;;Size: Small=2",
+        ],
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    errors = {
+        (error["row"], error["field"], error["code"]) for error in import_file.errors
+    }
+    assert errors == {
+        (3, "product type", ImportErrorCode.NOT_FOUND.value),
+        (3, "product type", ImportErrorCode.INVALID.value),
+        (3, "channel", ImportErrorCode.NOT_FOUND.value),
+        (3, "warehouse", ImportErrorCode.NOT_FOUND.value),
+        (4, "product slug", ImportErrorCode.UNIQUE.value),
+        (4, "category", ImportErrorCode.NOT_FOUND.value),
+        (4, "variant sku", ImportErrorCode.UNIQUE.value),
+        (6, "channel", ImportErrorCode.DUPLICATED_INPUT_ITEM.value),
+        (6, "options", ImportErrorCode.INVALID.value),
+    }
+    assert not Product.objects.exclude(pk=variant_product.pk).exists()
+
+
+def test_import_products_missing_columns(store, staff_user, media_root):
+    # given
+    import_file = ImportFile.objects.create(
+        user=staff_user,
+        store=store,
+        content_file=ContentFile(b"product name;price\nPizza;10", name="p.csv"),
+    )
+
+    # when
+    import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert {error["field"] for error in import_file.errors} == {
+        "product type",
+        "variant sku",
+        "channel",
+    }
+
+
+def test_import_products_task(store, staff_user, channel_USD, import_catalogue):
+    # given
+    import_file = _create_import_file(
+        store, staff_user, [f"Margherita;;pizza;;;marg;;{channel_USD.slug};8;;;;"]
+    )
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.SUCCESS
+    assert Product.objects.filter(slug="margherita").exists()
+
+
+def test_import_products_task_with_invalid_rows(
+    store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    import_file = _create_import_file(
+        store, staff_user, [f"Margherita;;pizza;;;marg;;{channel_USD.slug};x;;;;"]
+    )
+
+    # when
+    import_products_task.delay(import_file.pk)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.status == JobStatus.FAILED
+    assert import_file.errors[0]["row"] == 2
+
+
+@pytest.mark.performance
+@patch("saleor.csv.utils.products_import.update_products_discounted_prices_task")
+def test_import_products_benchmark(
+    _update_prices_task_mock, store, staff_user, channel_USD, import_catalogue
+):
+    # given
+    products_count = 10000
+    variants_per_product = 5
+    channel = channel_USD.slug
+    lines = [
+        f"Pizza {index};;pizza;pizzas;;pizza-{index}-{size};{size};{channel};"
+        f"{10 + size};;kitchen;{size};Size: S{size}={size} | Extras: Cheese=1"
+        for index in range(products_count)
+        for size in range(variants_per_product)
+    ]
+    import_file = _create_import_file(store, staff_user, lines)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        import_products(import_file)
+
+    # then
+    import_file.refresh_from_db()
+    assert import_file.errors == []
+    assert ProductVariant.objects.count() == len(lines)
+    assert Stock.objects.count() == len(lines)
+    # Rows are saved in bulk, the number of queries grows with batches of them.
+    batches = -(-len(lines) // BATCH_SIZE)
+    assert len(queries) <= batches * 5
@@ -67,3 +67,35 @@ class ProductExportFields:
         "variant_currency_code": "variants__channel_listings__currency",
         "variant_cost_price": "variants__channel_listings__cost_price_amount",
     }
+
+
+class ProductImportFields:
+    """Headers of product import files, one row per variant and channel."""
+
+    PRODUCT_NAME = "product name"
+    PRODUCT_SLUG = "product slug"
+    PRODUCT_TYPE = "product type"
+    CATEGORY = "category"
+    DESCRIPTION = "description"
+    PUBLISHED = "published"
+    VARIANT_SKU = "variant sku"
+    VARIANT_NAME = "variant name"
+    CHANNEL = "channel"
+    PRICE = "price"
+    COST_PRICE = "cost price"
+    WAREHOUSE = "warehouse"
+    QUANTITY = "quantity"
+    OPTIONS = "options"
+
+    REQUIRED_HEADERS = [PRODUCT_NAME, PRODUCT_TYPE, VARIANT_SKU, CHANNEL, PRICE]
+    HEADERS = REQUIRED_HEADERS + [
+        PRODUCT_SLUG,
+        CATEGORY,
+        DESCRIPTION,
+        PUBLISHED,
+        VARIANT_NAME,
+        COST_PRICE,
+        WAREHOUSE,
+        QUANTITY,
+        OPTIONS,
+    ]
@@ -1,25 +1,48 @@
+import csv
 import secrets
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from tempfile import NamedTemporaryFile
-from typing import IO, TYPE_CHECKING, Any, Dict, List, Set, Union
-
+from typing import (
+    IO,
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+
+import openpyxl
 import petl as etl
+from django.conf import settings
+from django.db import connections
 from django.utils import timezone
+from django_multitenant.utils import get_current_tenant, set_current_tenant
 
 from ...product.models import Product
 from .. import FileTypes
+from ..models import ExportFile
 from ..notifications import send_export_download_link_notification
 from .product_headers import get_export_fields_and_headers_info
-from .products_data import get_products_data
+from .products_data import get_products_data, iter_products_data
 
 if TYPE_CHECKING:
     # flake8: noqa
     from django.db.models import QuerySet
 
-    from ..models import ExportFile
-
 
 BATCH_SIZE = 10000
 
+ExportRow = Dict[str, Union[str, bool]]
+
 
 def export_products(
     export_file: "ExportFile",
@@ -45,6 +68,7 @@ def export_products(
         delimiter,
         temporary_file,
         file_type,
+        export_file=export_file,
     )
 
     save_csv_file_in_export_file(export_file, temporary_file, file_name)
@@ -103,26 +127,152 @@ def export_products_in_batches(
     delimiter: str,
     temporary_file: Any,
     file_type: str,
+    export_file: Optional["ExportFile"] = None,
 ):
+    """Append rows of all products in the queryset to the file with headers.
+
+    Rows are written as they are produced, so only a single batch of products is
+    kept in memory. When the export file is given, its progress is updated after
+    every batch.
+    """
     warehouses = export_info.get("warehouses")
     attributes = export_info.get("attributes")
     channels = export_info.get("channels")
 
-    for batch_pks in queryset_in_batches(queryset):
-        product_batch = Product.objects.filter(pk__in=batch_pks).prefetch_related(
-            "attributes",
-            "variants",
-            "collections",
-            "media",
-            "product_type",
-            "category",
-        )
+    if export_file:
+        start_export_progress(export_file, queryset.count())
+    started_at = time.monotonic()
+
+    batches = get_products_data_in_batches(
+        queryset, export_fields, attributes, warehouses, channels
+    )
+    with open_file_writer(temporary_file, headers, file_type, delimiter) as write:
+        for products_count, export_data in batches:
+            write(export_data)
+            if export_file:
+                update_export_progress(export_file, products_count, started_at)
 
-        export_data = get_products_data(
-            product_batch, export_fields, attributes, warehouses, channels
+
+def get_products_data_in_batches(
+    queryset: "QuerySet",
+    export_fields: Set[str],
+    attribute_ids: Optional[List[int]],
+    warehouse_ids: Optional[List[int]],
+    channel_ids: Optional[List[int]],
+) -> Iterator[Tuple[int, Iterable[ExportRow]]]:
+    """Yield the number of products and rows of every batch, in queryset order.
+
+    With `CSV_EXPORT_WORKERS` set, batches are prepared by a pool of threads
+    ahead of the one being written.
+    """
+    args = (export_fields, attribute_ids, warehouse_ids, channel_ids)
+    workers = settings.CSV_EXPORT_WORKERS
+    if not workers:
+        for batch_pks in queryset_in_batches(queryset):
+            product_batch = Product.objects.filter(pk__in=batch_pks)
+            yield len(batch_pks), iter_products_data(product_batch, *args)
+        return
+
+    tenant = get_current_tenant()
+    pending: deque = deque()
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        for batch_pks in queryset_in_batches(queryset):
+            future = executor.submit(
+                get_products_data_for_batch, tenant, batch_pks, *args
+            )
+            pending.append((len(batch_pks), future))
+            # Bound the number of prepared batches waiting to be written.
+            if len(pending) > workers:
+                products_count, future = pending.popleft()
+                yield products_count, future.result()
+        while pending:
+            products_count, future = pending.popleft()
+            yield products_count, future.result()
+
+
+def get_products_data_for_batch(
+    tenant,
+    batch_pks: List[int],
+    export_fields: Set[str],
+    attribute_ids: Optional[List[int]],
+    warehouse_ids: Optional[List[int]],
+    channel_ids: Optional[List[int]],
+) -> List[ExportRow]:
+    """Prepare rows of a batch of products in a pool thread."""
+    try:
+        set_current_tenant(tenant)
+        product_batch = Product.objects.filter(pk__in=batch_pks)
+        return get_products_data(
+            product_batch, export_fields, attribute_ids, warehouse_ids, channel_ids
         )
+    finally:
+        connections.close_all()
+
+
+def start_export_progress(export_file: "ExportFile", total_count: int):
+    export_file.total_count = total_count
+    export_file.processed_count = 0
+    export_file.throughput = None
+    ExportFile.objects.filter(pk=export_file.pk).update(
+        total_count=total_count,
+        processed_count=0,
+        throughput=None,
+        updated_at=timezone.now(),
+    )
+
+
+def update_export_progress(
+    export_file: "ExportFile", products_count: int, started_at: float
+):
+    """Add exported products to the progress and update products per second."""
+    export_file.processed_count += products_count
+    elapsed = time.monotonic() - started_at
+    export_file.throughput = export_file.processed_count / elapsed if elapsed else None
+    ExportFile.objects.filter(pk=export_file.pk).update(
+        processed_count=export_file.processed_count,
+        throughput=export_file.throughput,
+        updated_at=timezone.now(),
+    )
+
+
+@contextmanager
+def open_file_writer(
+    temporary_file: Any, headers: List[str], file_type: str, delimiter: str
+) -> Iterator[Callable[[Iterable[ExportRow]], None]]:
+    """Open the file with headers for appending rows.
 
-        append_to_file(export_data, headers, temporary_file, file_type, delimiter)
+    Yield a function that writes given rows, values of missing headers are
+    filled with a space.
+    """
+    if file_type == FileTypes.CSV:
+        with open(temporary_file.name, "a", encoding="utf-8", newline="") as file:
+            writer = csv.DictWriter(
+                file,
+                headers,
+                restval=" ",
+                extrasaction="ignore",
+                delimiter=delimiter,
+            )
+            yield writer.writerows
+        return
+
+    # Worksheets can't be appended to in place, rows already in the file are
+    # copied to a write-only workbook, which keeps new rows on disk.
+    workbook = openpyxl.load_workbook(temporary_file.name, read_only=True)
+    existing_rows = list(workbook.active.values)
+    workbook.close()
+
+    workbook = openpyxl.Workbook(write_only=True)
+    worksheet = workbook.create_sheet()
+    for row in existing_rows:
+        worksheet.append(row)
+
+    def write_rows(export_data: Iterable[ExportRow]):
+        for data in export_data:
+            worksheet.append([data.get(header, " ") for header in headers])
+
+    yield write_rows
+    workbook.save(temporary_file.name)
 
 
 def create_file_with_headers(file_headers: List[str], delimiter: str, file_type: str):
@@ -138,21 +288,6 @@ def create_file_with_headers(file_headers: List[str], delimiter: str, file_type:
     return temp_file
 
 
-def append_to_file(
-    export_data: List[Dict[str, Union[str, bool]]],
-    headers: List[str],
-    temporary_file: Any,
-    file_type: str,
-    delimiter: str,
-):
-    table = etl.fromdicts(export_data, header=headers, missing=" ")
-
-    if file_type == FileTypes.CSV:
-        etl.io.csv.appendcsv(table, temporary_file.name, delimiter=delimiter)
-    else:
-        etl.io.xlsx.appendxlsx(table, temporary_file.name)
-
-
 def save_csv_file_in_export_file(
     export_file: "ExportFile", temporary_file: IO[bytes], file_name: str
 ):
@@ -1,5 +1,5 @@
 from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Dict, List, Optional, Set, Union
+from typing import TYPE_CHECKING, Dict, Iterator, List, Optional, Set, Union
 from urllib.parse import urljoin
 
 import graphene
@@ -30,9 +30,25 @@ def get_products_data(
     It return list with product and variant data which can be used as import to
     csv writer and list of attribute and warehouse headers.
     """
+    return list(
+        iter_products_data(
+            queryset, export_fields, attribute_ids, warehouse_ids, channel_ids
+        )
+    )
 
-    products_with_variants_data = []
 
+def iter_products_data(
+    queryset: "QuerySet",
+    export_fields: Set[str],
+    attribute_ids: Optional[List[int]],
+    warehouse_ids: Optional[List[int]],
+    channel_ids: Optional[List[int]],
+) -> Iterator[Dict[str, Union[str, bool]]]:
+    """Yield data of products and their variants with fields values.
+
+    Rows are built from `values()` projections and produced one by one, only the
+    relations data of the queryset is kept in memory.
+    """
     product_fields = set(
         ProductExportFields.HEADERS_TO_FIELDS_MAPPING["fields"].values()
     )
@@ -69,7 +85,7 @@ def get_products_data(
         queryset, export_fields, attribute_ids, warehouse_ids, channel_ids
     )
 
-    for product_data in products_data:
+    for product_data in products_data.iterator():
         pk = product_data["id"]
         variant_pk = product_data.pop("variants__id")
 
@@ -79,11 +95,7 @@ def get_products_data(
         )
 
         product_data["id"] = graphene.Node.to_global_id("Product", pk)
-        data = {**product_data, **product_relations_data, **variant_relations_data}
-
-        products_with_variants_data.append(data)
-
-    return products_with_variants_data
+        yield {**product_data, **product_relations_data, **variant_relations_data}
 
 
 def get_products_relations_data(
@@ -0,0 +1,782 @@
+"""Bulk import of products from CSV files.
+
+A file has a row per variant and channel, rows with the same product slug (or
+name, when the slug is empty) make up a single product. The whole file is
+validated first and every error is reported with its line number; nothing is
+saved unless all rows are valid.
+
+Products and variants are inserted with `bulk_create` since their ids are needed
+by related rows. Channel listings, stocks and product options don't need ids
+back and are loaded with `COPY`.
+
+The options column lists options with values and their prices in the channel of
+the row, e.g. `Size: Small=0, Large=2.50 | Toppings: Cheese=1`. Missing options
+and values are created, prices of existing option values are kept.
+"""
+import csv
+import io
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import Decimal, InvalidOperation
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Type,
+    Union,
+)
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Max, Model, Q
+from django.utils import timezone
+from django.utils.functional import cached_property
+from django.utils.text import slugify
+
+from ...channel.models import Channel
+from ...product.models import (
+    Category,
+    Option,
+    OptionValue,
+    OptionValueChannelListing,
+    Product,
+    ProductChannelListing,
+    ProductOption,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...product.tasks import update_products_discounted_prices_task
+from ...warehouse.models import Stock, Warehouse
+from ..error_codes import ImportErrorCode
+from . import ProductImportFields
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..models import ImportFile
+
+
+BATCH_SIZE = 5000
+
+# Rows of an invalid file can all be wrong, only the first errors are reported.
+MAX_REPORTED_ERRORS = 1000
+
+DEFAULT_OPTION_TYPE = "single"
+
+COPY_NULL = r"\N"
+
+RowError = Dict[str, Union[int, str, None]]
+OptionData = Tuple[str, List[Tuple[str, Decimal]]]
+
+
+@dataclass
+class ProductImportRow:
+    line: int
+    product_name: str
+    product_slug: str
+    product_type: str
+    category: str
+    description: str
+    published: bool
+    variant_sku: str
+    variant_name: str
+    channel: str
+    price: Decimal
+    cost_price: Optional[Decimal]
+    warehouse: str
+    quantity: Optional[int]
+    options: List[OptionData]
+
+    @cached_property
+    def product_key(self) -> str:
+        """Identify the product of the row, variants of a product share it."""
+        return self.product_slug or slugify(self.product_name, allow_unicode=True)
+
+
+@dataclass
+class ProductImportContext:
+    """Objects referenced by the imported rows, loaded with a query per model."""
+
+    product_types: Dict[str, ProductType]
+    categories: Dict[str, Category]
+    channels: Dict[str, Channel]
+    warehouses: Dict[str, Warehouse]
+    existing_skus: Set[str]
+    existing_slugs: Set[str]
+    options: Dict[str, Option]
+    option_values: Dict[Tuple[int, str], OptionValue]
+    option_value_listings: Set[Tuple[int, int]]
+
+
+def make_error(
+    line: int, header: Optional[str], message: str, code: ImportErrorCode
+) -> RowError:
+    return {"row": line, "field": header, "message": message, "code": code.value}
+
+
+def import_products(import_file: "ImportFile", delimiter: str = ";"):
+    """Validate the import file and create its products when all rows are valid."""
+    with import_file.content_file.open("rb") as content_file:
+        content = content_file.read()
+    rows, errors = read_import_rows(content, delimiter)
+    if not errors:
+        context = get_import_context(rows)
+        errors = validate_import_rows(rows, context)
+    if not errors:
+        save_import_rows(rows, context)
+
+    import_file.total_count = len(rows)
+    import_file.errors = errors[:MAX_REPORTED_ERRORS]
+    import_file.save(update_fields=["total_count", "errors", "updated_at"])
+
+
+def read_import_rows(
+    content: bytes, delimiter: str
+) -> Tuple[List[ProductImportRow], List[RowError]]:
+    try:
+        text = content.decode("utf-8-sig")
+    except UnicodeDecodeError:
+        return [], [
+            make_error(1, None, "File is not UTF-8 encoded.", ImportErrorCode.INVALID)
+        ]
+
+    reader = csv.reader(io.StringIO(text, newline=""), delimiter=delimiter)
+    headers = [header.strip().lower() for header in next(reader, [])]
+    errors = [
+        make_error(1, header, "Missing column.", ImportErrorCode.REQUIRED)
+        for header in ProductImportFields.REQUIRED_HEADERS
+        if header not in headers
+    ]
+    if errors:
+        return [], errors
+
+    rows = []
+    for values in reader:
+        if not any(value.strip() for value in values):
+            continue
+        data = {
+            header: value.strip()
+            for header, value in zip(headers, values)
+            if header in ProductImportFields.HEADERS
+        }
+        row, row_errors = parse_import_row(reader.line_num, data)
+        errors.extend(row_errors)
+        if row:
+            rows.append(row)
+    return rows, errors
+
+
+def parse_import_row(
+    line: int, data: Dict[str, str]
+) -> Tuple[Optional[ProductImportRow], List[RowError]]:
+    fields = ProductImportFields
+    errors = [
+        make_error(line, header, "This field is required.", ImportErrorCode.REQUIRED)
+        for header in fields.REQUIRED_HEADERS
+        if not data.get(header)
+    ]
+
+    def parse_price_field(header: str) -> Optional[Decimal]:
+        value = data.get(header)
+        if not value:
+            return None
+        try:
+            return parse_price(value)
+        except ValueError:
+            errors.append(
+                make_error(line, header, "Invalid price.", ImportErrorCode.INVALID)
+            )
+            return None
+
+    price = parse_price_field(fields.PRICE)
+    cost_price = parse_price_field(fields.COST_PRICE)
+
+    quantity = None
+    if data.get(fields.QUANTITY):
+        try:
+            quantity = int(data[fields.QUANTITY])
+        except ValueError:
+            quantity = -1
+        if quantity < 0:
+            errors.append(
+                make_error(
+                    line, fields.QUANTITY, "Invalid quantity.", ImportErrorCode.INVALID
+                )
+            )
+
+    published = data.get(fields.PUBLISHED, "").lower()
+    if published not in ("", "true", "false", "yes", "no", "1", "0"):
+        errors.append(
+            make_error(
+                line, fields.PUBLISHED, "Invalid boolean.", ImportErrorCode.INVALID
+            )
+        )
+
+    try:
+        options = parse_options(data.get(fields.OPTIONS, ""))
+    except ValueError as e:
+        options = []
+        errors.append(make_error(line, fields.OPTIONS, str(e), ImportErrorCode.INVALID))
+
+    if errors:
+        return None, errors
+
+    return (
+        ProductImportRow(
+            line=line,
+            product_name=data[fields.PRODUCT_NAME],
+            product_slug=data.get(fields.PRODUCT_SLUG, ""),
+            product_type=data[fields.PRODUCT_TYPE],
+            category=data.get(fields.CATEGORY, ""),
+            description=data.get(fields.DESCRIPTION, ""),
+            published=published not in ("false", "no", "0"),
+            variant_sku=data[fields.VARIANT_SKU],
+            variant_name=data.get(fields.VARIANT_NAME, ""),
+            channel=data[fields.CHANNEL],
+            price=price,  # type: ignore
+            cost_price=cost_price,
+            warehouse=data.get(fields.WAREHOUSE, ""),
+            quantity=quantity,
+            options=options,
+        ),
+        [],
+    )
+
+
+def parse_price(value: str) -> Decimal:
+    """Parse a non-negative price with at most the stored decimal places.
+
+    :raises ValueError: when the value isn't a valid price.
+    """
+    try:
+        price = Decimal(value)
+    except InvalidOperation:
+        raise ValueError(f"Invalid price '{value}'.")
+    if (
+        not price.is_finite()
+        or price < 0
+        or price.as_tuple().exponent < -settings.DEFAULT_DECIMAL_PLACES
+    ):
+        raise ValueError(f"Invalid price '{value}'.")
+    return price
+
+
+def parse_options(value: str) -> List[OptionData]:
+    """Parse options formatted as `Size: Small=0, Large=2.50 | Toppings: Cheese`."""
+    options = []
+    for option_data in value.split("|"):
+        if not option_data.strip():
+            continue
+        name, separator, values_data = option_data.partition(":")
+        if not separator or not name.strip():
+            raise ValueError(f"Invalid option '{option_data.strip()}'.")
+        values = []
+        for value_data in values_data.split(","):
+            value_name, _, price = value_data.partition("=")
+            if not value_name.strip():
+                raise ValueError(f"Invalid values of option '{name.strip()}'.")
+            try:
+                value_price = parse_price(price.strip() or "0")
+            except ValueError:
+                raise ValueError(
+                    f"Invalid price of option value '{value_name.strip()}'."
+                )
+            values.append((value_name.strip(), value_price))
+        options.append((name.strip(), values))
+    return options
+
+
+def get_import_context(rows: List[ProductImportRow]) -> ProductImportContext:
+    product_type_keys = {row.product_type for row in rows}
+    product_types: Dict[str, ProductType] = {}
+    for product_type in ProductType.objects.filter(
+        Q(slug__in=product_type_keys) | Q(name__in=product_type_keys)
+    ):
+        product_types[product_type.name] = product_type
+    for product_type in product_types.copy().values():
+        product_types[product_type.slug] = product_type
+
+    option_names = {name for row in rows for name, _values in row.options}
+    options = {
+        option.name: option for option in Option.objects.filter(name__in=option_names)
+    }
+    option_values = {
+        (value.option_id, value.name): value
+        for value in OptionValue.objects.filter(option__in=options.values())
+    }
+    option_value_listings = set(
+        OptionValueChannelListing.objects.filter(
+            option_value__in=option_values.values()
+        ).values_list("option_value_id", "channel_id")
+    )
+
+    # Product slugs are unique across all stores.
+    product_keys = {row.product_key for row in rows}
+    existing_slugs = set(
+        Product._base_manager.filter(slug__in=product_keys).values_list(
+            "slug", flat=True
+        )
+    )
+
+    return ProductImportContext(
+        product_types=product_types,
+        categories={
+            category.slug: category
+            for category in Category.objects.filter(
+                slug__in={row.category for row in rows}
+            )
+        },
+        channels={
+            channel.slug: channel
+            for channel in Channel.objects.filter(
+                slug__in={row.channel for row in rows}
+            )
+        },
+        warehouses={
+            warehouse.slug: warehouse
+            for warehouse in Warehouse.objects.filter(
+                slug__in={row.warehouse for row in rows}
+            )
+        },
+        existing_skus=set(
+            ProductVariant.objects.filter(
+                sku__in={row.variant_sku for row in rows}
+            ).values_list("sku", flat=True)
+        ),
+        existing_slugs=existing_slugs,
+        options=options,
+        option_values=option_values,
+        option_value_listings=option_value_listings,
+    )
+
+
+def validate_import_rows(
+    rows: List[ProductImportRow], context: ProductImportContext
+) -> List[RowError]:
+    fields = ProductImportFields
+    errors: List[RowError] = []
+    first_product_rows: Dict[str, ProductImportRow] = {}
+    first_variant_rows: Dict[str, ProductImportRow] = {}
+    variant_channels: Set[Tuple[str, str]] = set()
+    variant_warehouses: Set[Tuple[str, str]] = set()
+    option_value_prices: Dict[Tuple[str, str, str], Decimal] = {}
+
+    for row in rows:
+
+        def add_error(header, message, code):
+            errors.append(make_error(row.line, header, message, code))
+
+        if row.product_type not in context.product_types:
+            add_error(
+                fields.PRODUCT_TYPE,
+                "Product type does not exist.",
+                ImportErrorCode.NOT_FOUND,
+            )
+        if row.category and row.category not in context.categories:
+            add_error(
+                fields.CATEGORY, "Category does not exist.", ImportErrorCode.NOT_FOUND
+            )
+        if row.channel not in context.channels:
+            add_error(
+                fields.CHANNEL, "Channel does not exist.", ImportErrorCode.NOT_FOUND
+            )
+        if row.warehouse and row.warehouse not in context.warehouses:
+            add_error(
+                fields.WAREHOUSE, "Warehouse does not exist.", ImportErrorCode.NOT_FOUND
+            )
+
+        product_key = row.product_key
+        if not product_key:
+            add_error(
+                fields.PRODUCT_NAME,
+                "Slug can't be created from the product name.",
+                ImportErrorCode.INVALID,
+            )
+        elif row.product_slug != slugify(row.product_slug, allow_unicode=True):
+            add_error(
+                fields.PRODUCT_SLUG, "Invalid product slug.", ImportErrorCode.INVALID
+            )
+        first_product_row = first_product_rows.setdefault(product_key, row)
+        if first_product_row is row:
+            if row.product_slug and row.product_slug in context.existing_slugs:
+                add_error(
+                    fields.PRODUCT_SLUG,
+                    "Product with this slug already exists.",
+                    ImportErrorCode.UNIQUE,
+                )
+        else:
+            for header, attribute in [
+                (fields.PRODUCT_NAME, "product_name"),
+                (fields.PRODUCT_TYPE, "product_type"),
+                (fields.CATEGORY, "category"),
+            ]:
+                if getattr(row, attribute) != getattr(first_product_row, attribute):
+                    add_error(
+                        header,
+                        f"Value differs from row {first_product_row.line}.",
+                        ImportErrorCode.INVALID,
+                    )
+
+        first_variant_row = first_variant_rows.setdefault(row.variant_sku, row)
+        if first_variant_row is row:
+            if row.variant_sku in context.existing_skus:
+                add_error(
+                    fields.VARIANT_SKU,
+                    "Product variant with this SKU already exists.",
+                    ImportErrorCode.UNIQUE,
+                )
+        elif first_variant_row.product_key != product_key:
+            add_error(
+                fields.VARIANT_SKU,
+                f"SKU is used by another product in row {first_variant_row.line}.",
+                ImportErrorCode.DUPLICATED_INPUT_ITEM,
+            )
+        if (row.variant_sku, row.channel) in variant_channels:
+            add_error(
+                fields.CHANNEL,
+                "Variant is already listed in this channel.",
+                ImportErrorCode.DUPLICATED_INPUT_ITEM,
+            )
+        variant_channels.add((row.variant_sku, row.channel))
+        if row.warehouse:
+            if (row.variant_sku, row.warehouse) in variant_warehouses:
+                add_error(
+                    fields.WAREHOUSE,
+                    "Variant already has stock in this warehouse.",
+                    ImportErrorCode.DUPLICATED_INPUT_ITEM,
+                )
+            variant_warehouses.add((row.variant_sku, row.warehouse))
+
+        for option_name, values in row.options:
+            for value_name, price in values:
+                key = (option_name, value_name, row.channel)
+                if option_value_prices.setdefault(key, price) != price:
+                    add_error(
+                        fields.OPTIONS,
+                        f"Option value '{value_name}' has another price in this "
+                        "channel in a previous row.",
+                        ImportErrorCode.INVALID,
+                    )
+    return errors
+
+
+def get_unique_slug(slug: str, used_slugs: Set[str]) -> str:
+    unique_slug = slug
+    extension = 1
+    while unique_slug in used_slugs:
+        extension += 1
+        unique_slug = f"{slug}-{extension}"
+    used_slugs.add(unique_slug)
+    return unique_slug
+
+
+def get_used_slugs(slugs: Iterable[str]) -> Set[str]:
+    lookup = Q()
+    for slug in slugs:
+        lookup |= Q(slug__startswith=slug)
+    if not lookup:
+        return set()
+    return set(Product._base_manager.filter(lookup).values_list("slug", flat=True))
+
+
+def get_max_sort_order(queryset) -> int:
+    max_sort_order = queryset.aggregate(Max("sort_order"))["sort_order__max"]
+    return -1 if max_sort_order is None else max_sort_order
+
+
+@transaction.atomic
+def save_import_rows(rows: List[ProductImportRow], context: ProductImportContext):
+    products = create_products(rows, context)
+    variants = create_variants(rows, products)
+    create_channel_listings(rows, context, products, variants)
+    create_stocks(rows, context, variants)
+    create_options(rows, context, products)
+
+    product_ids = [product.pk for product in products.values()]
+
+    def update_discounted_prices():
+        for index in range(0, len(product_ids), BATCH_SIZE):
+            update_products_discounted_prices_task.delay(
+                product_ids[index : index + BATCH_SIZE]
+            )
+
+    transaction.on_commit(update_discounted_prices)
+
+
+def create_products(
+    rows: List[ProductImportRow], context: ProductImportContext
+) -> Dict[str, Product]:
+    product_rows: Dict[str, ProductImportRow] = {}
+    for row in rows:
+        product_rows.setdefault(row.product_key, row)
+
+    generated_slugs = [key for key, row in product_rows.items() if not row.product_slug]
+    used_slugs = get_used_slugs(
+        slug for slug in generated_slugs if slug in context.existing_slugs
+    )
+    used_slugs.update(product_rows)
+
+    sort_order = get_max_sort_order(Product.objects.all())
+    products = {}
+    for key, row in product_rows.items():
+        sort_order += 1
+        slug = key
+        if not row.product_slug and key in context.existing_slugs:
+            slug = get_unique_slug(key, used_slugs)
+        description = None
+        if row.description:
+            description = {
+                "blocks": [{"type": "paragraph", "data": {"text": row.description}}]
+            }
+        products[key] = Product(
+            name=row.product_name,
+            slug=slug,
+            product_type=context.product_types[row.product_type],
+            category=context.categories.get(row.category),
+            description=description,
+            description_plaintext=row.description,
+            sort_order=sort_order,
+        )
+    Product.objects.bulk_create(products.values(), batch_size=BATCH_SIZE)
+    return products
+
+
+def create_variants(
+    rows: List[ProductImportRow], products: Dict[str, Product]
+) -> Dict[str, ProductVariant]:
+    variants: Dict[str, ProductVariant] = {}
+    variants_count: Dict[str, int] = defaultdict(int)
+    for row in rows:
+        if row.variant_sku in variants:
+            continue
+        product_key = row.product_key
+        variants[row.variant_sku] = ProductVariant(
+            product=products[product_key],
+            sku=row.variant_sku,
+            name=row.variant_name,
+            sort_order=variants_count[product_key],
+        )
+        variants_count[product_key] += 1
+    ProductVariant.objects.bulk_create(variants.values(), batch_size=BATCH_SIZE)
+
+    default_variants = {}
+    for variant in variants.values():
+        if not variant.product.default_variant_id:
+            variant.product.default_variant = variant
+            default_variants[variant.product_id] = variant.pk
+    set_default_variants(default_variants)
+    return variants
+
+
+def set_default_variants(default_variants: Dict[int, int]):
+    """Set default variants with one statement.
+
+    `bulk_update` would build a `CASE` with a branch per product.
+    """
+    quote_name = connection.ops.quote_name
+    table = quote_name(Product._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"UPDATE {table} SET {quote_name('default_variant_id')} = data.variant_id "
+            "FROM unnest(%s::int[], %s::int[]) AS data (product_id, variant_id) "
+            f"WHERE {table}.{quote_name('id')} = data.product_id",
+            [list(default_variants.keys()), list(default_variants.values())],
+        )
+
+
+def create_channel_listings(
+    rows: List[ProductImportRow],
+    context: ProductImportContext,
+    products: Dict[str, Product],
+    variants: Dict[str, ProductVariant],
+):
+    today = timezone.now().date()
+    product_prices: Dict[Tuple[str, str], Decimal] = {}
+    product_published: Dict[Tuple[str, str], bool] = {}
+    variant_listings = []
+    for row in rows:
+        channel = context.channels[row.channel]
+        variant_listings.append(
+            (
+                variants[row.variant_sku].pk,
+                channel.pk,
+                channel.currency_code,
+                row.price,
+                row.cost_price,
+            )
+        )
+
+        key = (row.product_key, row.channel)
+        product_published.setdefault(key, row.published)
+        if key not in product_prices or row.price < product_prices[key]:
+            product_prices[key] = row.price
+
+    product_listings = []
+    for (product_key, channel_slug), published in product_published.items():
+        channel = context.channels[channel_slug]
+        publication_date = today if published else None
+        product_listings.append(
+            (
+                products[product_key].pk,
+                channel.pk,
+                channel.currency_code,
+                published,
+                publication_date,
+                published,
+                publication_date,
+                # Sales are applied by the task scheduled after the import.
+                product_prices[(product_key, channel_slug)],
+            )
+        )
+
+    copy_rows(
+        ProductChannelListing,
+        [
+            "product",
+            "channel",
+            "currency",
+            "is_published",
+            "publication_date",
+            "visible_in_listings",
+            "available_for_purchase",
+            "discounted_price_amount",
+        ],
+        product_listings,
+    )
+    copy_rows(
+        ProductVariantChannelListing,
+        ["variant", "channel", "currency", "price_amount", "cost_price_amount"],
+        variant_listings,
+    )
+
+
+def create_stocks(
+    rows: List[ProductImportRow],
+    context: ProductImportContext,
+    variants: Dict[str, ProductVariant],
+):
+    copy_rows(
+        Stock,
+        ["warehouse", "product_variant", "quantity", "quantity_allocated"],
+        [
+            (
+                context.warehouses[row.warehouse].pk,
+                variants[row.variant_sku].pk,
+                row.quantity or 0,
+                0,
+            )
+            for row in rows
+            if row.warehouse
+        ],
+    )
+
+
+def create_options(
+    rows: List[ProductImportRow],
+    context: ProductImportContext,
+    products: Dict[str, Product],
+):
+    options = context.options
+    new_options = []
+    sort_order = get_max_sort_order(Option.objects.all())
+    for row in rows:
+        for option_name, _values in row.options:
+            if option_name not in options:
+                sort_order += 1
+                options[option_name] = Option(
+                    name=option_name, type=DEFAULT_OPTION_TYPE, sort_order=sort_order
+                )
+                new_options.append(options[option_name])
+    Option.objects.bulk_create(new_options, batch_size=BATCH_SIZE)
+
+    option_values = context.option_values
+    new_option_values = []
+    value_sort_orders = dict(
+        OptionValue.objects.filter(option__in=options.values())
+        .order_by()
+        .values("option_id")
+        .annotate(max_sort_order=Max("sort_order"))
+        .values_list("option_id", "max_sort_order")
+    )
+    for row in rows:
+        for option_name, values in row.options:
+            option = options[option_name]
+            for value_name, _price in values:
+                if (option.pk, value_name) in option_values:
+                    continue
+                sort_order = value_sort_orders.get(option.pk)
+                sort_order = 0 if sort_order is None else sort_order + 1
+                value_sort_orders[option.pk] = sort_order
+                option_values[(option.pk, value_name)] = OptionValue(
+                    option=option, name=value_name, sort_order=sort_order
+                )
+                new_option_values.append(option_values[(option.pk, value_name)])
+    OptionValue.objects.bulk_create(new_option_values, batch_size=BATCH_SIZE)
+
+    option_value_listings = []
+    product_options: Dict[Tuple[int, int], int] = {}
+    product_options_count: Dict[int, int] = defaultdict(int)
+    for row in rows:
+        channel = context.channels[row.channel]
+        product_id = products[row.product_key].pk
+        for option_name, values in row.options:
+            option_id = options[option_name].pk
+            if (product_id, option_id) not in product_options:
+                product_options[(product_id, option_id)] = product_options_count[
+                    product_id
+                ]
+                product_options_count[product_id] += 1
+            for value_name, price in values:
+                option_value_id = option_values[(option_id, value_name)].pk
+                if (option_value_id, channel.pk) in context.option_value_listings:
+                    continue
+                context.option_value_listings.add((option_value_id, channel.pk))
+                option_value_listings.append(
+                    (option_value_id, channel.pk, channel.currency_code, price)
+                )
+
+    copy_rows(
+        OptionValueChannelListing,
+        ["option_value", "channel", "currency", "price_amount"],
+        option_value_listings,
+    )
+    copy_rows(
+        ProductOption,
+        ["product", "option", "sort_order"],
+        [
+            (product_id, option_id, sort_order)
+            for (product_id, option_id), sort_order in product_options.items()
+        ],
+    )
+
+
+def copy_rows(model: Type[Model], field_names: List[str], rows: Iterable[Tuple]):
+    """Insert rows of field values with `COPY`.
+
+    Rows are written as they are, foreign keys are given as ids. Building model
+    instances would take longer than loading them for large imports.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerows(
+        [COPY_NULL if value is None else value for value in row] for row in rows
+    )
+    if not buffer.tell():
+        return
+    buffer.seek(0)
+
+    quote_name = connection.ops.quote_name
+    columns = ", ".join(
+        quote_name(model._meta.get_field(field_name).column)
+        for field_name in field_names
+    )
+    with connection.cursor() as cursor:
+        cursor.copy_expert(
+            f"COPY {quote_name(model._meta.db_table)} ({columns}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')",
+            buffer,
+        )
@@ -0,0 +1,35 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class DeliveryAppConfig(AppConfig):
+    name = "saleor.delivery"
+
+    def ready(self):
+        from ..graphql.core.resolver_cache import (
+            invalidate_resolver_cache_for_instance,
+        )
+        from .models import Delivery
+        from .signals import invalidate_delivery_rates_cache
+
+        # preventing duplicate signals
+        post_save.connect(
+            invalidate_resolver_cache_for_instance,
+            sender=Delivery,
+            dispatch_uid="invalidate_delivery_resolver_cache_on_save",
+        )
+        post_delete.connect(
+            invalidate_resolver_cache_for_instance,
+            sender=Delivery,
+            dispatch_uid="invalidate_delivery_resolver_cache_on_delete",
+        )
+        post_save.connect(
+            invalidate_delivery_rates_cache,
+            sender=Delivery,
+            dispatch_uid="invalidate_delivery_rates_cache_on_save",
+        )
+        post_delete.connect(
+            invalidate_delivery_rates_cache,
+            sender=Delivery,
+            dispatch_uid="invalidate_delivery_rates_cache_on_delete",
+        )
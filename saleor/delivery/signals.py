@@ -0,0 +1,6 @@
+from .utils import invalidate_delivery_rates
+
+
+def invalidate_delivery_rates_cache(sender, instance, **kwargs):
+    if instance.store_id:
+        invalidate_delivery_rates(instance.store_id)
@@ -0,0 +1,219 @@
+import random
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.core.exceptions import ValidationError
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
+
+from .. import utils
+from ..models import Delivery
+from ..utils import DeliveryQuote, compile_delivery_rates, get_delivery_quote
+
+
+@pytest.fixture(autouse=True)
+def reset_current_tenant():
+    yield
+    unset_current_tenant()
+
+
+def _find_rates_by_scanning(delivery, postal_code):
+    """Reference implementation, scans sorted areas like checkout used to."""
+    delivery_fee, min_order = delivery.delivery_fee, delivery.min_order
+    areas = sorted(
+        delivery.delivery_area["areas"], key=lambda area: area["from"] + area["to"]
+    )
+    code = int(postal_code[:4])
+    for area in areas:
+        if area["from"] <= code <= area["to"]:
+            delivery_fee = round(area["customDeliveryFee"], 2)
+            if area["customMinOrder"] != "":
+                min_order = area["customMinOrder"]
+            break
+    return delivery_fee, min_order
+
+
+def _generate_delivery(areas_count):
+    areas = []
+    for _ in range(areas_count):
+        start = random.randint(1000, 9899)
+        areas.append(
+            {
+                "from": start,
+                "to": start + random.randint(0, 100),
+                "customDeliveryFee": random.randint(0, 1000) / 100,
+                "customMinOrder": random.choice(["", random.randint(0, 50)]),
+            }
+        )
+    return Delivery(
+        delivery_area={"areas": areas},
+        delivery_fee=Decimal("4.00"),
+        min_order=Decimal("10.00"),
+        from_delivery=Decimal("50.00"),
+        enable_custom_delivery_fee=True,
+        enable_minimum_delivery_order_value=True,
+    )
+
+
+@pytest.mark.parametrize(
+    "postal_code, delivery_fee, min_order",
+    [
+        ("1000 AB", Decimal("2.5"), Decimal("15")),
+        ("1099", Decimal("2.5"), Decimal("15")),
+        ("1100", Decimal("3.46"), Decimal("10.00")),
+        ("2500XY", Decimal("5"), Decimal("30")),
+        ("1500", Decimal("4.00"), Decimal("10.00")),
+        ("0999", Decimal("4.00"), Decimal("10.00")),
+        ("9999", Decimal("4.00"), Decimal("10.00")),
+        ("AB12", Decimal("4.00"), Decimal("10.00")),
+        (None, Decimal("4.00"), Decimal("10.00")),
+    ],
+)
+def test_get_delivery_quote(delivery, postal_code, delivery_fee, min_order):
+    # given
+    set_current_tenant(delivery.store)
+
+    # when
+    quote = get_delivery_quote(postal_code)
+
+    # then
+    assert quote.delivery_fee == delivery_fee
+    assert quote.min_order == min_order
+    assert quote.free_delivery_from == Decimal("50.00")
+
+
+def test_get_delivery_quote_free_delivery_for_big_orders(delivery):
+    # given
+    set_current_tenant(delivery.store)
+
+    # when
+    quote = get_delivery_quote("1000")
+
+    # then
+    assert quote.get_delivery_fee(Decimal("49.99")) == Decimal("2.5")
+    assert quote.get_delivery_fee(Decimal("50.00")) == Decimal(0)
+
+
+def test_get_delivery_quote_without_delivery_settings(store):
+    # given
+    set_current_tenant(store)
+
+    # when
+    quote = get_delivery_quote("1000")
+
+    # then
+    assert quote is None
+
+
+def test_get_delivery_quote_from_cache(delivery, django_assert_num_queries):
+    # given
+    set_current_tenant(delivery.store)
+    get_delivery_quote("1000")
+
+    # when
+    with django_assert_num_queries(0):
+        quote = get_delivery_quote("1000")
+
+    # then
+    assert quote.delivery_fee == Decimal("2.5")
+
+
+def test_get_delivery_quote_invalidated_on_delivery_save(delivery):
+    # given
+    set_current_tenant(delivery.store)
+    get_delivery_quote("1000")
+
+    # when
+    delivery.enable_custom_delivery_fee = False
+    delivery.save(update_fields=["enable_custom_delivery_fee"])
+
+    # then
+    assert get_delivery_quote("1000").delivery_fee == Decimal("4.00")
+
+
+def test_compile_delivery_rates_overlapping_areas():
+    # given
+    delivery = Delivery(
+        delivery_area={
+            "areas": [
+                {"from": 1000, "to": 1999, "customDeliveryFee": 1, "customMinOrder": 1},
+                {"from": 1200, "to": 1300, "customDeliveryFee": 2, "customMinOrder": 2},
+            ]
+        },
+        delivery_fee=Decimal("4.00"),
+        min_order=Decimal("10.00"),
+        enable_custom_delivery_fee=True,
+    )
+
+    # when
+    rates = compile_delivery_rates(delivery)
+
+    # then
+    # the narrower area comes first when ordered by `from + to`
+    assert rates.get_quote("1100").delivery_fee == Decimal("1")
+    assert rates.get_quote("1250").delivery_fee == Decimal("2")
+    assert rates.get_quote("1301").delivery_fee == Decimal("1")
+    assert rates.get_quote("1250").min_order == Decimal("10.00")
+
+
+def test_delivery_quote_validate_min_order():
+    # given
+    quote = DeliveryQuote(
+        delivery_fee=Decimal("4.00"),
+        min_order=Decimal("10.00"),
+        free_delivery_from=None,
+    )
+    quote.validate_min_order(Decimal("10.00"))
+
+    # when
+    with pytest.raises(ValidationError) as e:
+        quote.validate_min_order(Decimal("9.99"))
+
+    # then
+    assert e.value.message_dict == {
+        "min_order": ["The subtotal must be equal or greater than 10.00"]
+    }
+
+
+def test_compile_delivery_rates_matches_linear_scan():
+    # given
+    random.seed(0)
+    delivery = _generate_delivery(500)
+    rates = compile_delivery_rates(delivery)
+
+    for code in range(900, 10000, 7):
+        postal_code = str(code).zfill(4)
+
+        # when
+        quote = rates.get_quote(postal_code)
+
+        # then
+        delivery_fee, min_order = _find_rates_by_scanning(delivery, postal_code)
+        assert quote.delivery_fee == Decimal(str(delivery_fee))
+        assert quote.min_order == Decimal(str(min_order))
+
+
+@pytest.mark.performance
+def test_delivery_rates_lookup_benchmark():
+    # given
+    random.seed(0)
+    deliveries = [_generate_delivery(random.randint(100, 500)) for _ in range(20)]
+    postal_codes = [str(random.randint(1000, 9999)) for _ in range(500)]
+    rates = [compile_delivery_rates(delivery) for delivery in deliveries]
+
+    # when
+    with patch.object(utils, "bisect_right", wraps=utils.bisect_right) as bisect_mock:
+        for store_rates in rates:
+            for postal_code in postal_codes:
+                store_rates.get_quote(postal_code)
+
+    # then
+    # Every lookup is a single bisect of sorted, non-overlapping intervals, at
+    # most two for every area, instead of a scan of all areas.
+    assert bisect_mock.call_count == len(deliveries) * len(postal_codes)
+    for delivery, store_rates in zip(deliveries, rates):
+        assert len(store_rates.starts) <= 2 * len(delivery.delivery_area["areas"])
+        assert all(
+            end < next_start
+            for end, next_start in zip(store_rates.ends, store_rates.starts[1:])
+        )
@@ -0,0 +1,201 @@
+"""Delivery fee and minimum order lookup by postal code.
+
+Delivery areas of a store are postal code ranges with a custom delivery fee and
+minimum order value. They are compiled once into sorted, non-overlapping
+intervals that are searched with bisect, and the compiled rates are kept in the
+cache until the delivery settings of the store change.
+"""
+from bisect import bisect_right
+from dataclasses import dataclass, field
+from decimal import Decimal
+from typing import TYPE_CHECKING, List, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.exceptions import ValidationError
+from django_multitenant.utils import get_current_tenant_value
+
+from . import models
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import Delivery
+
+CACHE_KEY_PREFIX = "delivery_rates:"
+
+# Cached marker for stores without delivery settings.
+NO_DELIVERY = "__no_delivery__"
+
+# Delivery areas are defined by the leading digits of a postal code.
+POSTAL_CODE_PREFIX_LENGTH = 4
+
+
+@dataclass(frozen=True)
+class DeliveryQuote:
+    delivery_fee: Decimal
+    min_order: Decimal
+    # the delivery is free for orders of at least this subtotal
+    free_delivery_from: Optional[Decimal]
+
+    def get_delivery_fee(self, subtotal: Decimal) -> Decimal:
+        if self.free_delivery_from is not None and subtotal >= self.free_delivery_from:
+            return Decimal(0)
+        return self.delivery_fee
+
+    def validate_min_order(self, subtotal: Decimal):
+        if self.min_order > subtotal:
+            raise ValidationError(
+                {
+                    "min_order": "The subtotal must be equal or greater than %s"
+                    % (self.min_order,)
+                }
+            )
+
+
+@dataclass
+class DeliveryRates:
+    delivery_fee: Decimal
+    min_order: Decimal
+    free_delivery_from: Optional[Decimal]
+    # sorted, non-overlapping postal code intervals and their custom rates,
+    # `None` stands for the default rate of the store
+    starts: List[int] = field(default_factory=list)
+    ends: List[int] = field(default_factory=list)
+    delivery_fees: List[Optional[Decimal]] = field(default_factory=list)
+    min_orders: List[Optional[Decimal]] = field(default_factory=list)
+
+    def get_quote(self, postal_code: Optional[str]) -> DeliveryQuote:
+        delivery_fee, min_order = self.delivery_fee, self.min_order
+        index = self._find_interval(postal_code)
+        if index is not None:
+            if self.delivery_fees[index] is not None:
+                delivery_fee = self.delivery_fees[index]
+            if self.min_orders[index] is not None:
+                min_order = self.min_orders[index]
+        return DeliveryQuote(
+            delivery_fee=delivery_fee,
+            min_order=min_order,
+            free_delivery_from=self.free_delivery_from,
+        )
+
+    def _find_interval(self, postal_code: Optional[str]) -> Optional[int]:
+        if not postal_code or not self.starts:
+            return None
+        try:
+            code = int(postal_code[:POSTAL_CODE_PREFIX_LENGTH])
+        except ValueError:
+            return None
+        index = bisect_right(self.starts, code) - 1
+        if index >= 0 and code <= self.ends[index]:
+            return index
+        return None
+
+
+def _get_custom_delivery_fee(area: dict) -> Optional[Decimal]:
+    fee = area.get("customDeliveryFee")
+    if fee is None or fee == "":
+        return None
+    return Decimal(str(round(fee, 2)))
+
+
+def _get_custom_min_order(area: dict) -> Optional[Decimal]:
+    min_order = area.get("customMinOrder")
+    if min_order is None or min_order == "":
+        return None
+    return Decimal(str(min_order))
+
+
+def compile_delivery_rates(delivery: "Delivery") -> DeliveryRates:
+    """Compile delivery areas into non-overlapping postal code intervals.
+
+    Areas are matched in the order of `from + to`, the first area containing a
+    postal code wins. Overlapping areas are split into elementary intervals, each
+    assigned to its winning area, so a lookup is a single bisect.
+    """
+    rates = DeliveryRates(
+        delivery_fee=delivery.delivery_fee,
+        min_order=delivery.min_order,
+        free_delivery_from=(
+            delivery.from_delivery if delivery.enable_for_big_order else None
+        ),
+    )
+    if not (
+        delivery.enable_custom_delivery_fee
+        or delivery.enable_minimum_delivery_order_value
+    ):
+        return rates
+
+    areas = list((delivery.delivery_area or {}).get("areas") or [])
+    areas.sort(key=lambda area: area["from"] + area["to"])
+    ranges = [(int(area["from"]), int(area["to"])) for area in areas]
+    boundaries = sorted(
+        {start for start, _end in ranges} | {end + 1 for _start, end in ranges}
+    )
+
+    winners: List[int] = []
+    for start, next_start in zip(boundaries, boundaries[1:]):
+        winner = next(
+            (
+                position
+                for position, (area_start, area_end) in enumerate(ranges)
+                if area_start <= start <= area_end
+            ),
+            None,
+        )
+        if winner is None:
+            continue
+        if winners and winners[-1] == winner and rates.ends[-1] == start - 1:
+            rates.ends[-1] = next_start - 1
+            continue
+        area = areas[winner]
+        winners.append(winner)
+        rates.starts.append(start)
+        rates.ends.append(next_start - 1)
+        rates.delivery_fees.append(
+            _get_custom_delivery_fee(area)
+            if delivery.enable_custom_delivery_fee
+            else None
+        )
+        rates.min_orders.append(
+            _get_custom_min_order(area)
+            if delivery.enable_minimum_delivery_order_value
+            else None
+        )
+    return rates
+
+
+def get_cache_key(store_id) -> str:
+    return f"{CACHE_KEY_PREFIX}{store_id}"
+
+
+def get_delivery_rates() -> Optional[DeliveryRates]:
+    """Return compiled delivery rates of the current store."""
+    store_id = get_current_tenant_value()
+    if store_id is None or isinstance(store_id, list):
+        delivery = models.Delivery.objects.first()
+        return compile_delivery_rates(delivery) if delivery else None
+
+    key = get_cache_key(store_id)
+    rates = cache.get(key)
+    if rates is None:
+        delivery = models.Delivery.objects.first()
+        rates = compile_delivery_rates(delivery) if delivery else NO_DELIVERY
+        cache.set(key, rates, settings.DELIVERY_RATES_CACHE_TIMEOUT)
+    if rates == NO_DELIVERY:
+        return None
+    return rates
+
+
+def get_delivery_quote(postal_code: Optional[str]) -> Optional[DeliveryQuote]:
+    """Return delivery fee, minimum order and free delivery threshold.
+
+    `None` is returned when the current store has no delivery settings.
+    """
+    rates = get_delivery_rates()
+    if rates is None:
+        return None
+    return rates.get_quote(postal_code)
+
+
+def invalidate_delivery_rates(store_id):
+    cache.delete(get_cache_key(store_id))
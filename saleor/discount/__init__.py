@@ -7,6 +7,8 @@ if TYPE_CHECKING:
     # flake8: noqa
     from .models import Sale, SaleChannelListing, Voucher
 
+default_app_config = "saleor.discount.app.DiscountAppConfig"
+
 
 class DiscountValueType:
     FIXED = "fixed"
@@ -0,0 +1,50 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from ..product.models import Category
+        from .models import Sale, SaleChannelListing
+        from .signals import (
+            invalidate_discount_snapshot_for_catalogue,
+            invalidate_discount_snapshot_for_channel_listing,
+            invalidate_discount_snapshot_for_instance,
+        )
+
+        # preventing duplicate signals
+        for model in (Sale, Category):
+            post_save.connect(
+                invalidate_discount_snapshot_for_instance,
+                sender=model,
+                dispatch_uid=f"invalidate_discount_snapshot_on_{model.__name__}_save",
+            )
+            post_delete.connect(
+                invalidate_discount_snapshot_for_instance,
+                sender=model,
+                dispatch_uid=(
+                    f"invalidate_discount_snapshot_on_{model.__name__}_delete"
+                ),
+            )
+        post_save.connect(
+            invalidate_discount_snapshot_for_channel_listing,
+            sender=SaleChannelListing,
+            dispatch_uid="invalidate_discount_snapshot_on_SaleChannelListing_save",
+        )
+        post_delete.connect(
+            invalidate_discount_snapshot_for_channel_listing,
+            sender=SaleChannelListing,
+            dispatch_uid="invalidate_discount_snapshot_on_SaleChannelListing_delete",
+        )
+        for through in (
+            Sale.products.through,
+            Sale.categories.through,
+            Sale.collections.through,
+        ):
+            m2m_changed.connect(
+                invalidate_discount_snapshot_for_catalogue,
+                sender=through,
+                dispatch_uid=f"invalidate_discount_snapshot_on_{through.__name__}",
+            )
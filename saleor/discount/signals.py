@@ -0,0 +1,35 @@
+from django.db import transaction
+
+from .models import Sale
+from .snapshot import invalidate_discount_snapshot
+
+
+def _invalidate_discount_snapshot(tenant_id):
+    # Invalidate once more after commit, so a snapshot rebuilt by a concurrent
+    # request from the data that was not committed yet is not kept.
+    invalidate_discount_snapshot(tenant_id)
+    transaction.on_commit(lambda: invalidate_discount_snapshot(tenant_id))
+
+
+def invalidate_discount_snapshot_for_instance(sender, instance, **kwargs):
+    """Handle changes of sales and of the categories their discounts apply to."""
+    _invalidate_discount_snapshot(instance.tenant_value)
+
+
+def invalidate_discount_snapshot_for_channel_listing(sender, instance, **kwargs):
+    store_id = (
+        Sale._base_manager.filter(pk=instance.sale_id)
+        .values_list("store_id", flat=True)
+        .first()
+    )
+    _invalidate_discount_snapshot(store_id)
+
+
+def invalidate_discount_snapshot_for_catalogue(sender, instance, action, **kwargs):
+    """Handle products, categories and collections assigned to or removed from sales.
+
+    The instance is either the sale or the catalogue object, both belong to the
+    same store.
+    """
+    if action in ("post_add", "post_remove", "post_clear"):
+        _invalidate_discount_snapshot(instance.tenant_value)
@@ -0,0 +1,144 @@
+"""Shared snapshot of active sales.
+
+Pricing needs the active sales with their catalogue and channel listings, which
+takes five queries to fetch. The snapshot keeps them per tenant in the shared
+Django cache under a version that signal handlers replace whenever a sale, its
+channel listings or its catalogue change. Each process keeps the last snapshot
+it has seen, so a request only reads the current version from the cache.
+
+A snapshot also records the nearest sale start or end date after it was built
+and is rebuilt once that moment has passed.
+"""
+import datetime
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import List, Optional, Tuple
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Min
+from django.utils import timezone
+from django_multitenant.utils import get_current_tenant_value
+
+from . import DiscountInfo
+from .models import Sale
+from .utils import fetch_discounts
+
+CACHE_KEY_PREFIX = "discount_snapshot:"
+VERSION_CACHE_KEY_PREFIX = "discount_snapshot_version:"
+
+# Snapshots are scoped to the current tenant, requests without one see the sales
+# of all stores.
+ALL_TENANTS = "all"
+
+_local_cache = LRUCache(maxsize=settings.DISCOUNT_SNAPSHOT_LOCAL_SIZE)
+_local_cache_lock = threading.Lock()
+
+
+@dataclass(frozen=True)
+class DiscountSnapshot:
+    version: str
+    discounts: Tuple[DiscountInfo, ...]
+    valid_from: datetime.datetime
+    valid_until: Optional[datetime.datetime]
+
+    def is_valid_at(self, date: datetime.datetime) -> bool:
+        if date < self.valid_from:
+            return False
+        return self.valid_until is None or date < self.valid_until
+
+
+def get_tenant_key(tenant_id=None) -> str:
+    return str(tenant_id) if tenant_id is not None else ALL_TENANTS
+
+
+def get_version_cache_key(tenant_key: str) -> str:
+    return VERSION_CACHE_KEY_PREFIX + tenant_key
+
+
+def get_cache_key(tenant_key: str, version: str) -> str:
+    return "%s%s:%s" % (CACHE_KEY_PREFIX, tenant_key, version)
+
+
+def get_next_sale_boundary(
+    discounts: List[DiscountInfo], date: datetime.datetime
+) -> Optional[datetime.datetime]:
+    """Return the nearest moment after `date` at which the active sales change."""
+    boundaries = [
+        info.sale.end_date for info in discounts if info.sale.end_date is not None
+    ]
+    next_start_date = Sale.objects.filter(start_date__gt=date).aggregate(
+        next_start_date=Min("start_date")
+    )["next_start_date"]
+    if next_start_date:
+        boundaries.append(next_start_date)
+    return min(boundaries) if boundaries else None
+
+
+def build_discount_snapshot(version: str, date: datetime.datetime) -> DiscountSnapshot:
+    discounts = fetch_discounts(date)
+    return DiscountSnapshot(
+        version=version,
+        discounts=tuple(discounts),
+        valid_from=date,
+        valid_until=get_next_sale_boundary(discounts, date),
+    )
+
+
+def _get_version(tenant_key: str) -> str:
+    key = get_version_cache_key(tenant_key)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, settings.DISCOUNT_SNAPSHOT_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def get_discount_snapshot(
+    date: Optional[datetime.datetime] = None,
+) -> DiscountSnapshot:
+    """Return the snapshot of sales active at the given date for the current tenant.
+
+    The snapshot is shared between requests, its discounts must not be mutated.
+    """
+    if date is None:
+        date = timezone.now()
+    tenant_key = get_tenant_key(get_current_tenant_value())
+    version = _get_version(tenant_key)
+    with _local_cache_lock:
+        snapshot = _local_cache.get(tenant_key)
+    if snapshot and snapshot.version == version and snapshot.is_valid_at(date):
+        return snapshot
+
+    key = get_cache_key(tenant_key, version)
+    snapshot = cache.get(key)
+    if snapshot is None or not snapshot.is_valid_at(date):
+        snapshot = build_discount_snapshot(version, date)
+        cache.set(key, snapshot, settings.DISCOUNT_SNAPSHOT_TIMEOUT)
+    with _local_cache_lock:
+        _local_cache[tenant_key] = snapshot
+    return snapshot
+
+
+def get_discounts(date: Optional[datetime.datetime] = None) -> List[DiscountInfo]:
+    """Return sales active at the given date, like `fetch_discounts` does."""
+    return list(get_discount_snapshot(date).discounts)
+
+
+def invalidate_discount_snapshot(tenant_id=None):
+    """Replace the snapshot version of the tenant and of requests without one."""
+    tenant_keys = {get_tenant_key(tenant_id), ALL_TENANTS}
+    cache.set_many(
+        {
+            get_version_cache_key(tenant_key): uuid.uuid4().hex
+            for tenant_key in tenant_keys
+        },
+        settings.DISCOUNT_SNAPSHOT_TIMEOUT,
+    )
+
+
+def clear_local_cache():
+    with _local_cache_lock:
+        _local_cache.clear()
@@ -0,0 +1,175 @@
+from datetime import timedelta
+
+import pytest
+from django.utils import timezone
+from django_multitenant.utils import set_current_tenant
+
+from ...product.models import Collection
+from ...store.models import Store
+from ..models import Sale, SaleChannelListing
+from ..snapshot import clear_local_cache, get_discount_snapshot, get_discounts
+
+
+@pytest.fixture
+def store_sale(store, channel_USD):
+    sale = Sale.objects.create(name="Store sale", store=store)
+    SaleChannelListing.objects.create(
+        sale=sale,
+        channel=channel_USD,
+        discount_value=5,
+        currency=channel_USD.currency_code,
+    )
+    return sale
+
+
+def test_get_discounts(store_sale, channel_USD):
+    # when
+    discounts = get_discounts()
+
+    # then
+    assert len(discounts) == 1
+    assert discounts[0].sale == store_sale
+    assert discounts[0].channel_listings[channel_USD.slug].discount_value == 5
+
+
+def test_get_discounts_reuses_snapshot(store_sale, django_assert_num_queries):
+    # given
+    get_discounts()
+
+    # when
+    with django_assert_num_queries(0):
+        discounts = get_discounts()
+
+    # then
+    assert discounts[0].sale == store_sale
+
+
+def test_get_discounts_reuses_shared_snapshot(store_sale, django_assert_num_queries):
+    # given
+    snapshot = get_discount_snapshot()
+    clear_local_cache()
+
+    # when
+    with django_assert_num_queries(0):
+        shared_snapshot = get_discount_snapshot()
+
+    # then
+    assert shared_snapshot.version == snapshot.version
+
+
+def test_get_discounts_scoped_to_current_tenant(store_sale, channel_USD):
+    # given
+    other_store = Store.objects.create(name="Other", domain="other.example.com")
+    Sale.objects.create(name="Other store sale", store=other_store)
+
+    # when
+    set_current_tenant(other_store)
+    discounts = get_discounts()
+
+    # then
+    assert [info.sale.name for info in discounts] == ["Other store sale"]
+
+
+def test_snapshot_rebuilt_on_sale_change(store_sale):
+    # given
+    get_discounts()
+
+    # when
+    store_sale.name = "Renamed sale"
+    store_sale.save(update_fields=["name"])
+
+    # then
+    assert get_discounts()[0].sale.name == "Renamed sale"
+
+
+def test_snapshot_rebuilt_on_sale_delete(store_sale):
+    # given
+    get_discounts()
+
+    # when
+    store_sale.delete()
+
+    # then
+    assert get_discounts() == []
+
+
+def test_snapshot_rebuilt_on_channel_listing_change(store_sale, channel_USD):
+    # given
+    get_discounts()
+
+    # when
+    store_sale.channel_listings.update(discount_value=10)
+    store_sale.channel_listings.get().save()
+
+    # then
+    channel_listings = get_discounts()[0].channel_listings
+    assert channel_listings[channel_USD.slug].discount_value == 10
+
+
+def test_snapshot_rebuilt_on_catalogue_change(store, store_sale):
+    # given
+    set_current_tenant(store)
+    collection = Collection.objects.create(name="Summer", slug="summer")
+    get_discounts()
+
+    # when
+    store_sale.collections.add(collection)
+
+    # then
+    assert get_discounts()[0].collection_ids == {collection.pk}
+
+
+def test_snapshot_rebuilt_when_sale_starts(store):
+    # given
+    now = timezone.now()
+    start_date = now + timedelta(hours=1)
+    Sale.objects.create(name="Upcoming sale", store=store, start_date=start_date)
+
+    # when
+    discounts_before_start = get_discounts(now)
+    discounts_after_start = get_discounts(start_date)
+
+    # then
+    assert discounts_before_start == []
+    assert [info.sale.name for info in discounts_after_start] == ["Upcoming sale"]
+
+
+def test_snapshot_rebuilt_when_sale_ends(store_sale):
+    # given
+    now = timezone.now()
+    store_sale.end_date = now + timedelta(hours=1)
+    store_sale.save(update_fields=["end_date"])
+
+    # when
+    discounts_before_end = get_discounts(now)
+    discounts_after_end = get_discounts(now + timedelta(hours=2))
+
+    # then
+    assert len(discounts_before_end) == 1
+    assert discounts_after_end == []
+
+
+def test_snapshot_valid_until_next_sale_boundary(store_sale, store):
+    # given
+    now = timezone.now()
+    start_date = now + timedelta(days=2)
+    Sale.objects.create(name="Upcoming sale", store=store, start_date=start_date)
+    store_sale.end_date = now + timedelta(days=3)
+    store_sale.save(update_fields=["end_date"])
+
+    # when
+    snapshot = get_discount_snapshot(now)
+
+    # then
+    assert snapshot.valid_until == start_date
+
+
+def test_get_discounts_of_earlier_date(store_sale):
+    # given
+    get_discount_snapshot()
+
+    # when
+    discounts = get_discounts(store_sale.start_date - timedelta(minutes=1))
+
+    # then
+    assert discounts == []
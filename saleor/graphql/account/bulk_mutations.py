@@ -5,6 +5,7 @@ from django.core.exceptions import ValidationError
 
 from ...account import models
 from ...account.error_codes import AccountErrorCode
+from ...core.jwt import invalidate_principals
 from ...core.permissions import AccountPermissions
 from ..core.mutations import BaseBulkMutation, ModelBulkDeleteMutation
 from ..core.types.common import AccountError, StaffError
@@ -110,3 +111,5 @@ class UserBulkSetActive(BaseBulkMutation):
     @classmethod
     def bulk_action(cls, info, queryset, is_active):
         queryset.update(is_active=is_active)
+        # queryset updates don't send signals
+        invalidate_principals(queryset.values_list("email", flat=True))
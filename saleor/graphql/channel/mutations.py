@@ -10,6 +10,7 @@ from ...checkout.models import Checkout
 from ...core.permissions import ChannelPermissions
 from ...core.tracing import traced_atomic_transaction
 from ...order.models import Order
+from ...order.rollups import move_sales_rollups_to_channel
 from ...shipping.tasks import drop_invalid_shipping_methods_relations_for_given_channels
 from ..core.mutations import BaseMutation, ModelDeleteMutation, ModelMutation
 from ..core.types.common import ChannelError, ChannelErrorCode
@@ -190,6 +191,7 @@ class ChannelDelete(ModelDeleteMutation):
         Order.objects.select_for_update().filter(channel_id=origin_channel_id).update(
             channel=target_channel_id
         )
+        move_sales_rollups_to_channel(origin_channel_id, target_channel_id)
 
     @classmethod
     def delete_checkouts(cls, origin_channel_id):
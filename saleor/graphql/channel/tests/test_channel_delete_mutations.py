@@ -3,7 +3,8 @@ import graphene
 from ....channel.error_codes import ChannelErrorCode
 from ....channel.models import Channel
 from ....checkout.models import Checkout
-from ....order.models import Order
+from ....order import SalesRollupGranularity
+from ....order.models import Order, SalesRollup
 from ...tests.utils import assert_no_permission, get_graphql_content
 
 CHANNEL_DELETE_MUTATION = """
@@ -225,3 +226,33 @@ def test_channel_delete_mutation_as_anonymous(
     # then
     assert_no_permission(response)
     assert Channel.objects.filter(slug=channel_USD.slug).exists()
+
+
+def test_channel_delete_mutation_moves_sales_rollups_to_target_channel(
+    permission_manage_channels,
+    staff_api_client,
+    store,
+    channel_USD,
+    other_channel_USD,
+):
+    # given
+    Order.objects.create(
+        store=store, channel=channel_USD, currency=channel_USD.currency_code
+    )
+    channel_id = graphene.Node.to_global_id("Channel", channel_USD.id)
+    channel_target_id = graphene.Node.to_global_id("Channel", other_channel_USD.id)
+    variables = {"id": channel_id, "input": {"channelId": channel_target_id}}
+
+    # when
+    response = staff_api_client.post_graphql(
+        CHANNEL_DELETE_MUTATION,
+        variables=variables,
+        permissions=(permission_manage_channels,),
+    )
+
+    # then
+    get_graphql_content(response)
+    rollups = SalesRollup.objects.filter(granularity=SalesRollupGranularity.DAY)
+    assert [(rollup.channel_id, rollup.orders_count) for rollup in rollups] == [
+        (other_channel_USD.id, 1)
+    ]
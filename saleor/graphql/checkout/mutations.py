@@ -1,5 +1,5 @@
 import datetime
-from saleor.core.utils.logging import log_info
+from saleor.core.utils.logging import log_event
 from saleor.table_service.error_codes import TableServiceErrorCode
 from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
 
@@ -9,13 +9,13 @@ from django.core.exceptions import ObjectDoesNotExist, ValidationError
 from django.db.models import Q
 
 from ...checkout import AddressType, models
+from ...checkout.cache import get_checkout_info, get_checkout_lines
 from ...checkout.complete_checkout import complete_checkout
 from ...checkout.error_codes import CheckoutErrorCode
 from ...checkout.fetch import (
     CheckoutLineInfo,
     fetch_checkout_info,
     fetch_checkout_lines,
-    get_valid_shipping_method_list_for_checkout_info,
     update_checkout_info_shipping_method,
 )
 from ...checkout.utils import (
@@ -384,7 +384,7 @@ class CheckoutCreate(ModelMutation, I18nMixin):
         # Create the checkout object
         instance.save()
 
-        log_info('Checkout', 'Create Checkout', content=instance.__dict__)
+        log_event("checkout.create", checkout_token=str(instance.token))
 
         # Set checkout country
         country = cleaned_input["country"]
@@ -498,7 +498,7 @@ class CheckoutInfoUpdate(BaseMutation):
             checkout.note = input.get("table_name")
         checkout.save()
         info.context.plugins.checkout_updated(checkout)
-        log_info('Checkout', 'Update Checkout', content=checkout.__dict__)
+        log_event("checkout.update", checkout_token=str(checkout.token))
         return CheckoutLanguageCodeUpdate(checkout=checkout)
 
 class CheckoutLinesAdd(BaseMutation):
@@ -554,12 +554,10 @@ class CheckoutLinesAdd(BaseMutation):
                         code=exc.code,
                     )
 
-        lines = fetch_checkout_lines(checkout)
-        checkout_info.valid_shipping_methods = (
-            get_valid_shipping_method_list_for_checkout_info(
-                checkout_info, checkout_info.shipping_address, lines, discounts, manager
-            )
-        )
+        lines = get_checkout_lines(checkout)
+        checkout_info.valid_shipping_methods = get_checkout_info(
+            checkout, lines, discounts, manager
+        ).valid_shipping_methods
 
     @classmethod
     def perform_mutation(cls, _root, info, checkout_id, lines, replace=False):
@@ -574,17 +572,17 @@ class CheckoutLinesAdd(BaseMutation):
         variants = cls.get_nodes_or_error(variant_ids, "variant_id", ProductVariant)
         quantities = [line.get("quantity") for line in lines]
 
-        checkout_info = fetch_checkout_info(checkout, [], discounts, manager)
+        checkout_info = get_checkout_info(
+            checkout, get_checkout_lines(checkout), discounts, manager
+        )
         cls.clean_input(
             checkout, variants, quantities, checkout_info, manager, discounts, replace
         )
 
-        lines = fetch_checkout_lines(checkout)
-        checkout_info.valid_shipping_methods = (
-            get_valid_shipping_method_list_for_checkout_info(
-                checkout_info, checkout_info.shipping_address, lines, discounts, manager
-            )
-        )
+        lines = get_checkout_lines(checkout)
+        checkout_info.valid_shipping_methods = get_checkout_info(
+            checkout, lines, discounts, manager
+        ).valid_shipping_methods
 
         update_checkout_shipping_method_if_invalid(checkout_info, lines)
         recalculate_checkout_discount(
@@ -638,8 +636,8 @@ class CheckoutLineDelete(BaseMutation):
             line.delete()
 
         manager = info.context.plugins
-        lines = fetch_checkout_lines(checkout)
-        checkout_info = fetch_checkout_info(
+        lines = get_checkout_lines(checkout)
+        checkout_info = get_checkout_info(
             checkout, lines, info.context.discounts, manager
         )
         update_checkout_shipping_method_if_invalid(checkout_info, lines)
@@ -759,7 +757,7 @@ class CheckoutShippingAddressUpdate(BaseMutation, I18nMixin):
                 }
             )
 
-        lines = fetch_checkout_lines(checkout)
+        lines = get_checkout_lines(checkout)
         if not is_shipping_required(lines):
             raise ValidationError(
                 {
@@ -779,7 +777,7 @@ class CheckoutShippingAddressUpdate(BaseMutation, I18nMixin):
 
         discounts = info.context.discounts
         manager = info.context.plugins
-        checkout_info = fetch_checkout_info(checkout, lines, discounts, manager)
+        checkout_info = get_checkout_info(checkout, lines, discounts, manager)
 
         country = get_user_country_context(
             destination_address=shipping_address,
@@ -904,8 +902,8 @@ class CheckoutShippingMethodUpdate(BaseMutation):
             info, checkout_id, only_type=Checkout, field="checkout_id"
         )
         manager = info.context.plugins
-        lines = fetch_checkout_lines(checkout)
-        checkout_info = fetch_checkout_info(
+        lines = get_checkout_lines(checkout)
+        checkout_info = get_checkout_info(
             checkout, lines, info.context.discounts, manager
         )
         if not is_shipping_required(lines):
@@ -1062,9 +1060,13 @@ class CheckoutComplete(BaseMutation):
                 tracking_code=tracking_code,
                 redirect_url=data.get("redirect_url"),
             )
-        # write log
-        log_info('Checkout', 'Checkout Lines', content=lines)
-
+        log_event(
+            "checkout.complete",
+            checkout_token=str(checkout.token),
+            order_id=order.pk if order else None,
+            lines_count=len(lines),
+            action_required=action_required,
+        )
 
         # If gateway returns information that additional steps are required we need
         # to inform the frontend and pass all required data
@@ -1098,8 +1100,8 @@ class CheckoutAddPromoCode(BaseMutation):
             info, checkout_id, only_type=Checkout, field="checkout_id"
         )
         manager = info.context.plugins
-        lines = fetch_checkout_lines(checkout)
-        checkout_info = fetch_checkout_info(
+        lines = get_checkout_lines(checkout)
+        checkout_info = get_checkout_info(
             checkout, lines, info.context.discounts, manager
         )
 
@@ -0,0 +1,73 @@
+import pytest
+from graphene import Node
+
+from .....product.models import OptionValue, ProductVariant
+
+MUTATION_CHECKOUT_CREATE_FOR_TABLE = """
+    mutation CheckoutCreateForTable($input: CheckoutCreateInput!) {
+        checkoutCreate(input: $input) {
+            checkout {
+                token
+                orderType
+                note
+                lines {
+                    quantity
+                    variant {
+                        name
+                    }
+                }
+                totalPrice {
+                    gross {
+                        amount
+                    }
+                }
+            }
+            checkoutErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_checkout_create_for_table(
+    api_client, restaurant, channel_USD, graphql_benchmark
+):
+    # given
+    variants = ProductVariant.objects.filter(product__store=restaurant)[:4]
+    option_values = OptionValue.objects.filter(option__store=restaurant)
+    variables = {
+        "input": {
+            "channel": channel_USD.slug,
+            "orderType": "DINEIN",
+            "tableName": "Table 3",
+            "lines": [
+                {
+                    "quantity": 2,
+                    "variantId": Node.to_global_id("ProductVariant", variant.pk),
+                    "optionValues": [
+                        {"optionValueId": Node.to_global_id("OptionValue", value.pk)}
+                        for value in option_values[index : index + 2]
+                    ],
+                }
+                for index, variant in enumerate(variants)
+            ],
+        }
+    }
+
+    # when
+    content = graphql_benchmark(
+        api_client,
+        MUTATION_CHECKOUT_CREATE_FOR_TABLE,
+        variables,
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["checkoutCreate"]
+    assert not data["checkoutErrors"]
+    assert data["checkout"]["orderType"] == "DINEIN"
+    assert len(data["checkout"]["lines"]) == 4
+    assert data["checkout"]["totalPrice"]["gross"]["amount"]
@@ -1,9 +1,13 @@
 import json
-from typing import Any, Dict, Iterable, List, Tuple, Union
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 
 import graphene
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import connections
+from django.db.models import BooleanField, Expression, F, Field
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
+from django.db.models import Q, QuerySet, Value
 from graphene.relay.connection import Connection
 from graphene_django.types import DjangoObjectType
 from graphql.error import GraphQLError
@@ -93,6 +97,85 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValueComparison(Expression):
+    """Compare rows of values, like `(created, id) < (%s, %s)`.
+
+    Unlike the equivalent combination of `OR` and `AND` conditions, the comparison
+    is resolved with a single range scan of an index on the compared columns.
+    """
+
+    def __init__(self, lhs: List[Any], operator: str, rhs: List[Any]):
+        super().__init__(output_field=BooleanField())
+        self.lhs = lhs
+        self.operator = operator
+        self.rhs = rhs
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        size = len(self.lhs)
+        self.lhs, self.rhs = exprs[:size], exprs[size:]
+
+    def as_sql(self, compiler, connection):
+        params: List[Any] = []
+        rows = []
+        for row in (self.lhs, self.rhs):
+            row_sql = []
+            for expression in row:
+                sql, expression_params = compiler.compile(expression)
+                row_sql.append(sql)
+                params.extend(expression_params)
+            rows.append("(%s)" % ", ".join(row_sql))
+        return "%s %s %s" % (rows[0], self.operator, rows[1]), params
+
+
+def _get_non_nullable_field(model, field_name: str) -> Optional[Field]:
+    """Return the model field of the lookup if neither it nor its joins are null."""
+    opts = model._meta
+    field = None
+    for part in field_name.split("__"):
+        if opts is None:
+            return None
+        try:
+            field = opts.pk if part == "pk" else opts.get_field(part)
+        except FieldDoesNotExist:
+            return None
+        if field.null or field.many_to_many or field.one_to_many:
+            return None
+        opts = field.related_model._meta if field.is_relation else None
+    return field
+
+
+def _prepare_row_value_filter(
+    qs: QuerySet,
+    cursor: List[str],
+    sorting_fields: List[str],
+    sorting_direction: str,
+) -> Optional[RowValueComparison]:
+    """Create a row value comparison for cursors of non-nullable model fields.
+
+    Return `None` when any sorting field is nullable or isn't a model field, e.g.
+    an annotation.
+    """
+    if any(value is None for value in cursor):
+        return None
+    model_fields = [
+        _get_non_nullable_field(qs.model, field_name) for field_name in sorting_fields
+    ]
+    if not all(model_fields):
+        return None
+    operator = ">" if sorting_direction == "gt" else "<"
+    return RowValueComparison(
+        [F(field_name) for field_name in sorting_fields],
+        operator,
+        [
+            Value(value, output_field=field)
+            for value, field in zip(cursor, model_fields)
+        ],
+    )
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -216,10 +299,14 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(cursor, sorting_fields, sorting_direction) if cursor else Q()
-    )
-    qs = qs.filter(filter_kwargs)
+    if cursor:
+        row_value_filter = _prepare_row_value_filter(
+            qs, cursor, sorting_fields, sorting_direction
+        )
+        if row_value_filter is not None:
+            qs = qs.filter(row_value_filter)
+        else:
+            qs = qs.filter(_prepare_filter(cursor, sorting_fields, sorting_direction))
     qs = qs[:end_margin]
     edges, page_info = _get_edges_for_connection(edge_type, qs, args, sorting_fields)
 
@@ -271,9 +358,28 @@ class CountableConnection(NonNullConnection):
     def resolve_total_count(root, *_args, **_kwargs):
         if isinstance(root.iterable, list):
             return len(root.iterable)
+        if getattr(root, "estimate_total_count", False):
+            estimated_count = get_estimated_count(root.iterable)
+            if estimated_count > settings.CONNECTION_EXACT_COUNT_LIMIT:
+                return estimated_count
         return root.iterable.count()
 
 
+def get_estimated_count(qs: QuerySet) -> int:
+    """Return the number of rows of the queryset estimated by the query planner.
+
+    The estimate comes from table statistics, it takes no longer to get for
+    millions of rows than for a few.
+    """
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute("EXPLAIN (FORMAT JSON) %s" % sql, params)
+        (plan,) = cursor.fetchone()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
 class CountableDjangoObjectType(DjangoObjectType):
     class Meta:
         abstract = True
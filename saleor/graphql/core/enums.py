@@ -113,6 +113,7 @@ AttributeErrorCode = graphene.Enum.from_enum(attribute_error_codes.AttributeErro
 ChannelErrorCode = graphene.Enum.from_enum(channel_error_codes.ChannelErrorCode)
 CheckoutErrorCode = graphene.Enum.from_enum(checkout_error_codes.CheckoutErrorCode)
 ExportErrorCode = graphene.Enum.from_enum(csv_error_codes.ExportErrorCode)
+ImportErrorCode = graphene.Enum.from_enum(csv_error_codes.ImportErrorCode)
 DiscountErrorCode = graphene.Enum.from_enum(discount_error_codes.DiscountErrorCode)
 PluginErrorCode = graphene.Enum.from_enum(plugin_error_codes.PluginErrorCode)
 GiftCardErrorCode = graphene.Enum.from_enum(giftcard_error_codes.GiftCardErrorCode)
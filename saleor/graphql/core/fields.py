@@ -6,6 +6,7 @@ from graphene.relay import PageInfo
 from graphene_django.fields import DjangoConnectionField
 from graphql.error import GraphQLError
 from graphql_relay.connection.arrayconnection import connection_from_list_slice
+from django_multitenant.utils import get_current_tenant
 from promise import Promise
 
 from ..channel import ChannelContext, ChannelQsContext
@@ -33,6 +34,19 @@ def patch_pagination_args(field: DjangoConnectionField):
     )
 
 
+def can_estimate_total_count(filter_input) -> bool:
+    """Check whether `totalCount` of a connection may be estimated by the database.
+
+    Estimates of the query planner are close for a store's objects, but not for
+    the ones matching filters or a search, those are always counted.
+    """
+    if get_current_tenant() is None:
+        return False
+    return not any(
+        value not in (None, "", [], {}) for value in (filter_input or {}).values()
+    )
+
+
 class BaseConnectionField(graphene.ConnectionField):
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
@@ -110,6 +124,8 @@ class PrefetchingConnectionField(BaseDjangoConnectionField):
 class FilterInputConnectionField(BaseDjangoConnectionField):
     def __init__(self, *args, **kwargs):
         self.filter_field_name = kwargs.pop("filter_field_name", "filter")
+        # Return `totalCount` estimated by the database for large querysets.
+        self.estimate_total_count = kwargs.pop("estimate_total_count", False)
         self.filter_input = kwargs.get(self.filter_field_name)
         self.filterset_class = None
         if self.filter_input:
@@ -127,6 +143,7 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
         enforce_first_or_last,
         filterset_class,
         filters_name,
+        estimate_total_count,
         root,
         info,
         **args,
@@ -170,9 +187,15 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
         # but iterable might be promise
         iterable = queryset_resolver(connection, iterable, info, args)
 
-        on_resolve = partial(
-            cls.resolve_connection, connection, args, max_limit=max_limit
-        )
+        def on_resolve(iterable):
+            connection_instance = cls.resolve_connection(
+                connection, args, iterable, max_limit=max_limit
+            )
+            filter_input = args.get(filters_name)
+            connection_instance.estimate_total_count = (
+                estimate_total_count and can_estimate_total_count(filter_input)
+            )
+            return connection_instance
 
         iterable = cls.filter_iterable(
             iterable, filterset_class, filters_name, info, **args
@@ -200,6 +223,7 @@ class FilterInputConnectionField(BaseDjangoConnectionField):
             super().get_resolver(parent_resolver),
             self.filterset_class,
             self.filter_field_name,
+            self.estimate_total_count,
         )
 
 
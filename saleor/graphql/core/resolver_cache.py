@@ -0,0 +1,113 @@
+"""Tenant scoped cache of resolver results.
+
+Storefront queries such as the store settings, service times or delivery
+options are read by every visitor and change only when the merchant edits them.
+Resolvers decorated with `cached_resolver` keep their results in the Django
+cache, keyed by the current tenant, the resolver and its arguments.
+
+Every entry depends on a version of each model it was built from. A version is
+kept per model and tenant and is bumped by save/delete signal handlers, which
+invalidates all entries of that tenant built from the model at once.
+"""
+import hashlib
+import json
+import uuid
+from functools import wraps
+from typing import Iterable, Optional, Type
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import Model, QuerySet
+from django_multitenant.utils import get_current_tenant_value
+
+CACHE_KEY_PREFIX = "resolver:"
+VERSION_CACHE_KEY_PREFIX = "resolver_version:"
+
+# Connections are paginated after the resolver returns, so pagination arguments
+# do not change the cached result.
+PAGINATION_ARGS = {"first", "last", "before", "after"}
+
+
+def get_model_version_cache_key(model: Type[Model], tenant_id) -> str:
+    return f"{VERSION_CACHE_KEY_PREFIX}{model._meta.label_lower}:{tenant_id}"
+
+
+def get_model_versions(models: Iterable[Type[Model]], tenant_id) -> list:
+    keys = [get_model_version_cache_key(model, tenant_id) for model in models]
+    versions = cache.get_many(keys)
+    for key in keys:
+        if key not in versions:
+            cache.add(key, uuid.uuid4().hex, None)
+            versions[key] = cache.get(key)
+    return [versions[key] for key in keys]
+
+
+def get_resolver_cache_key(resolver_name: str, tenant_id, versions, kwargs) -> str:
+    arguments = json.dumps(
+        {name: value for name, value in kwargs.items() if name not in PAGINATION_ARGS},
+        sort_keys=True,
+        default=str,
+    )
+    digest = hashlib.sha256(
+        ":".join([resolver_name, *versions, arguments]).encode("utf-8")
+    ).hexdigest()
+    return f"{CACHE_KEY_PREFIX}{tenant_id}:{digest}"
+
+
+def invalidate_resolver_cache(model: Type[Model], tenant_id):
+    cache.set(get_model_version_cache_key(model, tenant_id), uuid.uuid4().hex, None)
+
+
+def invalidate_resolver_cache_for_instance(sender, instance, **kwargs):
+    """Drop cached results built from the tenant of the saved or deleted instance."""
+    tenant_id = instance.tenant_value
+    if tenant_id is not None:
+        invalidate_resolver_cache(sender, tenant_id)
+
+
+def cached_resolver(
+    *models: Type[Model],
+    timeout: Optional[int] = None,
+    skip_args: Iterable[str] = ("filter", "sort_by"),
+):
+    """Cache results of a resolver of the current tenant.
+
+    `models` are the models the result is built from, the cache is invalidated
+    whenever an instance of one of them is saved or deleted. Resolvers that
+    return a queryset are cached as a list of instances. The cache is skipped
+    when one of `skip_args` is provided, as filtering and sorting of connections
+    have to be done on querysets, and when there is no current tenant.
+    """
+    skip_args = tuple(skip_args)
+
+    def decorator(resolver):
+        resolver_name = f"{resolver.__module__}.{resolver.__qualname__}"
+
+        @wraps(resolver)
+        def wrapper(*args, **kwargs):
+            tenant_id = get_current_tenant_value()
+            if (
+                not settings.RESOLVER_CACHE_ENABLED
+                or tenant_id is None
+                or isinstance(tenant_id, list)
+                or any(kwargs.get(arg) for arg in skip_args)
+            ):
+                return resolver(*args, **kwargs)
+
+            versions = get_model_versions(models, tenant_id)
+            key = get_resolver_cache_key(resolver_name, tenant_id, versions, kwargs)
+            result = cache.get(key)
+            if result is None:
+                result = resolver(*args, **kwargs)
+                if isinstance(result, QuerySet):
+                    result = list(result)
+                cache.set(
+                    key,
+                    result,
+                    timeout if timeout is not None else settings.RESOLVER_CACHE_TIMEOUT,
+                )
+            return result
+
+        return wrapper
+
+    return decorator
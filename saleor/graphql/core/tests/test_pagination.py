@@ -1,11 +1,23 @@
 import math
+from unittest.mock import patch
 
+import django_filters
 import graphene
 import pytest
+from django.db import connection
+from django.db.models.functions import Length
+from django.test.utils import CaptureQueriesContext
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
 
 from ....tests.models import Book
-from ..connection import CountableDjangoObjectType
+from ..connection import (
+    CountableDjangoObjectType,
+    connection_from_queryset_slice,
+    get_estimated_count,
+    to_global_cursor,
+)
 from ..fields import FilterInputConnectionField
+from ..types import FilterInputObjectType
 
 
 class BookType(CountableDjangoObjectType):
@@ -13,8 +25,24 @@ class BookType(CountableDjangoObjectType):
         model = Book
 
 
+class BookFilter(django_filters.FilterSet):
+    name = django_filters.CharFilter()
+
+    class Meta:
+        model = Book
+        fields = []
+
+
+class BookFilterInput(FilterInputObjectType):
+    class Meta:
+        filterset_class = BookFilter
+
+
 class Query(graphene.ObjectType):
     books = FilterInputConnectionField(BookType)
+    estimated_books = FilterInputConnectionField(
+        BookType, filter=BookFilterInput(), estimate_total_count=True
+    )
 
 
 schema = graphene.Schema(query=Query)
@@ -218,3 +246,142 @@ def test_pagination_backward_last_page_info(books):
     page_info = content["books"]["pageInfo"]
     assert page_info["hasNextPage"]
     assert page_info["hasPreviousPage"] is False
+
+
+def test_pagination_filters_cursor_with_row_value_comparison(books):
+    # given
+    qs = Book.objects.order_by("-name", "-pk")
+    cursor = to_global_cursor(["Book5", books[5].pk])
+    args = {
+        "first": 3,
+        "after": cursor,
+        "sort_by": {"field": ["name", "pk"], "direction": "-"},
+    }
+
+    # when
+    with CaptureQueriesContext(connection) as context:
+        result = connection_from_queryset_slice(
+            qs, args, BookType._meta.connection, BookType._meta.connection.Edge
+        )
+
+    # then
+    assert [edge.node.name for edge in result.edges] == ["Book4", "Book3", "Book23"]
+    (query,) = context.captured_queries
+    assert '("tests_book"."name", "tests_book"."id") < (' in query["sql"]
+
+
+def test_pagination_filters_cursor_of_annotations(books):
+    # given
+    qs = Book.objects.annotate(name_length=Length("name")).order_by(
+        "name_length", "name"
+    )
+    cursor = to_global_cursor([5, "Book9"])
+    args = {
+        "first": 2,
+        "after": cursor,
+        "sort_by": {"field": ["name_length", "name"], "direction": ""},
+    }
+
+    # when
+    with CaptureQueriesContext(connection) as context:
+        result = connection_from_queryset_slice(
+            qs, args, BookType._meta.connection, BookType._meta.connection.Edge
+        )
+
+    # then
+    assert [edge.node.name for edge in result.edges] == ["Book10", "Book11"]
+    (query,) = context.captured_queries
+    assert ") > (" not in query["sql"]
+
+
+QUERY_ESTIMATED_TOTAL_COUNT = """
+    query EstimatedBooksCount($first: Int, $filter: BookFilterInput) {
+        estimatedBooks(first: $first, filter: $filter) {
+            totalCount
+        }
+    }
+"""
+
+
+@pytest.fixture
+def tenant(store):
+    set_current_tenant(store)
+    yield store
+    unset_current_tenant()
+
+
+@patch("saleor.graphql.core.connection.get_estimated_count")
+def test_total_count_estimated_for_large_querysets(
+    get_estimated_count_mock, books, tenant, settings
+):
+    # given
+    settings.CONNECTION_EXACT_COUNT_LIMIT = 10000
+    get_estimated_count_mock.return_value = 1000000
+
+    # when
+    result = schema.execute(QUERY_ESTIMATED_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["estimatedBooks"]["totalCount"] == 1000000
+
+
+@patch("saleor.graphql.core.connection.get_estimated_count")
+def test_total_count_exact_for_small_querysets(
+    get_estimated_count_mock, books, tenant, settings
+):
+    # given
+    settings.CONNECTION_EXACT_COUNT_LIMIT = 10000
+    get_estimated_count_mock.return_value = 30
+
+    # when
+    result = schema.execute(QUERY_ESTIMATED_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["estimatedBooks"]["totalCount"] == len(books)
+
+
+@patch("saleor.graphql.core.connection.get_estimated_count")
+def test_total_count_exact_for_filtered_querysets(
+    get_estimated_count_mock, books, tenant, settings
+):
+    # given
+    settings.CONNECTION_EXACT_COUNT_LIMIT = 10000
+    get_estimated_count_mock.return_value = 1000000
+    variables = {"first": 1, "filter": {"name": books[0].name}}
+
+    # when
+    result = schema.execute(QUERY_ESTIMATED_TOTAL_COUNT, variables=variables)
+
+    # then
+    assert not result.errors
+    assert result.data["estimatedBooks"]["totalCount"] == 1
+    get_estimated_count_mock.assert_not_called()
+
+
+@patch("saleor.graphql.core.connection.get_estimated_count")
+def test_total_count_exact_without_tenant(get_estimated_count_mock, books, settings):
+    # given
+    settings.CONNECTION_EXACT_COUNT_LIMIT = 10000
+    get_estimated_count_mock.return_value = 1000000
+
+    # when
+    result = schema.execute(QUERY_ESTIMATED_TOTAL_COUNT, variables={"first": 1})
+
+    # then
+    assert not result.errors
+    assert result.data["estimatedBooks"]["totalCount"] == len(books)
+    get_estimated_count_mock.assert_not_called()
+
+
+def test_get_estimated_count(books):
+    # given
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE tests_book")
+
+    # when
+    estimated_count = get_estimated_count(Book.objects.all())
+
+    # then
+    assert estimated_count == len(books)
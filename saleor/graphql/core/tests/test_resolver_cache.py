@@ -0,0 +1,97 @@
+import pytest
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
+
+from ....delivery.models import Delivery
+from ....store.models import Store
+from ...delivery.resolvers import resolve_deliveries
+from ...store.resolvers import resolve_favicon_pwa, resolve_my_store
+
+
+@pytest.fixture
+def current_store(store):
+    set_current_tenant(store)
+    yield store
+    unset_current_tenant()
+
+
+def test_cached_resolver_second_call_skips_database(
+    current_store, django_assert_num_queries
+):
+    # given
+    resolve_my_store(None)
+
+    # when
+    with django_assert_num_queries(0):
+        result = resolve_my_store(None)
+
+    # then
+    assert result == current_store
+
+
+def test_cached_resolver_invalidated_on_save(current_store):
+    # given
+    resolve_my_store(None)
+
+    # when
+    current_store.name = "Pizzeria Saleor"
+    current_store.save(update_fields=["name"])
+
+    # then
+    assert resolve_my_store(None).name == "Pizzeria Saleor"
+
+
+def test_cached_resolver_invalidated_on_delete(current_store):
+    # given
+    delivery = Delivery.objects.create(store=current_store, delivery_fee=5)
+    assert resolve_deliveries(None) == [delivery]
+
+    # when
+    delivery.delete()
+
+    # then
+    assert resolve_deliveries(None) == []
+
+
+def test_cached_resolver_is_scoped_to_tenant(current_store):
+    # given
+    Delivery.objects.create(store=current_store, delivery_fee=5)
+    resolve_deliveries(None)
+    unset_current_tenant()
+    other_store = Store.objects.create(name="Other", domain="other.example.com")
+
+    # when
+    set_current_tenant(other_store)
+    deliveries = resolve_deliveries(None)
+
+    # then
+    assert deliveries == []
+
+
+def test_cached_resolver_skipped_when_filtering(
+    current_store, django_assert_num_queries
+):
+    # given
+    resolve_favicon_pwa(None)
+
+    # when
+    with django_assert_num_queries(1):
+        list(resolve_favicon_pwa(None, filter={"search": "icon"}))
+
+
+def test_cached_resolver_skipped_without_tenant(store, django_assert_num_queries):
+    # given
+    resolve_my_store(None)
+
+    # when
+    with django_assert_num_queries(1):
+        resolve_my_store(None)
+
+
+def test_cached_resolver_disabled(current_store, settings, django_assert_num_queries):
+    # given
+    settings.RESOLVER_CACHE_ENABLED = False
+    resolve_my_store(None)
+
+    # when
+    with django_assert_num_queries(1):
+        resolve_my_store(None)
@@ -4,6 +4,8 @@ import graphene
 import pytest
 from django.test import override_settings
 from graphql.execution.base import ExecutionResult
+from graphql.language.parser import parse
+from graphql.validation import validate
 
 from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
@@ -15,7 +17,12 @@ from ...tests.fixtures import (
     API_PATH,
 )
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...views import (
+    PERSISTED_QUERY_NOT_FOUND,
+    clear_documents_cache,
+    generate_cache_key,
+    hash_query,
+)
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -227,6 +234,7 @@ def test_graphql_execution_exception(monkeypatch, api_client):
         raise IOError("Spanish inquisition")
 
     monkeypatch.setattr("graphql.backend.core.execute_and_validate", mocked_execute)
+    clear_documents_cache()
     response = api_client.post_graphql("{ shop { name }}")
     assert response.status_code == 400
     content = get_graphql_content_from_response(response)
@@ -416,3 +424,76 @@ def test_introspection_query_is_not_cached_in_debug_mode(
 def test_generate_cache_key_use_saleor_version():
     cache_key = generate_cache_key(INTROSPECTION_QUERY)
     assert saleor_version in cache_key
+
+
+QUERY_SHOP_NAME = "{ shop { name } }"
+
+
+def _persisted_query_data(query=None, query_hash=None):
+    data = {
+        "extensions": {
+            "persistedQuery": {
+                "version": 1,
+                "sha256Hash": query_hash or hash_query(QUERY_SHOP_NAME),
+            }
+        }
+    }
+    if query:
+        data["query"] = query
+    return data
+
+
+def test_persisted_query_not_found(api_client):
+    response = api_client.post(_persisted_query_data(query_hash="unknown"))
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == PERSISTED_QUERY_NOT_FOUND
+
+
+def test_persisted_query_registered_and_executed_by_hash(api_client, site_settings):
+    # given
+    response = api_client.post(_persisted_query_data(query=QUERY_SHOP_NAME))
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+    # when
+    response = api_client.post(_persisted_query_data())
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_persisted_query_hash_mismatch(api_client):
+    response = api_client.post(
+        _persisted_query_data(query=QUERY_SHOP_NAME, query_hash="invalid")
+    )
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match query."
+    )
+
+
+@override_settings(GRAPHQL_PERSISTED_QUERIES_ENABLED=False)
+def test_persisted_query_not_supported(api_client):
+    response = api_client.post(_persisted_query_data())
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == "PersistedQueryNotSupported"
+
+
+@mock.patch("graphql.backend.core.parse", wraps=parse)
+@mock.patch("graphql.backend.core.validate", wraps=validate)
+@mock.patch("saleor.graphql.views.validate", wraps=validate)
+def test_cached_document_is_not_parsed_and_validated_again(
+    mocked_view_validate, mocked_backend_validate, mocked_parse, api_client
+):
+    # given
+    clear_documents_cache()
+
+    # when
+    responses = [api_client.post_graphql(QUERY_SHOP_NAME) for _ in range(2)]
+
+    # then
+    assert all(get_graphql_content(response) for response in responses)
+    # The view validates the document once, executions skip the validation.
+    assert mocked_parse.call_count == 1
+    assert mocked_view_validate.call_count + mocked_backend_validate.call_count == 1
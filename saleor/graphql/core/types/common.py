@@ -16,6 +16,7 @@ from ..enums import (
     DiscountErrorCode,
     ExportErrorCode,
     GiftCardErrorCode,
+    ImportErrorCode,
     InvoiceErrorCode,
     JobStatusEnum,
     LanguageCodeEnum,
@@ -163,6 +164,10 @@ class ExportError(Error):
     code = ExportErrorCode(description="The error code.", required=True)
 
 
+class ProductImportError(Error):
+    code = ImportErrorCode(description="The error code.", required=True)
+
+
 class MenuError(Error):
     code = MenuErrorCode(description="The error code.", required=True)
 
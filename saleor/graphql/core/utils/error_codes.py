@@ -11,7 +11,7 @@ from ....core.error_codes import (
     TranslationErrorCode,
     UploadErrorCode,
 )
-from ....csv.error_codes import ExportErrorCode
+from ....csv.error_codes import ExportErrorCode, ImportErrorCode
 from ....discount.error_codes import DiscountErrorCode
 from ....giftcard.error_codes import GiftCardErrorCode
 from ....invoice.error_codes import InvoiceErrorCode
@@ -59,6 +59,7 @@ SALEOR_ERROR_CODE_ENUMS = [
     ChannelErrorCode,
     CheckoutErrorCode,
     ExportErrorCode,
+    ImportErrorCode,
     DiscountErrorCode,
     PluginErrorCode,
     GiftCardErrorCode,
@@ -1,22 +1,26 @@
+import os
 from typing import Dict, List, Mapping, Union
 
 import graphene
 from django.core.exceptions import ValidationError
+from django_multitenant.utils import get_current_tenant
 
 from ...core.permissions import ProductPermissions
 from ...csv import models as csv_models
+from ...csv.error_codes import ImportErrorCode
 from ...csv.events import export_started_event
-from ...csv.tasks import export_products_task
+from ...csv.tasks import export_products_task, import_products_task
 from ..attribute.types import Attribute
 from ..channel.types import Channel
 from ..core.enums import ExportErrorCode
 from ..core.mutations import BaseMutation
-from ..core.types.common import ExportError
+from ..core.types import Upload
+from ..core.types.common import ExportError, ProductImportError
 from ..product.filters import ProductFilterInput
 from ..product.types import Product
 from ..warehouse.types import Warehouse
 from .enums import ExportScope, FileTypeEnum, ProductFieldEnum
-from .types import ExportFile
+from .types import ExportFile, ImportFile
 
 
 class ExportInfoInput(graphene.InputObjectType):
@@ -156,3 +160,60 @@ class ExportProducts(BaseMutation):
             return
         pks = cls.get_global_ids_or_error(ids, only_type=graphene_type, field=field)
         return pks
+
+
+class ImportProducts(BaseMutation):
+    import_file = graphene.Field(
+        ImportFile,
+        description="The newly created import file job which imports the products.",
+    )
+
+    class Arguments:
+        file = Upload(
+            required=True,
+            description=(
+                "CSV file with a row per variant and channel, sent as a `multipart` "
+                "request."
+            ),
+        )
+        delimiter = graphene.String(
+            description="Delimiter of the CSV file columns.", default_value=";"
+        )
+
+    class Meta:
+        description = "Import products, their variants, options and stocks from a file."
+        permissions = (ProductPermissions.MANAGE_PRODUCTS,)
+        error_type_class = ProductImportError
+        error_type_field = "import_errors"
+
+    @classmethod
+    def perform_mutation(cls, _root, info, **data):
+        file_data = info.context.FILES.get(data["file"])
+        if not file_data or os.path.splitext(file_data.name)[1].lower() != ".csv":
+            raise ValidationError(
+                {
+                    "file": ValidationError(
+                        "Upload a CSV file.", code=ImportErrorCode.INVALID.value
+                    )
+                }
+            )
+        delimiter = data["delimiter"]
+        if len(delimiter) != 1:
+            raise ValidationError(
+                {
+                    "delimiter": ValidationError(
+                        "Delimiter must be a single character.",
+                        code=ImportErrorCode.INVALID.value,
+                    )
+                }
+            )
+
+        app = info.context.app
+        kwargs = {"app": app} if app else {"user": info.context.user}
+        import_file = csv_models.ImportFile.objects.create(
+            store=get_current_tenant(), content_file=file_data, **kwargs
+        )
+        import_products_task.delay(import_file.pk, delimiter)
+
+        import_file.refresh_from_db()
+        return cls(import_file=import_file)
@@ -1,3 +1,5 @@
+from django_multitenant.utils import get_current_tenant_value
+
 from ...csv import models
 
 
@@ -7,3 +9,9 @@ def resolve_export_file(id):
 
 def resolve_export_files():
     return models.ExportFile.objects.all()
+
+
+def resolve_import_file(id):
+    return models.ImportFile.objects.filter(
+        id=id, store_id=get_current_tenant_value()
+    ).first()
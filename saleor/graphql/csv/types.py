@@ -8,6 +8,7 @@ from ..account.types import User
 from ..account.utils import requestor_has_access
 from ..app.types import App
 from ..core.connection import CountableDjangoObjectType
+from ..core.enums import ImportErrorCode
 from ..core.types.common import Job
 from ..utils import get_user_or_app_from_context
 from .enums import ExportEventEnum
@@ -59,6 +60,11 @@ class ExportEvent(CountableDjangoObjectType):
 
 class ExportFile(CountableDjangoObjectType):
     url = graphene.String(description="The URL of field to download.")
+    total_count = graphene.Int(description="Number of products to export.")
+    processed_count = graphene.Int(
+        required=True, description="Number of products exported so far."
+    )
+    throughput = graphene.Float(description="Exported products per second.")
     events = graphene.List(
         graphene.NonNull(ExportEvent),
         description="List of events associated with the export.",
@@ -68,7 +74,15 @@ class ExportFile(CountableDjangoObjectType):
         description = "Represents a job data of exported file."
         interfaces = [graphene.relay.Node, Job]
         model = models.ExportFile
-        only_fields = ["id", "user", "app", "url"]
+        only_fields = [
+            "id",
+            "user",
+            "app",
+            "url",
+            "total_count",
+            "processed_count",
+            "throughput",
+        ]
 
     @staticmethod
     @traced_resolver
@@ -98,3 +112,48 @@ class ExportFile(CountableDjangoObjectType):
     @traced_resolver
     def resolve_events(root: models.ExportFile, _info):
         return root.events.all().order_by("pk")
+
+
+class ImportRowError(graphene.ObjectType):
+    row = graphene.Int(description="Line of the file with the error.", required=True)
+    field = graphene.String(description="Column of the file with the error.")
+    message = graphene.String(description="The error message.", required=True)
+    code = ImportErrorCode(description="The error code.", required=True)
+
+    class Meta:
+        description = "Represents an error of a row of an imported file."
+
+
+class ImportFile(CountableDjangoObjectType):
+    total_count = graphene.Int(description="Number of rows in the file.")
+    errors = graphene.List(
+        graphene.NonNull(ImportRowError),
+        description="Errors of invalid rows, nothing is imported when there are any.",
+        required=True,
+    )
+
+    class Meta:
+        description = "Represents a job importing products from a file."
+        interfaces = [graphene.relay.Node, Job]
+        model = models.ImportFile
+        only_fields = ["id", "user", "app", "total_count"]
+
+    @staticmethod
+    @traced_resolver
+    def resolve_user(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.user
+        raise PermissionDenied()
+
+    @staticmethod
+    @traced_resolver
+    def resolve_app(root: models.ImportFile, info):
+        requestor = get_user_or_app_from_context(info.context)
+        if requestor_has_access(requestor, root.user, AccountPermissions.MANAGE_STAFF):
+            return root.app
+        raise PermissionDenied()
+
+    @staticmethod
+    def resolve_errors(root: models.ImportFile, _info):
+        return [ImportRowError(**error) for error in root.errors]
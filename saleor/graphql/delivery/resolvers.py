@@ -1,6 +1,9 @@
 import graphene 
 from ...delivery import models
+from ...delivery.utils import get_delivery_quote
+from ..core.resolver_cache import cached_resolver
 
+@cached_resolver(models.Delivery)
 def resolve_deliveries(info, **kwargs):
     return models.Delivery.objects.all()
 
@@ -10,6 +13,9 @@ def resolve_delivery(info, **kwargs):
     delivery = models.Delivery.objects.first()
     return delivery
 
+def resolve_delivery_quote(info, postal_code=None):
+    return get_delivery_quote(postal_code)
+
 
 
 
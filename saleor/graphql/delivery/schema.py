@@ -1,9 +1,10 @@
 import graphene 
-from .types import Delivery
+from .types import Delivery, DeliveryQuote
 from ..core.fields import FilterInputConnectionField
 from .resolvers import(
     resolve_deliveries,
-    resolve_delivery
+    resolve_delivery,
+    resolve_delivery_quote
 )
 from .mutations.deliveries import(
     DeliveryCreate,
@@ -19,6 +20,11 @@ class DeliveryQueries(graphene.ObjectType):
         Delivery,
         description="List of the deliveries"
     )
+    delivery_quote = graphene.Field(
+        DeliveryQuote,
+        postal_code=graphene.String(description="Postal code of the address."),
+        description="Look up the delivery fee and minimum order for a postal code."
+    )
 
     def resolve_deliveries(self, info, **kwargs):
         return resolve_deliveries(info, **kwargs)
@@ -26,6 +32,9 @@ class DeliveryQueries(graphene.ObjectType):
     def resolve_current_delivery(self, info, **kwargs):
         return resolve_delivery(info, **kwargs)
 
+    def resolve_delivery_quote(self, info, postal_code=None):
+        return resolve_delivery_quote(info, postal_code)
+
 
         
 class DeliveryMutations(graphene.ObjectType):
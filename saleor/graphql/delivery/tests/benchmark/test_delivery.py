@@ -0,0 +1,106 @@
+import graphene
+import pytest
+
+from ..test_delivery_quote import QUERY_DELIVERY_QUOTE
+
+QUERY_CURRENT_DELIVERY = """
+    query CurrentDelivery {
+        currentDelivery {
+            id
+            deliveryArea
+            deliveryFee
+            fromDelivery
+            minOrder
+            enableForBigOrder
+            enableCustomDeliveryFee
+            enableMinimumDeliveryOrderValue
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_current_delivery(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_CURRENT_DELIVERY, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert content["data"]["currentDelivery"]["deliveryFee"] == 4.0
+
+
+QUERY_DELIVERIES = """
+    query Deliveries {
+        deliveries {
+            id
+            deliveryFee
+            minOrder
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_deliveries(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_DELIVERIES, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert len(content["data"]["deliveries"]) == 1
+
+
+@pytest.mark.django_db
+@pytest.mark.parametrize("postal_code", ["1000", "5950", "9999"])
+def test_delivery_quote(api_client, restaurant, postal_code, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client,
+        QUERY_DELIVERY_QUOTE,
+        {"postalCode": postal_code},
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    assert content["data"]["deliveryQuote"]["deliveryFee"]
+
+
+MUTATION_DELIVERY_UPDATE = """
+    mutation DeliveryUpdate($id: ID!, $input: DeliveryUpdateInput!) {
+        deliveryUpdate(id: $id, input: $input) {
+            delivery {
+                deliveryFee
+                minOrder
+            }
+            deliveryErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_delivery_update(restaurant_staff_api_client, restaurant, graphql_benchmark):
+    # given
+    delivery = restaurant.deliveries.get()
+    variables = {
+        "id": graphene.Node.to_global_id("Delivery", delivery.pk),
+        "input": {"deliveryFee": 3.5, "minOrder": 12},
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_DELIVERY_UPDATE,
+        variables,
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["deliveryUpdate"]
+    assert not data["deliveryErrors"]
+    assert data["delivery"] == {"deliveryFee": 3.5, "minOrder": 12.0}
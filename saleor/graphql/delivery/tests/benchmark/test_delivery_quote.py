@@ -0,0 +1,34 @@
+import pytest
+
+from ....tests.utils import get_graphql_content
+from ..test_delivery_quote import QUERY_DELIVERY_QUOTE
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+def test_delivery_quote(api_client, delivery, count_queries):
+    # given
+    delivery.delivery_area = {
+        "areas": [
+            {
+                "from": 1000 + index * 10,
+                "to": 1009 + index * 10,
+                "customDeliveryFee": index / 100,
+                "customMinOrder": index,
+            }
+            for index in range(500)
+        ]
+    }
+    delivery.save()
+
+    # when
+    for postal_code in ("1000", "3555", "5995", "9999"):
+        response = api_client.post_graphql(
+            QUERY_DELIVERY_QUOTE,
+            {"postalCode": postal_code},
+            HTTP_HOST=delivery.store.domain,
+        )
+
+        # then
+        content = get_graphql_content(response)
+        assert content["data"]["deliveryQuote"]
@@ -0,0 +1,46 @@
+import pytest
+
+from ...tests.utils import get_graphql_content
+
+QUERY_DELIVERY_QUOTE = """
+    query DeliveryQuote($postalCode: String) {
+        deliveryQuote(postalCode: $postalCode) {
+            deliveryFee
+            minOrder
+            freeDeliveryFrom
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize(
+    "postal_code, delivery_fee, min_order",
+    [("1000AB", 2.5, 15), ("1150", 3.46, 10), ("5000", 4, 10), (None, 4, 10)],
+)
+def test_delivery_quote(api_client, delivery, postal_code, delivery_fee, min_order):
+    # when
+    response = api_client.post_graphql(
+        QUERY_DELIVERY_QUOTE,
+        {"postalCode": postal_code},
+        HTTP_HOST=delivery.store.domain,
+    )
+
+    # then
+    content = get_graphql_content(response)
+    data = content["data"]["deliveryQuote"]
+    assert data == {
+        "deliveryFee": delivery_fee,
+        "minOrder": min_order,
+        "freeDeliveryFrom": 50,
+    }
+
+
+def test_delivery_quote_without_delivery_settings(api_client, store):
+    # when
+    response = api_client.post_graphql(
+        QUERY_DELIVERY_QUOTE, {"postalCode": "1000"}, HTTP_HOST=store.domain
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["deliveryQuote"] is None
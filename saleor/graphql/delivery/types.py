@@ -44,3 +44,20 @@ class Delivery(CountableDjangoObjectType):
         ]
         interfaces = [graphene.relay.Node, ObjectWithMetadata]
         model = models.Delivery
+
+
+class DeliveryQuote(graphene.ObjectType):
+    delivery_fee = graphene.Float(
+        description="Delivery fee for the postal code."
+    )
+    min_order = graphene.Float(
+        description="Minimum order value for the postal code."
+    )
+    free_delivery_from = graphene.Float(
+        description="Order subtotal from which the delivery is free."
+    )
+
+    class Meta:
+        description = (
+            "Delivery fee and minimum order value for a postal code."
+        )
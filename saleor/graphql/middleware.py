@@ -6,7 +6,6 @@ from django.contrib.auth.models import AnonymousUser
 from django.utils.functional import SimpleLazyObject
 
 from saleor.account.models import User
-from saleor.core.utils.logging import log_info
 
 from ..app.models import App
 from ..core.exceptions import ReadOnlyException, PermissionDenied
@@ -1,5 +1,12 @@
+import logging
+import threading
+from typing import List, Optional, Tuple
+
 import channels_graphql_ws
 import graphene
+from asgiref.sync import async_to_sync
+from django.db import transaction
+from graphql_relay import from_global_id
 
 # from django.contrib.auth import get_user_model
 
@@ -7,6 +14,30 @@ import graphene
 
 # USER = get_user_model()
 
+logger = logging.getLogger(__name__)
+
+_pending_notifications = threading.local()
+
+
+def get_store_notification_group(store_id) -> str:
+    """Return the subscription group of a store.
+
+    Accepts both a global `Store` ID and a database one, so publishers and
+    dashboard subscriptions end up in the same group.
+    """
+    store_pk = str(store_id)
+    try:
+        _type, store_pk = from_global_id(store_pk)
+    except ValueError:
+        # Not base64 or without a type, a database ID.
+        pass
+    except Exception:
+        logger.exception(
+            "Cannot decode store ID of a notification group",
+            extra={"store_id": store_pk},
+        )
+    return f"store-{store_pk}"
+
 
 class LiveNotification(channels_graphql_ws.Subscription):
     store_id = graphene.String()
@@ -24,7 +55,7 @@ class LiveNotification(channels_graphql_ws.Subscription):
         """Client subscription handler."""
         del info
         # Specify the subscription group client subscribes to.
-        return [id] if id is not None else None
+        return [get_store_notification_group(id)] if id is not None else None
 
     def publish(self, info, **arg1):
         store_id = self["store_id"]
@@ -39,11 +70,57 @@ class LiveNotification(channels_graphql_ws.Subscription):
         inside auxiliary class methods inside the subscription class.
         That allows to consider a structure of the `payload` as an
         implementation details.
+
+        Notifications are sent once the current transaction is committed, all
+        notifications queued within one transaction go out in a single batch
+        and duplicates are dropped.
         """
-        cls.broadcast(
-            group=store_id,
-            payload={"store_id": store_id, "message_title": message_title},
+        message = (
+            get_store_notification_group(store_id),
+            {"store_id": store_id, "message_title": message_title},
         )
+        connection = transaction.get_connection()
+        if not connection.in_atomic_block:
+            async_to_sync(cls.broadcast_batch)([message])
+            return
+
+        batch = _get_transaction_batch(connection)
+        if batch is None:
+            batch = {"connection": connection, "messages": []}
+            batch["flush"] = lambda: _flush_batch(cls, batch)
+            _pending_notifications.batch = batch
+            transaction.on_commit(batch["flush"])
+        if message not in batch["messages"]:
+            batch["messages"].append(message)
+
+    @classmethod
+    async def broadcast_batch(cls, messages: List[Tuple[str, dict]]):
+        """Send many notifications with one hop to the event loop."""
+        for group, payload in messages:
+            await cls.broadcast_async(group=group, payload=payload)
+
+
+def _get_transaction_batch(connection) -> Optional[dict]:
+    """Return the notifications batch of the current transaction.
+
+    A batch belongs to the transaction its flush hook was registered in. The hook
+    is removed from the commit hooks of the connection when that transaction,
+    or the savepoint it was registered in, is rolled back, and the batch is
+    dropped when the hook runs on commit.
+    """
+    batch = getattr(_pending_notifications, "batch", None)
+    if batch is None or batch["connection"] is not connection:
+        return None
+    if not any(hook is batch["flush"] for _sids, hook in connection.run_on_commit):
+        return None
+    return batch
+
+
+def _flush_batch(subscription, batch: dict):
+    if getattr(_pending_notifications, "batch", None) is batch:
+        _pending_notifications.batch = None
+    async_to_sync(subscription.broadcast_batch)(batch["messages"])
+
 
 class AppNotification(graphene.ObjectType):
     app_live_notification = LiveNotification.Field()
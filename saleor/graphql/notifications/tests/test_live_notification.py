@@ -0,0 +1,171 @@
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import graphene
+import pytest
+from asgiref.sync import async_to_sync
+from channels_graphql_ws.testing import GraphqlWsClient, GraphqlWsTransport
+from django.db import DatabaseError, transaction
+from django.test import TestCase
+
+from ...api import MyGraphqlWsConsumer
+from ..schema import LiveNotification, get_store_notification_group
+
+SUBSCRIPTION_LIVE_NOTIFICATION = """
+    subscription LiveNotification($id: ID!) {
+        appLiveNotification(id: $id) {
+            storeId
+            messageTitle
+        }
+    }
+"""
+
+
+def test_store_notification_group_accepts_global_and_database_ids():
+    # given
+    global_id = graphene.Node.to_global_id("Store", 7)
+
+    # when
+    groups = {get_store_notification_group(global_id), get_store_notification_group(7)}
+
+    # then
+    assert groups == {"store-7"}
+
+
+@patch("saleor.graphql.notifications.schema.from_global_id", side_effect=TypeError)
+def test_store_notification_group_logs_unexpected_errors(_from_global_id, caplog):
+    # when
+    group = get_store_notification_group("7")
+
+    # then
+    assert group == "store-7"
+    assert caplog.records[0].store_id == "7"
+
+
+@pytest.mark.django_db(transaction=True)
+@patch.object(LiveNotification, "broadcast_batch", new_callable=AsyncMock)
+def test_new_message_outside_transaction_is_sent_immediately(broadcast_batch_mock):
+    # when
+    LiveNotification.new_message(store_id="7", message_title="New order")
+
+    # then
+    broadcast_batch_mock.assert_awaited_once_with(
+        [("store-7", {"store_id": "7", "message_title": "New order"})]
+    )
+
+
+@pytest.mark.django_db
+@patch.object(LiveNotification, "broadcast_batch", new_callable=AsyncMock)
+def test_new_message_in_transaction_is_batched_on_commit(broadcast_batch_mock):
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        LiveNotification.new_message(store_id="7", message_title="New order")
+        LiveNotification.new_message(store_id="7", message_title="New order")
+        LiveNotification.new_message(store_id="8", message_title="New order")
+        broadcast_batch_mock.assert_not_awaited()
+
+    # then
+    broadcast_batch_mock.assert_awaited_once_with(
+        [
+            ("store-7", {"store_id": "7", "message_title": "New order"}),
+            ("store-8", {"store_id": "8", "message_title": "New order"}),
+        ]
+    )
+
+
+@pytest.mark.django_db
+@patch.object(LiveNotification, "broadcast_batch", new_callable=AsyncMock)
+def test_new_message_in_rolled_back_savepoint_is_not_sent(broadcast_batch_mock):
+    # when
+    with TestCase.captureOnCommitCallbacks(execute=True):
+        try:
+            with transaction.atomic():
+                LiveNotification.new_message(store_id="7", message_title="New order")
+                raise DatabaseError()
+        except DatabaseError:
+            pass
+        LiveNotification.new_message(store_id="8", message_title="New order")
+
+    # then
+    broadcast_batch_mock.assert_awaited_once_with(
+        [("store-8", {"store_id": "8", "message_title": "New order"})]
+    )
+
+
+class ConfirmingGraphqlWsConsumer(MyGraphqlWsConsumer):
+    # Let clients wait until they are subscribed before anything is broadcast.
+    confirm_subscriptions = True
+
+
+async def _broadcast_to_subscribed_clients(stores_count, clients_per_store):
+    """Subscribe the clients, notify every store once and return the deliveries.
+
+    Return the store IDs of notifications received by the clients of every store.
+    """
+    clients = {}
+    for store_pk in range(1, stores_count + 1):
+        store_id = graphene.Node.to_global_id("Store", store_pk)
+        for _ in range(clients_per_store):
+            client = GraphqlWsClient(
+                GraphqlWsTransport(
+                    application=ConfirmingGraphqlWsConsumer.as_asgi(), path="graphql/"
+                )
+            )
+            await client.connect_and_init(connect_only=True)
+            await client.send(msg_type="connection_init", payload={"domain": None})
+            await client.receive(assert_type="connection_ack")
+            await client.subscribe(
+                SUBSCRIPTION_LIVE_NOTIFICATION, variables={"id": store_id}
+            )
+            clients.setdefault(store_id, []).append(client)
+
+    deliveries = {}
+    try:
+        await LiveNotification.broadcast_batch(
+            [
+                (
+                    get_store_notification_group(store_id),
+                    {"store_id": store_id, "message_title": "New order"},
+                )
+                for store_id in clients
+            ]
+        )
+        for store_id, store_clients in clients.items():
+            responses = await asyncio.gather(
+                *[client.receive() for client in store_clients]
+            )
+            deliveries[store_id] = [
+                response["data"]["appLiveNotification"]["storeId"]
+                for response in responses
+            ]
+        for store_clients in clients.values():
+            for client in store_clients:
+                await client.assert_no_messages(attempts=1, interval=0)
+    finally:
+        for store_clients in clients.values():
+            for client in store_clients:
+                await client.finalize()
+    return deliveries
+
+
+@pytest.mark.performance
+def test_live_notification_broadcast_fan_out():
+    """Fan-out of a batch of notifications to clients subscribed to many stores.
+
+    Runs in one process on the in-memory channel layer, or on Redis when
+    `REDIS_CHANNEL` is set. It doesn't cover notifications published by checkout
+    completion in another worker.
+    """
+    # given
+    stores_count, clients_per_store = 20, 5
+
+    # when
+    deliveries = async_to_sync(_broadcast_to_subscribed_clients)(
+        stores_count, clients_per_store
+    )
+
+    # then
+    # Every client gets the notification of its store, and only that one.
+    assert len(deliveries) == stores_count
+    for store_id, received in deliveries.items():
+        assert received == [store_id] * clients_per_store
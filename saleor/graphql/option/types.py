@@ -7,6 +7,14 @@ from saleor.graphql.channel.types import Channel
 from ...product import models
 from ..core.connection import CountableDjangoObjectType
 from ..meta.types import ObjectWithMetadata
+from ..product.dataloaders import (
+    OptionValueChannelListingByOptionValueIdLoader,
+    OptionValuesByOptionIdLoader,
+)
+
+
+def _is_prefetched(root, related_name: str) -> bool:
+    return related_name in getattr(root, "_prefetched_objects_cache", {})
 
 
 class OptionValueChannelListing(CountableDjangoObjectType):
@@ -48,7 +56,12 @@ class OptionValue(CountableDjangoObjectType):
     @staticmethod
     @traced_resolver
     def resolve_channel_listing(root: models.OptionValue, info, **_kwargs):
-        return root.option_value_channels.all()
+        # listings of options of a product are prefetched for its channel
+        if _is_prefetched(root, "option_value_channels"):
+            return root.option_value_channels.all()
+        return OptionValueChannelListingByOptionValueIdLoader(info.context).load(
+            root.id
+        )
 
 class Option(CountableDjangoObjectType):
     name = graphene.String(description="Name")
@@ -81,4 +94,6 @@ class Option(CountableDjangoObjectType):
     @staticmethod
     @traced_resolver
     def resolve_option_values(root: models.Option, info, **_kwargs):
-        return root.option_values.all()
+        if _is_prefetched(root, "option_values"):
+            return root.option_values.all()
+        return OptionValuesByOptionIdLoader(info.context).load(root.id)
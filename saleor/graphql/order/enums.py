@@ -1,11 +1,17 @@
 import graphene
 
 from ...graphql.core.enums import to_enum
-from ...order import OrderEvents, OrderEventsEmails, OrderOrigin
+from ...order import (
+    OrderEvents,
+    OrderEventsEmails,
+    OrderOrigin,
+    SalesRollupGranularity,
+)
 
 OrderEventsEnum = to_enum(OrderEvents)
 OrderEventsEmailsEnum = to_enum(OrderEventsEmails)
 OrderOriginEnum = to_enum(OrderOrigin)
+SalesRollupGranularityEnum = to_enum(SalesRollupGranularity)
 
 
 class OrderStatusFilter(graphene.Enum):
@@ -1,12 +1,14 @@
+from django.db.models import Sum
+from prices import Money, TaxedMoney
+
 from ...channel.models import Channel
 from ...core.tracing import traced_resolver
-from ...order import OrderStatus, models
+from ...order import OrderStatus, SalesRollupGranularity, models
 from ...payment.models import Payment
 from ...order.events import OrderEvents
 from ...order.models import OrderEvent
-from ...order.utils import sum_order_totals
 from ..channel.utils import get_default_channel_slug_or_graphql_error
-from ..utils.filters import filter_by_period
+from ..utils.filters import filter_range_field, reporting_period_to_date
 
 ORDER_SEARCH_FIELDS = ("id", "discount_name", "token", "user_email", "user__email")
 
@@ -25,20 +27,75 @@ def resolve_draft_orders(_info, **_kwargs):
     return qs
 
 
-@traced_resolver
-def resolve_orders_total(_info, period, channel_slug):
+def _get_channel_sales_rollups(channel_slug, granularity):
     if channel_slug is None:
         channel_slug = get_default_channel_slug_or_graphql_error()
     channel = Channel.objects.filter(slug=str(channel_slug)).first()
+    if not channel:
+        return None, None
+    rollups = models.SalesRollup.objects.filter(
+        channel=channel, granularity=granularity, currency=channel.currency_code
+    )
+    return channel, rollups
+
+
+def _get_rollups_total(net_amount, gross_amount, currency):
+    return TaxedMoney(
+        net=Money(net_amount or 0, currency), gross=Money(gross_amount or 0, currency)
+    )
+
+
+@traced_resolver
+def resolve_orders_total(_info, period, channel_slug):
+    # Periods start at midnight, they are covered by daily rollups.
+    channel, rollups = _get_channel_sales_rollups(
+        channel_slug, SalesRollupGranularity.DAY
+    )
     if not channel:
         return None
-    qs = (
-        models.Order.objects.non_draft()
-        .exclude(status=OrderStatus.CANCELED)
-        .filter(channel__slug=str(channel_slug))
+    totals = rollups.filter(period__gte=reporting_period_to_date(period)).aggregate(
+        net_amount=Sum("total_net_amount"), gross_amount=Sum("total_gross_amount")
+    )
+    return _get_rollups_total(
+        totals["net_amount"], totals["gross_amount"], channel.currency_code
+    )
+
+
+@traced_resolver
+def resolve_sales_rollups(
+    _info, granularity, channel_slug, order_type=None, period_range=None
+):
+    channel, rollups = _get_channel_sales_rollups(channel_slug, granularity)
+    if not channel:
+        return []
+    if order_type:
+        rollups = rollups.filter(order_type=order_type)
+    if period_range:
+        rollups = filter_range_field(rollups, "period", period_range)
+    # Sum rows of the same period, concurrent orders may have created more than one.
+    rows = (
+        rollups.values("period", "order_type")
+        .annotate(
+            period_orders_count=Sum("orders_count"),
+            period_net_amount=Sum("total_net_amount"),
+            period_gross_amount=Sum("total_gross_amount"),
+        )
+        .filter(period_orders_count__gt=0)
+        .order_by("period", "order_type")
     )
-    qs = filter_by_period(qs, period, "created")
-    return sum_order_totals(qs, channel.currency_code)
+    return [
+        {
+            "period": row["period"],
+            "order_type": row["order_type"],
+            "orders_count": row["period_orders_count"],
+            "total": _get_rollups_total(
+                row["period_net_amount"],
+                row["period_gross_amount"],
+                channel.currency_code,
+            ),
+        }
+        for row in rows
+    ]
 
 
 def resolve_order(id):
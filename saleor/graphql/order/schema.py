@@ -3,14 +3,16 @@ from graphene.types.scalars import String
 
 from ...core.permissions import OrderPermissions
 from ...core.tracing import traced_resolver
-from ..core.enums import ReportingPeriod
+from ..core.enums import OrderTypeEnum, ReportingPeriod
 from ..core.fields import FilterInputConnectionField, PrefetchingConnectionField
 from ..core.scalars import UUID
 from ..core.types import FilterInputObjectType, TaxedMoney
+from ..core.types.common import DateTimeRangeInput
 from ..core.utils import from_global_id_or_error
 from ..decorators import permission_required
 from .bulk_mutations.draft_orders import DraftOrderBulkDelete, DraftOrderLinesBulkDelete
 from .bulk_mutations.orders import OrderBulkCancel
+from .enums import SalesRollupGranularityEnum
 from .filters import DraftOrderFilter, OrderFilter
 from .mutations.discount_order import (
     OrderDiscountAdd,
@@ -55,9 +57,10 @@ from .resolvers import (
     resolve_orders,
     resolve_orders_total,
     resolve_order_by_payment_token,
+    resolve_sales_rollups,
 )
 from .sorters import OrderSortingInput
-from .types import Order, OrderEvent
+from .types import Order, OrderEvent, SalesRollup
 
 
 class OrderFilterInput(FilterInputObjectType):
@@ -91,12 +94,14 @@ class OrderQueries(graphene.ObjectType):
             description="Slug of a channel for which the data should be returned."
         ),
         description="List of orders.",
+        estimate_total_count=True,
     )
     draft_orders = FilterInputConnectionField(
         Order,
         sort_by=OrderSortingInput(description="Sort draft orders."),
         filter=OrderDraftFilterInput(description="Filtering options for draft orders."),
         description="List of draft orders.",
+        estimate_total_count=True,
     )
     orders_total = graphene.Field(
         TaxedMoney,
@@ -107,6 +112,26 @@ class OrderQueries(graphene.ObjectType):
             description="Slug of a channel for which the data should be returned.",
         ),
     )
+    sales_rollups = graphene.List(
+        graphene.NonNull(SalesRollup),
+        required=True,
+        description="Return sales of every hour or day of a period by order type.",
+        granularity=graphene.Argument(
+            SalesRollupGranularityEnum,
+            required=True,
+            description="Length of the periods of sales.",
+        ),
+        channel=graphene.Argument(
+            graphene.String,
+            description="Slug of a channel for which the data should be returned.",
+        ),
+        order_type=graphene.Argument(
+            OrderTypeEnum, description="Return sales of orders of the type only."
+        ),
+        period=graphene.Argument(
+            DateTimeRangeInput, description="Return sales of periods in the range."
+        ),
+    )
     order_by_token = graphene.Field(
         Order,
         description="Look up an order by token.",
@@ -140,6 +165,12 @@ class OrderQueries(graphene.ObjectType):
     def resolve_orders_total(self, info, period, channel=None, **_kwargs):
         return resolve_orders_total(info, period, channel)
 
+    @permission_required(OrderPermissions.MANAGE_ORDERS)
+    def resolve_sales_rollups(
+        self, info, granularity, channel=None, order_type=None, period=None, **_kwargs
+    ):
+        return resolve_sales_rollups(info, granularity, channel, order_type, period)
+
     @traced_resolver
     def resolve_order_by_token(self, _info, token):
         return resolve_order_by_token(token)
@@ -735,6 +735,8 @@ def test_create_digital_fulfillment(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    stock.quantity_allocated = order_line.quantity
+    stock.save(update_fields=["quantity_allocated"])
 
     second_line = order.lines.last()
     first_line_id = graphene.Node.to_global_id("OrderLine", order_line.id)
@@ -1,7 +1,10 @@
 from datetime import date, timedelta
 
-from prices import Money
+from django.utils import timezone
+from prices import Money, TaxedMoney
 
+from ....order import OrderStatus
+from ....order.models import Order
 from ...core.enums import ReportingPeriod
 from ...tests.utils import assert_no_permission, get_graphql_content
 
@@ -363,3 +366,135 @@ def test_orders_total_count_as_anonymous(
 
     # then
     assert_no_permission(response)
+
+
+def _create_order(channel, gross, **kwargs):
+    return Order.objects.create(
+        channel=channel,
+        currency=channel.currency_code,
+        total=TaxedMoney(
+            net=Money(gross, channel.currency_code),
+            gross=Money(gross, channel.currency_code),
+        ),
+        **kwargs,
+    )
+
+
+def test_orders_total_from_sales_rollups(
+    staff_api_client, permission_manage_orders, channel_USD
+):
+    # given
+    _create_order(channel_USD, 10)
+    _create_order(channel_USD, 20, order_type="delivery")
+    _create_order(channel_USD, 30, status=OrderStatus.CANCELED)
+    _create_order(channel_USD, 40, status=OrderStatus.DRAFT)
+    _create_order(channel_USD, 50, created=timezone.now() - timedelta(days=40))
+    variables = {"period": ReportingPeriod.TODAY.name, "channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_ORDER_TOTAL, variables, permissions=[permission_manage_orders]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["ordersTotal"]["gross"] == {
+        "amount": 30.0,
+        "currency": "USD",
+    }
+
+
+QUERY_SALES_ROLLUPS = """
+query SalesRollups(
+    $granularity: SalesRollupGranularityEnum!,
+    $channel: String,
+    $orderType: OrderTypeEnum,
+    $period: DateTimeRangeInput
+) {
+    salesRollups(
+        granularity: $granularity,
+        channel: $channel,
+        orderType: $orderType,
+        period: $period
+    ) {
+        period
+        orderType
+        ordersCount
+        total {
+            gross {
+                amount
+            }
+        }
+        averageBasket {
+            gross {
+                amount
+            }
+        }
+    }
+}
+"""
+
+
+def test_sales_rollups(staff_api_client, permission_manage_orders, channel_USD):
+    # given
+    _create_order(channel_USD, 10, order_type="delivery")
+    _create_order(channel_USD, 15, order_type="delivery")
+    _create_order(channel_USD, 20, order_type="pickup")
+    _create_order(channel_USD, 30, order_type="pickup", status=OrderStatus.CANCELED)
+    variables = {"granularity": "DAY", "channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_SALES_ROLLUPS, variables, permissions=[permission_manage_orders]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    rollups = content["data"]["salesRollups"]
+    assert [
+        (
+            rollup["orderType"],
+            rollup["ordersCount"],
+            rollup["total"]["gross"]["amount"],
+            rollup["averageBasket"]["gross"]["amount"],
+        )
+        for rollup in rollups
+    ] == [("DELIVERY", 2, 25.0, 12.5), ("PICKUP", 1, 20.0, 20.0)]
+
+
+def test_sales_rollups_by_order_type_in_period(
+    staff_api_client, permission_manage_orders, channel_USD
+):
+    # given
+    now = timezone.now()
+    _create_order(channel_USD, 10, order_type="delivery")
+    _create_order(channel_USD, 20, order_type="pickup")
+    _create_order(channel_USD, 30, order_type="delivery", created=now - timedelta(2))
+    variables = {
+        "granularity": "HOUR",
+        "channel": channel_USD.slug,
+        "orderType": "DELIVERY",
+        "period": {"gte": (now - timedelta(days=1)).isoformat()},
+    }
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_SALES_ROLLUPS, variables, permissions=[permission_manage_orders]
+    )
+
+    # then
+    content = get_graphql_content(response)
+    (rollup,) = content["data"]["salesRollups"]
+    assert rollup["ordersCount"] == 1
+    assert rollup["total"]["gross"]["amount"] == 10.0
+
+
+def test_sales_rollups_requires_permission(staff_api_client, channel_USD):
+    # given
+    variables = {"granularity": "DAY", "channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(QUERY_SALES_ROLLUPS, variables)
+
+    # then
+    assert_no_permission(response)
@@ -1,15 +1,26 @@
+import json
 import uuid
 from datetime import date, timedelta
 from decimal import Decimal
 
 import graphene
 import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django_multitenant.utils import set_current_tenant
 from freezegun import freeze_time
 from prices import Money, TaxedMoney
 
 from ....discount.models import OrderDiscount
 from ....order.models import Order, OrderStatus
 from ....payment import ChargeStatus
+from ...core.connection import (
+    connection_from_queryset_slice,
+    get_estimated_count,
+    to_global_cursor,
+)
+from ...order.types import Order as OrderType
 from ...tests.utils import get_graphql_content
 
 
@@ -642,3 +653,72 @@ def test_query_orders_pagination_with_sort(
 
     for order, order_number in enumerate(result_order):
         assert orders[order]["node"]["number"] == str(created_orders[order_number].pk)
+
+
+def _explain_analyze(sql):
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (ANALYZE, FORMAT JSON) {sql}")
+        (plan,) = cursor.fetchone()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def _get_plan_nodes(plan):
+    yield plan
+    for subplan in plan.get("Plans", []):
+        yield from _get_plan_nodes(subplan)
+
+
+@pytest.mark.performance
+def test_orders_keyset_pagination_benchmark(store, channel_USD):
+    # given
+    orders_count = 200000
+    page_size = 100
+    set_current_tenant(store)
+    created = timezone.now()
+    statuses = [OrderStatus.UNFULFILLED, OrderStatus.FULFILLED, OrderStatus.CANCELED]
+    Order.objects.bulk_create(
+        [
+            Order(
+                token=str(uuid.uuid4()),
+                store=store,
+                channel=channel_USD,
+                currency="USD",
+                status=statuses[index % len(statuses)],
+                created=created - timedelta(minutes=index),
+            )
+            for index in range(orders_count)
+        ],
+        batch_size=5000,
+    )
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE order_order")
+    qs = Order.objects.order_by("-created", "-status", "-pk")
+    sort_by = {"field": ["created", "status", "pk"], "direction": "-"}
+    connection_type = OrderType._meta.connection
+
+    # when
+    plans = {}
+    for depth in (0, orders_count // 2, orders_count - page_size):
+        args = {"first": page_size, "sort_by": sort_by}
+        if depth:
+            order = qs[depth - 1]
+            args["after"] = to_global_cursor([order.created, order.status, order.pk])
+        with CaptureQueriesContext(connection) as queries:
+            connection_from_queryset_slice(
+                qs, args, connection_type, connection_type.Edge
+            )
+        assert len(queries) == 1
+        plans[depth] = list(_get_plan_nodes(_explain_analyze(queries[0]["sql"])))
+    estimated_count = get_estimated_count(qs)
+
+    # then
+    # Keyset pagination reads a page from the index at any depth, without sorting
+    # or scanning the orders before it.
+    for nodes in plans.values():
+        node_types = {node["Node Type"] for node in nodes}
+        assert "Sort" not in node_types
+        assert "Seq Scan" not in node_types
+        assert max(node["Actual Rows"] for node in nodes) <= page_size + 1
+    assert abs(estimated_count - orders_count) < orders_count * 0.1
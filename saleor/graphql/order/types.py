@@ -14,6 +14,7 @@ from ...account.utils import requestor_is_staff_member_or_app
 from ...core.anonymize import obfuscate_address, obfuscate_email
 from ...core.exceptions import PermissionDenied
 from ...core.permissions import AccountPermissions, OrderPermissions, ProductPermissions
+from ...core.prices import quantize_price
 from ...core.taxes import display_gross_prices
 from ...core.tracing import traced_resolver
 from ...discount import OrderDiscountType
@@ -37,7 +38,7 @@ from ..account.utils import requestor_has_access
 from ..channel import ChannelContext
 from ..channel.dataloaders import ChannelByIdLoader, ChannelByOrderLineIdLoader
 from ..core.connection import CountableDjangoObjectType
-from ..core.enums import LanguageCodeEnum
+from ..core.enums import LanguageCodeEnum, OrderTypeEnum
 from ..core.mutations import validation_error_to_error_type
 from ..core.scalars import PositiveDecimal
 from ..core.types.common import Image, OrderError
@@ -126,6 +127,30 @@ class OrderEventDiscountObject(OrderDiscount):
     )
 
 
+class SalesRollup(graphene.ObjectType):
+    period = graphene.DateTime(
+        required=True, description="Start of the hour or the day of the sales."
+    )
+    order_type = graphene.Field(
+        OrderTypeEnum, required=True, description="Type of the sold orders."
+    )
+    orders_count = graphene.Int(required=True, description="Number of sold orders.")
+    total = graphene.Field(
+        TaxedMoney, required=True, description="Total amount of sold orders."
+    )
+    average_basket = graphene.Field(
+        TaxedMoney, required=True, description="Average total amount of an order."
+    )
+
+    class Meta:
+        description = "Sales of orders of a type placed within an hour or a day."
+
+    @staticmethod
+    def resolve_average_basket(root, _info):
+        total = root["total"]
+        return quantize_price(total / root["orders_count"], total.currency)
+
+
 class OrderEventOrderLineObject(graphene.ObjectType):
     quantity = graphene.Int(description="The variant quantity.")
     order_line = graphene.Field(lambda: OrderLine, description="The order line.")
@@ -1,8 +1,10 @@
-from decimal import Decimal
-from saleor.core.utils.logging import log_info
+import logging
+
+from saleor.core.utils.logging import log_event
 from django.conf import settings
 import graphene
 from django.core.exceptions import ValidationError
+from django_multitenant.utils import get_current_tenant
 
 from ...channel.models import Channel
 from ...checkout.calculations import calculate_checkout_total_with_gift_cards
@@ -21,7 +23,7 @@ from ..core.mutations import BaseMutation
 from ..core.scalars import PositiveDecimal
 from ..core.types import common as common_types
 from .types import Payment, PaymentInitialized
-from ...delivery.models import Delivery
+from ...delivery.utils import get_delivery_quote
 from ...store.models import Store
 
 class PaymentInput(graphene.InputObjectType):
@@ -72,10 +74,13 @@ class CheckoutPaymentCreate(BaseMutation, I18nMixin):
 
     @classmethod
     def clean_payment_amount(cls, info, checkout_total, amount):
-        log_info('Payment', '-------Payment Price Error--------')
-
-
         if amount != round(checkout_total.gross.amount, 2):
+            log_event(
+                "payment.amount_mismatch",
+                level=logging.WARNING,
+                amount=str(amount),
+                checkout_total=str(checkout_total.gross.amount),
+            )
             raise ValidationError(
                 {
                     "amount": ValidationError(
@@ -162,56 +167,25 @@ class CheckoutPaymentCreate(BaseMutation, I18nMixin):
             discounts=info.context.discounts,
         )
         undiscount_checkout_total = checkout_total.gross.amount + checkout_info.checkout.discount.amount
-        delivery_setting = Delivery.objects.all().first()
-        current_strore = Store.objects.all().first()
-        
+        current_strore = get_current_tenant() or Store.objects.all().first()
 
-        
         # implement delivery fee
         delivery_fee = 0
-        min_order=0
-        
-        if delivery_setting and checkout.order_type == "delivery":
-            delivery_fee = delivery_setting.delivery_fee
-            # implement delivery fee when enable custom delivery fee
-            if delivery_setting.enable_custom_delivery_fee and (checkout_info.billing_address.postal_code is not None):
-                global delivery_fee_by_postal_code
-                current_postal_code = (checkout_info.billing_address.postal_code)[0:4]
-                delivery_areas = [] 
-                delivery_areas.extend(delivery_setting.delivery_area['areas'])
-                delivery_areas.sort(key=lambda area: area['from'] + area['to'])
-                
-                for x in delivery_areas:
-
-                    if int(current_postal_code) >= x['from'] and int(current_postal_code) <= x['to']:
-                        delivery_fee_by_postal_code = round(x["customDeliveryFee"], 2)
-                        break
-                delivery_fee = delivery_fee_by_postal_code
-
-            # implement min order when enable custom delivery fee
-            if delivery_setting.enable_minimum_delivery_order_value and (checkout_info.billing_address.postal_code is not None):
-                global min_order_by_postal_code
-                current_postal_code = (checkout_info.billing_address.postal_code)[0:4]
-                delivery_areas = [] 
-                delivery_areas.extend(delivery_setting.delivery_area['areas'])
-                delivery_areas.sort(key=lambda area: area['from'] + area['to'])
-                
-                for x in delivery_areas:
-                    if int(current_postal_code) >= x['from'] and int(current_postal_code) <= x['to']:
-                        min_order_by_postal_code = x["customMinOrder"]
-                        break
-                min_order = min_order_by_postal_code if min_order_by_postal_code != "" else delivery_setting.min_order
-
-            if min_order > undiscount_checkout_total and checkout.order_type == settings.ORDER_TYPES[0][0]:
-                raise ValidationError(
-                {
-                    "min_order": "The subtotal must be equal or greater than {min_order}".format(min_order=min_order)
-                }
+        delivery_quote = None
+        if checkout.order_type == "delivery":
+            postal_code = (
+                checkout_info.billing_address.postal_code
+                if checkout_info.billing_address
+                else None
             )
-            if checkout.order_type == settings.ORDER_TYPES[0][0] and \
-               (undiscount_checkout_total < delivery_setting.from_delivery or (undiscount_checkout_total >= delivery_setting.from_delivery and not delivery_setting.enable_for_big_order)):
-                checkout_total.gross.amount = checkout_total.gross.amount + round(Decimal(delivery_fee), 2)
-        
+            delivery_quote = get_delivery_quote(postal_code)
+        if delivery_quote:
+            delivery_fee = delivery_quote.delivery_fee
+            delivery_quote.validate_min_order(undiscount_checkout_total)
+            checkout_total.gross.amount = checkout_total.gross.amount + round(
+                delivery_quote.get_delivery_fee(undiscount_checkout_total), 2
+            )
+
         # implement transaction fee
         transaction_fee = 0
         if current_strore.enable_transaction_fee:
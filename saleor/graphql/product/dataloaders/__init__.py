@@ -4,6 +4,15 @@ from .attributes import (
     SelectedAttributesByProductVariantIdLoader,
     VariantAttributesByProductTypeIdLoader,
 )
+from .options import (
+    OptionsByProductIdAndChannelSlugLoader,
+    OptionValueChannelListingByOptionValueIdLoader,
+    OptionValuesByOptionIdLoader,
+)
+from .pricing import (
+    ProductPricingByProductIdChannelSlugAndCountryLoader,
+    VariantsPriceRangeByProductIdAndChannelSlugLoader,
+)
 from .products import (
     AvailableProductVariantsByProductIdAndChannel,
     CategoryByIdLoader,
@@ -50,6 +59,9 @@ __all__ = [
     "ImagesByProductIdLoader",
     "ImagesByProductVariantIdLoader",
     "MediaByProductIdLoader",
+    "OptionsByProductIdAndChannelSlugLoader",
+    "OptionValueChannelListingByOptionValueIdLoader",
+    "OptionValuesByOptionIdLoader",
     "ProductAttributesByProductTypeIdLoader",
     "ProductByIdLoader",
     "ProductByVariantIdLoader",
@@ -64,6 +76,7 @@ __all__ = [
     "ProductVariantChannelListingByIdLoader",
     "ProductVariantsByProductIdLoader",
     "ProductMediaByIdLoader",
+    "ProductPricingByProductIdChannelSlugAndCountryLoader",
     "MediaByProductVariantIdLoader",
     "SelectedAttributesByProductIdLoader",
     "SelectedAttributesByProductVariantIdLoader",
@@ -72,6 +85,7 @@ __all__ = [
     "VariantChannelListingByVariantIdAndChannelIdLoader",
     "VariantChannelListingByVariantIdLoader",
     "VariantsChannelListingByProductIdAndChannelSlugLoader",
+    "VariantsPriceRangeByProductIdAndChannelSlugLoader",
     "ProductVariantsByProductIdAndChannel",
     "AvailableProductVariantsByProductIdAndChannel",
 ]
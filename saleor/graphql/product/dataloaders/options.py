@@ -0,0 +1,69 @@
+from collections import defaultdict
+from typing import DefaultDict, Iterable, List, Optional, Tuple
+
+from django.db.models import F
+
+from ....product.models import Option, OptionValue, OptionValueChannelListing
+from ...core.dataloaders import DataLoader
+
+ProductIdAndChannelSlug = Tuple[int, Optional[str]]
+
+
+class OptionsByProductIdAndChannelSlugLoader(
+    DataLoader[ProductIdAndChannelSlug, List[Option]]
+):
+    """Load options of products with option values priced in the channel.
+
+    Without a channel all option values and their channel listings are returned.
+    """
+
+    context_key = "options_by_product_and_channel"
+
+    def batch_load(self, keys):
+        product_ids_by_channel: DefaultDict[Optional[str], List[int]] = defaultdict(
+            list
+        )
+        for product_id, channel_slug in keys:
+            product_ids_by_channel[channel_slug].append(product_id)
+
+        options_by_product_and_channel: DefaultDict[
+            ProductIdAndChannelSlug, List[Option]
+        ] = defaultdict(list)
+        for channel_slug, product_ids in product_ids_by_channel.items():
+            options = (
+                Option.objects.visible_to_user(channel_slug)
+                .filter(product_options__product_id__in=product_ids)
+                .annotate(product_id=F("product_options__product_id"))
+            )
+            for option in options:
+                options_by_product_and_channel[
+                    (option.product_id, channel_slug)
+                ].append(option)
+        return [options_by_product_and_channel[key] for key in keys]
+
+
+class OptionValuesByOptionIdLoader(DataLoader[int, List[OptionValue]]):
+    context_key = "option_values_by_option"
+
+    def batch_load(self, keys: Iterable[int]):
+        option_values_map: DefaultDict[int, List[OptionValue]] = defaultdict(list)
+        for option_value in OptionValue.objects.filter(option_id__in=keys):
+            option_values_map[option_value.option_id].append(option_value)
+        return [option_values_map[option_id] for option_id in keys]
+
+
+class OptionValueChannelListingByOptionValueIdLoader(
+    DataLoader[int, List[OptionValueChannelListing]]
+):
+    context_key = "optionvaluechannelisting_by_option_value"
+
+    def batch_load(self, keys: Iterable[int]):
+        listings_map: DefaultDict[int, List[OptionValueChannelListing]] = defaultdict(
+            list
+        )
+        listings = OptionValueChannelListing.objects.filter(
+            option_value_id__in=keys
+        ).select_related("channel")
+        for listing in listings:
+            listings_map[listing.option_value_id].append(listing)
+        return [listings_map[option_value_id] for option_value_id in keys]
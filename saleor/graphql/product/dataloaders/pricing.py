@@ -0,0 +1,173 @@
+from collections import defaultdict
+from typing import DefaultDict, Dict, List, Optional, Tuple
+
+from django.conf import settings
+from django.db.models import Max, Min
+from django_countries.fields import Country
+from prices import Money, MoneyRange
+from promise import Promise
+
+from ....core.utils import get_currency_for_country
+from ....product.models import ProductChannelListing, ProductVariantChannelListing
+from ....product.utils.availability import (
+    ProductAvailability,
+    get_products_availability,
+)
+from ...core.dataloaders import DataLoader
+from ...discount.dataloaders import DiscountsByDateTimeLoader
+from .products import (
+    CollectionsByProductIdLoader,
+    ProductByIdLoader,
+    ProductChannelListingByProductIdAndChannelSlugLoader,
+    ProductIdAndChannelSlug,
+)
+
+ProductIdChannelSlugAndCountryCode = Tuple[int, str, str]
+
+
+class VariantsPriceRangeByProductIdAndChannelSlugLoader(
+    DataLoader[ProductIdAndChannelSlug, Optional[MoneyRange]]
+):
+    """Load undiscounted price ranges of product variants in channels."""
+
+    context_key = "variants_price_range_by_product_and_channel"
+
+    def batch_load(self, keys):
+        product_ids_by_channel: DefaultDict[str, List[int]] = defaultdict(list)
+        for product_id, channel_slug in keys:
+            product_ids_by_channel[channel_slug].append(product_id)
+
+        # One query per channel returns the cheapest and the most expensive
+        # variant price of every product.
+        price_ranges: Dict[ProductIdAndChannelSlug, MoneyRange] = {}
+        for channel_slug, product_ids in product_ids_by_channel.items():
+            rows = (
+                ProductVariantChannelListing.objects.filter(
+                    channel__slug=channel_slug,
+                    variant__product_id__in=product_ids,
+                    price_amount__isnull=False,
+                )
+                .values_list("variant__product_id", "currency")
+                .annotate(Min("price_amount"), Max("price_amount"))
+                .order_by()
+            )
+            for product_id, currency, start, stop in rows:
+                price_ranges[(product_id, channel_slug)] = MoneyRange(
+                    Money(start, currency), Money(stop, currency)
+                )
+        return [price_ranges.get(key) for key in keys]
+
+
+def get_precomputed_price_range(
+    product_channel_listing: Optional[ProductChannelListing],
+) -> Optional[MoneyRange]:
+    if (
+        product_channel_listing is None
+        or product_channel_listing.price_range_start_amount is None
+        or product_channel_listing.price_range_stop_amount is None
+    ):
+        return None
+    return MoneyRange(
+        product_channel_listing.price_range_start,
+        product_channel_listing.price_range_stop,
+    )
+
+
+class ProductPricingByProductIdChannelSlugAndCountryLoader(
+    DataLoader[ProductIdChannelSlugAndCountryCode, Optional[ProductAvailability]]
+):
+    """Calculate pricing of all requested products at once.
+
+    Products are priced in one pass per channel and country from their listings,
+    variant price ranges and collections. With `USE_PRECOMPUTED_PRICE_RANGES`
+    the price ranges stored in product channel listings are used, the ranges
+    are only queried for listings that don't have them.
+    """
+
+    context_key = "product_pricing_by_product_channel_and_country"
+
+    def batch_load(self, keys):
+        # Channel loaders import checkout loaders, which depend on product loaders.
+        from ...channel.dataloaders import ChannelBySlugLoader
+
+        product_ids = list({product_id for product_id, _, _ in keys})
+        listing_keys = list({(product_id, slug) for product_id, slug, _ in keys})
+        channel_slugs = list({slug for _, slug, _ in keys})
+
+        def with_listings(listings):
+            listings_map = dict(zip(listing_keys, listings))
+            price_ranges_map = {}
+            if settings.USE_PRECOMPUTED_PRICE_RANGES:
+                price_ranges_map = {
+                    key: get_precomputed_price_range(listing)
+                    for key, listing in listings_map.items()
+                }
+            missing_keys = [
+                key for key in listing_keys if price_ranges_map.get(key) is None
+            ]
+
+            def with_price_ranges(price_ranges):
+                price_ranges_map.update(zip(missing_keys, price_ranges))
+                return listings_map, price_ranges_map
+
+            return (
+                VariantsPriceRangeByProductIdAndChannelSlugLoader(self.context)
+                .load_many(missing_keys)
+                .then(with_price_ranges)
+            )
+
+        def calculate_pricing(results):
+            (
+                (listings_map, price_ranges_map),
+                products,
+                collections,
+                channels,
+                discounts,
+            ) = results
+            products_map = dict(zip(product_ids, products))
+            collections_map = dict(zip(product_ids, collections))
+            channels_map = dict(zip(channel_slugs, channels))
+
+            keys_by_channel_and_country = defaultdict(list)
+            for key in keys:
+                _, channel_slug, country_code = key
+                keys_by_channel_and_country[channel_slug, country_code].append(key)
+
+            pricing = {}
+            for group_key, group in keys_by_channel_and_country.items():
+                channel_slug, country_code = group_key
+                group_listing_keys = [
+                    (product_id, channel_slug) for product_id, _, _ in group
+                ]
+                availabilities = get_products_availability(
+                    products=[products_map[product_id] for product_id, _, _ in group],
+                    product_channel_listings=[
+                        listings_map[key] for key in group_listing_keys
+                    ],
+                    price_ranges=[price_ranges_map[key] for key in group_listing_keys],
+                    collections=[
+                        collections_map[product_id] for product_id, _, _ in group
+                    ],
+                    discounts=discounts,
+                    channel=channels_map[channel_slug],
+                    manager=self.context.plugins,
+                    country=Country(country_code),
+                    local_currency=get_currency_for_country(country_code),
+                )
+                pricing.update(zip(group, availabilities))
+            return [pricing[key] for key in keys]
+
+        listings = (
+            ProductChannelListingByProductIdAndChannelSlugLoader(self.context)
+            .load_many(listing_keys)
+            .then(with_listings)
+        )
+        return Promise.all(
+            [
+                listings,
+                ProductByIdLoader(self.context).load_many(product_ids),
+                CollectionsByProductIdLoader(self.context).load_many(product_ids),
+                ChannelBySlugLoader(self.context).load_many(channel_slugs),
+                DiscountsByDateTimeLoader(self.context).load(self.context.request_time),
+            ]
+        ).then(calculate_pricing)
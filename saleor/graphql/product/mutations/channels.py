@@ -7,6 +7,7 @@ from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.db.utils import IntegrityError
 
+from ....checkout.cache import invalidate_checkout_catalogue_cache
 from ....checkout.models import CheckoutLine
 from ....core.permissions import ProductPermissions
 from ....core.tracing import traced_atomic_transaction
@@ -221,6 +222,9 @@ class ProductChannelListingUpdate(BaseChannelListingMutation):
                     )
                 }
             )
+        # Bulk created listings don't send signals, lines of the variants were
+        # left out of the cached checkout lines so far.
+        transaction.on_commit(lambda: invalidate_checkout_catalogue_cache(channel.pk))
 
     @classmethod
     def remove_variants(
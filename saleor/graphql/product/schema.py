@@ -202,6 +202,7 @@ class ProductQueries(graphene.ObjectType):
             description="Slug of a channel for which the data should be returned."
         ),
         description="List of the shop's products.",
+        estimate_total_count=True,
     )
     product_type = graphene.Field(
         ProductType,
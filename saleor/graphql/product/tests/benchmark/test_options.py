@@ -0,0 +1,323 @@
+import pytest
+from graphene import Node
+
+from ..test_product_options import QUERY_OPTIONS, QUERY_PRODUCTS_WITH_OPTIONS
+
+
+@pytest.mark.django_db
+def test_options(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_OPTIONS, {"first": 10}, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert len(content["data"]["options"]["edges"]) == restaurant.options.count()
+
+
+QUERY_OPTION = """
+    query Option($id: ID!) {
+        option(id: $id) {
+            name
+            type
+            optionValues {
+                name
+                channelListing {
+                    price {
+                        amount
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_option(api_client, restaurant, graphql_benchmark):
+    # given
+    option = restaurant.options.first()
+    variables = {"id": Node.to_global_id("Option", option.pk)}
+
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_OPTION, variables, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert content["data"]["option"]["name"] == option.name
+
+
+QUERY_OPTION_VALUES = """
+    query OptionValues($id: ID!, $first: Int) {
+        optionValues(id: $id, first: $first) {
+            edges {
+                node {
+                    name
+                    channelListing {
+                        price {
+                            amount
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_option_values(api_client, restaurant, graphql_benchmark):
+    # given
+    option = restaurant.options.first()
+    variables = {"id": Node.to_global_id("Option", option.pk), "first": 10}
+
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_OPTION_VALUES, variables, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    edges = content["data"]["optionValues"]["edges"]
+    assert len(edges) == option.option_values.count()
+
+
+@pytest.mark.django_db
+def test_products_with_options(api_client, restaurant, channel_USD, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client,
+        QUERY_PRODUCTS_WITH_OPTIONS,
+        {"first": 20, "channel": channel_USD.slug},
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    edges = content["data"]["products"]["edges"]
+    assert len(edges) == restaurant.products.count()
+    assert len(edges[0]["node"]["options"]) == restaurant.options.count()
+
+
+MUTATION_OPTION_CREATE = """
+    mutation OptionCreate($input: OptionCreateInput!) {
+        optionCreate(input: $input) {
+            option {
+                name
+                optionValues {
+                    name
+                }
+            }
+            optionErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_option_create(
+    restaurant_staff_api_client,
+    restaurant,
+    channel_USD,
+    permission_manage_products,
+    graphql_benchmark,
+):
+    # given
+    channel_id = Node.to_global_id("Channel", channel_USD.pk)
+    variables = {
+        "input": {
+            "name": "Sauce",
+            "type": "multiple",
+            "maxOptions": 2,
+            "values": [
+                {
+                    "name": f"Sauce {index}",
+                    "channelListing": [
+                        {
+                            "channelId": channel_id,
+                            "price": index,
+                            "currency": channel_USD.currency_code,
+                        }
+                    ],
+                }
+                for index in range(4)
+            ],
+        }
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_OPTION_CREATE,
+        variables,
+        permissions=[permission_manage_products],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["optionCreate"]
+    assert not data["optionErrors"]
+    assert len(data["option"]["optionValues"]) == 4
+
+
+MUTATION_OPTION_UPDATE = """
+    mutation OptionUpdate($id: ID!, $input: OptionUpdateInput!) {
+        optionUpdate(id: $id, input: $input) {
+            option {
+                name
+                optionValues {
+                    name
+                }
+            }
+            optionErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_option_update(
+    restaurant_staff_api_client,
+    restaurant,
+    channel_USD,
+    permission_manage_products,
+    graphql_benchmark,
+):
+    # given
+    option = restaurant.options.first()
+    variables = {
+        "id": Node.to_global_id("Option", option.pk),
+        "input": {
+            "name": "Size",
+            "addValues": [
+                {
+                    "name": "Family",
+                    "channelListing": [
+                        {
+                            "channelId": Node.to_global_id("Channel", channel_USD.pk),
+                            "price": 6,
+                            "currency": channel_USD.currency_code,
+                        }
+                    ],
+                }
+            ],
+            "removeValues": [
+                Node.to_global_id("OptionValue", option.option_values.first().pk)
+            ],
+        },
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_OPTION_UPDATE,
+        variables,
+        permissions=[permission_manage_products],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["optionUpdate"]
+    assert not data["optionErrors"]
+    assert data["option"]["name"] == "Size"
+
+
+MUTATION_OPTION_VALUE_UPDATE = """
+    mutation OptionValueUpdate($id: ID!, $input: UpdateOptionValueInput!) {
+        optionValueUpdate(id: $id, input: $input) {
+            optionValue {
+                name
+            }
+            optionErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_option_value_update(
+    restaurant_staff_api_client,
+    restaurant,
+    channel_USD,
+    permission_manage_products,
+    graphql_benchmark,
+):
+    # given
+    option_value = restaurant.options.first().option_values.first()
+    channel_listing = option_value.option_value_channels.get()
+    variables = {
+        "id": Node.to_global_id("OptionValue", option_value.pk),
+        "input": {
+            "name": "Large",
+            "channelListingUpdate": [
+                {
+                    "id": Node.to_global_id(
+                        "OptionValueChannelListing", channel_listing.pk
+                    ),
+                    "channelId": Node.to_global_id("Channel", channel_USD.pk),
+                    "price": 3,
+                    "currency": channel_USD.currency_code,
+                }
+            ],
+        },
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_OPTION_VALUE_UPDATE,
+        variables,
+        permissions=[permission_manage_products],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["optionValueUpdate"]
+    assert not data["optionErrors"]
+    assert data["optionValue"]["name"] == "Large"
+
+
+MUTATION_REORDER_OPTIONS = """
+    mutation ReorderOptions($moves: [MoveOptionInput]!) {
+        reorderOptions(moves: $moves) {
+            optionErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_reorder_options(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_products,
+    graphql_benchmark,
+):
+    # given
+    option = restaurant.options.last()
+    variables = {
+        "moves": [{"optionId": Node.to_global_id("Option", option.pk), "sortOrder": -2}]
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_REORDER_OPTIONS,
+        variables,
+        permissions=[permission_manage_products],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    assert not content["data"]["reorderOptions"]["optionErrors"]
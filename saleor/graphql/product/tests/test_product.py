@@ -2231,6 +2231,8 @@ def test_products_query_with_filter_stock_availability_as_staff(
         Allocation.objects.create(
             order_line=order_line, stock=stock, quantity_allocated=stock.quantity
         )
+        stock.quantity_allocated = stock.quantity
+        stock.save(update_fields=["quantity_allocated"])
     product = product_list[0]
     product.variants.first().channel_listings.filter(channel=channel_USD).update(
         price_amount=None
@@ -2260,6 +2262,8 @@ def test_products_query_with_filter_stock_availability_as_user(
         Allocation.objects.create(
             order_line=order_line, stock=stock, quantity_allocated=stock.quantity
         )
+        stock.quantity_allocated = stock.quantity
+        stock.save(update_fields=["quantity_allocated"])
     product = product_list[0]
     product.variants.first().channel_listings.filter(channel=channel_USD).update(
         price_amount=None
@@ -2295,6 +2299,8 @@ def test_products_query_with_filter_stock_availability_channel_without_shipping_
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=stock.quantity
     )
+    stock.quantity_allocated = stock.quantity
+    stock.save(update_fields=["quantity_allocated"])
     variables = {
         "filter": {"stockAvailability": "OUT_OF_STOCK", "channel": channel_USD.slug}
     }
@@ -0,0 +1,122 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_WITH_OPTIONS = """
+    query ProductsWithOptions($first: Int, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                    options {
+                        name
+                        optionValues {
+                            name
+                            channelListing {
+                                channel {
+                                    slug
+                                }
+                                price {
+                                    amount
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def _query_products_with_options(api_client, store, first, channel_slug):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post_graphql(
+            QUERY_PRODUCTS_WITH_OPTIONS,
+            {"first": first, "channel": channel_slug},
+            HTTP_HOST=store.domain,
+        )
+    content = get_graphql_content(response)
+    return content["data"]["products"]["edges"], len(queries)
+
+
+def test_products_with_options(api_client, store, products_with_options, channel_USD):
+    # when
+    edges, _ = _query_products_with_options(api_client, store, 5, channel_USD.slug)
+
+    # then
+    assert len(edges) == 5
+    options = edges[0]["node"]["options"]
+    assert [option["name"] for option in options] == ["Size", "Toppings"]
+    assert options[1]["optionValues"][2] == {
+        "name": "Toppings 2",
+        "channelListing": [
+            {"channel": {"slug": channel_USD.slug}, "price": {"amount": 2.0}}
+        ],
+    }
+
+
+def test_products_with_options_query_count(
+    api_client, store, products_with_options, channel_USD
+):
+    # given
+    _query_products_with_options(api_client, store, 1, channel_USD.slug)
+
+    # when
+    _, single_product_queries = _query_products_with_options(
+        api_client, store, 1, channel_USD.slug
+    )
+    _, all_products_queries = _query_products_with_options(
+        api_client, store, 5, channel_USD.slug
+    )
+
+    # then
+    assert all_products_queries == single_product_queries
+
+
+QUERY_OPTIONS = """
+    query Options($first: Int) {
+        options(first: $first) {
+            edges {
+                node {
+                    name
+                    optionValues {
+                        name
+                        channelListing {
+                            price {
+                                amount
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def _query_options(api_client, store, first):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post_graphql(
+            QUERY_OPTIONS, {"first": first}, HTTP_HOST=store.domain
+        )
+    content = get_graphql_content(response)
+    return content["data"]["options"]["edges"], len(queries)
+
+
+def test_options_query_count(api_client, store, product_options):
+    # given
+    _query_options(api_client, store, 1)
+
+    # when
+    edges, single_option_queries = _query_options(api_client, store, 1)
+    edges, all_options_queries = _query_options(api_client, store, 2)
+
+    # then
+    assert len(edges) == 2
+    assert edges[1]["node"]["optionValues"][1] == {
+        "name": "Toppings 1",
+        "channelListing": [{"price": {"amount": 1.0}}],
+    }
+    assert all_options_queries == single_option_queries
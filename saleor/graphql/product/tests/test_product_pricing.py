@@ -0,0 +1,267 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from ....discount import DiscountValueType
+from ....discount.models import Sale, SaleChannelListing
+from ....product.models import (
+    Product,
+    ProductChannelListing,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ....product.utils.variant_prices import update_products_discounted_prices
+from ...tests.utils import get_graphql_content
+
+QUERY_PRODUCTS_PRICING = """
+    query ProductsPricing($first: Int, $channel: String) {
+        products(first: $first, channel: $channel) {
+            edges {
+                node {
+                    name
+                    pricing {
+                        onSale
+                        discount {
+                            gross {
+                                amount
+                            }
+                        }
+                        priceRange {
+                            start {
+                                gross {
+                                    amount
+                                }
+                            }
+                            stop {
+                                gross {
+                                    amount
+                                }
+                            }
+                        }
+                        priceRangeUndiscounted {
+                            start {
+                                gross {
+                                    amount
+                                }
+                            }
+                            stop {
+                                gross {
+                                    amount
+                                }
+                            }
+                        }
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def _query_products_pricing(api_client, store, first, channel_slug):
+    with CaptureQueriesContext(connection) as queries:
+        response = api_client.post_graphql(
+            QUERY_PRODUCTS_PRICING,
+            {"first": first, "channel": channel_slug},
+            HTTP_HOST=store.domain,
+        )
+    content = get_graphql_content(response)
+    pricing = {
+        edge["node"]["name"]: edge["node"]["pricing"]
+        for edge in content["data"]["products"]["edges"]
+    }
+    return pricing, len(queries)
+
+
+def _get_price_range(pricing, field="priceRange"):
+    price_range = pricing[field]
+    return (
+        price_range["start"]["gross"]["amount"],
+        price_range["stop"]["gross"]["amount"],
+    )
+
+
+@pytest.fixture
+def product_on_sale(products_with_options, channel_USD):
+    product = products_with_options[0]
+    variant = ProductVariant.objects.create(product=product, sku="pizza-0-large")
+    ProductVariantChannelListing.objects.create(
+        variant=variant,
+        channel=channel_USD,
+        price_amount=Decimal(20),
+        currency=channel_USD.currency_code,
+    )
+    sale = Sale.objects.create(name="Half price", type=DiscountValueType.PERCENTAGE)
+    SaleChannelListing.objects.create(
+        sale=sale,
+        channel=channel_USD,
+        discount_value=50,
+        currency=channel_USD.currency_code,
+    )
+    sale.products.add(product)
+    return product
+
+
+def test_products_pricing(api_client, store, product_on_sale, channel_USD):
+    # when
+    pricing, _ = _query_products_pricing(api_client, store, 5, channel_USD.slug)
+
+    # then
+    product_pricing = pricing[product_on_sale.name]
+    assert product_pricing["onSale"] is True
+    assert product_pricing["discount"]["gross"]["amount"] == 5.0
+    assert _get_price_range(product_pricing) == (5.0, 10.0)
+    assert _get_price_range(product_pricing, "priceRangeUndiscounted") == (
+        10.0,
+        20.0,
+    )
+    other_pricing = pricing["Pizza 1"]
+    assert other_pricing["onSale"] is False
+    assert other_pricing["discount"] is None
+    assert _get_price_range(other_pricing) == (10.0, 10.0)
+
+
+def test_products_pricing_with_precomputed_price_ranges(
+    api_client, store, product_on_sale, channel_USD, settings
+):
+    # given
+    settings.USE_PRECOMPUTED_PRICE_RANGES = True
+    update_products_discounted_prices(Product.objects.filter(pk=product_on_sale.pk))
+
+    # when
+    pricing, _ = _query_products_pricing(api_client, store, 5, channel_USD.slug)
+
+    # then
+    product_pricing = pricing[product_on_sale.name]
+    assert _get_price_range(product_pricing) == (5.0, 10.0)
+    assert _get_price_range(product_pricing, "priceRangeUndiscounted") == (
+        10.0,
+        20.0,
+    )
+    # Products without precomputed ranges are priced from their variants.
+    assert _get_price_range(pricing["Pizza 1"]) == (10.0, 10.0)
+
+
+def test_products_pricing_uses_precomputed_price_ranges(
+    api_client, store, products_with_options, channel_USD, settings
+):
+    # given
+    settings.USE_PRECOMPUTED_PRICE_RANGES = True
+    ProductChannelListing.objects.filter(product=products_with_options[0]).update(
+        price_range_start_amount=Decimal(8), price_range_stop_amount=Decimal(12)
+    )
+
+    # when
+    pricing, _ = _query_products_pricing(api_client, store, 5, channel_USD.slug)
+
+    # then
+    assert _get_price_range(pricing[products_with_options[0].name]) == (8.0, 12.0)
+
+
+def test_products_pricing_query_count(api_client, store, product_on_sale, channel_USD):
+    # given
+    _query_products_pricing(api_client, store, 1, channel_USD.slug)
+
+    # when
+    _, single_product_queries = _query_products_pricing(
+        api_client, store, 1, channel_USD.slug
+    )
+    _, all_products_queries = _query_products_pricing(
+        api_client, store, 5, channel_USD.slug
+    )
+
+    # then
+    assert all_products_queries == single_product_queries
+
+
+@pytest.fixture
+def category_page_products(products_with_options, channel_USD):
+    category = products_with_options[0].category
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Menu item {index}",
+                slug=f"menu-item-{index}",
+                product_type=products_with_options[0].product_type,
+                category=category,
+                store=products_with_options[0].store,
+            )
+            for index in range(100 - len(products_with_options))
+        ]
+    )
+    ProductChannelListing.objects.bulk_create(
+        [
+            ProductChannelListing(
+                product=product,
+                channel=channel_USD,
+                is_published=True,
+                visible_in_listings=True,
+                currency=channel_USD.currency_code,
+            )
+            for product in products
+        ]
+    )
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"{product.slug}-{size}")
+            for product in products
+            for size in range(3)
+        ]
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        [
+            ProductVariantChannelListing(
+                variant=variant,
+                channel=channel_USD,
+                price_amount=Decimal(10 + index % 3),
+                currency=channel_USD.currency_code,
+            )
+            for index, variant in enumerate(variants)
+        ]
+    )
+    sale = Sale.objects.create(name="Happy hour")
+    SaleChannelListing.objects.create(
+        sale=sale,
+        channel=channel_USD,
+        discount_value=2,
+        currency=channel_USD.currency_code,
+    )
+    sale.categories.add(category)
+    return list(Product.objects.all())
+
+
+@pytest.mark.performance
+def test_products_pricing_benchmark(
+    api_client, store, category_page_products, channel_USD, settings
+):
+    # given
+    update_products_discounted_prices(Product.objects.all())
+
+    def query_pages():
+        # The first query fills caches shared between requests.
+        _query_products_pricing(api_client, store, 100, channel_USD.slug)
+        _, small_page_queries = _query_products_pricing(
+            api_client, store, 10, channel_USD.slug
+        )
+        pricing, queries = _query_products_pricing(
+            api_client, store, 100, channel_USD.slug
+        )
+        return pricing, queries, small_page_queries
+
+    # when
+    pricing, queries, small_page_queries = query_pages()
+    settings.USE_PRECOMPUTED_PRICE_RANGES = True
+    precomputed_pricing, precomputed_queries, precomputed_small_page_queries = (
+        query_pages()
+    )
+
+    # then
+    assert len(pricing) == 100
+    assert precomputed_pricing == pricing
+    assert _get_price_range(pricing["Menu item 0"]) == (8.0, 10.0)
+    assert precomputed_queries == queries - 1
+    # Pricing of a page takes the same number of queries whatever its size.
+    assert queries == small_page_queries
+    assert precomputed_queries == precomputed_small_page_queries
@@ -18,10 +18,7 @@ from ....core.weight import convert_weight_to_default_weight_unit
 from ....product import models
 from ....product.product_images import get_product_image_thumbnail, get_thumbnail
 from ....product.utils import calculate_revenue_for_variant
-from ....product.utils.availability import (
-    get_product_availability,
-    get_variant_availability,
-)
+from ....product.utils.availability import get_variant_availability
 from ....product.utils.variants import get_variant_selection_attributes
 from ....warehouse.availability import is_product_in_stock
 from ...account import types as account_types
@@ -81,19 +78,20 @@ from ..dataloaders import (
     ImagesByProductVariantIdLoader,
     MediaByProductIdLoader,
     MediaByProductVariantIdLoader,
+    OptionsByProductIdAndChannelSlugLoader,
     ProductAttributesByProductTypeIdLoader,
     ProductByIdLoader,
     ProductChannelListingByProductIdAndChannelSlugLoader,
     ProductChannelListingByProductIdLoader,
     ProductTypeByIdLoader,
     ProductVariantByIdLoader,
+    ProductPricingByProductIdChannelSlugAndCountryLoader,
     ProductVariantsByProductIdLoader,
     SelectedAttributesByProductIdLoader,
     SelectedAttributesByProductVariantIdLoader,
     VariantAttributesByProductTypeIdLoader,
     VariantChannelListingByVariantIdAndChannelSlugLoader,
     VariantChannelListingByVariantIdLoader,
-    VariantsChannelListingByProductIdAndChannelSlugLoader,
 )
 from ..enums import VariantAttributeScope
 from ..filters import ProductFilterInput
@@ -685,64 +683,19 @@ class Product(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
         )
         context = info.context
         channel_slug = str(root.channel_slug)
-        product_channel_listing = ProductChannelListingByProductIdAndChannelSlugLoader(
-            context
-        ).load((root.node.id, channel_slug))
-        variants = ProductVariantsByProductIdLoader(context).load(root.node.id)
-        variants_channel_listing = (
-            VariantsChannelListingByProductIdAndChannelSlugLoader(context).load(
-                (root.node.id, channel_slug)
-            )
-        )
-        collections = CollectionsByProductIdLoader(context).load(root.node.id)
-        channel = ChannelBySlugLoader(context).load(channel_slug)
-
-        def calculate_pricing_info(discounts):
-            def calculate_pricing_with_channel(channel):
-                def calculate_pricing_with_product_channel_listings(
-                    product_channel_listing,
-                ):
-                    def calculate_pricing_with_variants(variants):
-                        def calculate_pricing_with_variants_channel_listings(
-                            variants_channel_listing,
-                        ):
-                            def calculate_pricing_with_collections(collections):
-                                if not variants_channel_listing:
-                                    return None
-                                availability = get_product_availability(
-                                    product=root.node,
-                                    product_channel_listing=product_channel_listing,
-                                    variants=variants,
-                                    variants_channel_listing=variants_channel_listing,
-                                    collections=collections,
-                                    discounts=discounts,
-                                    channel=channel,
-                                    manager=context.plugins,
-                                    country=Country(country_code),
-                                    local_currency=get_currency_for_country(
-                                        country_code
-                                    ),
-                                )
-                                return ProductPricingInfo(**asdict(availability))
-
-                            return collections.then(calculate_pricing_with_collections)
-
-                        return variants_channel_listing.then(
-                            calculate_pricing_with_variants_channel_listings
-                        )
+        # Products of the page are priced together, the loader doesn't need to
+        # fetch them again.
+        ProductByIdLoader(context).prime(root.node.id, root.node)
 
-                    return variants.then(calculate_pricing_with_variants)
-
-                return product_channel_listing.then(
-                    calculate_pricing_with_product_channel_listings
-                )
-
-            return channel.then(calculate_pricing_with_channel)
+        def to_pricing_info(availability):
+            if availability is None:
+                return None
+            return ProductPricingInfo(**asdict(availability))
 
         return (
-            DiscountsByDateTimeLoader(context)
-            .load(info.context.request_time)
-            .then(calculate_pricing_info)
+            ProductPricingByProductIdChannelSlugAndCountryLoader(context)
+            .load((root.node.id, channel_slug, country_code))
+            .then(to_pricing_info)
         )
 
     @staticmethod
@@ -829,9 +782,9 @@ class Product(ChannelContextTypeWithMetadata, CountableDjangoObjectType):
     @staticmethod
     @traced_resolver
     def resolve_options(root: ChannelContext[models.Product], info, **_kwargs):
-        if root.channel_slug:
-            return root.node.options.visible_to_user(root.channel_slug)
-        return root.node.options.all()
+        return OptionsByProductIdAndChannelSlugLoader(info.context).load(
+            (root.node.id, root.channel_slug)
+        )
 
     @staticmethod
     @traced_resolver
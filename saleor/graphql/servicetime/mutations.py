@@ -68,6 +68,17 @@ class ServiceTimeInput(graphene.InputObjectType):
         required=True,
        description="Pickup service time setting.")
 
+    # Slot capacity
+    dl_slot_capacity = graphene.Int(
+       description="Maximum number of delivery orders per time slot."
+    )
+    pu_slot_capacity = graphene.Int(
+       description="Maximum number of pickup orders per time slot."
+    )
+    table_slot_capacity = graphene.Int(
+       description="Maximum number of table service orders per time slot."
+    )
+
 class ServiceTimeCreate(ModelMutation):
     class Arguments:
         input = ServiceTimeInput(
@@ -129,6 +140,18 @@ class ServiceTimeUpdateInput(graphene.InputObjectType):
    # Table service time
     table_service_time = graphene.JSONString(
        description="Pickup service time setting.")
+
+    # Slot capacity
+    dl_slot_capacity = graphene.Int(
+       description="Maximum number of delivery orders per time slot."
+    )
+    pu_slot_capacity = graphene.Int(
+       description="Maximum number of pickup orders per time slot."
+    )
+    table_slot_capacity = graphene.Int(
+       description="Maximum number of table service orders per time slot."
+    )
+
 class ServiceTimeUpdate(ModelMutation):
     class Arguments:
         id = graphene.ID(required=True, description="ID of a service time to update.")
@@ -1,5 +1,28 @@
+import datetime
+
+from django_multitenant.utils import get_current_tenant
+
 from ...servicetime import models
+from ...servicetime.slots import format_slot, get_service_time_calendar
+from ..core.resolver_cache import cached_resolver
 
 
+@cached_resolver(models.ServiceTime)
 def resolve_service_time(self, info, **kwargs):
     return models.ServiceTime.objects.all()
+
+
+def resolve_service_time_slots(info, order_type):
+    store = get_current_tenant()
+    calendar = get_service_time_calendar(store) if store else None
+    if calendar is None:
+        return []
+    days_count = len(calendar.services[order_type].days)
+    service_time_slots = []
+    for offset in range(days_count):
+        date = calendar.start_date + datetime.timedelta(days=offset)
+        slots = calendar.get_slots(order_type, date)
+        service_time_slots.append(
+            {"date": date, "slots": [format_slot(slot) for slot in slots]}
+        )
+    return service_time_slots
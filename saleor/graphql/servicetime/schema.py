@@ -1,9 +1,10 @@
 from saleor.graphql.notifications.schema import LiveNotification
-from saleor.graphql.servicetime.types import ServiceTime
+from saleor.graphql.servicetime.types import ServiceTime, ServiceTimeSlotDay
 import graphene
 from ..decorators import permission_required
+from ..core.enums import OrderTypeEnum
 from ..core.fields import FilterInputConnectionField
-from .resolvers import resolve_service_time
+from .resolvers import resolve_service_time, resolve_service_time_slots
 from .mutations import (
     ServiceTimeCreate,
     ServiceTimeUpdate
@@ -14,11 +15,24 @@ class ServiceTimeQueries(graphene.ObjectType):
         ServiceTime,
         description="List of the servicetime.",
     )
+    service_time_slots = graphene.List(
+        graphene.NonNull(ServiceTimeSlotDay),
+        order_type=graphene.Argument(
+            OrderTypeEnum, required=True, description="Type of the order."
+        ),
+        description=(
+            "Available time slots of the current store, starting today, for "
+            "the expected date and time of an order."
+        ),
+    )
     
-    def resolve_servie_times(self, info, **kwargs):
+    def resolve_service_times(self, info, **kwargs):
         
         return resolve_service_time(self, info, **kwargs)
 
+    def resolve_service_time_slots(self, info, order_type):
+        return resolve_service_time_slots(info, order_type)
+
 class ServiceTimeMutations(graphene.ObjectType):
     # store mutations
     service_time_create = ServiceTimeCreate.Field()
@@ -0,0 +1,103 @@
+import graphene
+import pytest
+from freezegun import freeze_time
+
+from ..test_service_time_slots import QUERY_SERVICE_TIME_SLOTS
+
+QUERY_SERVICE_TIMES = """
+    query ServiceTimes($first: Int) {
+        serviceTimes(first: $first) {
+            edges {
+                node {
+                    id
+                    dlDeliveryTime
+                    dlTimeGap
+                    dlAllowPreorder
+                    dlPreorderDay
+                    dlServiceTime
+                    puDeliveryTime
+                    puTimeGap
+                    puServiceTime
+                    tableServiceTime
+                    dlSlotCapacity
+                    puSlotCapacity
+                    tableSlotCapacity
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_service_times(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_SERVICE_TIMES, {"first": 10}, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert len(content["data"]["serviceTimes"]["edges"]) == 1
+
+
+@freeze_time("2021-07-05 10:00")
+@pytest.mark.django_db
+@pytest.mark.parametrize("order_type", ["DELIVERY", "PICKUP", "DINEIN"])
+def test_service_time_slots(api_client, restaurant, order_type, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client,
+        QUERY_SERVICE_TIME_SLOTS,
+        {"orderType": order_type},
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    days = content["data"]["serviceTimeSlots"]
+    assert days
+    assert days[0]["slots"]
+
+
+MUTATION_SERVICE_TIME_UPDATE = """
+    mutation ServiceTimeUpdate($id: ID!, $input: ServiceTimeUpdateInput!) {
+        serviceTimeUpdate(id: $id, input: $input) {
+            serviceTime {
+                dlTimeGap
+                dlSlotCapacity
+            }
+            serviceTimeErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_service_time_update(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_service_time,
+    graphql_benchmark,
+):
+    # given
+    service_time = restaurant.service_times.get()
+    variables = {
+        "id": graphene.Node.to_global_id("ServiceTime", service_time.pk),
+        "input": {"dlTimeGap": 30, "dlSlotCapacity": 5},
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_SERVICE_TIME_UPDATE,
+        variables,
+        permissions=[permission_manage_service_time],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["serviceTimeUpdate"]
+    assert not data["serviceTimeErrors"]
+    assert data["serviceTime"] == {"dlTimeGap": 30, "dlSlotCapacity": 5}
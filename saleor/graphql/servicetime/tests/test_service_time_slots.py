@@ -0,0 +1,42 @@
+from freezegun import freeze_time
+
+from ...tests.utils import get_graphql_content
+
+QUERY_SERVICE_TIME_SLOTS = """
+    query ServiceTimeSlots($orderType: OrderTypeEnum!) {
+        serviceTimeSlots(orderType: $orderType) {
+            date
+            slots
+        }
+    }
+"""
+
+
+@freeze_time("2021-07-05 11:45-05:00")
+def test_service_time_slots(api_client, service_time):
+    # when
+    response = api_client.post_graphql(
+        QUERY_SERVICE_TIME_SLOTS,
+        {"orderType": "PICKUP"},
+        HTTP_HOST=service_time.store.domain,
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["serviceTimeSlots"] == [
+        {
+            "date": "2021-07-05",
+            "slots": ["12:00", "12:30", "13:00", "17:00", "17:30", "18:00"],
+        }
+    ]
+
+
+def test_service_time_slots_without_service_time(api_client, store):
+    # when
+    response = api_client.post_graphql(
+        QUERY_SERVICE_TIME_SLOTS, {"orderType": "DELIVERY"}, HTTP_HOST=store.domain
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["serviceTimeSlots"] == []
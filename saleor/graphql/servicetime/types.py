@@ -27,6 +27,10 @@ class ServiceTime(CountableDjangoObjectType):
     table_service_time = graphene.JSONString(
         description="Service time.",
     )
+
+    dl_slot_capacity = graphene.Int(description="Delivery orders per time slot")
+    pu_slot_capacity = graphene.Int(description="Pickup orders per time slot")
+    table_slot_capacity = graphene.Int(description="Table orders per time slot")
     class Meta:
         description = (
             "Service time config"
@@ -47,7 +51,22 @@ class ServiceTime(CountableDjangoObjectType):
             "pu_same_day_order",
             "pu_service_time",
             "table_service_time",
+            "dl_slot_capacity",
+            "pu_slot_capacity",
+            "table_slot_capacity",
             "id",
         ]
         interfaces = [graphene.relay.Node, ObjectWithMetadata]
-        model = models.ServiceTime
\ No newline at end of file
+        model = models.ServiceTime
+
+
+class ServiceTimeSlotDay(graphene.ObjectType):
+    date = graphene.Date(required=True, description="Day of the slots.")
+    slots = graphene.List(
+        graphene.NonNull(graphene.String),
+        required=True,
+        description="Available slot times of the day, formatted as HH:MM.",
+    )
+
+    class Meta:
+        description = "Available service time slots of a day."
@@ -6,6 +6,7 @@ from django.contrib.auth import password_validation
 from django.contrib.auth.models import Group
 from django.core.exceptions import ValidationError
 from collections import defaultdict
+from datetime import timedelta
 import os
 import io
 from PIL import Image as Img
@@ -28,6 +29,7 @@ from ....core.exceptions import DomainIsExist, PermissionDenied
 from ....core.permissions import StorePermissions, get_permissions_default
 from ....core.utils.url import validate_storefront_url
 from ....store import models
+from ....store.tenant_cache import invalidate_hosts
 from ....store.utils import delete_stores, verify_ssl
 from ...core.mutations import BaseBulkMutation, BaseMutation, ModelBulkDeleteMutation, ModelDeleteMutation, ModelMutation
 from ...core.types import Upload
@@ -257,6 +259,31 @@ class StoreUpdateInput(graphene.InputObjectType):
     # Custom domain
     custom_domain_enable = graphene.Boolean(description="Enable custom domain")
 
+    # Checkout expiration
+    checkout_ttl = graphene.Int(
+        description=(
+            "Minutes after the last change when checkouts are deleted, the "
+            "default TTL when empty."
+        )
+    )
+
+
+def clean_checkout_ttl(cleaned_input):
+    """Convert the checkout TTL in minutes to the duration stored by the store."""
+    minutes = cleaned_input.get("checkout_ttl")
+    if minutes is None:
+        return
+    if minutes <= 0:
+        raise ValidationError(
+            {
+                "checkout_ttl": ValidationError(
+                    "Checkout TTL must be a positive number of minutes.",
+                    code=StoreErrorCode.INVALID.value,
+                )
+            }
+        )
+    cleaned_input["checkout_ttl"] = timedelta(minutes=minutes)
+
 
 class StoreUpdate(ModelMutation):
     class Arguments:
@@ -272,6 +299,12 @@ class StoreUpdate(ModelMutation):
         error_type_class = StoreError
         error_type_field = "store_errors"
 
+    @classmethod
+    def clean_input(cls, info, instance, data):
+        cleaned_input = super().clean_input(info, instance, data)
+        clean_checkout_ttl(cleaned_input)
+        return cleaned_input
+
     @classmethod
     def perform_mutation(cls, root, info, **data):
         _type , current_domain_pk = from_global_id(data["id"])
@@ -314,6 +347,7 @@ class MyStoreUpdate(ModelMutation):
     @classmethod
     def perform_mutation(cls, root, info, **data):
         input = data.get("input")
+        clean_checkout_ttl(input)
         my_store = models.Store.objects.first()
         if my_store:
             for field_name, field_item in input._meta.fields.items():
@@ -476,7 +510,9 @@ class CustomDomainsVerifySSL(ModelMutation):
         list_domain = data['input']['domains']
         for i in range(len(list_domain)):
             models.CustomDomain.objects.filter(domain_custom=data['input']['domains'][i]['domain_custom']).update(status=not verify_ssl(list_domain[i].domain_custom))
-            
+        # queryset updates don't send signals
+        invalidate_hosts([domain.domain_custom for domain in list_domain])
+
         return super().perform_mutation(_root, info, **data)
 
     class Meta:
@@ -2,6 +2,7 @@ import graphene
 from graphql_relay.node.node import from_global_id
 
 from ...store import models
+from ..core.resolver_cache import cached_resolver
 from ..core.validators import validate_one_of_args_is_in_query
 from .types import Store
 from ...account.models import User
@@ -28,6 +29,7 @@ def resolve_store(info, global_page_id=None, slug=None):
 def resolve_stores(info, **_kwargs):
     return models.Store.objects.all()
 
+@cached_resolver(models.Store)
 def resolve_my_store(info, **_kwargs):
     return models.Store.objects.all().first()
 
@@ -41,5 +43,6 @@ def resolve_custom_domain(info, id, **_kwargs):
         raise BadRequest("domain doesn't exists")
     return domain
 
+@cached_resolver(models.FaviconPwa)
 def resolve_favicon_pwa(info, **_kwargs):
     return models.FaviconPwa.objects.all()
@@ -0,0 +1,123 @@
+import graphene
+import pytest
+
+QUERY_MY_STORE = """
+    query MyStore {
+        myStore {
+            id
+            name
+            domain
+            phone
+            address
+            webshopStatus
+            deliveryStatus
+            pickupStatus
+            tableServiceStatus
+            emailNotifications
+            enableTransactionFee
+            contantEnable
+            contantCost
+            stripeEnable
+            stripeCost
+            customDomainEnable
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_my_store(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(api_client, QUERY_MY_STORE, HTTP_HOST=restaurant.domain)
+
+    # then
+    assert content["data"]["myStore"]["name"] == restaurant.name
+
+
+QUERY_STORE = """
+    query Store($id: ID!) {
+        store(id: $id) {
+            name
+            domain
+            description
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_store(api_client, restaurant, graphql_benchmark):
+    # given
+    variables = {"id": graphene.Node.to_global_id("Store", restaurant.pk)}
+
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_STORE, variables, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert content["data"]["store"]["domain"] == restaurant.domain
+
+
+QUERY_STORES = """
+    query Stores($first: Int) {
+        stores(first: $first) {
+            edges {
+                node {
+                    name
+                    domain
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_stores(api_client, restaurant, graphql_benchmark):
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_STORES, {"first": 10}, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    edges = content["data"]["stores"]["edges"]
+    assert [edge["node"]["name"] for edge in edges] == [restaurant.name]
+
+
+MUTATION_MY_STORE_UPDATE = """
+    mutation MyStoreUpdate($input: StoreUpdateInput!) {
+        myStoreUpdate(input: $input) {
+            store {
+                name
+                phone
+            }
+            storeErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_my_store_update(
+    restaurant_staff_api_client, restaurant, permission_manage_stores, graphql_benchmark
+):
+    # given
+    variables = {"input": {"name": "Trattoria", "phone": "+31201234567"}}
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_MY_STORE_UPDATE,
+        variables,
+        permissions=[permission_manage_stores],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["myStoreUpdate"]
+    assert not data["storeErrors"]
+    assert data["store"]["name"] == "Trattoria"
@@ -0,0 +1,96 @@
+from datetime import timedelta
+
+import pytest
+
+from ....account.models import User
+from ....store.error_codes import StoreErrorCode
+from ...tests.fixtures import ApiClient
+from ...tests.utils import get_graphql_content
+
+
+@pytest.fixture
+def store_staff_api_client(store):
+    staff_user = User.objects.create_user(
+        email=f"staff@{store.domain}",
+        password="password",
+        is_staff=True,
+        is_active=True,
+        store=store,
+    )
+    return ApiClient(user=staff_user)
+
+
+MUTATION_MY_STORE_UPDATE_CHECKOUT_TTL = """
+    mutation MyStoreUpdate($checkoutTtl: Int) {
+        myStoreUpdate(input: {checkoutTtl: $checkoutTtl}) {
+            store {
+                checkoutTtl
+            }
+            storeErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+def test_my_store_update_checkout_ttl(
+    store_staff_api_client, store, permission_manage_stores
+):
+    # when
+    response = store_staff_api_client.post_graphql(
+        MUTATION_MY_STORE_UPDATE_CHECKOUT_TTL,
+        {"checkoutTtl": 90},
+        permissions=[permission_manage_stores],
+        HTTP_HOST=store.domain,
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["myStoreUpdate"]
+    assert not data["storeErrors"]
+    assert data["store"]["checkoutTtl"] == 90
+    store.refresh_from_db()
+    assert store.checkout_ttl == timedelta(minutes=90)
+
+
+def test_my_store_update_clears_checkout_ttl(
+    store_staff_api_client, store, permission_manage_stores
+):
+    # given
+    store.checkout_ttl = timedelta(days=1)
+    store.save(update_fields=["checkout_ttl"])
+
+    # when
+    response = store_staff_api_client.post_graphql(
+        MUTATION_MY_STORE_UPDATE_CHECKOUT_TTL,
+        {"checkoutTtl": None},
+        permissions=[permission_manage_stores],
+        HTTP_HOST=store.domain,
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["myStoreUpdate"]
+    assert data["store"]["checkoutTtl"] is None
+    store.refresh_from_db()
+    assert store.checkout_ttl is None
+
+
+def test_my_store_update_invalid_checkout_ttl(
+    store_staff_api_client, store, permission_manage_stores
+):
+    # when
+    response = store_staff_api_client.post_graphql(
+        MUTATION_MY_STORE_UPDATE_CHECKOUT_TTL,
+        {"checkoutTtl": 0},
+        permissions=[permission_manage_stores],
+        HTTP_HOST=store.domain,
+    )
+
+    # then
+    data = get_graphql_content(response)["data"]["myStoreUpdate"]
+    assert data["storeErrors"] == [
+        {"field": "checkoutTtl", "code": StoreErrorCode.INVALID.name}
+    ]
+    store.refresh_from_db()
+    assert store.checkout_ttl is None
@@ -74,6 +74,13 @@ class Store(CountableDjangoObjectType):
     index_stripe = graphene.Int(description="Index stripe", required=False)
     custom_domain_enable = graphene.Boolean(
         description="Enable use custom domain", required=False)
+    checkout_ttl = graphene.Int(
+        description=(
+            "Minutes after the last change when checkouts are deleted, the "
+            "default TTL when empty."
+        ),
+        required=False,
+    )
 
     class Meta:
         description = (
@@ -107,11 +114,18 @@ class Store(CountableDjangoObjectType):
             "index_stripe",
             "enable_transaction_fee",
             "custom_domain_enable",
+            "checkout_ttl",
             "id",
         ]
         interfaces = [graphene.relay.Node, ObjectWithMetadata]
         model = models.Store
 
+    @staticmethod
+    def resolve_checkout_ttl(root: models.Store, _info, **_kwargs):
+        if root.checkout_ttl is not None:
+            return int(root.checkout_ttl.total_seconds() // 60)
+        return None
+
     @staticmethod
     def resolve_logo(root: models.Store, info, size=None, **_kwargs):
         if root.logo:
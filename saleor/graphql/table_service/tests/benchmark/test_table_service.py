@@ -0,0 +1,195 @@
+import graphene
+import pytest
+
+QUERY_TABLE_SERVICES = """
+    query TableServices($first: Int) {
+        tableServices(first: $first) {
+            totalCount
+            edges {
+                node {
+                    id
+                    tableName
+                    tableQrCode
+                    active
+                }
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_table_services(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_table_service,
+    graphql_benchmark,
+):
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        QUERY_TABLE_SERVICES,
+        {"first": 100},
+        permissions=[permission_manage_table_service],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    table_services = content["data"]["tableServices"]
+    assert table_services["totalCount"] == restaurant.table_services.count()
+
+
+QUERY_TABLE_SERVICE = """
+    query TableService($id: ID!) {
+        tableService(id: $id) {
+            tableName
+            tableQrCode
+            active
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_table_service(api_client, restaurant, graphql_benchmark):
+    # given
+    table_service = restaurant.table_services.first()
+    variables = {"id": graphene.Node.to_global_id("TableService", table_service.pk)}
+
+    # when
+    content = graphql_benchmark(
+        api_client, QUERY_TABLE_SERVICE, variables, HTTP_HOST=restaurant.domain
+    )
+
+    # then
+    assert content["data"]["tableService"]["tableName"] == table_service.table_name
+
+
+MUTATION_TABLE_SERVICE_CREATE = """
+    mutation TableServiceCreate($input: TableServiceInput!) {
+        tableServiceCreate(input: $input) {
+            tableService {
+                tableName
+            }
+            tableServiceErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_table_service_create(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_table_service,
+    graphql_benchmark,
+):
+    # given
+    variables = {
+        "input": {"tableName": "Terrace 1", "tableQrCode": "qr", "active": True}
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_TABLE_SERVICE_CREATE,
+        variables,
+        permissions=[permission_manage_table_service],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["tableServiceCreate"]
+    assert not data["tableServiceErrors"]
+    assert data["tableService"]["tableName"] == "Terrace 1"
+
+
+MUTATION_TABLE_SERVICE_UPDATE = """
+    mutation TableServiceUpdate($id: ID!, $input: TableServiceUpdateInput!) {
+        tableServiceUpdate(id: $id, input: $input) {
+            tableService {
+                tableName
+                active
+            }
+            tableServiceErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_table_service_update(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_table_service,
+    graphql_benchmark,
+):
+    # given
+    table_service = restaurant.table_services.first()
+    variables = {
+        "id": graphene.Node.to_global_id("TableService", table_service.pk),
+        "input": {"tableName": "Bar 1", "active": False},
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_TABLE_SERVICE_UPDATE,
+        variables,
+        permissions=[permission_manage_table_service],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["tableServiceUpdate"]
+    assert not data["tableServiceErrors"]
+    assert data["tableService"] == {"tableName": "Bar 1", "active": False}
+
+
+MUTATION_TABLE_SERVICE_BULK_DELETE = """
+    mutation TableServiceBulkDelete($ids: [ID]!) {
+        tableServiceBulkDelete(ids: $ids) {
+            count
+            tableServiceErrors {
+                field
+                code
+            }
+        }
+    }
+"""
+
+
+@pytest.mark.django_db
+def test_table_service_bulk_delete(
+    restaurant_staff_api_client,
+    restaurant,
+    permission_manage_table_service,
+    graphql_benchmark,
+):
+    # given
+    variables = {
+        "ids": [
+            graphene.Node.to_global_id("TableService", pk)
+            for pk in restaurant.table_services.values_list("pk", flat=True)
+        ]
+    }
+
+    # when
+    content = graphql_benchmark(
+        restaurant_staff_api_client,
+        MUTATION_TABLE_SERVICE_BULK_DELETE,
+        variables,
+        permissions=[permission_manage_table_service],
+        HTTP_HOST=restaurant.domain,
+    )
+
+    # then
+    data = content["data"]["tableServiceBulkDelete"]
+    assert not data["tableServiceErrors"]
+    assert data["count"] == len(variables["ids"])
@@ -0,0 +1,479 @@
+"""Benchmarks of GraphQL queries and mutations with stored baselines.
+
+Every measurement records the number of database queries, the median wall time
+and the peak of memory allocated while serving a request, and compares them to
+the baseline stored in `baselines.json` next to this module. A benchmark fails
+when it runs more queries than its baseline.
+
+Wall times and allocations depend on the machine and on what else it runs, they
+are only compared when their tolerance is given with
+`--benchmark-time-tolerance` or `--benchmark-allocations-tolerance`, in a single
+process. Run the benchmarks with `-n 0 --update-benchmark-baselines` to record
+new baselines after an intended change, then commit the updated file.
+"""
+import datetime
+import fcntl
+import json
+import os
+import statistics
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from decimal import Decimal
+from typing import Dict, List, Optional
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
+
+from ....account.models import User
+from ....delivery.models import Delivery
+from ....product.models import (
+    Category,
+    Option,
+    OptionValue,
+    OptionValueChannelListing,
+    Product,
+    ProductChannelListing,
+    ProductOption,
+    ProductType,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ....servicetime.models import ServiceTime
+from ....store.models import Store
+from ....table_service.models import TableService
+from ..fixtures import ApiClient
+from ..utils import get_graphql_content
+
+BASELINES_PATH = os.path.join(os.path.dirname(__file__), "baselines.json")
+
+# Compared wall time and allocations may exceed their baselines by a tolerance
+# factor and these small absolute margins, for measurements close to zero.
+TIME_MARGIN_MS = 5.0
+ALLOCATIONS_MARGIN_KB = 64.0
+
+RESTAURANTS_COUNT = 4
+OPTIONS_PER_RESTAURANT = 3
+VALUES_PER_OPTION = 4
+PRODUCTS_PER_RESTAURANT = 20
+VARIANTS_PER_PRODUCT = 2
+TABLES_PER_RESTAURANT = 10
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark baselines")
+    group.addoption(
+        "--update-benchmark-baselines",
+        action="store_true",
+        default=False,
+        help="Store the measured GraphQL benchmarks as their new baselines.",
+    )
+    group.addoption(
+        "--benchmark-time-tolerance",
+        type=float,
+        default=None,
+        help=(
+            "Compare benchmark wall times to their baselines, allowing this ratio, "
+            "e.g. 2.0. Not compared by default."
+        ),
+    )
+    group.addoption(
+        "--benchmark-allocations-tolerance",
+        type=float,
+        default=None,
+        help=(
+            "Compare benchmark allocations to their baselines, allowing this "
+            "ratio, e.g. 1.25. Not compared by default."
+        ),
+    )
+
+
+@pytest.hookimpl(trylast=True)
+def pytest_configure(config):
+    if not _is_parallel_run(config):
+        return
+    if config.getoption("--update-benchmark-baselines"):
+        raise pytest.UsageError(
+            "Benchmark baselines have to be recorded in a single process, "
+            "run the tests with -n 0."
+        )
+    tolerances = ["--benchmark-time-tolerance", "--benchmark-allocations-tolerance"]
+    if any(config.getoption(option) for option in tolerances):
+        raise pytest.UsageError(
+            "Benchmark wall times and allocations are compared in a single "
+            "process, run the tests with -n 0."
+        )
+
+
+def _is_parallel_run(config) -> bool:
+    if hasattr(config, "workerinput"):
+        return config.workerinput["workercount"] > 1
+    return bool(getattr(config.option, "numprocesses", 0))
+
+
+@dataclass
+class BenchmarkResult:
+    queries: int
+    time_ms: float
+    allocations_kb: float
+
+
+def load_baselines(path: str = BASELINES_PATH) -> Dict[str, Dict[str, dict]]:
+    if not os.path.exists(path):
+        return {}
+    with open(path) as baselines_file:
+        return json.load(baselines_file)
+
+
+def store_baselines(
+    test_id: str, results: Dict[str, BenchmarkResult], path: str = BASELINES_PATH
+):
+    """Replace the baselines of the test in the baselines file.
+
+    The file is locked for the update, tests running in parallel workers store
+    their baselines in the same file.
+    """
+    with open(path, "a+") as baselines_file:
+        fcntl.flock(baselines_file, fcntl.LOCK_EX)
+        baselines_file.seek(0)
+        content = baselines_file.read()
+        baselines = json.loads(content) if content else {}
+        baselines[test_id] = {
+            label: asdict(result) for label, result in results.items()
+        }
+        baselines_file.seek(0)
+        baselines_file.truncate()
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write("\n")
+
+
+def get_regressions(
+    result: BenchmarkResult,
+    baseline: dict,
+    time_tolerance: Optional[float] = None,
+    allocations_tolerance: Optional[float] = None,
+) -> List[str]:
+    """Return descriptions of the measurements that exceed the baseline.
+
+    Wall time and allocations are only compared when their tolerance is given.
+    """
+    regressions = []
+    if result.queries > baseline["queries"]:
+        regressions.append(
+            f"{result.queries} queries, baseline is {baseline['queries']}"
+        )
+    if (
+        time_tolerance
+        and result.time_ms > baseline["time_ms"] * time_tolerance + TIME_MARGIN_MS
+    ):
+        regressions.append(
+            f"{result.time_ms:.1f}ms, baseline is {baseline['time_ms']:.1f}ms"
+        )
+    if (
+        allocations_tolerance
+        and result.allocations_kb
+        > baseline["allocations_kb"] * allocations_tolerance + ALLOCATIONS_MARGIN_KB
+    ):
+        regressions.append(
+            f"{result.allocations_kb:.0f}KB allocated, "
+            f"baseline is {baseline['allocations_kb']:.0f}KB"
+        )
+    return regressions
+
+
+class GraphQLBenchmark:
+    """Measure GraphQL requests and compare them to their baselines.
+
+    Each request is sent once to warm up caches and then measured in a number of
+    rounds. Every request runs in a transaction that is rolled back, so
+    mutations are measured on the same data in each round.
+    """
+
+    def __init__(
+        self,
+        test_id: str,
+        update: bool,
+        time_tolerance: Optional[float] = None,
+        allocations_tolerance: Optional[float] = None,
+    ):
+        self.test_id = test_id
+        self.update = update
+        self.time_tolerance = time_tolerance
+        self.allocations_tolerance = allocations_tolerance
+        self.baselines = load_baselines().get(test_id, {})
+        self.results: Dict[str, BenchmarkResult] = {}
+
+    def __call__(
+        self,
+        api_client,
+        query: str,
+        variables: Optional[dict] = None,
+        label: Optional[str] = None,
+        permissions=None,
+        rounds: int = 5,
+        **kwargs,
+    ) -> dict:
+        label = label or "default"
+        assert label not in self.results, f"Benchmark {label} was already measured."
+        if permissions:
+            if api_client.app:
+                api_client.app.permissions.add(*permissions)
+            else:
+                api_client.user.user_permissions.add(*permissions)
+
+        def post():
+            with transaction.atomic():
+                response = api_client.post_graphql(query, variables, **kwargs)
+                transaction.set_rollback(True)
+            return response
+
+        content = get_graphql_content(post())
+
+        queries = []
+        durations = []
+        for _ in range(rounds):
+            with CaptureQueriesContext(connection) as captured_queries:
+                started_at = time.perf_counter()
+                post()
+                durations.append(time.perf_counter() - started_at)
+            queries.append(len(captured_queries))
+
+        tracemalloc.start()
+        try:
+            post()
+            _, peak = tracemalloc.get_traced_memory()
+        finally:
+            tracemalloc.stop()
+
+        result = BenchmarkResult(
+            queries=max(queries),
+            time_ms=round(statistics.median(durations) * 1000, 2),
+            allocations_kb=round(peak / 1024, 1),
+        )
+        self.results[label] = result
+        self.check(label, result)
+        return content
+
+    def check(self, label: str, result: BenchmarkResult):
+        if self.update:
+            return
+        baseline = self.baselines.get(label)
+        if baseline is None:
+            pytest.fail(
+                f"No baseline for benchmark {label} of {self.test_id}, "
+                "run the benchmarks with --update-benchmark-baselines."
+            )
+        regressions = get_regressions(
+            result, baseline, self.time_tolerance, self.allocations_tolerance
+        )
+        if regressions:
+            pytest.fail(
+                f"Benchmark {label} of {self.test_id} regressed: "
+                + "; ".join(regressions)
+            )
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    outcome = yield
+    report = outcome.get_result()
+    if report.when == "call":
+        item.benchmark_passed = report.passed
+
+
+@pytest.fixture
+def graphql_benchmark(request, db):
+    benchmark = GraphQLBenchmark(
+        request.node.nodeid,
+        update=request.config.getoption("--update-benchmark-baselines"),
+        time_tolerance=request.config.getoption("--benchmark-time-tolerance"),
+        allocations_tolerance=request.config.getoption(
+            "--benchmark-allocations-tolerance"
+        ),
+    )
+    yield benchmark
+    # Baselines are only stored for tests that passed all their assertions.
+    if benchmark.update and getattr(request.node, "benchmark_passed", False):
+        store_baselines(benchmark.test_id, benchmark.results)
+
+
+def _create_restaurant(index, product_type, channel):
+    # The current tenant would be assigned as the primary key of a new store.
+    unset_current_tenant()
+    store = Store.objects.create(
+        name=f"Restaurant {index}", domain=f"restaurant-{index}.example.com"
+    )
+    set_current_tenant(store)
+
+    options = []
+    for option_index in range(OPTIONS_PER_RESTAURANT):
+        option = Option.objects.create(
+            name=f"Option {option_index}", type="single", store=store
+        )
+        for value_index in range(VALUES_PER_OPTION):
+            option_value = OptionValue.objects.create(
+                option=option, name=f"Option {option_index} value {value_index}"
+            )
+            OptionValueChannelListing.objects.create(
+                option_value=option_value,
+                channel=channel,
+                price_amount=Decimal(value_index),
+                currency=channel.currency_code,
+            )
+        options.append(option)
+
+    category = Category.objects.create(
+        name=f"Menu {index}", slug=f"menu-{index}", store=store
+    )
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Dish {product_index}",
+                slug=f"restaurant-{index}-dish-{product_index}",
+                product_type=product_type,
+                category=category,
+                store=store,
+                sort_order=product_index,
+            )
+            for product_index in range(PRODUCTS_PER_RESTAURANT)
+        ]
+    )
+    ProductChannelListing.objects.bulk_create(
+        [
+            ProductChannelListing(
+                product=product,
+                channel=channel,
+                is_published=True,
+                visible_in_listings=True,
+                available_for_purchase=datetime.date(1999, 1, 1),
+                currency=channel.currency_code,
+            )
+            for product in products
+        ]
+    )
+    ProductOption.objects.bulk_create(
+        [
+            ProductOption(product=product, option=option, sort_order=sort_order)
+            for product in products
+            for sort_order, option in enumerate(options)
+        ]
+    )
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(
+                product=product,
+                store=store,
+                sku=f"{product.slug}-{variant_index}",
+                sort_order=variant_index,
+                # Dishes are made to order, without stock.
+                track_inventory=False,
+            )
+            for product in products
+            for variant_index in range(VARIANTS_PER_PRODUCT)
+        ]
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        [
+            ProductVariantChannelListing(
+                variant=variant,
+                channel=channel,
+                price_amount=Decimal(8 + variant_index % VARIANTS_PER_PRODUCT * 4),
+                currency=channel.currency_code,
+            )
+            for variant_index, variant in enumerate(variants)
+        ]
+    )
+
+    TableService.objects.bulk_create(
+        [
+            TableService(
+                store=store,
+                table_name=f"Table {table_index}",
+                table_qr_code=f"https://{store.domain}/table/{table_index}",
+            )
+            for table_index in range(TABLES_PER_RESTAURANT)
+        ]
+    )
+    ServiceTime.objects.create(
+        store=store,
+        dl_delivery_time=30,
+        dl_time_gap=15,
+        dl_allow_preorder=True,
+        dl_preorder_day=6,
+        dl_same_day_order=True,
+        dl_service_time={
+            "dl": [{"days": [True] * 7, "open": "11:00", "close": "22:00"}]
+        },
+        pu_delivery_time=15,
+        pu_time_gap=15,
+        pu_allow_preorder=True,
+        pu_preorder_day=6,
+        pu_same_day_order=True,
+        pu_service_time={
+            "pu": [
+                {"days": [True] * 7, "open": "11:00", "close": "14:00"},
+                {"days": [True] * 7, "open": "17:00", "close": "22:00"},
+            ]
+        },
+        table_service_time={
+            "tb": [{"days": [True] * 7, "open": "11:00", "close": "23:00"}]
+        },
+    )
+    Delivery.objects.create(
+        store=store,
+        delivery_area={
+            "areas": [
+                {
+                    "from": 1000 + area_index * 100,
+                    "to": 1099 + area_index * 100,
+                    "customDeliveryFee": 2 + area_index / 10,
+                    "customMinOrder": 10 + area_index,
+                }
+                for area_index in range(50)
+            ]
+        },
+        delivery_fee=Decimal("4.00"),
+        min_order=Decimal("10.00"),
+        from_delivery=Decimal("50.00"),
+        enable_for_big_order=True,
+        enable_custom_delivery_fee=True,
+        enable_minimum_delivery_order_value=True,
+    )
+    return store
+
+
+@pytest.fixture
+def restaurants(channel_USD):
+    """Restaurants with menus, options, tables, service times and delivery.
+
+    Each restaurant is a separate store with its own menu of dishes with options
+    and variants, so benchmarks of a store are run next to the data of others.
+    """
+    product_type = ProductType.objects.create(
+        name="Dish", slug="dish", has_variants=True, is_shipping_required=True
+    )
+    stores = [
+        _create_restaurant(index, product_type, channel_USD)
+        for index in range(RESTAURANTS_COUNT)
+    ]
+    unset_current_tenant()
+    return stores
+
+
+@pytest.fixture
+def restaurant(restaurants):
+    return restaurants[0]
+
+
+@pytest.fixture
+def restaurant_staff_api_client(restaurant):
+    staff_user = User.objects.create_user(
+        email=f"staff@{restaurant.domain}",
+        password="password",
+        is_staff=True,
+        is_active=True,
+        store=restaurant,
+    )
+    return ApiClient(user=staff_user)
@@ -0,0 +1,76 @@
+import json
+
+from .fixtures import BenchmarkResult, get_regressions, store_baselines
+
+BASELINE = {"queries": 10, "time_ms": 20.0, "allocations_kb": 400.0}
+
+
+def test_get_regressions_within_tolerance():
+    # given
+    result = BenchmarkResult(queries=9, time_ms=40.0, allocations_kb=500.0)
+
+    # when
+    regressions = get_regressions(
+        result, BASELINE, time_tolerance=2.0, allocations_tolerance=1.25
+    )
+
+    # then
+    assert regressions == []
+
+
+def test_get_regressions():
+    # given
+    result = BenchmarkResult(queries=11, time_ms=60.0, allocations_kb=600.0)
+
+    # when
+    regressions = get_regressions(
+        result, BASELINE, time_tolerance=2.0, allocations_tolerance=1.25
+    )
+
+    # then
+    assert regressions == [
+        "11 queries, baseline is 10",
+        "60.0ms, baseline is 20.0ms",
+        "600KB allocated, baseline is 400KB",
+    ]
+
+
+def test_get_regressions_compares_only_queries_by_default():
+    # given
+    result = BenchmarkResult(queries=11, time_ms=600.0, allocations_kb=4000.0)
+
+    # when
+    regressions = get_regressions(result, BASELINE)
+
+    # then
+    assert regressions == ["11 queries, baseline is 10"]
+
+
+def test_store_baselines_replaces_baselines_of_test(tmp_path):
+    # given
+    path = tmp_path / "baselines.json"
+    path.write_text(
+        json.dumps({"test_a": {"old": BASELINE}, "test_b": {"default": BASELINE}})
+    )
+    result = BenchmarkResult(queries=3, time_ms=1.5, allocations_kb=32.0)
+
+    # when
+    store_baselines("test_a", {"default": result}, path=str(path))
+
+    # then
+    assert json.loads(path.read_text()) == {
+        "test_a": {"default": {"queries": 3, "time_ms": 1.5, "allocations_kb": 32.0}},
+        "test_b": {"default": BASELINE},
+    }
+
+
+def test_store_baselines_creates_file(tmp_path):
+    # given
+    path = tmp_path / "baselines.json"
+    result = BenchmarkResult(queries=3, time_ms=1.5, allocations_kb=32.0)
+
+    # when
+    store_baselines("test_a", {"default": result}, path=str(path))
+
+    # then
+    assert json.loads(path.read_text())["test_a"]["default"]["queries"] == 3
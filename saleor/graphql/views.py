@@ -2,11 +2,14 @@ import fnmatch
 import hashlib
 import json
 import logging
+import threading
 import traceback
+from functools import partial
 from typing import Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
+from cachetools import LRUCache
 from django.conf import settings
 from django.core.cache import cache
 from django.db import connection
@@ -22,7 +25,9 @@ from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
 from graphql.error import format_error as format_graphql_error
 from graphql.execution import ExecutionResult
+from graphql.validation import validate
 from jwt.exceptions import PyJWTError
+from promise.promise import async_instance
 
 from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied, ReadOnlyException
@@ -31,9 +36,17 @@ from ..core.utils import is_valid_ipv4, is_valid_ipv6
 API_PATH = SimpleLazyObject(lambda: reverse("api"))
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
+PERSISTED_QUERY_VERSION = 1
+PERSISTED_QUERY_NOT_FOUND = "PersistedQueryNotFound"
+PERSISTED_QUERY_NOT_SUPPORTED = "PersistedQueryNotSupported"
+
 unhandled_errors_logger = logging.getLogger("saleor.graphql.errors.unhandled")
 handled_errors_logger = logging.getLogger("saleor.graphql.errors.handled")
 
+# Parsed and validated documents shared by all requests of a worker
+_documents_cache = LRUCache(maxsize=settings.GRAPHQL_DOCUMENT_CACHE_SIZE)
+_documents_cache_lock = threading.Lock()
+
 
 def tracing_wrapper(execute, sql, params, many, context):
     conn: DatabaseWrapper = context["connection"]
@@ -218,15 +231,73 @@ class GraphQLView(View):
                 ),
             )
 
+        key = (self.schema, hash_query(query))
+        with _documents_cache_lock:
+            document = _documents_cache.get(key)
+        if document is not None:
+            return document, None
+
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),  # type: ignore
-                None,
+            document = self.backend.document_from_string(  # type: ignore
+                self.schema, query
             )
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
+        validation_errors = validate(self.schema, document.document_ast)
+        if validation_errors:
+            return None, ExecutionResult(errors=validation_errors, invalid=True)
+
+        # The document is valid, so cached executions may skip the validation
+        document.execute = partial(document.execute, validate=False)
+        with _documents_cache_lock:
+            _documents_cache[key] = document
+        return document, None
+
+    def get_persisted_query(
+        self, query: Optional[str], data: dict
+    ) -> Tuple[Optional[str], Optional[ExecutionResult]]:
+        """Resolve the query of an automatic persisted query request.
+
+        Clients send only the sha256 hash of a query they sent before; a hash
+        unknown to the server is answered with `PersistedQueryNotFound`, and the
+        client retries with both the query and its hash, which registers it.
+        """
+        extensions = data.get("extensions")
+        persisted_query = (
+            extensions.get("persistedQuery") if isinstance(extensions, dict) else None
+        )
+        if not persisted_query:
+            return query, None
+        if not settings.GRAPHQL_PERSISTED_QUERIES_ENABLED:
+            return None, ExecutionResult(
+                errors=[GraphQLError(PERSISTED_QUERY_NOT_SUPPORTED)]
+            )
+        if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+            return None, ExecutionResult(
+                errors=[ValueError("Unsupported persisted query version.")],
+                invalid=True,
+            )
+
+        query_hash = persisted_query.get("sha256Hash")
+        key = generate_persisted_query_cache_key(str(query_hash))
+        if query:
+            if not isinstance(query, str) or hash_query(query) != query_hash:
+                return None, ExecutionResult(
+                    errors=[ValueError("Provided sha256Hash does not match query.")],
+                    invalid=True,
+                )
+            cache.set(key, query, settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+            return query, None
+
+        query = cache.get(key)
+        if query is None:
+            return None, ExecutionResult(
+                errors=[GraphQLError(PERSISTED_QUERY_NOT_FOUND)]
+            )
+        return query, None
+
     def check_if_query_contains_only_schema(self, document: GraphQLDocument):
         query_with_schema = False
         for definition in document.document_ast.definitions:
@@ -247,6 +318,9 @@ class GraphQLView(View):
             span.set_tag(opentracing.tags.COMPONENT, "GraphQL")
 
             query, variables, operation_name = self.get_graphql_params(request, data)
+            query, error = self.get_persisted_query(query, data)
+            if error:
+                return error
 
             document, error = self.parse_query(query)
             if error:
@@ -279,6 +353,11 @@ class GraphQLView(View):
                         response = cache.get(key)
 
                     if not response:
+                        # `channels_graphql_ws` disables the promise trampoline of
+                        # the thread importing it, which makes dataloaders send a
+                        # query per key. The trampoline state is thread-local and
+                        # the websocket consumer executes queries in own threads.
+                        async_instance.enable_trampoline()
                         response = document.execute(  # type: ignore
                             root=self.get_root_value(),
                             variables=variables,
@@ -406,6 +485,18 @@ def obj_set(obj, path, value, do_not_replace):
     return obj_set(obj[current_path], path[1:], value, do_not_replace)
 
 
+def clear_documents_cache():
+    with _documents_cache_lock:
+        _documents_cache.clear()
+
+
+def hash_query(raw_query: str) -> str:
+    return hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
+
+
 def generate_cache_key(raw_query: str) -> str:
-    hashed_query = hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
-    return f"{saleor_version}-{hashed_query}"
+    return f"{saleor_version}-{hash_query(raw_query)}"
+
+
+def generate_persisted_query_cache_key(query_hash: str) -> str:
+    return f"persisted-query-{query_hash}"
@@ -27,6 +27,13 @@ class WebhookCreateInput(graphene.InputObjectType):
         description="The secret key used to create a hash signature with each payload.",
         required=False,
     )
+    batch_events = graphene.Boolean(
+        description=(
+            "Determine if events will be coalesced and sent in batches as lists "
+            "of event types and payloads."
+        ),
+        required=False,
+    )
 
 
 class WebhookCreate(ModelMutation):
@@ -111,6 +118,13 @@ class WebhookUpdateInput(graphene.InputObjectType):
     secret_key = graphene.String(
         description="Use to create a hash signature with each payload.", required=False
     )
+    batch_events = graphene.Boolean(
+        description=(
+            "Determine if events will be coalesced and sent in batches as lists "
+            "of event types and payloads."
+        ),
+        required=False,
+    )
 
 
 class WebhookUpdate(ModelMutation):
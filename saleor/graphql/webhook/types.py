@@ -41,6 +41,7 @@ class Webhook(CountableDjangoObjectType):
             "is_active",
             "secret_key",
             "name",
+            "batch_events",
         ]
 
     @staticmethod
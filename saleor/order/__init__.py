@@ -5,6 +5,8 @@ if TYPE_CHECKING:
     from ..product.models import ProductVariant, OptionValue
     from .models import FulfillmentLine, OrderLine
 
+default_app_config = "saleor.order.app.OrderAppConfig"
+
 
 class OrderStatus:
     DRAFT = "draft"  # fully editable, not finalized order created by staff users
@@ -47,6 +49,16 @@ class OrderOrigin:
     ]
 
 
+class SalesRollupGranularity:
+    HOUR = "hour"  # sales of orders placed within an hour
+    DAY = "day"  # sales of orders placed within a UTC day
+
+    CHOICES = [
+        (HOUR, "Hour"),
+        (DAY, "Day"),
+    ]
+
+
 class FulfillmentStatus:
     FULFILLED = "fulfilled"  # group of products in an order marked as fulfilled
     REFUNDED = "refunded"  # group of refunded products
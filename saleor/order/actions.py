@@ -24,11 +24,13 @@ from ..payment import (ChargeStatus, CustomPaymentChoices, PaymentError,
                        TransactionKind, gateway)
 from ..payment.models import Payment, Transaction
 from ..payment.utils import create_payment
+from ..servicetime.capacity import release_order_slot
 from ..store.models import Store
 from ..warehouse.management import (deallocate_stock,
                                     deallocate_stock_for_order, decrease_stock,
                                     get_order_lines_with_track_inventory)
 from ..warehouse.models import Stock
+from ..webhook.payloads import shared_payloads
 from . import (FulfillmentLineData, FulfillmentStatus, OrderLineData,
                OrderOrigin, OrderStatus, events, utils)
 from .error_codes import OrderErrorCode
@@ -208,8 +210,9 @@ def handle_fully_paid_order(
     except Exception:
         # Analytics failing should not abort the checkout flow
         logger.exception("Recording order in analytics failed")
-    manager.order_fully_paid(order)
-    manager.order_updated(order)
+    with shared_payloads():
+        manager.order_fully_paid(order)
+        manager.order_updated(order)
 
 
 @traced_atomic_transaction()
@@ -222,11 +225,13 @@ def cancel_order(order: "Order", user: Optional["User"], manager: "PluginsManage
     events.order_canceled_event(order=order, user=user)
 
     deallocate_stock_for_order(order)
+    release_order_slot(order)
     order.status = OrderStatus.CANCELED
-    order.save(update_fields=["status"])
+    order.save(update_fields=["status", "slot_reserved"])
 
-    manager.order_cancelled(order)
-    manager.order_updated(order)
+    with shared_payloads():
+        manager.order_cancelled(order)
+        manager.order_updated(order)
 
     send_order_canceled_confirmation(order, user, manager)
 
@@ -275,13 +280,14 @@ def order_fulfilled(
     events.fulfillment_fulfilled_items_event(
         order=order, user=user, fulfillment_lines=fulfillment_lines
     )
-    manager.order_updated(order)
+    with shared_payloads():
+        manager.order_updated(order)
 
-    for fulfillment in fulfillments:
-        manager.fulfillment_created(fulfillment)
+        for fulfillment in fulfillments:
+            manager.fulfillment_created(fulfillment)
 
-    if order.status == OrderStatus.FULFILLED:
-        manager.order_fulfilled(order)
+        if order.status == OrderStatus.FULFILLED:
+            manager.order_fulfilled(order)
 
     if notify_customer:
         for fulfillment in fulfillments:
@@ -403,8 +409,9 @@ def mark_order_as_paid(
     events.order_manually_marked_as_paid_event(
         order=order, user=request_user, transaction_reference=external_reference
     )
-    manager.order_fully_paid(order)
-    manager.order_updated(order)
+    with shared_payloads():
+        manager.order_fully_paid(order)
+        manager.order_updated(order)
     order.update_total_paid()
 
 
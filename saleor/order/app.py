@@ -0,0 +1,31 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_save
+
+
+class OrderAppConfig(AppConfig):
+    name = "saleor.order"
+
+    def ready(self):
+        from .models import Order
+        from .signals import (
+            fetch_previous_sales_rollup_entry,
+            remove_sales_rollups_for_order,
+            update_sales_rollups_for_order,
+        )
+
+        # preventing duplicate signals
+        pre_save.connect(
+            fetch_previous_sales_rollup_entry,
+            sender=Order,
+            dispatch_uid="fetch_previous_sales_rollup_entry_on_order_save",
+        )
+        post_save.connect(
+            update_sales_rollups_for_order,
+            sender=Order,
+            dispatch_uid="update_sales_rollups_on_order_save",
+        )
+        post_delete.connect(
+            remove_sales_rollups_for_order,
+            sender=Order,
+            dispatch_uid="remove_sales_rollups_on_order_delete",
+        )
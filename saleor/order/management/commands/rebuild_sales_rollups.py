@@ -0,0 +1,18 @@
+from django.core.management.base import BaseCommand
+
+from ...rollups import rebuild_sales_rollups
+
+
+class Command(BaseCommand):
+    help = "Recalculate hourly and daily sales rollups from orders."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--store-id",
+            type=int,
+            help="Rebuild rollups of a single store instead of all stores.",
+        )
+
+    def handle(self, *args, **options):
+        created = rebuild_sales_rollups(store_id=options["store_id"])
+        self.stdout.write(f"Created {created} sales rollups.")
@@ -0,0 +1,24 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0126_auto_20211123_0908"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(fields=["store", "id"], name="order_store_id_idx"),
+        ),
+        migrations.AddIndex(
+            model_name="order",
+            index=models.Index(
+                fields=["store", "created", "status", "id"],
+                name="order_store_created_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,88 @@
+# Generated by Django 3.2.4 on 2026-10-18 15:20
+
+import django.db.models.deletion
+import django_multitenant.mixins
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("channel", "0001_initial"),
+        ("store", "0021_store_sound_notifications"),
+        ("order", "0127_order_keyset_pagination_indexes"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SalesRollup",
+            fields=[
+                (
+                    "id",
+                    models.AutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "order_type",
+                    models.CharField(
+                        choices=[
+                            ("delivery", "Delivery"),
+                            ("pickup", "Pickup"),
+                            ("dinein", "Dine-in"),
+                        ],
+                        max_length=35,
+                    ),
+                ),
+                (
+                    "granularity",
+                    models.CharField(
+                        choices=[("hour", "Hour"), ("day", "Day")], max_length=8
+                    ),
+                ),
+                ("period", models.DateTimeField()),
+                ("currency", models.CharField(max_length=3)),
+                ("orders_count", models.IntegerField(default=0)),
+                (
+                    "total_net_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "total_gross_amount",
+                    models.DecimalField(decimal_places=3, default=0, max_digits=12),
+                ),
+                (
+                    "channel",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_rollups",
+                        to="channel.channel",
+                    ),
+                ),
+                (
+                    "store",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="sales_rollups",
+                        to="store.store",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ("period", "pk"),
+            },
+            bases=(django_multitenant.mixins.TenantModelMixin, models.Model),
+        ),
+        migrations.AddIndex(
+            model_name="salesrollup",
+            index=models.Index(
+                fields=["store", "channel", "granularity", "period"],
+                name="salesrollup_period_idx",
+            ),
+        ),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 16:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("order", "0128_salesrollup"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="order",
+            name="slot_reserved",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -7,12 +7,13 @@ from uuid import uuid4
 from django.conf import settings
 from django.contrib.postgres.indexes import GinIndex
 from django.core.validators import MinValueValidator
-from django.db import models
+from django.db import models, transaction
 from django.db.models import JSONField  # type: ignore
 from django.db.models import F, Max, Sum
 from django.db.models.expressions import Exists, OuterRef
 from django.utils.timezone import now
 from django_measurement.models import MeasurementField
+from django_multitenant.models import TenantModel
 from django_prices.models import MoneyField, TaxedMoneyField
 from measurement.measures import Weight
 from saleor.store.models import Store
@@ -29,7 +30,13 @@ from ..payment import ChargeStatus, TransactionKind
 from ..payment.model_helpers import get_subtotal, get_total_authorized
 from ..payment.models import Payment
 from ..shipping.models import ShippingMethod
-from . import FulfillmentStatus, OrderEvents, OrderOrigin, OrderStatus
+from . import (
+    FulfillmentStatus,
+    OrderEvents,
+    OrderOrigin,
+    OrderStatus,
+    SalesRollupGranularity,
+)
 
 
 class OrderQueryset(CustomQueryset):
@@ -262,6 +269,8 @@ class Order(MultitenantModelWithMetadata):
     expected_time = models.CharField(
         max_length=50, blank=True, null=True
     )
+    # Whether the order is counted in the capacity of its service time slot.
+    slot_reserved = models.BooleanField(default=False)
 
     delivery_fee = models.DecimalField(
         max_digits=settings.DEFAULT_MAX_DIGITS,
@@ -284,12 +293,24 @@ class Order(MultitenantModelWithMetadata):
     class Meta:
         ordering = ("-pk",)
         permissions = ((OrderPermissions.MANAGE_ORDERS.codename, "Manage orders."),)
-        indexes = [*ModelWithMetadata.Meta.indexes, GinIndex(fields=["user_email"])]
+        indexes = [
+            *ModelWithMetadata.Meta.indexes,
+            GinIndex(fields=["user_email"]),
+            # Keyset pagination of orders sorted by number and creation date.
+            models.Index(fields=["store", "id"], name="order_store_id_idx"),
+            models.Index(
+                fields=["store", "created", "status", "id"],
+                name="order_store_created_idx",
+            ),
+        ]
 
     def save(self, *args, **kwargs):
         if not self.token:
             self.token = str(uuid4())
-        return super().save(*args, **kwargs)
+        # Sales rollups are updated by signals, the saved order stays locked
+        # from reading its previous values until the rollups are updated.
+        with transaction.atomic(savepoint=False):
+            return super().save(*args, **kwargs)
 
     def is_fully_paid(self):
         return self.total_paid >= self.total.gross
@@ -728,3 +749,55 @@ class OrderEvent(MultitenantModelWithMetadata):
 
     def __repr__(self):
         return f"{self.__class__.__name__}(type={self.type!r}, user={self.user!r})"
+
+
+class SalesRollup(TenantModel):
+    """Sales of orders of a type placed in a channel within an hour or a day.
+
+    Rows are maintained incrementally when orders are saved, see
+    `saleor.order.rollups`. Every change adds delta rows that are merged
+    periodically, so readers always sum all rows of a period.
+    """
+
+    store = models.ForeignKey(
+        Store,
+        related_name="sales_rollups",
+        on_delete=models.CASCADE,
+        null=True,
+        blank=True,
+    )
+    tenant_id = "store_id"
+    channel = models.ForeignKey(
+        Channel, related_name="sales_rollups", on_delete=models.CASCADE
+    )
+    order_type = models.CharField(max_length=35, choices=settings.ORDER_TYPES)
+    granularity = models.CharField(
+        max_length=8, choices=SalesRollupGranularity.CHOICES
+    )
+    period = models.DateTimeField()
+    currency = models.CharField(max_length=settings.DEFAULT_CURRENCY_CODE_LENGTH)
+    orders_count = models.IntegerField(default=0)
+    total_net_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total_gross_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        default=0,
+    )
+    total = TaxedMoneyField(
+        net_amount_field="total_net_amount",
+        gross_amount_field="total_gross_amount",
+        currency_field="currency",
+    )
+
+    class Meta:
+        ordering = ("period", "pk")
+        indexes = [
+            models.Index(
+                fields=["store", "channel", "granularity", "period"],
+                name="salesrollup_period_idx",
+            )
+        ]
@@ -0,0 +1,223 @@
+"""Incrementally maintained sales rollups of orders.
+
+Every order that isn't a draft or canceled adds its total to the rollups of the
+hour and the day it was placed in, for its store, channel and order type. When
+an order is saved its previous contribution is subtracted and the current one is
+added as new delta rows, which a periodic task merges, so dashboards sum a few
+rollup rows instead of all orders of a period.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from decimal import Decimal
+from typing import Any, Dict, List, Mapping, Optional, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Exists, OuterRef, Sum
+from django.db.models.functions import TruncDay, TruncHour
+
+from . import OrderStatus, SalesRollupGranularity
+from .models import Order, SalesRollup
+
+# Order fields that the rollup of an order depends on.
+ROLLUP_ORDER_FIELDS = (
+    "store_id",
+    "channel_id",
+    "status",
+    "order_type",
+    "created",
+    "currency",
+    "total_net_amount",
+    "total_gross_amount",
+)
+EXCLUDED_STATUSES = (OrderStatus.DRAFT, OrderStatus.CANCELED)
+# Rollup fields that identify the period a row belongs to.
+ROLLUP_KEY_FIELDS = (
+    "store_id",
+    "channel_id",
+    "order_type",
+    "granularity",
+    "period",
+    "currency",
+)
+
+
+@dataclass(frozen=True)
+class SalesRollupEntry:
+    store_id: Optional[int]
+    channel_id: int
+    order_type: str
+    created: datetime
+    currency: str
+    total_net_amount: Decimal
+    total_gross_amount: Decimal
+
+
+def get_sales_rollup_entry(values: Mapping[str, Any]) -> Optional[SalesRollupEntry]:
+    """Return the contribution of the order values to rollups, if it has any."""
+    if values["status"] in EXCLUDED_STATUSES:
+        return None
+    return SalesRollupEntry(
+        store_id=values["store_id"],
+        channel_id=values["channel_id"],
+        order_type=values["order_type"],
+        created=values["created"],
+        currency=values["currency"],
+        total_net_amount=Decimal(values["total_net_amount"]),
+        total_gross_amount=Decimal(values["total_gross_amount"]),
+    )
+
+
+def get_order_sales_rollup_entry(order: Order) -> Optional[SalesRollupEntry]:
+    return get_sales_rollup_entry(
+        {field: getattr(order, field) for field in ROLLUP_ORDER_FIELDS}
+    )
+
+
+def get_rollup_periods(created: datetime) -> List[Tuple[str, datetime]]:
+    hour = created.astimezone(timezone.utc).replace(minute=0, second=0, microsecond=0)
+    return [
+        (SalesRollupGranularity.HOUR, hour),
+        (SalesRollupGranularity.DAY, hour.replace(hour=0)),
+    ]
+
+
+def _get_delta_rollups(entry: SalesRollupEntry, sign: int) -> List[SalesRollup]:
+    return [
+        SalesRollup(
+            store_id=entry.store_id,
+            channel_id=entry.channel_id,
+            order_type=entry.order_type,
+            granularity=granularity,
+            period=period,
+            currency=entry.currency,
+            orders_count=sign,
+            total_net_amount=sign * entry.total_net_amount,
+            total_gross_amount=sign * entry.total_gross_amount,
+        )
+        for granularity, period in get_rollup_periods(entry.created)
+    ]
+
+
+def update_sales_rollups(
+    previous: Optional[SalesRollupEntry], current: Optional[SalesRollupEntry]
+):
+    """Replace the previous contribution of an order to rollups with the current.
+
+    The change is inserted as delta rows instead of updating the rollup of the
+    period, so concurrent orders don't wait for each other's transactions on the
+    same rows. Deltas are merged later by `compact_sales_rollups`.
+    """
+    if previous == current:
+        return
+    rollups = []
+    if previous is not None:
+        rollups.extend(_get_delta_rollups(previous, -1))
+    if current is not None:
+        rollups.extend(_get_delta_rollups(current, 1))
+    # Rollups of other stores may be updated, e.g. by Celery tasks running
+    # without the current tenant, skip the tenant manager.
+    SalesRollup._base_manager.bulk_create(rollups)
+
+
+def compact_sales_rollups() -> int:
+    """Merge rollup rows of the same period into a single row.
+
+    Rows that sum up to nothing, e.g. of orders canceled in the same period, are
+    removed. Return the number of merged periods.
+    """
+    duplicates = SalesRollup._base_manager.filter(
+        **{field: OuterRef(field) for field in ROLLUP_KEY_FIELDS}
+    ).exclude(pk=OuterRef("pk"))
+    with transaction.atomic():
+        # Locked rows are skipped by a concurrent compaction once it gets them,
+        # so every delta is merged only once.
+        rows = (
+            SalesRollup._base_manager.filter(Exists(duplicates))
+            .select_for_update()
+            .order_by("pk")
+        )
+        merged: Dict[Tuple, SalesRollup] = {}
+        pks = []
+        for row in rows:
+            pks.append(row.pk)
+            key = tuple(getattr(row, field) for field in ROLLUP_KEY_FIELDS)
+            rollup = merged.get(key)
+            if rollup is None:
+                row.pk = None
+                merged[key] = row
+                continue
+            rollup.orders_count += row.orders_count
+            rollup.total_net_amount += row.total_net_amount
+            rollup.total_gross_amount += row.total_gross_amount
+        SalesRollup._base_manager.filter(pk__in=pks).delete()
+        SalesRollup._base_manager.bulk_create(
+            [
+                rollup
+                for rollup in merged.values()
+                if rollup.orders_count
+                or rollup.total_net_amount
+                or rollup.total_gross_amount
+            ],
+            batch_size=1000,
+        )
+    return len(merged)
+
+
+def move_sales_rollups_to_channel(origin_channel_id: int, target_channel_id: int):
+    """Assign rollups to the channel that orders of the origin channel moved to.
+
+    Orders are moved with a queryset update, which doesn't send the signals that
+    maintain rollups. Readers sum all rows of a period, so the moved rollups
+    don't need to be merged with the rollups of the target channel.
+    """
+    SalesRollup._base_manager.filter(channel_id=origin_channel_id).update(
+        channel_id=target_channel_id
+    )
+
+
+def rebuild_sales_rollups(store_id: Optional[int] = None) -> int:
+    """Recalculate rollups from orders, e.g. for orders created before them.
+
+    Return the number of created rollups.
+    """
+    orders = Order._base_manager.exclude(status__in=EXCLUDED_STATUSES)
+    rollups = SalesRollup._base_manager.all()
+    if store_id is not None:
+        orders = orders.filter(store_id=store_id)
+        rollups = rollups.filter(store_id=store_id)
+
+    new_rollups = []
+    for granularity, trunc in (
+        (SalesRollupGranularity.HOUR, TruncHour),
+        (SalesRollupGranularity.DAY, TruncDay),
+    ):
+        rows = (
+            orders.annotate(rollup_period=trunc("created", tzinfo=timezone.utc))
+            .values("store_id", "channel_id", "order_type", "currency", "rollup_period")
+            .annotate(
+                rollup_orders_count=Count("pk"),
+                rollup_total_net_amount=Sum("total_net_amount"),
+                rollup_total_gross_amount=Sum("total_gross_amount"),
+            )
+            .order_by()
+        )
+        new_rollups.extend(_get_rollup(granularity, row) for row in rows.iterator())
+
+    with transaction.atomic():
+        rollups.delete()
+        SalesRollup._base_manager.bulk_create(new_rollups, batch_size=1000)
+    return len(new_rollups)
+
+
+def _get_rollup(granularity: str, row: Dict[str, Any]) -> SalesRollup:
+    return SalesRollup(
+        store_id=row["store_id"],
+        channel_id=row["channel_id"],
+        order_type=row["order_type"],
+        granularity=granularity,
+        period=row["rollup_period"],
+        currency=row["currency"],
+        orders_count=row["rollup_orders_count"],
+        total_net_amount=row["rollup_total_net_amount"],
+        total_gross_amount=row["rollup_total_gross_amount"],
+    )
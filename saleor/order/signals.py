@@ -0,0 +1,52 @@
+from .models import Order
+from .rollups import (
+    ROLLUP_ORDER_FIELDS,
+    get_order_sales_rollup_entry,
+    get_sales_rollup_entry,
+    update_sales_rollups,
+)
+
+# Names under which fields the rollups depend on may be passed in `update_fields`.
+ROLLUP_UPDATE_FIELDS = frozenset(
+    [*ROLLUP_ORDER_FIELDS, "store", "channel", "total_net", "total_gross", "total"]
+)
+PREVIOUS_ENTRY_ATTR = "_previous_sales_rollup_entry"
+
+
+def _fetch_sales_rollup_entry(order_pk: int, lock: bool = False):
+    orders = Order._base_manager.filter(pk=order_pk)
+    if lock:
+        orders = orders.select_for_update()
+    values = orders.values(*ROLLUP_ORDER_FIELDS).first()
+    return get_sales_rollup_entry(values) if values else None
+
+
+def fetch_previous_sales_rollup_entry(
+    sender, instance, raw=False, update_fields=None, **kwargs
+):
+    """Remember the contribution of the order to rollups before it's saved."""
+    if raw:
+        return
+    if update_fields is not None and not ROLLUP_UPDATE_FIELDS.intersection(
+        update_fields
+    ):
+        return
+    previous_entry = None
+    if not instance._state.adding:
+        # Read and lock the saved values, the instance may have been loaded
+        # before the order was changed by another request. The lock is held
+        # until the rollups are updated, `Order.save` runs in a transaction.
+        previous_entry = _fetch_sales_rollup_entry(instance.pk, lock=True)
+    setattr(instance, PREVIOUS_ENTRY_ATTR, previous_entry)
+
+
+def update_sales_rollups_for_order(sender, instance, raw=False, **kwargs):
+    if raw or not hasattr(instance, PREVIOUS_ENTRY_ATTR):
+        return
+    previous_entry = instance.__dict__.pop(PREVIOUS_ENTRY_ATTR)
+    # Fields missing from `update_fields` were not written, read what was saved.
+    update_sales_rollups(previous_entry, _fetch_sales_rollup_entry(instance.pk))
+
+
+def remove_sales_rollups_for_order(sender, instance, **kwargs):
+    update_sales_rollups(get_order_sales_rollup_entry(instance), None)
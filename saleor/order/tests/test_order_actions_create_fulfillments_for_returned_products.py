@@ -561,6 +561,8 @@ def test_create_return_fulfillment_with_lines_already_refunded(
     Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    stock.quantity_allocated = order_line.quantity
+    stock.save(update_fields=["quantity_allocated"])
     refunded_fulfillment = Fulfillment.objects.create(
         order=fulfilled_order, status=FulfillmentStatus.REFUNDED
     )
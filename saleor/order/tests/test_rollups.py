@@ -0,0 +1,297 @@
+from datetime import datetime, timezone
+from decimal import Decimal
+
+import pytest
+from django.core.management import call_command
+from django.db import connection
+from django.db.models import Sum
+from django.test.utils import CaptureQueriesContext
+from prices import Money, TaxedMoney
+
+from .. import OrderStatus, SalesRollupGranularity
+from ..models import Order, SalesRollup
+from ..rollups import (
+    compact_sales_rollups,
+    move_sales_rollups_to_channel,
+    rebuild_sales_rollups,
+)
+
+PLACED_AT = datetime(2022, 3, 1, 10, 30, tzinfo=timezone.utc)
+HOUR = datetime(2022, 3, 1, 10, tzinfo=timezone.utc)
+DAY = datetime(2022, 3, 1, tzinfo=timezone.utc)
+
+
+def _create_order(store, channel, gross, status=OrderStatus.UNFULFILLED, **kwargs):
+    return Order.objects.create(
+        store=store,
+        channel=channel,
+        currency=channel.currency_code,
+        status=status,
+        total=TaxedMoney(
+            net=Money(gross - 2, channel.currency_code),
+            gross=Money(gross, channel.currency_code),
+        ),
+        created=kwargs.pop("created", PLACED_AT),
+        **kwargs,
+    )
+
+
+def _get_rollups():
+    rows = (
+        SalesRollup.objects.values("granularity", "period", "order_type")
+        .annotate(
+            period_orders_count=Sum("orders_count"),
+            period_gross_amount=Sum("total_gross_amount"),
+        )
+        .filter(period_orders_count__gt=0)
+        .order_by()
+    )
+    return {
+        (row["granularity"], row["period"], row["order_type"]): (
+            row["period_orders_count"],
+            row["period_gross_amount"],
+        )
+        for row in rows
+    }
+
+
+def test_sales_rollups_for_placed_orders(store, channel_USD):
+    # when
+    _create_order(store, channel_USD, 10, order_type="delivery")
+    _create_order(store, channel_USD, 20, order_type="delivery")
+    _create_order(
+        store,
+        channel_USD,
+        5,
+        order_type="pickup",
+        created=datetime(2022, 3, 1, 18, tzinfo=timezone.utc),
+    )
+
+    # then
+    assert _get_rollups() == {
+        (SalesRollupGranularity.HOUR, HOUR, "delivery"): (2, Decimal(30)),
+        (
+            SalesRollupGranularity.HOUR,
+            datetime(2022, 3, 1, 18, tzinfo=timezone.utc),
+            "pickup",
+        ): (1, Decimal(5)),
+        (SalesRollupGranularity.DAY, DAY, "delivery"): (2, Decimal(30)),
+        (SalesRollupGranularity.DAY, DAY, "pickup"): (1, Decimal(5)),
+    }
+    rollups = SalesRollup.objects.filter(
+        granularity=SalesRollupGranularity.DAY, order_type="delivery"
+    )
+    assert {rollup.store for rollup in rollups} == {store}
+    assert rollups.aggregate(Sum("total_net_amount"), Sum("total_gross_amount")) == {
+        "total_net_amount__sum": Decimal(26),
+        "total_gross_amount__sum": Decimal(30),
+    }
+
+
+def test_sales_rollups_skip_draft_orders(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10, status=OrderStatus.DRAFT)
+    assert _get_rollups() == {}
+
+    # when
+    order.status = OrderStatus.UNFULFILLED
+    order.save(update_fields=["status"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(10))
+
+
+def test_sales_rollups_after_order_cancel(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+    _create_order(store, channel_USD, 20)
+
+    # when
+    order.status = OrderStatus.CANCELED
+    order.save(update_fields=["status"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(20))
+
+
+def test_sales_rollups_after_order_total_change(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+
+    # when
+    order.total = TaxedMoney(net=Money(12, "USD"), gross=Money(15, "USD"))
+    order.save(update_fields=["total_net_amount", "total_gross_amount"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.HOUR, HOUR, "pickup")] == (1, Decimal(15))
+
+
+def test_sales_rollups_after_order_changed_by_another_instance(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+    stale_order = Order.objects.get(pk=order.pk)
+    order.status = OrderStatus.CANCELED
+    order.save(update_fields=["status"])
+
+    # when
+    stale_order.status = OrderStatus.FULFILLED
+    stale_order.save(update_fields=["status"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(10))
+
+
+def test_sales_rollups_after_partial_order_update(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+    order.total = TaxedMoney(net=Money(12, "USD"), gross=Money(15, "USD"))
+
+    # when
+    order.status = OrderStatus.FULFILLED
+    order.save(update_fields=["status"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(10))
+
+
+def test_sales_rollups_lock_order_while_updated(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+
+    # when
+    order.status = OrderStatus.CANCELED
+    with CaptureQueriesContext(connection) as queries:
+        order.save(update_fields=["status"])
+
+    # then
+    assert "FOR UPDATE" in queries[0]["sql"]
+    assert queries[1]["sql"].startswith("UPDATE")
+    # Rollups are changed by inserting deltas, without locking existing rows.
+    rollup_queries = [
+        query["sql"] for query in queries if "salesrollup" in query["sql"]
+    ]
+    assert len(rollup_queries) == 1
+    assert rollup_queries[0].startswith("INSERT")
+
+
+def test_compact_sales_rollups(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+    _create_order(store, channel_USD, 20)
+    _create_order(store, channel_USD, 5, order_type="delivery")
+    order.status = OrderStatus.CANCELED
+    order.save(update_fields=["status"])
+    expected_rollups = _get_rollups()
+
+    # when
+    merged = compact_sales_rollups()
+
+    # then
+    assert merged == 2
+    assert _get_rollups() == expected_rollups
+    assert SalesRollup.objects.count() == 4
+    rollup = SalesRollup.objects.get(
+        granularity=SalesRollupGranularity.DAY, order_type="pickup"
+    )
+    assert rollup.total == TaxedMoney(net=Money(18, "USD"), gross=Money(20, "USD"))
+
+
+def test_compact_sales_rollups_removes_empty_periods(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+    order.status = OrderStatus.CANCELED
+    order.save(update_fields=["status"])
+
+    # when
+    compact_sales_rollups()
+
+    # then
+    assert not SalesRollup.objects.exists()
+
+
+def test_move_sales_rollups_to_channel(store, channel_USD, other_channel_USD):
+    # given
+    _create_order(store, channel_USD, 10)
+    _create_order(store, other_channel_USD, 20)
+
+    # when
+    move_sales_rollups_to_channel(channel_USD.pk, other_channel_USD.pk)
+
+    # then
+    rollups = SalesRollup.objects.filter(granularity=SalesRollupGranularity.DAY)
+    assert rollups.filter(channel=channel_USD).count() == 0
+    assert rollups.filter(channel=other_channel_USD).aggregate(
+        Sum("orders_count"), Sum("total_gross_amount")
+    ) == {"orders_count__sum": 2, "total_gross_amount__sum": Decimal(30)}
+
+
+def test_sales_rollups_after_order_delete(store, channel_USD):
+    # given
+    order = _create_order(store, channel_USD, 10)
+
+    # when
+    order.delete()
+
+    # then
+    assert _get_rollups() == {}
+
+
+def test_sales_rollups_not_updated_for_other_fields(
+    store, channel_USD, django_assert_num_queries
+):
+    # given
+    order = _create_order(store, channel_USD, 10)
+
+    # when
+    order.customer_note = "Extra cheese"
+    with django_assert_num_queries(1):
+        order.save(update_fields=["customer_note"])
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(10))
+
+
+def test_rebuild_sales_rollups(store, channel_USD):
+    # given
+    _create_order(store, channel_USD, 10)
+    _create_order(store, channel_USD, 20, order_type="delivery")
+    _create_order(store, channel_USD, 30, status=OrderStatus.CANCELED)
+    expected_rollups = _get_rollups()
+    SalesRollup.objects.all().delete()
+
+    # when
+    created = rebuild_sales_rollups()
+
+    # then
+    assert created == 4
+    assert _get_rollups() == expected_rollups
+
+
+def test_rebuild_sales_rollups_command(store, channel_USD):
+    # given
+    _create_order(store, channel_USD, 10)
+    SalesRollup.objects.update(orders_count=5)
+
+    # when
+    call_command("rebuild_sales_rollups", store_id=store.pk)
+
+    # then
+    rollups = _get_rollups()
+    assert rollups[(SalesRollupGranularity.DAY, DAY, "pickup")] == (1, Decimal(10))
+
+
+@pytest.mark.parametrize(
+    "status", [OrderStatus.UNCONFIRMED, OrderStatus.FULFILLED, OrderStatus.RETURNED]
+)
+def test_sales_rollups_count_non_draft_orders(status, store, channel_USD):
+    # when
+    _create_order(store, channel_USD, 10, status=status)
+
+    # then
+    assert len(_get_rollups()) == 2
@@ -1,4 +1,4 @@
-from saleor.core.utils.logging import log_info
+from saleor.core.utils.logging import log_event
 from saleor.payment.gateways.stripe.consts import STRIPE_API_VERSION
 from saleor.checkout.models import Checkout
 from typing import List
@@ -76,7 +76,11 @@ def authorize(
                 # return_url= "http://52.58.195.234:81/order-history" + "/" + payment.token + "?payment_token=true",
                 stripe_version=STRIPE_API_VERSION
             )
-        log_info("Stripe", "Stripe Intent", content=intent.__dict__)
+        log_event(
+            "stripe.payment_intent.create",
+            payment_intent_id=intent.id,
+            payment_intent_status=intent.status,
+        )
         # if config.store_customer and not customer_id:
         #     with opentracing.global_tracer().start_active_span(
         #         "stripe.Customer.create"
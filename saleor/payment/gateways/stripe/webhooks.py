@@ -1,6 +1,6 @@
 import json
 import logging
-from saleor.core.utils.logging import log_info
+from saleor.core.utils.logging import log_event
 from typing import Optional
 
 from django.contrib.auth.models import AnonymousUser
@@ -144,7 +144,12 @@ def _finalize_checkout(
         checkout, lines, discounts, manager  # type: ignore
     )
 
-    log_info('Webhook', 'Webhook Respone', content=gateway_response.__dict__)
+    log_event(
+        "stripe.webhook.payment_intent",
+        payment_intent_id=payment_intent.id,
+        kind=kind,
+        amount=str(gateway_response.amount),
+    )
     order, _, _, _ = complete_checkout(
         manager=manager,
         checkout_info=checkout_info,
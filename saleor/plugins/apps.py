@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 
 if TYPE_CHECKING:
@@ -19,6 +20,8 @@ class PluginConfig(AppConfig):
         for plugin_path in plugins:
             self.load_and_check_plugin(plugin_path)
 
+        self.connect_pooled_managers_invalidation()
+
     def load_and_check_plugin(self, plugin_path: str):
         try:
             plugin = import_string(plugin_path)
@@ -33,3 +36,22 @@ class PluginConfig(AppConfig):
         for field in fields:
             if not getattr(plugin_class, field, None):
                 raise ImproperlyConfigured(f"Missing field {field} for plugin - {name}")
+
+    def connect_pooled_managers_invalidation(self):
+        from ..channel.models import Channel
+        from .models import PluginConfiguration
+        from .signals import invalidate_plugins_managers
+
+        # managers shared between requests hold plugin configurations and
+        # the list of channels
+        for model in (PluginConfiguration, Channel):
+            post_save.connect(
+                invalidate_plugins_managers,
+                sender=model,
+                dispatch_uid=f"invalidate_plugins_managers_on_{model.__name__}_save",
+            )
+            post_delete.connect(
+                invalidate_plugins_managers,
+                sender=model,
+                dispatch_uid=f"invalidate_plugins_managers_on_{model.__name__}_delete",
+            )
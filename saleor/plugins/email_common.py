@@ -6,7 +6,6 @@ from dataclasses import dataclass
 from decimal import Decimal, InvalidOperation
 from email.headerregistry import Address
 from typing import List, Optional
-from saleor.core.utils.logging import log_info
 import dateutil.parser
 from django_multitenant.utils import get_current_tenant
 import html2text
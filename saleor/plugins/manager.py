@@ -1,3 +1,5 @@
+import threading
+import uuid
 from collections import defaultdict
 from decimal import Decimal
 from typing import (
@@ -13,11 +15,14 @@ from typing import (
 )
 
 import opentracing
+from cachetools import TTLCache
 from django.conf import settings
+from django.core.cache import cache
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse, HttpResponseNotFound
 from django.utils.module_loading import import_string
 from django_countries.fields import Country
+from django_multitenant.utils import get_current_tenant
 from prices import Money, TaxedMoney
 
 from ..channel.models import Channel
@@ -51,6 +56,8 @@ if TYPE_CHECKING:
 
 NotifyEventTypeChoice = str
 
+PLUGINS_CONFIGURATION_VERSION_CACHE_KEY = "plugins_configuration_version"
+
 
 class PluginsManager(PaymentInterface):
     """Base manager for handling plugins logic."""
@@ -866,6 +873,7 @@ class PluginsManager(PaymentInterface):
                 configuration.description = plugin.PLUGIN_DESCRIPTION
                 plugin.active = configuration.active
                 plugin.configuration = configuration.configuration
+                invalidate_pooled_plugins_managers()
                 return configuration
 
     def get_plugin(
@@ -1006,3 +1014,46 @@ class PluginsManager(PaymentInterface):
 def get_plugins_manager() -> PluginsManager:
     with opentracing.global_tracer().start_active_span("get_plugins_manager"):
         return PluginsManager(settings.PLUGINS)
+
+
+_managers_pool = TTLCache(
+    maxsize=settings.PLUGINS_MANAGER_POOL_SIZE,
+    ttl=settings.PLUGINS_MANAGER_POOL_TIMEOUT,
+)
+_managers_pool_lock = threading.Lock()
+
+
+def get_plugins_configuration_version() -> str:
+    version = cache.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+        version = cache.get(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_pooled_plugins_managers():
+    """Make all workers build a new manager on their next request."""
+    cache.set(PLUGINS_CONFIGURATION_VERSION_CACHE_KEY, uuid.uuid4().hex, None)
+    with _managers_pool_lock:
+        _managers_pool.clear()
+
+
+def get_pooled_plugins_manager() -> PluginsManager:
+    """Return a plugins manager shared by all requests of the current tenant.
+
+    Managers are kept per worker and rebuilt when the plugins configuration version
+    changes, or once they are older than `PLUGINS_MANAGER_POOL_TIMEOUT`.
+    """
+    tenant = get_current_tenant()
+    key = (
+        tenant.id if tenant else None,
+        get_plugins_configuration_version(),
+        tuple(settings.PLUGINS),
+    )
+    with _managers_pool_lock:
+        manager = _managers_pool.get(key)
+    if manager is None:
+        manager = get_plugins_manager()
+        with _managers_pool_lock:
+            _managers_pool[key] = manager
+    return manager
@@ -0,0 +1,5 @@
+from .manager import invalidate_pooled_plugins_managers
+
+
+def invalidate_plugins_managers(sender, **kwargs):
+    invalidate_pooled_plugins_managers()
@@ -12,7 +12,11 @@ from ...core.taxes import TaxType
 from ...payment.interface import PaymentGateway
 from ...product.models import Product
 from ..base_plugin import ExternalAccessTokens
-from ..manager import PluginsManager, get_plugins_manager
+from ..manager import (
+    PluginsManager,
+    get_plugins_manager,
+    get_pooled_plugins_manager,
+)
 from ..models import PluginConfiguration
 from ..tests.sample_plugins import (
     ActiveDummyPaymentGateway,
@@ -875,3 +879,23 @@ def test_list_external_authentications_active_only(channel_USD):
         "id": PluginSample.PLUGIN_ID,
         "name": PluginSample.PLUGIN_NAME,
     } in external_auths
+
+
+def test_get_pooled_plugins_manager_reuses_manager(settings):
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_pooled_plugins_manager()
+    assert get_pooled_plugins_manager() is manager
+
+
+def test_get_pooled_plugins_manager_rebuilt_after_configuration_change(settings):
+    # given
+    settings.PLUGINS = ["saleor.plugins.tests.sample_plugins.PluginSample"]
+    manager = get_pooled_plugins_manager()
+
+    # when
+    manager.save_plugin_configuration(PluginSample.PLUGIN_ID, None, {"active": False})
+
+    # then
+    new_manager = get_pooled_plugins_manager()
+    assert new_manager is not manager
+    assert not new_manager.get_plugin(PluginSample.PLUGIN_ID).active
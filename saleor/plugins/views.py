@@ -2,7 +2,6 @@ from django.conf import settings
 from django.core.handlers.wsgi import WSGIRequest
 from django.http import HttpResponse
 from django_multitenant.utils import get_current_tenant
-from saleor.core.utils.logging import log_info
 import json
 import os
 from saleor.core.jwt import get_domain_from_request
@@ -0,0 +1,278 @@
+"""Pooled and concurrent delivery of webhook payloads.
+
+Each webhook target host gets its own `requests.Session`, so successive payloads
+reuse kept-alive connections instead of opening a new connection per event.
+Payloads of an event are posted to all its webhooks concurrently in a pool of
+`WEBHOOK_DELIVERY_WORKERS` threads.
+
+Webhooks with `batch_events` set receive events coalesced into batches. Events
+are kept in the shared Django cache for `WEBHOOK_BATCH_WINDOW` seconds and sent
+as a single JSON list of `{"event_type": ..., "data": ...}` objects.
+"""
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.cookiejar import DefaultCookiePolicy
+from typing import Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+import requests
+from django.conf import settings
+from django.core.cache import cache
+from requests.adapters import HTTPAdapter
+from requests.exceptions import RequestException
+
+from . import signature_for_payload
+
+logger = logging.getLogger(__name__)
+
+WEBHOOK_TIMEOUT = 10
+BATCH_EVENT_TYPE = "batch"
+BATCH_CACHE_KEY_PREFIX = "webhook_batch:"
+# Events wait in the cache until their batch is sent, a busy queue may delay
+# sending well past the batch window.
+BATCH_CACHE_TIMEOUT = 60 * 60
+
+
+@dataclass
+class WebhookDelivery:
+    webhook_id: int
+    target_url: str
+    secret_key: Optional[str]
+    event_type: str
+    data: str
+
+
+class DeliveryMetrics:
+    """Delivery counters of the current process."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.delivered = 0
+            self.failed = 0
+            self.retries = 0
+            self.total_duration = 0.0
+            self.max_duration = 0.0
+
+    def record(self, duration: float, failed: bool = False, attempt: int = 0):
+        with self._lock:
+            if failed:
+                self.failed += 1
+            else:
+                self.delivered += 1
+            if attempt:
+                self.retries += 1
+            self.total_duration += duration
+            self.max_duration = max(self.max_duration, duration)
+
+    def as_dict(self) -> Dict[str, float]:
+        with self._lock:
+            requests_count = self.delivered + self.failed
+            return {
+                "delivered": self.delivered,
+                "failed": self.failed,
+                "retries": self.retries,
+                "average_duration": (
+                    self.total_duration / requests_count if requests_count else 0.0
+                ),
+                "max_duration": self.max_duration,
+            }
+
+
+delivery_metrics = DeliveryMetrics()
+
+
+def record_delivery(
+    webhook_id,
+    target_url: str,
+    event_type: str,
+    duration: float,
+    error: Optional[Exception] = None,
+    attempt: int = 0,
+):
+    """Update the delivery metrics and log failed requests."""
+    delivery_metrics.record(duration, failed=error is not None, attempt=attempt)
+    if error is not None:
+        logger.warning(
+            "[Webhook ID:%r] Failed request to %r for event %r: %r",
+            webhook_id,
+            target_url,
+            event_type,
+            error,
+            extra={
+                "webhook_id": webhook_id,
+                "target_url": target_url,
+                "event_type": event_type,
+                "duration": duration,
+                "attempt": attempt,
+            },
+        )
+
+
+_sessions: Dict[str, requests.Session] = {}
+_sessions_lock = threading.Lock()
+
+
+def get_session(target_url: str) -> requests.Session:
+    """Return the session keeping connections to the host of the URL alive."""
+    parts = urlparse(target_url)
+    key = "%s://%s" % (parts.scheme.lower(), parts.netloc.lower())
+    session = _sessions.get(key)
+    if session is None:
+        with _sessions_lock:
+            session = _sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                # Sessions are shared by all webhooks of the host, don't let
+                # cookies set for one of them reach the others.
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(
+                    pool_connections=1, pool_maxsize=settings.WEBHOOK_POOL_MAXSIZE
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                _sessions[key] = session
+    return session
+
+
+def close_sessions():
+    with _sessions_lock:
+        for session in _sessions.values():
+            session.close()
+        _sessions.clear()
+
+
+if hasattr(os, "register_at_fork"):
+    # Connections opened before forking workers must not be shared with them.
+    os.register_at_fork(after_in_child=_sessions.clear)
+
+
+def send_webhook_using_http(target_url, message, domain, signature, event_type):
+    headers = {
+        "Content-Type": "application/json",
+        "X-Saleor-Event": event_type,
+        "X-Saleor-Domain": domain,
+        "X-Saleor-Signature": signature,
+    }
+
+    response = get_session(target_url).post(
+        target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
+    )
+    response.raise_for_status()
+    return response
+
+
+def send_webhooks_using_http(
+    deliveries: List[WebhookDelivery], domain: str, workers: int = None
+) -> List[WebhookDelivery]:
+    """Post payloads to their HTTP webhooks concurrently.
+
+    Return the deliveries that failed.
+    """
+    if workers is None:
+        workers = settings.WEBHOOK_DELIVERY_WORKERS
+
+    def send(delivery: WebhookDelivery) -> bool:
+        message = delivery.data.encode("utf-8")
+        signature = signature_for_payload(message, delivery.secret_key)
+        started_at = time.perf_counter()
+        error = None
+        try:
+            send_webhook_using_http(
+                delivery.target_url, message, domain, signature, delivery.event_type
+            )
+        except RequestException as e:
+            error = e
+        else:
+            logger.debug(
+                "[Webhook ID:%r] Payload sent to %r for event %r",
+                delivery.webhook_id,
+                delivery.target_url,
+                delivery.event_type,
+            )
+        record_delivery(
+            delivery.webhook_id,
+            delivery.target_url,
+            delivery.event_type,
+            time.perf_counter() - started_at,
+            error=error,
+        )
+        return error is None
+
+    if workers and len(deliveries) > 1:
+        with ThreadPoolExecutor(max_workers=min(workers, len(deliveries))) as executor:
+            results = list(executor.map(send, deliveries))
+    else:
+        results = [send(delivery) for delivery in deliveries]
+    return [
+        delivery for delivery, delivered in zip(deliveries, results) if not delivered
+    ]
+
+
+def _get_batch_key(webhook_id, *parts) -> str:
+    return "%s%s:%s" % (
+        BATCH_CACHE_KEY_PREFIX,
+        webhook_id,
+        ":".join(str(part) for part in parts),
+    )
+
+
+def get_batch_generation(webhook_id) -> int:
+    key = _get_batch_key(webhook_id, "generation")
+    cache.add(key, 1, None)
+    return cache.get(key, 1)
+
+
+def add_to_batch(webhook_id, event_type: str, data: str) -> Tuple[int, int]:
+    """Add the event to the open batch of the webhook.
+
+    Return the generation of the batch and the position of the event in it.
+    """
+    generation = get_batch_generation(webhook_id)
+    count_key = _get_batch_key(webhook_id, generation, "count")
+    cache.add(count_key, 0, BATCH_CACHE_TIMEOUT)
+    position = cache.incr(count_key)
+    cache.set(
+        _get_batch_key(webhook_id, generation, position),
+        (event_type, data),
+        BATCH_CACHE_TIMEOUT,
+    )
+    return generation, position
+
+
+def is_batch_open(webhook_id, generation: int) -> bool:
+    return cache.get(_get_batch_key(webhook_id, "generation")) == generation
+
+
+def pop_batch(webhook_id, generation: int) -> List[Tuple[str, str]]:
+    """Close the batch of the given generation and return its events."""
+    if is_batch_open(webhook_id, generation):
+        # Events added from now on go to the next batch.
+        try:
+            cache.incr(_get_batch_key(webhook_id, "generation"))
+        except ValueError:
+            pass
+    count = cache.get(_get_batch_key(webhook_id, generation, "count"), 0)
+    keys = [
+        _get_batch_key(webhook_id, generation, position)
+        for position in range(1, count + 1)
+    ]
+    events = cache.get_many(keys)
+    cache.delete_many(list(events))
+    return [events[key] for key in keys if key in events]
+
+
+def get_batch_payload(events: Iterable[Tuple[str, str]]) -> str:
+    # Event payloads are serialized already, they are embedded as they are.
+    return "[%s]" % ", ".join(
+        '{"event_type": %s, "data": %s}' % (json.dumps(event_type), data or "null")
+        for event_type, data in events
+    )
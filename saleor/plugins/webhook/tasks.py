@@ -1,11 +1,12 @@
 import logging
+import time
 from enum import Enum
 from json import JSONDecodeError
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, List
 from urllib.parse import urlparse, urlunparse
 
 import boto3
-import requests
+from django.conf import settings
 from google.cloud import pubsub_v1
 from requests.exceptions import RequestException
 
@@ -15,13 +16,26 @@ from ...site.models import Site
 from ...webhook.event_types import WebhookEventType
 from ...webhook.models import Webhook
 from . import signature_for_payload
+from .delivery import (
+    BATCH_EVENT_TYPE,
+    WebhookDelivery,
+    add_to_batch,
+    get_batch_payload,
+    is_batch_open,
+    pop_batch,
+    record_delivery,
+    send_webhook_using_http,
+    send_webhooks_using_http,
+)
 
 if TYPE_CHECKING:
     from ...app.models import App
 
 logger = logging.getLogger(__name__)
 
-WEBHOOK_TIMEOUT = 10
+# Delay of the first retry of failed requests, like `retry_backoff` of
+# `send_webhook_request`.
+WEBHOOK_RETRY_DELAY = 10
 
 
 class WebhookSchemes(str, Enum):
@@ -58,14 +72,94 @@ def _get_webhooks_for_event(event_type, webhooks=None):
 
 @app.task(compression="zlib")
 def trigger_webhooks_for_event(event_type, data):
-    """Send a webhook request for an event as an async task."""
+    """Send webhook requests for an event as an async task.
+
+    Payloads are posted to HTTP webhooks concurrently, failed requests are
+    retried in separate tasks.
+    """
     webhooks = _get_webhooks_for_event(event_type)
+    deliveries = []
     for webhook in webhooks:
-        send_webhook_request.delay(
-            webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+        if webhook.batch_events:
+            add_webhook_event_to_batch(webhook.pk, event_type, data)
+        else:
+            deliveries.append(
+                WebhookDelivery(
+                    webhook.pk, webhook.target_url, webhook.secret_key, event_type, data
+                )
+            )
+    send_webhook_deliveries(deliveries)
+
+
+def send_webhook_deliveries(deliveries: List[WebhookDelivery]):
+    http_deliveries = []
+    for delivery in deliveries:
+        scheme = urlparse(delivery.target_url).scheme.lower()
+        if scheme in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
+            http_deliveries.append(delivery)
+        else:
+            send_webhook_request.delay(
+                delivery.webhook_id,
+                delivery.target_url,
+                delivery.secret_key,
+                delivery.event_type,
+                delivery.data,
+            )
+    if not http_deliveries:
+        return
+
+    domain = Site.objects.get_current().domain
+    failed_deliveries = send_webhooks_using_http(http_deliveries, domain)
+    for delivery in failed_deliveries:
+        send_webhook_request.apply_async(
+            (
+                delivery.webhook_id,
+                delivery.target_url,
+                delivery.secret_key,
+                delivery.event_type,
+                delivery.data,
+            ),
+            # The failed request was the first attempt.
+            kwargs={"attempt": 1},
+            countdown=WEBHOOK_RETRY_DELAY,
         )
 
 
+def add_webhook_event_to_batch(webhook_id, event_type, data):
+    generation, position = add_to_batch(webhook_id, event_type, data)
+    if position >= settings.WEBHOOK_BATCH_MAX_SIZE or not is_batch_open(
+        webhook_id, generation
+    ):
+        # The batch is full or it was sent before the event was added to it.
+        send_webhook_batch.delay(webhook_id, generation)
+    elif position == 1:
+        send_webhook_batch.apply_async(
+            (webhook_id, generation), countdown=settings.WEBHOOK_BATCH_WINDOW
+        )
+
+
+@app.task(compression="zlib")
+def send_webhook_batch(webhook_id, generation):
+    """Send events coalesced in a batch of the webhook as a single request."""
+    events = pop_batch(webhook_id, generation)
+    if not events:
+        return
+    webhook = Webhook.objects.filter(pk=webhook_id, is_active=True).first()
+    if not webhook:
+        return
+    send_webhook_deliveries(
+        [
+            WebhookDelivery(
+                webhook.pk,
+                webhook.target_url,
+                webhook.secret_key,
+                BATCH_EVENT_TYPE,
+                get_batch_payload(events),
+            )
+        ]
+    )
+
+
 def trigger_webhook_sync(event_type: str, data: str, app: "App"):
     """Send a synchronous webhook request."""
     webhooks = _get_webhooks_for_event(event_type, app.webhooks.all())
@@ -78,21 +172,6 @@ def trigger_webhook_sync(event_type: str, data: str, app: "App"):
     )
 
 
-def send_webhook_using_http(target_url, message, domain, signature, event_type):
-    headers = {
-        "Content-Type": "application/json",
-        "X-Saleor-Event": event_type,
-        "X-Saleor-Domain": domain,
-        "X-Saleor-Signature": signature,
-    }
-
-    response = requests.post(
-        target_url, data=message, headers=headers, timeout=WEBHOOK_TIMEOUT
-    )
-    response.raise_for_status()
-    return response
-
-
 def send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type):
     parts = urlparse(target_url)
     region = "us-east-1"
@@ -145,16 +224,33 @@ def send_webhook_using_google_cloud_pubsub(
 @app.task(
     autoretry_for=(RequestException,),
     retry_backoff=10,
-    retry_kwargs={"max_retries": 5},
+    # HTTP requests are first sent by `trigger_webhooks_for_event`, which counts
+    # as the first of 6 attempts.
+    retry_kwargs={"max_retries": 4},
     compression="zlib",
 )
-def send_webhook_request(webhook_id, target_url, secret, event_type, data):
+def send_webhook_request(webhook_id, target_url, secret, event_type, data, attempt=0):
     parts = urlparse(target_url)
     domain = Site.objects.get_current().domain
     message = data.encode("utf-8")
     signature = signature_for_payload(message, secret)
     if parts.scheme.lower() in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
-        send_webhook_using_http(target_url, message, domain, signature, event_type)
+        started_at = time.perf_counter()
+        error = None
+        try:
+            send_webhook_using_http(target_url, message, domain, signature, event_type)
+        except RequestException as e:
+            error = e
+            raise
+        finally:
+            record_delivery(
+                webhook_id,
+                target_url,
+                event_type,
+                time.perf_counter() - started_at,
+                error=error,
+                attempt=attempt + (send_webhook_request.request.retries or 0),
+            )
     elif parts.scheme.lower() == WebhookSchemes.AWS_SQS:
         send_webhook_using_aws_sqs(target_url, message, domain, signature, event_type)
     elif parts.scheme.lower() == WebhookSchemes.GOOGLE_CLOUD_PUBSUB:
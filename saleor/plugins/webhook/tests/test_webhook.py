@@ -47,7 +47,7 @@ third_url = "http://www.example.com/third/"
         (WebhookEventType.CUSTOMER_CREATED, 0, set()),
     ],
 )
-@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request.delay")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhooks_using_http")
 def test_trigger_webhooks_for_event_calls_expected_events(
     mock_request,
     event_name,
@@ -84,10 +84,14 @@ def test_trigger_webhooks_for_event_calls_expected_events(
     )
     third_webhook.events.create(event_type=WebhookEventType.ANY)
 
+    mock_request.return_value = []
+
     trigger_webhooks_for_event(event_name, data="")
-    assert mock_request.call_count == total_webhook_calls
 
-    target_url_calls = {call[0][1] for call in mock_request.call_args_list}
+    deliveries = mock_request.call_args[0][0] if mock_request.called else []
+    assert len(deliveries) == total_webhook_calls
+
+    target_url_calls = {delivery.target_url for delivery in deliveries}
     assert target_url_calls == expected_target_urls
 
 
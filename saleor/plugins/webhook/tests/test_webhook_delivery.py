@@ -0,0 +1,280 @@
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import pytest
+
+from ....webhook.event_types import WebhookEventType
+from .. import signature_for_payload
+from ..delivery import (
+    WebhookDelivery,
+    close_sessions,
+    delivery_metrics,
+    get_batch_generation,
+    send_webhooks_using_http,
+)
+from ..tasks import send_webhook_batch, send_webhook_request, trigger_webhooks_for_event
+
+
+class WebhookTargetHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_POST(self):
+        body = self.rfile.read(int(self.headers["Content-Length"]))
+        self.server.received.append(
+            {
+                "path": self.path,
+                "headers": dict(self.headers),
+                "body": body,
+                "client_address": self.client_address,
+            }
+        )
+        time.sleep(self.server.delay)
+        status = self.server.statuses.get(self.path, 200)
+        if self.server.barrier:
+            try:
+                self.server.barrier.wait()
+            except threading.BrokenBarrierError:
+                status = 504
+        self.send_response(status)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def webhook_target():
+    """Run a local HTTP server standing in for webhook targets."""
+    server = ThreadingHTTPServer(("127.0.0.1", 0), WebhookTargetHandler)
+    server.daemon_threads = True
+    server.received = []
+    server.statuses = {}
+    server.delay = 0
+    server.barrier = None
+    server.url = "http://127.0.0.1:%s" % server.server_address[1]
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    close_sessions()
+    server.shutdown()
+    server.server_close()
+
+
+@pytest.fixture
+def http_webhook(webhook, webhook_target, permission_manage_orders):
+    webhook.app.permissions.add(permission_manage_orders)
+    webhook.target_url = webhook_target.url + "/webhook/"
+    webhook.secret_key = "secret_key"
+    webhook.save()
+    return webhook
+
+
+def test_send_webhooks_using_http(webhook_target):
+    # given
+    deliveries = [
+        WebhookDelivery(
+            index, webhook_target.url + "/%s/" % index, "key", "order_created", "[]"
+        )
+        for index in range(3)
+    ]
+
+    # when
+    failed = send_webhooks_using_http(deliveries, "mirumee.com")
+
+    # then
+    assert failed == []
+    assert sorted(request["path"] for request in webhook_target.received) == [
+        "/0/",
+        "/1/",
+        "/2/",
+    ]
+    headers = webhook_target.received[0]["headers"]
+    assert headers["X-Saleor-Event"] == "order_created"
+    assert headers["X-Saleor-Domain"] == "mirumee.com"
+    assert headers["X-Saleor-Signature"] == signature_for_payload(b"[]", "key")
+
+
+def test_send_webhooks_using_http_reuses_connections(webhook_target):
+    # given
+    delivery = WebhookDelivery(
+        1, webhook_target.url + "/webhook/", None, "order_created", "[]"
+    )
+
+    # when
+    for _ in range(3):
+        send_webhooks_using_http([delivery], "mirumee.com")
+
+    # then
+    client_addresses = {
+        request["client_address"] for request in webhook_target.received
+    }
+    assert len(webhook_target.received) == 3
+    assert len(client_addresses) == 1
+
+
+def test_send_webhooks_using_http_concurrently(webhook_target):
+    # given
+    # Requests are answered only once all of them are being handled at once.
+    webhook_target.barrier = threading.Barrier(5, timeout=5)
+    deliveries = [
+        WebhookDelivery(index, webhook_target.url + "/webhook/", None, "event", "[]")
+        for index in range(5)
+    ]
+
+    # when
+    failed = send_webhooks_using_http(deliveries, "mirumee.com", workers=5)
+
+    # then
+    assert failed == []
+    assert len(webhook_target.received) == 5
+
+
+def test_send_webhooks_using_http_returns_failed_deliveries(webhook_target):
+    # given
+    webhook_target.statuses["/failing/"] = 500
+    delivered = WebhookDelivery(1, webhook_target.url + "/ok/", None, "event", "[]")
+    failing = WebhookDelivery(2, webhook_target.url + "/failing/", None, "event", "[]")
+    delivery_metrics.reset()
+
+    # when
+    failed = send_webhooks_using_http([delivered, failing], "mirumee.com")
+
+    # then
+    assert failed == [failing]
+    metrics = delivery_metrics.as_dict()
+    assert metrics["delivered"] == 1
+    assert metrics["failed"] == 1
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_trigger_webhooks_for_event_posts_payload(
+    retry_mock, http_webhook, webhook_target, site_settings
+):
+    # when
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, '[{"id": 1}]')
+
+    # then
+    (request,) = webhook_target.received
+    assert request["path"] == "/webhook/"
+    assert request["body"] == b'[{"id": 1}]'
+    assert request["headers"]["X-Saleor-Signature"] == signature_for_payload(
+        b'[{"id": 1}]', http_webhook.secret_key
+    )
+    retry_mock.assert_not_called()
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_request.apply_async")
+def test_trigger_webhooks_for_event_retries_failed_requests(
+    retry_mock, http_webhook, webhook_target, site_settings
+):
+    # given
+    webhook_target.statuses["/webhook/"] = 503
+
+    # when
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "[]")
+
+    # then
+    retry_mock.assert_called_once_with(
+        (
+            http_webhook.pk,
+            http_webhook.target_url,
+            http_webhook.secret_key,
+            WebhookEventType.ORDER_CREATED,
+            "[]",
+        ),
+        kwargs={"attempt": 1},
+        countdown=10,
+    )
+
+
+def test_trigger_webhooks_for_event_limits_failed_request_attempts(
+    http_webhook, webhook_target, site_settings
+):
+    # given
+    webhook_target.statuses["/webhook/"] = 503
+
+    # when
+    # Retries of eager tasks run right away.
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "[]")
+
+    # then
+    assert len(webhook_target.received) == 6
+
+
+def test_send_webhook_request_records_retries(
+    http_webhook, webhook_target, site_settings
+):
+    # given
+    delivery_metrics.reset()
+
+    # when
+    send_webhook_request(
+        http_webhook.pk,
+        http_webhook.target_url,
+        http_webhook.secret_key,
+        WebhookEventType.ORDER_CREATED,
+        "[]",
+        attempt=1,
+    )
+
+    # then
+    assert len(webhook_target.received) == 1
+    metrics = delivery_metrics.as_dict()
+    assert metrics["delivered"] == 1
+    assert metrics["retries"] == 1
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_batch.apply_async")
+def test_trigger_webhooks_for_event_coalesces_batched_events(
+    send_batch_mock, http_webhook, webhook_target, site_settings, settings
+):
+    # given
+    http_webhook.batch_events = True
+    http_webhook.save(update_fields=["batch_events"])
+    generation = get_batch_generation(http_webhook.pk)
+
+    # when
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, '[{"id": 1}]')
+    trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, '[{"id": 2}]')
+
+    # then
+    send_batch_mock.assert_called_once_with(
+        (http_webhook.pk, generation), countdown=settings.WEBHOOK_BATCH_WINDOW
+    )
+    assert webhook_target.received == []
+
+    send_webhook_batch(http_webhook.pk, generation)
+    (request,) = webhook_target.received
+    assert request["headers"]["X-Saleor-Event"] == "batch"
+    assert json.loads(request["body"]) == [
+        {"event_type": "order_created", "data": [{"id": 1}]},
+        {"event_type": "order_created", "data": [{"id": 2}]},
+    ]
+    assert get_batch_generation(http_webhook.pk) == generation + 1
+
+
+@patch("saleor.plugins.webhook.tasks.send_webhook_batch.apply_async")
+def test_trigger_webhooks_for_event_sends_full_batch(
+    send_batch_mock, http_webhook, webhook_target, site_settings, settings
+):
+    # given
+    settings.WEBHOOK_BATCH_MAX_SIZE = 2
+    http_webhook.batch_events = True
+    http_webhook.save(update_fields=["batch_events"])
+
+    generation = get_batch_generation(http_webhook.pk)
+
+    # when
+    for index in range(2):
+        trigger_webhooks_for_event(WebhookEventType.ORDER_CREATED, "[%s]" % index)
+
+    # then
+    first_call, full_batch_call = send_batch_mock.call_args_list
+    assert first_call.kwargs == {"countdown": settings.WEBHOOK_BATCH_WINDOW}
+    # The full batch is sent without waiting for the window to pass.
+    assert full_batch_call.args[0] == (http_webhook.pk, generation)
+    assert "countdown" not in full_batch_call.kwargs
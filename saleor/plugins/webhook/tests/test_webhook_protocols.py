@@ -1,4 +1,4 @@
-from unittest.mock import MagicMock, patch
+from unittest.mock import ANY, MagicMock, patch
 
 import boto3
 import pytest
@@ -181,7 +181,9 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
+)
 def test_trigger_webhooks_with_http(
     mock_request,
     webhook,
@@ -206,6 +208,7 @@ def test_trigger_webhooks_with_http(
     }
 
     mock_request.assert_called_once_with(
+        ANY,
         webhook.target_url,
         data=bytes(expected_data, "utf-8"),
         headers=expected_headers,
@@ -214,7 +217,9 @@ def test_trigger_webhooks_with_http(
 
 
 @pytest.mark.vcr
-@patch("saleor.plugins.webhook.tasks.requests.post", wraps=requests.post)
+@patch.object(
+    requests.Session, "post", autospec=True, side_effect=requests.Session.post
+)
 def test_trigger_webhooks_with_http_and_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
@@ -237,6 +242,7 @@ def test_trigger_webhooks_with_http_and_secret_key(
     }
 
     mock_request.assert_called_once_with(
+        ANY,
         webhook.target_url,
         data=bytes(expected_data, "utf-8"),
         headers=expected_headers,
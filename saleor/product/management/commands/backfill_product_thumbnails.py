@@ -0,0 +1,66 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from ...models import ProductMedia
+from ...thumbnails import create_product_thumbnails_batch
+from ...utils.renditions import render_product_media_thumbnails
+
+
+class Command(BaseCommand):
+    help = (
+        "Render missing thumbnails of all product sizes, with their WebP copies, "
+        "for all product images."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=settings.PRODUCT_THUMBNAILS_BATCH_SIZE,
+            help="Number of images rendered in a batch.",
+        )
+        parser.add_argument(
+            "--overwrite",
+            action="store_true",
+            help="Render thumbnails that already exist again.",
+        )
+        parser.add_argument(
+            "--async",
+            action="store_true",
+            dest="run_async",
+            help="Send the batches to Celery workers instead of rendering them here.",
+        )
+
+    def handle(self, *args, **options):
+        batch_size = options["batch_size"]
+        overwrite = options["overwrite"]
+        media_ids = list(
+            ProductMedia.objects.exclude(image="")
+            .exclude(image__isnull=True)
+            .order_by("pk")
+            .values_list("pk", flat=True)
+        )
+        self.stdout.write(f"Rendering thumbnails of {len(media_ids)} images.")
+
+        num_created = 0
+        for start in range(0, len(media_ids), batch_size):
+            end = start + batch_size
+            batch_ids = media_ids[start:end]
+            if options["run_async"]:
+                create_product_thumbnails_batch.delay(batch_ids, overwrite=overwrite)
+                continue
+            created, failed_to_create = render_product_media_thumbnails(
+                ProductMedia.objects.filter(pk__in=batch_ids), overwrite=overwrite
+            )
+            num_created += created
+            self.log_failed_images(failed_to_create)
+            self.stdout.write(f"Rendered {start + len(batch_ids)}/{len(media_ids)}.")
+
+        if not options["run_async"]:
+            self.stdout.write(f"Created {num_created} thumbnails.")
+
+    def log_failed_images(self, failed_to_create):
+        if failed_to_create:
+            self.stderr.write("Failed to generate thumbnails:")
+            for path in failed_to_create:
+                self.stderr.write(path)
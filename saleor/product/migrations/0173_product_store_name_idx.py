@@ -0,0 +1,19 @@
+# Generated by Django 3.2.4 on 2026-10-18 14:05
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0172_auto_20220309_0657"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="product",
+            index=models.Index(
+                fields=["store", "name", "slug"], name="product_store_name_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,46 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0173_product_store_name_idx"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="productchannellisting",
+            name="price_range_start_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=3, max_digits=12, null=True
+            ),
+        ),
+        migrations.AddField(
+            model_name="productchannellisting",
+            name="price_range_stop_amount",
+            field=models.DecimalField(
+                blank=True, decimal_places=3, max_digits=12, null=True
+            ),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE product_productchannellisting
+            SET price_range_start_amount = prices.price_range_start_amount,
+                price_range_stop_amount = prices.price_range_stop_amount
+            FROM (
+                SELECT
+                    variant.product_id,
+                    listing.channel_id,
+                    MIN(listing.price_amount) AS price_range_start_amount,
+                    MAX(listing.price_amount) AS price_range_stop_amount
+                FROM product_productvariantchannellisting listing
+                JOIN product_productvariant variant ON variant.id = listing.variant_id
+                WHERE listing.price_amount IS NOT NULL
+                GROUP BY variant.product_id, listing.channel_id
+            ) AS prices
+            WHERE product_productchannellisting.product_id = prices.product_id
+                AND product_productchannellisting.channel_id = prices.channel_id;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -0,0 +1,28 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("product", "0174_productchannellisting_price_range"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="ProductDiscountedPriceUpdate",
+            fields=[
+                (
+                    "product",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="+",
+                        serialize=False,
+                        to="product.product",
+                    ),
+                ),
+                ("created_at", models.DateTimeField(db_index=True)),
+            ],
+        ),
+    ]
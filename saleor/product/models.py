@@ -478,7 +478,13 @@ class Product(SortableModel, MultitenantModelWithMetadata, SeoModel):
         permissions = (
             (ProductPermissions.MANAGE_PRODUCTS.codename, "Manage products."),
         )
-        indexes = [GinIndex(fields=["search_vector"])]
+        indexes = [
+            GinIndex(fields=["search_vector"]),
+            # Keyset pagination of products sorted by name.
+            models.Index(
+                fields=["store", "name", "slug"], name="product_store_name_idx"
+            ),
+        ]
         indexes.extend(ModelWithMetadata.Meta.indexes)
     
 
@@ -542,9 +548,7 @@ class ProductVariantQueryset(CustomQueryset):
     def annotate_quantities(self):
         return self.annotate(
             quantity=Coalesce(Sum("stocks__quantity"), 0),
-            quantity_allocated=Coalesce(
-                Sum("stocks__allocations__quantity_allocated"), 0
-            ),
+            quantity_allocated=Coalesce(Sum("stocks__quantity_allocated"), 0),
         )
 
     def available_in_channel(self, channel_slug):
@@ -588,6 +592,26 @@ class ProductChannelListing(PublishableModel):
     discounted_price = MoneyField(
         amount_field="discounted_price_amount", currency_field="currency"
     )
+    # Undiscounted prices of the cheapest and the most expensive variant in the
+    # channel, updated together with `discounted_price`.
+    price_range_start_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        blank=True,
+        null=True,
+    )
+    price_range_start = MoneyField(
+        amount_field="price_range_start_amount", currency_field="currency"
+    )
+    price_range_stop_amount = models.DecimalField(
+        max_digits=settings.DEFAULT_MAX_DIGITS,
+        decimal_places=settings.DEFAULT_DECIMAL_PLACES,
+        blank=True,
+        null=True,
+    )
+    price_range_stop = MoneyField(
+        amount_field="price_range_stop_amount", currency_field="currency"
+    )
 
     class Meta:
         unique_together = [["product", "channel"]]
@@ -603,6 +627,19 @@ class ProductChannelListing(PublishableModel):
         )
 
 
+class ProductDiscountedPriceUpdate(models.Model):
+    """Product queued for the update of its discounted prices.
+
+    Changes of sales and their catalogues queue the affected products, which are
+    updated together by `update_marked_products_discounted_prices_task`.
+    """
+
+    product = models.OneToOneField(
+        Product, primary_key=True, related_name="+", on_delete=models.CASCADE
+    )
+    created_at = models.DateTimeField(db_index=True)
+
+
 class ProductVariant(SortableModel, MultitenantModelWithMetadata):
     store = models.ForeignKey(
         Store,
@@ -945,8 +982,14 @@ class CollectionTranslation(SeoModelTranslation):
 class OptionValueQueryset(QuerySet):
     def visible_to_user(self, channel_slug: str):
         if channel_slug:
-            return self.prefetch_related(Prefetch('option_value_channels',
-                                                  queryset=OptionValueChannelListing.objects.filter(channel__slug=channel_slug))).order_by("sort_order")
+            return self.prefetch_related(
+                Prefetch(
+                    "option_value_channels",
+                    queryset=OptionValueChannelListing.objects.filter(
+                        channel__slug=channel_slug
+                    ).select_related("channel"),
+                )
+            ).order_by("sort_order")
         return self.all().order_by("sort_order")
 
 
@@ -973,18 +1016,32 @@ class OptionValue(SortableModel):
         return store_options.options.get(id = self.option_id).option_values.all()
 
 
+    def get_channel_listing(self, channel_slug: str) -> "OptionValueChannelListing":
+        """Return the channel listing, using prefetched listings when available.
+
+        Listings are prefetched with their channels for whole checkouts, see
+        `product.utils.options.get_option_values_prefetch`.
+        """
+        prefetched = getattr(self, "_prefetched_objects_cache", {})
+        if "option_value_channels" not in prefetched:
+            return self.option_value_channels.get(channel__slug=channel_slug)
+        for option_value_channel in prefetched["option_value_channels"]:
+            if option_value_channel.channel.slug == channel_slug:
+                return option_value_channel
+        raise OptionValueChannelListing.DoesNotExist(
+            "OptionValueChannelListing matching query does not exist."
+        )
+
     def get_price_by_channel(self, channel_slug: str):
         if channel_slug:
-            option_value_channel = self.option_value_channels.get(
-                channel__slug=channel_slug)
+            option_value_channel = self.get_channel_listing(channel_slug)
             option_value_price = option_value_channel.price
             return option_value_price or 0
         return 0
 
     def get_price_amount_by_channel(self, channel_slug: str):
         if channel_slug:
-            option_value_channel = self.option_value_channels.get(
-                channel__slug=channel_slug)
+            option_value_channel = self.get_channel_listing(channel_slug)
             option_value_price = option_value_channel.price_amount
             return option_value_price or Decimal(0)
         return Decimal(0)
@@ -1,22 +1,28 @@
 import logging
 from typing import Iterable, List, Optional
 
+from django.conf import settings
+from django.core.cache import cache
 from django.core.exceptions import ObjectDoesNotExist
+from django.db.models import QuerySet
 
 from ..attribute.models import Attribute
 from ..celeryconf import app
 from ..discount.models import Sale
 from .models import Product, ProductType, ProductVariant
 from .utils.variant_prices import (
+    get_products_of_catalogues,
+    get_products_of_discount,
+    mark_products_discounted_prices_for_update,
+    update_marked_products_discounted_prices,
     update_product_discounted_price,
-    update_products_discounted_prices,
-    update_products_discounted_prices_of_catalogues,
-    update_products_discounted_prices_of_discount,
 )
 from .utils.variants import generate_and_set_variant_name
 
 logger = logging.getLogger(__name__)
 
+DISCOUNTED_PRICES_UPDATE_SCHEDULED_CACHE_KEY = "discounted_prices_update_scheduled"
+
 
 def _update_variants_names(instance: ProductType, saved_attributes: Iterable):
     """Product variant names are created from names of assigned attributes.
@@ -60,15 +66,40 @@ def update_product_discounted_price_task(product_pk: int):
     update_product_discounted_price(product)
 
 
+def schedule_marked_products_discounted_prices_update():
+    """Enqueue the update of queued products unless it's already waiting to run.
+
+    The update runs after `DISCOUNTED_PRICES_UPDATE_DELAY`, so products queued by
+    a series of quick changes are updated once.
+    """
+    delay = settings.DISCOUNTED_PRICES_UPDATE_DELAY
+    if cache.add(DISCOUNTED_PRICES_UPDATE_SCHEDULED_CACHE_KEY, True, timeout=delay):
+        update_marked_products_discounted_prices_task.apply_async(countdown=delay)
+
+
+def _queue_products_discounted_prices_update(products: QuerySet):
+    mark_products_discounted_prices_for_update(products)
+    schedule_marked_products_discounted_prices_update()
+
+
+@app.task
+def update_marked_products_discounted_prices_task():
+    # Products queued from now on are updated by the next run.
+    cache.delete(DISCOUNTED_PRICES_UPDATE_SCHEDULED_CACHE_KEY)
+    _, has_more = update_marked_products_discounted_prices()
+    if has_more:
+        update_marked_products_discounted_prices_task.delay()
+
+
 @app.task
 def update_products_discounted_prices_of_catalogues_task(
     product_ids: Optional[List[int]] = None,
     category_ids: Optional[List[int]] = None,
     collection_ids: Optional[List[int]] = None,
 ):
-    update_products_discounted_prices_of_catalogues(
-        product_ids, category_ids, collection_ids
-    )
+    products = get_products_of_catalogues(product_ids, category_ids, collection_ids)
+    if products is not None:
+        _queue_products_discounted_prices_update(products)
 
 
 @app.task
@@ -78,10 +109,12 @@ def update_products_discounted_prices_of_discount_task(discount_pk: int):
     except ObjectDoesNotExist:
         logging.warning(f"Cannot find discount with id: {discount_pk}.")
         return
-    update_products_discounted_prices_of_discount(discount)
+    products = get_products_of_discount(discount)
+    if products is not None:
+        _queue_products_discounted_prices_update(products)
 
 
 @app.task
 def update_products_discounted_prices_task(product_ids: List[int]):
     products = Product.objects.filter(pk__in=product_ids)
-    update_products_discounted_prices(products)
+    _queue_products_discounted_prices_update(products)
@@ -1,14 +1,19 @@
 import datetime
+from collections import defaultdict
 from decimal import Decimal
-from unittest.mock import Mock
+from unittest.mock import Mock, patch
 
+import pytest
 from django_countries.fields import Country
 from freezegun import freeze_time
-from prices import Money, TaxedMoney, TaxedMoneyRange
+from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
+from ...discount.models import Sale, SaleChannelListing
+from ...discount.utils import fetch_active_discounts
 from ...plugins.manager import PluginsManager, get_plugins_manager
 from .. import models
-from ..utils.availability import get_product_availability
+from ..utils import availability as availability_utils
+from ..utils.availability import get_product_availability, get_products_availability
 
 
 def test_availability(stock, monkeypatch, settings, channel_USD):
@@ -349,3 +354,196 @@ def test_filter_not_published_product_without_assigned_channel(
 
     not_available_products_pln = models.Product.objects.not_published(channel_PLN.slug)
     assert not_available_products_pln.count() == 1
+
+
+def _get_products_availability_inputs(products, channel):
+    listings = {
+        listing.product_id: listing
+        for listing in models.ProductChannelListing.objects.filter(channel=channel)
+    }
+    variants_channel_listings = defaultdict(list)
+    for listing in models.ProductVariantChannelListing.objects.filter(
+        channel=channel
+    ).select_related("variant"):
+        variants_channel_listings[listing.variant.product_id].append(listing)
+    price_ranges = [
+        MoneyRange(
+            min(listing.price for listing in variants_channel_listings[product.pk]),
+            max(listing.price for listing in variants_channel_listings[product.pk]),
+        )
+        for product in products
+    ]
+    return listings, variants_channel_listings, price_ranges
+
+
+def _get_discounts(channel, **catalogue):
+    sale = Sale.objects.create(name="Happy hour")
+    SaleChannelListing.objects.create(
+        sale=sale, channel=channel, discount_value=3, currency=channel.currency_code
+    )
+    for field, objects in catalogue.items():
+        getattr(sale, field).add(*objects)
+    return fetch_active_discounts()
+
+
+def test_get_products_availability(products_with_options, channel_USD):
+    # given
+    product = products_with_options[0]
+    variant = models.ProductVariant.objects.create(product=product, sku="large")
+    models.ProductVariantChannelListing.objects.create(
+        variant=variant,
+        channel=channel_USD,
+        price_amount=Decimal(20),
+        currency=channel_USD.currency_code,
+    )
+    discounts = _get_discounts(channel_USD, products=products_with_options[:2])
+    (
+        listings,
+        variants_channel_listings,
+        price_ranges,
+    ) = _get_products_availability_inputs(products_with_options, channel_USD)
+    manager = get_plugins_manager()
+
+    # when
+    availabilities = get_products_availability(
+        products=products_with_options,
+        product_channel_listings=[listings[p.pk] for p in products_with_options],
+        price_ranges=price_ranges,
+        collections=[[] for _ in products_with_options],
+        discounts=discounts,
+        channel=channel_USD,
+        manager=manager,
+        country=Country("US"),
+    )
+
+    # then
+    assert availabilities == [
+        get_product_availability(
+            product=product,
+            product_channel_listing=listings[product.pk],
+            variants=product.variants.all(),
+            variants_channel_listing=variants_channel_listings[product.pk],
+            collections=[],
+            discounts=discounts,
+            channel=channel_USD,
+            manager=manager,
+            country=Country("US"),
+        )
+        for product in products_with_options
+    ]
+    assert availabilities[0].price_range.start.net == Money(7, "USD")
+    assert availabilities[0].price_range.stop.net == Money(17, "USD")
+    assert availabilities[2].discount is None
+
+
+def test_get_products_availability_without_price_range(
+    products_with_options, channel_USD
+):
+    # when
+    availabilities = get_products_availability(
+        products=products_with_options[:1],
+        product_channel_listings=[None],
+        price_ranges=[None],
+        collections=[[]],
+        discounts=[],
+        channel=channel_USD,
+        manager=get_plugins_manager(),
+    )
+
+    # then
+    assert availabilities == [None]
+
+
+@pytest.mark.performance
+def test_get_products_availability_benchmark(products_with_options, channel_USD):
+    # given
+    product = products_with_options[0]
+    products = models.Product.objects.bulk_create(
+        [
+            models.Product(
+                name=f"Menu item {index}",
+                slug=f"menu-item-{index}",
+                product_type=product.product_type,
+                category=product.category,
+                store=product.store,
+            )
+            for index in range(100)
+        ]
+    )
+    models.ProductChannelListing.objects.bulk_create(
+        [
+            models.ProductChannelListing(
+                product=product, channel=channel_USD, currency="USD", is_published=True
+            )
+            for product in products
+        ]
+    )
+    variants = models.ProductVariant.objects.bulk_create(
+        [
+            models.ProductVariant(product=product, sku=f"{product.slug}-{size}")
+            for product in products
+            for size in range(3)
+        ]
+    )
+    models.ProductVariantChannelListing.objects.bulk_create(
+        [
+            models.ProductVariantChannelListing(
+                variant=variant,
+                channel=channel_USD,
+                price_amount=Decimal(10 + index % 3),
+                currency="USD",
+            )
+            for index, variant in enumerate(variants)
+        ]
+    )
+    discounts = _get_discounts(channel_USD, categories=[product.category])
+    (
+        listings,
+        variants_channel_listings,
+        price_ranges,
+    ) = _get_products_availability_inputs(products, channel_USD)
+    variants_by_product = defaultdict(list)
+    for variant in variants:
+        variants_by_product[variant.product_id].append(variant)
+    manager = get_plugins_manager()
+
+    # when
+    with patch.object(
+        availability_utils,
+        "calculate_discounted_price",
+        wraps=availability_utils.calculate_discounted_price,
+    ) as per_variant_mock:
+        expected = [
+            get_product_availability(
+                product=product,
+                product_channel_listing=listings[product.pk],
+                variants=variants_by_product[product.pk],
+                variants_channel_listing=variants_channel_listings[product.pk],
+                collections=[],
+                discounts=discounts,
+                channel=channel_USD,
+                manager=manager,
+            )
+            for product in products
+        ]
+    with patch.object(
+        availability_utils,
+        "get_product_discounts",
+        wraps=availability_utils.get_product_discounts,
+    ) as per_product_mock:
+        availabilities = get_products_availability(
+            products=products,
+            product_channel_listings=[listings[p.pk] for p in products],
+            price_ranges=price_ranges,
+            collections=[[] for _ in products],
+            discounts=discounts,
+            channel=channel_USD,
+            manager=manager,
+        )
+
+    # then
+    assert availabilities == expected
+    # Discounts are looked up once per product, not for every variant price of
+    # both the discounted and the undiscounted price range.
+    assert per_variant_mock.call_count == len(variants) * 2
+    assert per_product_mock.call_count == len(products)
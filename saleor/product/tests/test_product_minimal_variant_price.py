@@ -1,13 +1,37 @@
+from datetime import timedelta
+from decimal import Decimal
 from unittest.mock import patch
 
+import pytest
 from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from prices import Money
 
+from ...discount import DiscountValueType
+from ...discount.models import Sale, SaleChannelListing
+from ..models import (
+    Category,
+    Collection,
+    Product,
+    ProductChannelListing,
+    ProductDiscountedPriceUpdate,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
 from ..tasks import (
-    update_products_discounted_prices_of_catalogues,
+    update_products_discounted_prices_of_catalogues_task,
     update_products_discounted_prices_task,
 )
-from ..utils.variant_prices import update_product_discounted_price
+from ..utils.variant_prices import (
+    get_products_of_catalogues,
+    mark_products_discounted_prices_for_update,
+    update_marked_products_discounted_prices,
+    update_product_discounted_price,
+    update_products_discounted_prices,
+    update_products_discounted_prices_in_bulk,
+)
 
 
 def test_update_product_discounted_price(product, channel_USD):
@@ -26,6 +50,22 @@ def test_update_product_discounted_price(product, channel_USD):
     assert product_channel_listing.discounted_price == variant_channel_listing.price
 
 
+def test_update_product_discounted_price_updates_price_range(
+    products_with_options, channel_USD
+):
+    product = products_with_options[0]
+    variant = product.variants.create(sku="pizza-0-large")
+    variant.channel_listings.create(
+        channel=channel_USD, price_amount=Decimal(20), currency="USD"
+    )
+
+    update_product_discounted_price(product)
+
+    product_channel_listing = product.channel_listings.get(channel_id=channel_USD.id)
+    assert product_channel_listing.price_range_start == Money("10", "USD")
+    assert product_channel_listing.price_range_stop == Money("20", "USD")
+
+
 def test_update_product_discounted_price_without_price(
     product, channel_USD, channel_PLN
 ):
@@ -57,7 +97,10 @@ def test_update_products_discounted_prices_of_catalogues_for_product(
 
     assert product_channel_listing.discounted_price == Money("10", "USD")
 
-    update_products_discounted_prices_of_catalogues(product_ids=[product.pk])
+    products = get_products_of_catalogues(product_ids=[product.pk])
+    update_products_discounted_prices_in_bulk(
+        list(products.values_list("pk", flat=True))
+    )
 
     product_channel_listing.refresh_from_db()
     assert product_channel_listing.discounted_price == variant_channel_listing.price
@@ -79,7 +122,10 @@ def test_update_products_discounted_prices_of_catalogues_for_category(
     product_channel_listing.refresh_from_db()
 
     assert product_channel_listing.discounted_price == Money("10", "USD")
-    update_products_discounted_prices_of_catalogues(category_ids=[product.category_id])
+    products = get_products_of_catalogues(category_ids=[product.category_id])
+    update_products_discounted_prices_in_bulk(
+        list(products.values_list("pk", flat=True))
+    )
     product_channel_listing.refresh_from_db()
     assert product_channel_listing.discounted_price == variant_channel_listing.price
 
@@ -99,7 +145,10 @@ def test_update_products_discounted_prices_of_catalogues_for_collection(
     collection.products.add(product)
     assert product_channel_listing.discounted_price == Money("10", "USD")
 
-    update_products_discounted_prices_of_catalogues(collection_ids=[collection.pk])
+    products = get_products_of_catalogues(collection_ids=[collection.pk])
+    update_products_discounted_prices_in_bulk(
+        list(products.values_list("pk", flat=True))
+    )
     product_channel_listing.refresh_from_db()
     assert product_channel_listing.discounted_price == variant_channel_listing.price
 
@@ -137,3 +186,290 @@ def test_management_commmand_update_all_products_discounted_price(
     call_args_list = mock_update_product_discounted_price.call_args_list
     for (args, kwargs), product in zip(call_args_list, product_list):
         assert args[0] == product
+
+
+def _create_sale(channel, discount_type, discount_value, **kwargs):
+    sale = Sale.objects.create(name="Sale", type=discount_type, **kwargs)
+    if discount_value is not None:
+        SaleChannelListing.objects.create(
+            sale=sale,
+            channel=channel,
+            discount_value=discount_value,
+            currency=channel.currency_code,
+        )
+    return sale
+
+
+def _get_listing_prices():
+    return {
+        listing.product_id: (
+            listing.discounted_price_amount,
+            listing.price_range_start_amount,
+            listing.price_range_stop_amount,
+        )
+        for listing in ProductChannelListing.objects.all()
+    }
+
+
+@pytest.fixture
+def products_on_sales(products_with_options, channel_USD):
+    pizza_0, pizza_1, pizza_2, pizza_3, pizza_4 = products_with_options
+    category = pizza_0.category
+    variant = ProductVariant.objects.create(product=pizza_0, sku="pizza-0-large")
+    ProductVariantChannelListing.objects.create(
+        variant=variant,
+        channel=channel_USD,
+        price_amount=Decimal("20.50"),
+        currency=channel_USD.currency_code,
+    )
+    pizza_1.category = Category.objects.create(
+        name="Calzones", slug="calzones", parent=category
+    )
+    pizza_1.save(update_fields=["category"])
+    collection = Collection.objects.create(name="Specials", slug="specials")
+    collection.products.add(pizza_3)
+
+    sale = _create_sale(channel_USD, DiscountValueType.PERCENTAGE, Decimal("33.3"))
+    sale.categories.add(category)
+    _create_sale(channel_USD, DiscountValueType.FIXED, 4).products.add(pizza_2)
+    _create_sale(channel_USD, DiscountValueType.PERCENTAGE, 40).collections.add(
+        collection
+    )
+    # Neither of these sales applies.
+    _create_sale(
+        channel_USD,
+        DiscountValueType.FIXED,
+        9,
+        end_date=timezone.now() - timedelta(days=1),
+    ).products.add(pizza_4)
+    _create_sale(channel_USD, DiscountValueType.FIXED, None).products.add(pizza_4)
+    return products_with_options
+
+
+def test_update_products_discounted_prices_in_bulk(products_on_sales):
+    # given
+    product_ids = [product.pk for product in products_on_sales]
+    update_products_discounted_prices(Product.objects.all())
+    expected_prices = _get_listing_prices()
+    ProductChannelListing.objects.update(
+        discounted_price_amount=None,
+        price_range_start_amount=None,
+        price_range_stop_amount=None,
+    )
+
+    # when
+    updated = update_products_discounted_prices_in_bulk(product_ids)
+
+    # then
+    assert updated == len(product_ids)
+    prices = _get_listing_prices()
+    assert prices == expected_prices
+    pizza_0, pizza_1, pizza_2, pizza_3, pizza_4 = product_ids
+    assert prices[pizza_0] == (Decimal("6.67"), Decimal(10), Decimal("20.50"))
+    assert prices[pizza_1][0] == Decimal("6.67")
+    assert prices[pizza_2][0] == Decimal(6)
+    assert prices[pizza_3][0] == Decimal(6)
+    assert prices[pizza_4][0] == Decimal("6.67")
+
+
+def test_update_products_discounted_prices_in_bulk_skips_unchanged(
+    products_on_sales,
+):
+    # given
+    product_ids = [product.pk for product in products_on_sales]
+    update_products_discounted_prices_in_bulk(product_ids)
+
+    # when
+    updated = update_products_discounted_prices_in_bulk(product_ids)
+
+    # then
+    assert updated == 0
+
+
+def test_mark_products_discounted_prices_for_update(products_with_options):
+    # given
+    products = Product.objects.filter(category=products_with_options[0].category)
+    mark_products_discounted_prices_for_update(
+        products.filter(pk=products_with_options[0].pk)
+    )
+    created_at = ProductDiscountedPriceUpdate.objects.get(
+        product=products_with_options[0]
+    ).created_at
+
+    # when
+    mark_products_discounted_prices_for_update(products)
+
+    # then
+    assert ProductDiscountedPriceUpdate.objects.count() == len(products_with_options)
+    assert (
+        ProductDiscountedPriceUpdate.objects.get(
+            product=products_with_options[0]
+        ).created_at
+        == created_at
+    )
+
+
+def test_update_marked_products_discounted_prices(products_on_sales, settings):
+    # given
+    settings.DISCOUNTED_PRICES_UPDATE_BATCH_SIZE = 2
+    mark_products_discounted_prices_for_update(Product.objects.all())
+
+    # when
+    updated, has_more = update_marked_products_discounted_prices()
+
+    # then
+    assert updated == len(products_on_sales)
+    assert not has_more
+    assert not ProductDiscountedPriceUpdate.objects.exists()
+    assert _get_listing_prices()[products_on_sales[2].pk][0] == Decimal(6)
+
+
+def test_update_marked_products_discounted_prices_keeps_product_marked_again(
+    products_on_sales,
+):
+    # given
+    product = products_on_sales[0]
+    mark_products_discounted_prices_for_update(Product.objects.all())
+
+    def mark_product_again(product_ids):
+        mark_products_discounted_prices_for_update(
+            Product.objects.filter(pk=product.pk)
+        )
+        return len(product_ids)
+
+    # when
+    with patch(
+        "saleor.product.utils.variant_prices.update_products_discounted_prices_in_bulk",
+        side_effect=mark_product_again,
+    ):
+        updated, _ = update_marked_products_discounted_prices()
+
+    # then
+    assert updated == len(products_on_sales)
+    assert list(
+        ProductDiscountedPriceUpdate.objects.values_list("product_id", flat=True)
+    ) == [product.pk]
+
+
+def test_update_marked_products_discounted_prices_stops_after_max_batches(
+    products_with_options, settings
+):
+    # given
+    settings.DISCOUNTED_PRICES_UPDATE_BATCH_SIZE = 2
+    settings.DISCOUNTED_PRICES_UPDATE_MAX_BATCHES = 2
+    mark_products_discounted_prices_for_update(Product.objects.all())
+
+    # when
+    updated, has_more = update_marked_products_discounted_prices()
+
+    # then
+    assert updated == 4
+    assert has_more
+    assert ProductDiscountedPriceUpdate.objects.count() == 1
+
+
+@pytest.fixture
+def large_catalogue(products_with_options, channel_USD):
+    product = products_with_options[0]
+    menu = product.category
+    categories = [
+        Category.objects.create(name=f"Menu {index}", slug=f"menu-{index}", parent=menu)
+        for index in range(10)
+    ]
+    products = Product.objects.bulk_create(
+        [
+            Product(
+                name=f"Dish {index}",
+                slug=f"dish-{index}",
+                product_type=product.product_type,
+                category=categories[index % len(categories)],
+                store=product.store,
+            )
+            for index in range(50000 - len(products_with_options))
+        ],
+        batch_size=5000,
+    )
+    ProductChannelListing.objects.bulk_create(
+        [
+            ProductChannelListing(
+                product=product,
+                channel=channel_USD,
+                is_published=True,
+                currency=channel_USD.currency_code,
+            )
+            for product in products
+        ],
+        batch_size=5000,
+    )
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"{product.slug}-{size}")
+            for product in products
+            for size in range(2)
+        ],
+        batch_size=5000,
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        [
+            ProductVariantChannelListing(
+                variant=variant,
+                channel=channel_USD,
+                price_amount=Decimal(8 + index % 7),
+                currency=channel_USD.currency_code,
+            )
+            for index, variant in enumerate(variants)
+        ],
+        batch_size=5000,
+    )
+    collection = Collection.objects.create(name="Specials", slug="specials")
+    collection.products.add(*products[::10])
+    _create_sale(
+        channel_USD, DiscountValueType.PERCENTAGE, Decimal("12.5")
+    ).categories.add(menu)
+    _create_sale(channel_USD, DiscountValueType.FIXED, 3).collections.add(collection)
+    with connection.cursor() as cursor:
+        cursor.execute("ANALYZE")
+    return menu
+
+
+@pytest.mark.performance
+@patch("saleor.product.tasks.update_marked_products_discounted_prices_task")
+def test_update_products_discounted_prices_benchmark(
+    update_marked_prices_task_mock, large_catalogue, settings
+):
+    # given
+    settings.DISCOUNTED_PRICES_UPDATE_MAX_BATCHES = 100
+    # The update stays scheduled however long queuing the catalogue takes.
+    settings.DISCOUNTED_PRICES_UPDATE_DELAY = 3600
+    sample = Product.objects.order_by("pk")[:1000]
+    with CaptureQueriesContext(connection) as python_queries:
+        update_products_discounted_prices(sample)
+    expected_prices = _get_listing_prices()
+    ProductChannelListing.objects.update(discounted_price_amount=None)
+
+    # when
+    with CaptureQueriesContext(connection) as queue_queries:
+        # Every edit of the sale in the dashboard queues its products again.
+        for _ in range(20):
+            update_products_discounted_prices_of_catalogues_task(
+                category_ids=[large_catalogue.pk]
+            )
+    with CaptureQueriesContext(connection) as update_queries:
+        updated, has_more = update_marked_products_discounted_prices()
+
+    # then
+    update_marked_prices_task_mock.apply_async.assert_called_once()
+    assert updated == 50000
+    assert not has_more
+    prices = _get_listing_prices()
+    assert all(
+        prices[product_id] == expected
+        for product_id, expected in expected_prices.items()
+        if expected[0] is not None
+    )
+    # Queuing the catalogue and updating a batch of its products take a fixed
+    # number of queries, updating products one by one takes some for each.
+    batches = -(-updated // settings.DISCOUNTED_PRICES_UPDATE_BATCH_SIZE)
+    assert len(python_queries) > len(sample)
+    assert len(queue_queries) <= 20 * 2
+    assert len(update_queries) <= (batches + 1) * 5
@@ -1,25 +1,33 @@
 import logging
 from unittest.mock import patch
 
+from django.conf import settings
+from django.utils import timezone
+from prices import Money
+
+from ..models import ProductDiscountedPriceUpdate
 from ..tasks import (
+    update_marked_products_discounted_prices_task,
     update_product_discounted_price_task,
+    update_products_discounted_prices_of_catalogues_task,
     update_products_discounted_prices_of_discount_task,
     update_variants_names,
 )
 
 
-@patch("saleor.product.tasks.update_products_discounted_prices_of_discount")
+@patch("saleor.product.tasks._queue_products_discounted_prices_update")
 def test_update_products_discounted_prices_of_discount_task(
-    update_product_prices_mock, sale
+    queue_product_prices_update_mock, sale, product
 ):
     # when
     update_products_discounted_prices_of_discount_task(sale.id)
 
     # then
-    update_product_prices_mock.assert_called_once_with(sale)
+    (products,), _ = queue_product_prices_update_mock.call_args
+    assert list(products) == [product]
 
 
-@patch("saleor.product.tasks.update_products_discounted_prices_of_discount")
+@patch("saleor.product.tasks._queue_products_discounted_prices_update")
 def test_update_products_discounted_prices_of_discount_task_discount_does_not_exist(
     update_product_prices_mock, caplog
 ):
@@ -73,7 +81,7 @@ def test_update_variants_names(
     assert {arg.pk for arg in args[1]} == {size_attribute.pk}
 
 
-@patch("saleor.product.tasks.update_products_discounted_prices_of_discount")
+@patch("saleor.product.tasks._update_variants_names")
 def test_update_variants_names_product_type_does_not_exist(
     update_variants_names_mock, caplog
 ):
@@ -87,3 +95,62 @@ def test_update_variants_names_product_type_does_not_exist(
     # then
     update_variants_names_mock.assert_not_called()
     assert f"Cannot find product type with id: {product_type_id}" in caplog.text
+
+
+@patch("saleor.product.tasks.update_marked_products_discounted_prices_task")
+def test_update_products_discounted_prices_of_catalogues_task_coalesces_updates(
+    update_marked_prices_task_mock, products_with_options
+):
+    # given
+    category_id = products_with_options[0].category_id
+    product_id = products_with_options[0].pk
+
+    # when
+    update_products_discounted_prices_of_catalogues_task(category_ids=[category_id])
+    update_products_discounted_prices_of_catalogues_task(product_ids=[product_id])
+
+    # then
+    update_marked_prices_task_mock.apply_async.assert_called_once_with(
+        countdown=settings.DISCOUNTED_PRICES_UPDATE_DELAY
+    )
+    assert set(
+        ProductDiscountedPriceUpdate.objects.values_list("product_id", flat=True)
+    ) == {product.pk for product in products_with_options}
+
+
+def test_update_products_discounted_prices_of_catalogues_task_updates_prices(
+    products_with_options, channel_USD
+):
+    # given
+    product = products_with_options[0]
+    product.channel_listings.update(discounted_price_amount=None)
+
+    # when
+    update_products_discounted_prices_of_catalogues_task(product_ids=[product.pk])
+
+    # then
+    listing = product.channel_listings.get(channel=channel_USD)
+    assert listing.discounted_price == Money("10", "USD")
+    assert not ProductDiscountedPriceUpdate.objects.exists()
+
+
+@patch("saleor.product.tasks.update_marked_products_discounted_prices_task.delay")
+def test_update_marked_products_discounted_prices_task_enqueues_next_run(
+    mocked_delay, products_with_options, settings
+):
+    # given
+    settings.DISCOUNTED_PRICES_UPDATE_BATCH_SIZE = 2
+    settings.DISCOUNTED_PRICES_UPDATE_MAX_BATCHES = 1
+    ProductDiscountedPriceUpdate.objects.bulk_create(
+        [
+            ProductDiscountedPriceUpdate(product=product, created_at=timezone.now())
+            for product in products_with_options
+        ]
+    )
+
+    # when
+    update_marked_products_discounted_prices_task()
+
+    # then
+    mocked_delay.assert_called_once_with()
+    assert ProductDiscountedPriceUpdate.objects.count() == 3
@@ -0,0 +1,232 @@
+from io import BytesIO
+from unittest.mock import patch
+
+import pytest
+from django.core.files.storage import default_storage
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.management import call_command
+from PIL import Image
+from versatileimagefield.datastructures.base import ProcessedImage
+from versatileimagefield.image_warmer import VersatileImageFieldWarmer
+
+from ..models import ProductMedia
+from ..thumbnails import create_product_thumbnails_batch
+from ..utils.renditions import (
+    get_rendition_paths,
+    get_rendition_sizes,
+    render_product_media_thumbnails,
+)
+
+
+def _create_image_file(name="product.jpg", size=(1200, 800), image_format="JPEG"):
+    img_data = BytesIO()
+    Image.new("RGB", size=size, color=(200, 30, 30)).save(img_data, format=image_format)
+    return SimpleUploadedFile(name, img_data.getvalue())
+
+
+@pytest.fixture
+def product_media(products_with_options, media_root):
+    return [
+        ProductMedia.objects.create(
+            product=product, image=_create_image_file(f"product-{index}.jpg")
+        )
+        for index, product in enumerate(products_with_options[:2])
+    ]
+
+
+def test_get_rendition_sizes():
+    assert get_rendition_sizes("products") == [
+        (1080, 1080),
+        (540, 540),
+        (510, 510),
+        (255, 255),
+        (120, 120),
+        (60, 60),
+    ]
+
+
+def test_render_product_media_thumbnails(product_media):
+    # when
+    num_created, failed = render_product_media_thumbnails(product_media)
+
+    # then
+    sizes = get_rendition_sizes("products")
+    assert num_created == len(product_media) * len(sizes) * 2
+    assert failed == []
+    image_file = product_media[0].image
+    for width, height in sizes:
+        path, webp_path = get_rendition_paths(image_file, width, height)
+        with default_storage.open(path) as rendition:
+            image = Image.open(rendition)
+            assert image.format == "JPEG"
+            assert image.size == (width, width * 2 // 3)
+        assert webp_path == path + ".webp"
+        with default_storage.open(webp_path) as rendition:
+            image = Image.open(rendition)
+            assert image.format == "WEBP"
+            assert image.size == (width, width * 2 // 3)
+
+
+def test_render_product_media_thumbnails_used_by_versatileimagefield(product_media):
+    # given
+    image_file = product_media[0].image
+    image_file.create_on_demand = False
+
+    # when
+    render_product_media_thumbnails(product_media[:1])
+
+    # then
+    rendition = image_file.thumbnail["255x255"]
+    assert default_storage.exists(rendition.name)
+
+
+def test_render_product_media_thumbnails_skips_existing(product_media):
+    # given
+    render_product_media_thumbnails(product_media)
+
+    # when
+    num_created, _ = render_product_media_thumbnails(product_media)
+    num_overwritten, _ = render_product_media_thumbnails(product_media, overwrite=True)
+
+    # then
+    assert num_created == 0
+    assert num_overwritten == len(product_media) * 12
+    path, _webp_path = get_rendition_paths(product_media[0].image, 60, 60)
+    # Overwritten renditions keep their names.
+    assert default_storage.exists(path)
+    assert not default_storage.exists(path.replace(".jpg", "_1.jpg"))
+
+
+def test_render_product_media_thumbnails_without_webp(product_media, settings):
+    # given
+    settings.PRODUCT_THUMBNAILS_WEBP = False
+
+    # when
+    num_created, _ = render_product_media_thumbnails(product_media[:1])
+
+    # then
+    assert num_created == 6
+    path = get_rendition_paths(product_media[0].image, 60, 60)[0]
+    assert not default_storage.exists(path + ".webp")
+
+
+def test_render_product_media_thumbnails_converts_palette_images_to_webp(
+    products_with_options, media_root
+):
+    # given
+    img_data = BytesIO()
+    Image.new("P", size=(100, 100)).save(img_data, format="GIF")
+    media = ProductMedia.objects.create(
+        product=products_with_options[0],
+        image=SimpleUploadedFile("product.gif", img_data.getvalue()),
+    )
+
+    # when
+    num_created, failed = render_product_media_thumbnails([media])
+
+    # then
+    assert failed == []
+    assert num_created == 12
+
+
+def test_render_product_media_thumbnails_reports_failed_images(product_media):
+    # given
+    broken_media = product_media[0]
+    with default_storage.open(broken_media.image.name, "wb") as image_file:
+        image_file.write(b"not an image")
+
+    # when
+    num_created, failed = render_product_media_thumbnails(product_media)
+
+    # then
+    assert num_created == 12
+    assert failed == [broken_media.image.name]
+
+
+@patch("saleor.product.thumbnails.render_product_media_thumbnails")
+def test_create_product_thumbnails_batch(render_mock, product_media):
+    # given
+    render_mock.return_value = (12, [])
+
+    # when
+    create_product_thumbnails_batch([media.pk for media in product_media])
+
+    # then
+    (media,), kwargs = render_mock.call_args
+    assert set(media) == set(product_media)
+    assert kwargs == {"overwrite": False}
+
+
+def test_backfill_product_thumbnails_command(product_media):
+    # when
+    call_command("backfill_product_thumbnails", batch_size=1)
+
+    # then
+    for media in product_media:
+        for path in get_rendition_paths(media.image, 60, 60):
+            assert default_storage.exists(path)
+
+
+@patch(
+    "saleor.product.management.commands.backfill_product_thumbnails."
+    "create_product_thumbnails_batch"
+)
+def test_backfill_product_thumbnails_command_async(task_mock, product_media):
+    # when
+    call_command("backfill_product_thumbnails", batch_size=1, run_async=True)
+
+    # then
+    assert [call.args[0] for call in task_mock.delay.call_args_list] == [
+        [media.pk] for media in product_media
+    ]
+
+
+@pytest.mark.performance
+def test_render_product_media_thumbnails_benchmark(
+    products_with_options, media_root, settings
+):
+    # given
+    images_count = 40
+    media = [
+        ProductMedia.objects.create(
+            product=products_with_options[index % len(products_with_options)],
+            image=_create_image_file(f"benchmark-{index}.jpg", size=(2400, 1600)),
+        )
+        for index in range(images_count)
+    ]
+    sizes_count = len(get_rendition_sizes("products"))
+
+    def count_decodes(render):
+        with patch.object(
+            ProcessedImage,
+            "retrieve_image",
+            autospec=True,
+            side_effect=ProcessedImage.retrieve_image,
+        ) as retrieve_mock:
+            render()
+        return retrieve_mock.call_count
+
+    # when
+    warmer_decodes = count_decodes(
+        lambda: [
+            VersatileImageFieldWarmer(
+                instance_or_queryset=item,
+                rendition_key_set="products",
+                image_attr="image",
+            ).warm()
+            for item in media
+        ]
+    )
+    batched_decodes = count_decodes(
+        lambda: render_product_media_thumbnails(media, overwrite=True, workers=0)
+    )
+    pool_decodes = count_decodes(
+        lambda: render_product_media_thumbnails(media, overwrite=True, workers=4)
+    )
+
+    # then
+    # Every size, and its WebP copy, is rendered from one decoded image, while the
+    # warmer decodes the image again for every size.
+    assert warmer_decodes == images_count * sizes_count
+    assert batched_decodes == images_count
+    assert pool_decodes == images_count
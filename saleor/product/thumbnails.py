@@ -1,6 +1,12 @@
+import logging
+from typing import List
+
 from ..celeryconf import app
 from ..core.utils import create_thumbnails
 from .models import Category, Collection, ProductMedia
+from .utils.renditions import render_product_media_thumbnails
+
+logger = logging.getLogger(__name__)
 
 
 @app.task
@@ -9,6 +15,19 @@ def create_product_thumbnails(image_id: str):
     create_thumbnails(pk=image_id, model=ProductMedia, size_set="products")
 
 
+@app.task
+def create_product_thumbnails_batch(media_ids: List[int], overwrite: bool = False):
+    """Render thumbnails of all product sizes, and their WebP copies, at once."""
+    media = ProductMedia.objects.filter(pk__in=media_ids).exclude(image="")
+    num_created, failed_to_create = render_product_media_thumbnails(
+        media, overwrite=overwrite
+    )
+    if num_created:
+        logger.info("Created %d thumbnails", num_created)
+    if failed_to_create:
+        logger.error("Failed to generate thumbnails", extra={"paths": failed_to_create})
+
+
 @app.task
 def create_category_background_image_thumbnails(category_id: str):
     """Take a Product model and create the background image thumbnails for it."""
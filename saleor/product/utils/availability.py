@@ -1,15 +1,15 @@
 from dataclasses import dataclass
-from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Callable, Iterable, List, Optional, Tuple, Union
 
 import opentracing
 from django.conf import settings
 from django_countries.fields import Country
-from prices import MoneyRange, TaxedMoney, TaxedMoneyRange
+from prices import Money, MoneyRange, TaxedMoney, TaxedMoneyRange
 
 from ...channel.models import Channel
 from ...core.utils import to_local_currency
 from ...discount import DiscountInfo
-from ...discount.utils import calculate_discounted_price
+from ...discount.utils import calculate_discounted_price, get_product_discounts
 from ...product.models import (
     Collection,
     Product,
@@ -152,9 +152,6 @@ def get_product_availability(
 ) -> ProductAvailability:
     country = country or Country(settings.DEFAULT_COUNTRY)
     with opentracing.global_tracer().start_active_span("get_product_availability"):
-        channel_slug = channel.slug
-
-        discounted = None
         discounted_net_range = get_product_price_range(
             product=product,
             variants=variants,
@@ -163,23 +160,6 @@ def get_product_availability(
             discounts=discounts,
             channel=channel,
         )
-        if discounted_net_range is not None:
-            discounted = TaxedMoneyRange(
-                start=manager.apply_taxes_to_product(
-                    product,
-                    discounted_net_range.start,
-                    country,
-                    channel_slug=channel_slug,
-                ),
-                stop=manager.apply_taxes_to_product(
-                    product,
-                    discounted_net_range.stop,
-                    country,
-                    channel_slug=channel_slug,
-                ),
-            )
-
-        undiscounted = None
         undiscounted_net_range = get_product_price_range(
             product=product,
             variants=variants,
@@ -188,45 +168,149 @@ def get_product_availability(
             discounts=[],
             channel=channel,
         )
-        if undiscounted_net_range is not None:
-            undiscounted = TaxedMoneyRange(
-                start=manager.apply_taxes_to_product(
-                    product,
-                    undiscounted_net_range.start,
-                    country,
-                    channel_slug=channel_slug,
-                ),
-                stop=manager.apply_taxes_to_product(
-                    product,
-                    undiscounted_net_range.stop,
-                    country,
-                    channel_slug=channel_slug,
-                ),
-            )
+        return _get_product_availability_from_net_ranges(
+            product=product,
+            product_channel_listing=product_channel_listing,
+            discounted_net_range=discounted_net_range,
+            undiscounted_net_range=undiscounted_net_range,
+            channel=channel,
+            manager=manager,
+            country=country,
+            local_currency=local_currency,
+        )
+
+
+def get_products_availability(
+    *,
+    products: List[Product],
+    product_channel_listings: List[Optional[ProductChannelListing]],
+    price_ranges: List[Optional[MoneyRange]],
+    collections: List[Iterable[Collection]],
+    discounts: Iterable[DiscountInfo],
+    channel: Channel,
+    manager: "PluginsManager",
+    country: Optional[Country] = None,
+    local_currency: Optional[str] = None,
+) -> List[Optional[ProductAvailability]]:
+    """Return availability of many products in a channel in one pass.
+
+    The arguments are columns, their n-th items belong to the n-th product.
+    `price_ranges` are the undiscounted price ranges of product variants in the
+    channel, the availability of products without them is None.
 
-        discount = None
-        price_range_local = None
-        discount_local_currency = None
-        if undiscounted_net_range is not None and discounted_net_range is not None:
-            discount = _get_total_discount_from_range(undiscounted, discounted)
-            price_range_local, discount_local_currency = _get_product_price_range(
-                discounted, undiscounted, local_currency
+    Discounts never change the order of prices, so the discounted price range
+    is the undiscounted one with the discounts applied to its ends.
+    """
+    country = country or Country(settings.DEFAULT_COUNTRY)
+    with opentracing.global_tracer().start_active_span("get_products_availability"):
+        availabilities: List[Optional[ProductAvailability]] = []
+        for product, product_channel_listing, price_range, product_collections in zip(
+            products, product_channel_listings, price_ranges, collections
+        ):
+            if price_range is None:
+                availabilities.append(None)
+                continue
+            product_discounts = list(
+                get_product_discounts(
+                    product=product,
+                    collections=product_collections,
+                    discounts=discounts,
+                    channel=channel,
+                )
+            )
+            discounted_net_range = MoneyRange(
+                _apply_discounts(price_range.start, product_discounts),
+                _apply_discounts(price_range.stop, product_discounts),
+            )
+            availabilities.append(
+                _get_product_availability_from_net_ranges(
+                    product=product,
+                    product_channel_listing=product_channel_listing,
+                    discounted_net_range=discounted_net_range,
+                    undiscounted_net_range=price_range,
+                    channel=channel,
+                    manager=manager,
+                    country=country,
+                    local_currency=local_currency,
+                )
             )
+        return availabilities
 
-        is_visible = (
-            product_channel_listing is not None and product_channel_listing.is_visible
+
+def _apply_discounts(price: Money, discounts: List[Callable[[Money], Money]]) -> Money:
+    return min((discount(price) for discount in discounts), default=price)
+
+
+def _get_product_availability_from_net_ranges(
+    *,
+    product: Product,
+    product_channel_listing: Optional[ProductChannelListing],
+    discounted_net_range: Optional[MoneyRange],
+    undiscounted_net_range: Optional[MoneyRange],
+    channel: Channel,
+    manager: "PluginsManager",
+    country: Country,
+    local_currency: Optional[str],
+) -> ProductAvailability:
+    channel_slug = channel.slug
+
+    discounted = None
+    if discounted_net_range is not None:
+        discounted = TaxedMoneyRange(
+            start=manager.apply_taxes_to_product(
+                product,
+                discounted_net_range.start,
+                country,
+                channel_slug=channel_slug,
+            ),
+            stop=manager.apply_taxes_to_product(
+                product,
+                discounted_net_range.stop,
+                country,
+                channel_slug=channel_slug,
+            ),
         )
-        is_on_sale = is_visible and discount is not None
 
-        return ProductAvailability(
-            on_sale=is_on_sale,
-            price_range=discounted,
-            price_range_undiscounted=undiscounted,
-            discount=discount,
-            price_range_local_currency=price_range_local,
-            discount_local_currency=discount_local_currency,
+    undiscounted = None
+    if undiscounted_net_range is not None:
+        undiscounted = TaxedMoneyRange(
+            start=manager.apply_taxes_to_product(
+                product,
+                undiscounted_net_range.start,
+                country,
+                channel_slug=channel_slug,
+            ),
+            stop=manager.apply_taxes_to_product(
+                product,
+                undiscounted_net_range.stop,
+                country,
+                channel_slug=channel_slug,
+            ),
         )
 
+    discount = None
+    price_range_local = None
+    discount_local_currency = None
+    if undiscounted is not None and discounted is not None:
+        discount = _get_total_discount_from_range(undiscounted, discounted)
+        price_range_local, discount_local_currency = _get_product_price_range(
+            discounted, undiscounted, local_currency
+        )
+
+    is_visible = (
+        product_channel_listing is not None and product_channel_listing.is_visible
+    )
+    is_on_sale = is_visible and discount is not None
+
+    return ProductAvailability(
+        on_sale=is_on_sale,
+        price_range=discounted,
+        price_range_undiscounted=undiscounted,
+        discount=discount,
+        price_range_local_currency=price_range_local,
+        discount_local_currency=discount_local_currency,
+    )
+
 
 def get_variant_availability(
     variant: ProductVariant,
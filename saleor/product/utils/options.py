@@ -0,0 +1,16 @@
+from django.db.models import Prefetch
+
+from ..models import OptionValue, OptionValueChannelListing
+
+
+def get_option_values_prefetch() -> Prefetch:
+    """Prefetch option values of lines with their options and channel listings."""
+    return Prefetch(
+        "option_values",
+        queryset=OptionValue.objects.select_related("option").prefetch_related(
+            Prefetch(
+                "option_value_channels",
+                queryset=OptionValueChannelListing.objects.select_related("channel"),
+            )
+        ),
+    )
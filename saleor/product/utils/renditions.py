@@ -0,0 +1,194 @@
+"""Pre-rendering of product image thumbnails in batches.
+
+Warming images with `VersatileImageFieldWarmer` opens and decodes the original
+image again for every rendition size. Here each image is decoded once and its
+renditions are scaled down from the previous, larger one. Every rendition is
+also saved in the WebP format next to the original one, under its name with
+the `.webp` extension appended.
+
+Renditions are saved under the paths `versatileimagefield` uses, so
+`get_thumbnail` serves them without rendering on demand.
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from io import BytesIO
+from typing import TYPE_CHECKING, Iterable, List, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from PIL import Image
+from versatileimagefield.settings import VERSATILEIMAGEFIELD_CACHE_LENGTH
+from versatileimagefield.utils import get_resized_path
+
+from ..product_images import AVAILABLE_SIZES
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from versatileimagefield.files import VersatileImageFieldFile
+
+    from ..models import ProductMedia
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_METHOD = "thumbnail"
+WEBP_EXTENSION = "webp"
+WEBP_MIME_TYPE = "image/webp"
+
+
+def get_rendition_sizes(rendition_key_set: str = "products") -> List[Tuple[int, int]]:
+    """Return thumbnail sizes of the key set, the largest first."""
+    sizes = set()
+    for size_name in AVAILABLE_SIZES[rendition_key_set]:
+        method, size = size_name.split("__")
+        if method == THUMBNAIL_METHOD:
+            width, height = size.split("x")
+            sizes.add((int(width), int(height)))
+    return sorted(sizes, key=lambda size: size[0] * size[1], reverse=True)
+
+
+def get_webp_path(path: str) -> str:
+    """Return the path of the WebP copy of a rendition, e.g. `foo.jpg.webp`.
+
+    The original extension is kept, so copies of `foo.jpg` and `foo.png` differ.
+    """
+    return "%s.%s" % (path, WEBP_EXTENSION)
+
+
+def get_rendition_paths(
+    image_file: "VersatileImageFieldFile", width: int, height: int
+) -> List[str]:
+    path = get_resized_path(
+        path_to_image=image_file.name,
+        width=width,
+        height=height,
+        filename_key=image_file.thumbnail.get_filename_key(),
+        storage=image_file.storage,
+    )
+    paths = [path]
+    if settings.PRODUCT_THUMBNAILS_WEBP:
+        paths.append(get_webp_path(path))
+    return paths
+
+
+def render_thumbnails(
+    image_file: "VersatileImageFieldFile",
+    sizes: Iterable[Tuple[int, int]],
+    overwrite: bool = False,
+) -> int:
+    """Decode the image once and save its missing thumbnails of all sizes.
+
+    Return the number of saved files.
+    """
+    storage = image_file.storage
+    sizes = [
+        (width, height)
+        for width, height in sizes
+        if overwrite
+        or not all(
+            storage.exists(path)
+            for path in get_rendition_paths(image_file, width, height)
+        )
+    ]
+    if not sizes:
+        return 0
+
+    sized_image = image_file.thumbnail
+    image, file_ext, image_format, mime_type = sized_image.retrieve_image(
+        image_file.name
+    )
+    # Let JPEG images be decoded at the smallest scale that is still larger than
+    # the largest thumbnail, `Image.thumbnail` does the same for a single size.
+    image.draft(image.mode, _get_thumbnail_size(image.size, sizes[0]))
+    image, save_kwargs = sized_image.preprocess(image, image_format)
+
+    saved_count = 0
+    source = image
+    for width, height in sizes:
+        thumbnail = source.copy()
+        thumbnail.thumbnail((width, height), Image.LANCZOS)
+        # Sizes go from the largest, the next thumbnail is scaled from this one.
+        source = thumbnail
+
+        path, *webp_paths = get_rendition_paths(image_file, width, height)
+        imagefile = BytesIO()
+        thumbnail.save(imagefile, **save_kwargs)
+        _save_rendition(sized_image, imagefile, path, file_ext, mime_type)
+        saved_count += 1
+
+        for webp_path in webp_paths:
+            imagefile = BytesIO()
+            _get_webp_image(thumbnail).save(
+                imagefile,
+                format="WEBP",
+                quality=settings.PRODUCT_THUMBNAILS_WEBP_QUALITY,
+            )
+            _save_rendition(
+                sized_image, imagefile, webp_path, WEBP_EXTENSION, WEBP_MIME_TYPE
+            )
+            saved_count += 1
+    return saved_count
+
+
+def _get_thumbnail_size(
+    image_size: Tuple[int, int], box: Tuple[int, int]
+) -> Tuple[int, int]:
+    ratio = min(box[0] / image_size[0], box[1] / image_size[1], 1)
+    return (
+        max(round(image_size[0] * ratio), 1),
+        max(round(image_size[1] * ratio), 1),
+    )
+
+
+def _get_webp_image(image: Image.Image) -> Image.Image:
+    if image.mode in ("RGB", "RGBA"):
+        return image
+    has_alpha = image.mode in ("LA", "PA") or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _save_rendition(sized_image, imagefile, path, file_ext, mime_type):
+    storage = sized_image.storage
+    if storage.exists(path):
+        storage.delete(path)
+    sized_image.save_image(imagefile, path, file_ext, mime_type)
+    # Let images rendered on demand skip checking the storage, like
+    # `versatileimagefield` does after rendering.
+    cache.set(storage.url(path), 1, VERSATILEIMAGEFIELD_CACHE_LENGTH)
+
+
+def render_product_media_thumbnails(
+    media: Iterable["ProductMedia"], overwrite: bool = False, workers: int = None
+) -> Tuple[int, List[str]]:
+    """Render thumbnails of all product sizes for the given product media.
+
+    Images are rendered in a pool of `PRODUCT_THUMBNAILS_WORKERS` threads, image
+    decoding and scaling release the GIL. Return the number of saved files and
+    the names of images that failed to render.
+    """
+    if workers is None:
+        workers = settings.PRODUCT_THUMBNAILS_WORKERS
+    sizes = get_rendition_sizes("products")
+    image_files = [item.image for item in media if item.image]
+
+    def render(image_file):
+        try:
+            return render_thumbnails(image_file, sizes, overwrite=overwrite)
+        except Exception:
+            logger.exception(
+                "Failed to render thumbnails", extra={"image": image_file.name}
+            )
+            return None
+
+    if workers:
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(render, image_files))
+    else:
+        results = [render(image_file) for image_file in image_files]
+
+    saved_count = sum(result for result in results if result)
+    failed = [
+        image_file.name
+        for image_file, result in zip(image_files, results)
+        if result is None
+    ]
+    return saved_count, failed
@@ -1,13 +1,30 @@
 import operator
 from collections import defaultdict
+from datetime import datetime
 from functools import reduce
-from typing import Optional
+from typing import List, Optional, Tuple
 
+from babel.numbers import get_currency_precision
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import QuerySet
 from django.db.models.query_utils import Q
+from django.utils import timezone
 from prices import Money
 
+from ...channel.models import Channel
+from ...discount import DiscountValueType
+from ...discount.models import Sale, SaleChannelListing
 from ...discount.utils import calculate_discounted_price, fetch_active_discounts
-from ..models import Product, ProductChannelListing, ProductVariantChannelListing
+from ..models import (
+    Category,
+    CollectionProduct,
+    Product,
+    ProductChannelListing,
+    ProductDiscountedPriceUpdate,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
 
 
 def _get_variant_prices_in_channels_dict(product):
@@ -54,13 +71,26 @@ def update_product_discounted_price(product, discounts=None):
             discounts,
             product_channel_listing.channel,
         )
-        if product_channel_listing.discounted_price != product_discounted_price:
+        price_range_start = min(variant_prices_dict)
+        price_range_stop = max(variant_prices_dict)
+        if (
+            product_channel_listing.discounted_price != product_discounted_price
+            or product_channel_listing.price_range_start != price_range_start
+            or product_channel_listing.price_range_stop != price_range_stop
+        ):
             product_channel_listing.discounted_price_amount = (
                 product_discounted_price.amount
             )
+            product_channel_listing.price_range_start_amount = price_range_start.amount
+            product_channel_listing.price_range_stop_amount = price_range_stop.amount
             changed_products_channels_to_update.append(product_channel_listing)
     ProductChannelListing.objects.bulk_update(
-        changed_products_channels_to_update, ["discounted_price_amount"]
+        changed_products_channels_to_update,
+        [
+            "discounted_price_amount",
+            "price_range_start_amount",
+            "price_range_stop_amount",
+        ],
     )
 
 
@@ -72,29 +102,234 @@ def update_products_discounted_prices(products, discounts=None):
         update_product_discounted_price(product, discounts)
 
 
-def update_products_discounted_prices_of_catalogues(
+def get_products_of_catalogues(
     product_ids=None, category_ids=None, collection_ids=None
-):
+) -> Optional[QuerySet]:
     # Building the matching products query
     q_list = []
     if product_ids:
         q_list.append(Q(pk__in=product_ids))
     if category_ids:
-        q_list.append(Q(category_id__in=category_ids))
+        # Sales of categories apply to their subcategories too.
+        categories = Category.tree.filter(pk__in=category_ids).get_descendants(
+            include_self=True
+        )
+        q_list.append(Q(category__in=categories))
     if collection_ids:
         q_list.append(Q(collectionproduct__collection_id__in=collection_ids))
     # Asserting that the function was called with some ids
-    if q_list:
-        # Querying the products
-        q_or = reduce(operator.or_, q_list)
-        products = Product.objects.filter(q_or).distinct()
-
-        update_products_discounted_prices(products)
+    if not q_list:
+        return None
+    q_or = reduce(operator.or_, q_list)
+    return Product.objects.filter(q_or).distinct()
 
 
-def update_products_discounted_prices_of_discount(discount):
-    update_products_discounted_prices_of_catalogues(
+def get_products_of_discount(discount) -> Optional[QuerySet]:
+    return get_products_of_catalogues(
         product_ids=discount.products.all().values_list("id", flat=True),
         category_ids=discount.categories.all().values_list("id", flat=True),
         collection_ids=discount.collections.all().values_list("id", flat=True),
     )
+
+
+def update_products_discounted_prices_in_bulk(
+    product_ids: List[int], date: Optional[datetime] = None
+) -> int:
+    """Update discounted prices and price ranges of products with SQL.
+
+    Gives the same results as `update_product_discounted_price` for every
+    product, but updates all of them with a single statement. Discounts never
+    make a higher price cheaper than a lower one, so the discounted price of a
+    product is the cheapest variant price with the best discount applied.
+    Return the number of updated channel listings.
+    """
+    if not product_ids:
+        return 0
+    # Percentage discounts are rounded down to the precision of the currency.
+    channels = Channel.objects.values_list("pk", "currency_code")
+    quote_name = connection.ops.quote_name
+    tables = {
+        name: quote_name(model._meta.db_table)
+        for name, model in [
+            ("product", Product),
+            ("category", Category),
+            ("variant", ProductVariant),
+            ("product_listing", ProductChannelListing),
+            ("variant_listing", ProductVariantChannelListing),
+            ("collection_product", CollectionProduct),
+            ("sale", Sale),
+            ("sale_listing", SaleChannelListing),
+            ("sale_products", Sale.products.through),
+            ("sale_categories", Sale.categories.through),
+            ("sale_collections", Sale.collections.through),
+        ]
+    }
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            WITH products AS (
+                SELECT DISTINCT unnest(%(product_ids)s::int[]) AS product_id
+            ),
+            variant_prices AS (
+                SELECT variant.product_id, listing.channel_id,
+                    MIN(listing.price_amount) AS start_amount,
+                    MAX(listing.price_amount) AS stop_amount
+                FROM products
+                JOIN {tables["variant"]} variant USING (product_id)
+                JOIN {tables["variant_listing"]} listing
+                    ON listing.variant_id = variant.id
+                WHERE listing.price_amount IS NOT NULL
+                GROUP BY variant.product_id, listing.channel_id
+            ),
+            product_sales AS (
+                SELECT product_id, sale_id
+                FROM products
+                JOIN {tables["sale_products"]} USING (product_id)
+                UNION
+                SELECT product.id, sale_category.sale_id
+                FROM products
+                JOIN {tables["product"]} product ON product.id = products.product_id
+                JOIN {tables["category"]} category
+                    ON category.id = product.category_id
+                JOIN {tables["category"]} ancestor
+                    ON ancestor.tree_id = category.tree_id
+                    AND category.lft BETWEEN ancestor.lft AND ancestor.rght
+                JOIN {tables["sale_categories"]} sale_category
+                    ON sale_category.category_id = ancestor.id
+                UNION
+                SELECT product_id, sale_collection.sale_id
+                FROM products
+                JOIN {tables["collection_product"]} collection_product
+                    USING (product_id)
+                JOIN {tables["sale_collections"]} sale_collection
+                    ON sale_collection.collection_id = collection_product.collection_id
+            ),
+            discounted_prices AS (
+                SELECT variant_prices.product_id, variant_prices.channel_id,
+                    MIN(
+                        CASE sale.type
+                        WHEN %(fixed)s THEN GREATEST(
+                            variant_prices.start_amount - sale_listing.discount_value,
+                            0
+                        )
+                        ELSE variant_prices.start_amount - TRUNC(
+                            variant_prices.start_amount
+                            * sale_listing.discount_value / 100,
+                            currency.precision
+                        )
+                        END
+                    ) AS amount
+                FROM variant_prices
+                JOIN product_sales USING (product_id)
+                JOIN {tables["sale"]} sale ON sale.id = product_sales.sale_id
+                JOIN {tables["sale_listing"]} sale_listing
+                    ON sale_listing.sale_id = sale.id
+                    AND sale_listing.channel_id = variant_prices.channel_id
+                JOIN unnest(%(channel_ids)s::int[], %(precisions)s::int[])
+                    AS currency (channel_id, precision)
+                    ON currency.channel_id = variant_prices.channel_id
+                WHERE sale.start_date <= %(date)s
+                    AND (sale.end_date IS NULL OR sale.end_date >= %(date)s)
+                GROUP BY variant_prices.product_id, variant_prices.channel_id
+            ),
+            prices AS (
+                SELECT variant_prices.*,
+                    COALESCE(
+                        discounted_prices.amount, variant_prices.start_amount
+                    ) AS discounted_amount
+                FROM variant_prices
+                LEFT JOIN discounted_prices USING (product_id, channel_id)
+            )
+            UPDATE {tables["product_listing"]} listing
+            SET discounted_price_amount = prices.discounted_amount,
+                price_range_start_amount = prices.start_amount,
+                price_range_stop_amount = prices.stop_amount
+            FROM prices
+            WHERE listing.product_id = prices.product_id
+                AND listing.channel_id = prices.channel_id
+                AND (
+                    listing.discounted_price_amount
+                        IS DISTINCT FROM prices.discounted_amount
+                    OR listing.price_range_start_amount
+                        IS DISTINCT FROM prices.start_amount
+                    OR listing.price_range_stop_amount
+                        IS DISTINCT FROM prices.stop_amount
+                )
+            """,
+            {
+                "product_ids": list(product_ids),
+                "date": date or timezone.now(),
+                "fixed": DiscountValueType.FIXED,
+                "channel_ids": [pk for pk, _ in channels],
+                "precisions": [
+                    get_currency_precision(currency) for _, currency in channels
+                ],
+            },
+        )
+        return cursor.rowcount
+
+
+def mark_products_discounted_prices_for_update(products: QuerySet):
+    """Queue products for the update of their discounted prices.
+
+    Products already waiting for the update are queued once.
+    """
+    sql, params = products.values("pk").order_by().query.sql_with_params()
+    quote_name = connection.ops.quote_name
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"INSERT INTO {quote_name(ProductDiscountedPriceUpdate._meta.db_table)} "
+            "(product_id, created_at) "
+            f"SELECT products.id, %s FROM ({sql}) AS products "
+            "ON CONFLICT (product_id) DO NOTHING",
+            [timezone.now(), *params],
+        )
+
+
+def _take_marked_products(limit: int) -> List[int]:
+    """Remove the oldest products from the queue and return their IDs.
+
+    Products are removed before their prices are calculated, so a product queued
+    again in the meantime waits for the removal to commit and is then queued for
+    the next batch. Products taken by a concurrent run are skipped.
+
+    The taken IDs are collected into an array, so they're deleted through the
+    primary key whatever the planner estimates for the queue.
+    """
+    table = connection.ops.quote_name(ProductDiscountedPriceUpdate._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f"""
+            DELETE FROM {table}
+            WHERE product_id = ANY(ARRAY(
+                SELECT product_id FROM {table}
+                ORDER BY created_at
+                LIMIT %s
+                FOR UPDATE SKIP LOCKED
+            ))
+            RETURNING product_id
+            """,
+            [limit],
+        )
+        return [product_id for product_id, in cursor.fetchall()]
+
+
+def update_marked_products_discounted_prices() -> Tuple[int, bool]:
+    """Update discounted prices of queued products, the oldest first.
+
+    Products are taken from the queue in batches, each one updated in its own
+    transaction. Return the number of updated products and whether products are
+    left in the queue because the batches limit was reached.
+    """
+    batch_size = settings.DISCOUNTED_PRICES_UPDATE_BATCH_SIZE
+    updated = 0
+    for _ in range(settings.DISCOUNTED_PRICES_UPDATE_MAX_BATCHES):
+        with transaction.atomic():
+            product_ids = _take_marked_products(batch_size)
+            if not product_ids:
+                return updated, False
+            update_products_discounted_prices_in_bulk(product_ids)
+        updated += len(product_ids)
+        if len(product_ids) < batch_size:
+            return updated, False
+    return updated, ProductDiscountedPriceUpdate.objects.exists()
@@ -0,0 +1 @@
+default_app_config = "saleor.servicetime.app.ServiceTimeAppConfig"
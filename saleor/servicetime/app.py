@@ -0,0 +1,35 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class ServiceTimeAppConfig(AppConfig):
+    name = "saleor.servicetime"
+
+    def ready(self):
+        from ..graphql.core.resolver_cache import (
+            invalidate_resolver_cache_for_instance,
+        )
+        from .models import ServiceTime
+        from .signals import invalidate_service_time_calendar_cache
+
+        # preventing duplicate signals
+        post_save.connect(
+            invalidate_resolver_cache_for_instance,
+            sender=ServiceTime,
+            dispatch_uid="invalidate_servicetime_resolver_cache_on_save",
+        )
+        post_delete.connect(
+            invalidate_resolver_cache_for_instance,
+            sender=ServiceTime,
+            dispatch_uid="invalidate_servicetime_resolver_cache_on_delete",
+        )
+        post_save.connect(
+            invalidate_service_time_calendar_cache,
+            sender=ServiceTime,
+            dispatch_uid="invalidate_service_time_calendar_cache_on_save",
+        )
+        post_delete.connect(
+            invalidate_service_time_calendar_cache,
+            sender=ServiceTime,
+            dispatch_uid="invalidate_service_time_calendar_cache_on_delete",
+        )
@@ -0,0 +1,116 @@
+"""Order capacity of service time slots.
+
+Stores may limit the number of orders placed for a single time slot of a
+service. Orders of a slot are counted in a `ServiceTimeSlot` row per store,
+order type, date and time. A reservation increments the counter with a single
+conditional update, so concurrent checkouts of the same slot are serialized by
+the row lock of the counter and a slot can never be overbooked.
+"""
+from typing import TYPE_CHECKING, Optional
+
+from django.db.models import F
+
+from ..core.exceptions import SlotCapacityExceeded
+from .models import ServiceTimeSlot
+from .slots import get_service_time_calendar
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..order.models import Order
+    from ..store.models import Store
+
+
+def get_slot_capacity(store: Optional["Store"], order_type: str) -> Optional[int]:
+    """Return the maximum number of orders per slot, `None` for unlimited."""
+    if store is None:
+        return None
+    calendar = get_service_time_calendar(store)
+    if calendar is None:
+        return None
+    return calendar.get_slot_capacity(order_type)
+
+
+def _get_slot_lookup(store, order_type, expected_date, expected_time) -> dict:
+    return {
+        "store_id": store.pk,
+        "order_type": order_type,
+        "expected_date": expected_date,
+        "expected_time": expected_time,
+    }
+
+
+def is_slot_full(
+    store: Optional["Store"],
+    order_type: str,
+    expected_date: Optional[str],
+    expected_time: Optional[str],
+) -> bool:
+    """Check without locking whether the slot has no capacity left."""
+    if not (expected_date and expected_time):
+        return False
+    capacity = get_slot_capacity(store, order_type)
+    if capacity is None:
+        return False
+    return ServiceTimeSlot.objects.filter(
+        **_get_slot_lookup(store, order_type, expected_date, expected_time),
+        orders_count__gte=capacity,
+    ).exists()
+
+
+def reserve_slot(
+    store: Optional["Store"],
+    order_type: str,
+    expected_date: Optional[str],
+    expected_time: Optional[str],
+) -> bool:
+    """Count an order in its time slot.
+
+    Should be called inside the transaction creating the order, so the
+    reservation is rolled back together with the order. The counter row stays
+    locked until the transaction ends. Return whether the order was counted,
+    slots without a capacity are not.
+
+    :raises SlotCapacityExceeded: when the slot is fully booked.
+    """
+    if not (expected_date and expected_time):
+        return False
+    capacity = get_slot_capacity(store, order_type)
+    if capacity is None:
+        return False
+    lookup = _get_slot_lookup(store, order_type, expected_date, expected_time)
+    slot, _ = ServiceTimeSlot.objects.get_or_create(**lookup)
+    reserved = ServiceTimeSlot.objects.filter(
+        pk=slot.pk, orders_count__lt=capacity
+    ).update(orders_count=F("orders_count") + 1)
+    if not reserved:
+        raise SlotCapacityExceeded(order_type, expected_date, expected_time)
+    return True
+
+
+def release_slot(
+    store: Optional["Store"],
+    order_type: str,
+    expected_date: Optional[str],
+    expected_time: Optional[str],
+):
+    """Free the place of an order in its time slot, e.g. when it is canceled."""
+    if store is None or not (expected_date and expected_time):
+        return
+    ServiceTimeSlot.objects.filter(
+        **_get_slot_lookup(store, order_type, expected_date, expected_time),
+        orders_count__gt=0,
+    ).update(orders_count=F("orders_count") - 1)
+
+
+def release_order_slot(order: "Order"):
+    """Free the place the order reserved in its time slot.
+
+    Orders placed before capacities existed, or while the slot had no capacity,
+    were never counted and don't release anything. The caller saves the order.
+    """
+    if not order.slot_reserved:
+        return
+    release_slot(
+        order.store, order.order_type, order.expected_date, order.expected_time
+    )
+    order.slot_reserved = False
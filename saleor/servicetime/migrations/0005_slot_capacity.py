@@ -0,0 +1,44 @@
+# Generated by Django 3.2.4 on 2021-08-20 04:12
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('store', '0021_store_sound_notifications'),
+        ('servicetime', '0004_servicetime_table_service_time'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='servicetime',
+            name='dl_slot_capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='servicetime',
+            name='pu_slot_capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='servicetime',
+            name='table_slot_capacity',
+            field=models.PositiveIntegerField(blank=True, null=True),
+        ),
+        migrations.CreateModel(
+            name='ServiceTimeSlot',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('order_type', models.CharField(choices=[('delivery', 'Delivery'), ('pickup', 'Pickup'), ('dinein', 'Dine-in')], max_length=35)),
+                ('expected_date', models.CharField(max_length=50)),
+                ('expected_time', models.CharField(max_length=50)),
+                ('orders_count', models.PositiveIntegerField(default=0)),
+                ('store', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='service_time_slots', to='store.store')),
+            ],
+            options={
+                'unique_together': {('store', 'order_type', 'expected_date', 'expected_time')},
+            },
+        ),
+    ]
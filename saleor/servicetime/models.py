@@ -1,4 +1,5 @@
 from saleor.store.models import Store
+from django.conf import settings
 from django.db import models
 from ..core.models import MultitenantModelWithMetadata
 from ..core.permissions import ServiceTimePermissions
@@ -32,6 +33,11 @@ class ServiceTime(MultitenantModelWithMetadata):
 
     table_service_time = SanitizedJSONField(blank=True, null=True, sanitizer=clean_editor_js)
 
+    # maximum number of orders per time slot, unlimited when not set
+    dl_slot_capacity = models.PositiveIntegerField(blank=True, null=True)
+    pu_slot_capacity = models.PositiveIntegerField(blank=True, null=True)
+    table_slot_capacity = models.PositiveIntegerField(blank=True, null=True)
+
     def __str__(self) -> str:
         return self.name
 
@@ -43,4 +49,22 @@ class ServiceTime(MultitenantModelWithMetadata):
                 ServiceTimePermissions.MANAGE_SERVICE_TIME.codename,
                 "Service time.",
             ),
-        )
\ No newline at end of file
+        )
+
+
+class ServiceTimeSlot(models.Model):
+    """Number of orders placed for a time slot of a store service."""
+
+    store = models.ForeignKey(
+        Store, related_name="service_time_slots", on_delete=models.CASCADE
+    )
+    order_type = models.CharField(max_length=35, choices=settings.ORDER_TYPES)
+    expected_date = models.CharField(max_length=50)
+    expected_time = models.CharField(max_length=50)
+    orders_count = models.PositiveIntegerField(default=0)
+
+    class Meta:
+        app_label = "servicetime"
+        unique_together = (
+            ("store", "order_type", "expected_date", "expected_time"),
+        )
@@ -0,0 +1,6 @@
+from .slots import invalidate_service_time_calendar
+
+
+def invalidate_service_time_calendar_cache(sender, instance, **kwargs):
+    if instance.store_id:
+        invalidate_service_time_calendar(instance.store_id)
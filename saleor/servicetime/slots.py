@@ -0,0 +1,281 @@
+"""Time slot calendar of store services.
+
+Opening hours of delivery, pickup and table service are stored as JSON on
+`ServiceTime`, e.g. `{"dl": [{"days": [...7 flags], "open": "10:00",
+"close": "22:00"}]}` where the first flag stands for Monday. The calendar
+expands them once into sorted slot times of the next days, taking the time gap,
+preorder days, same day orders and emergency closures of the store into account. It is cached
+per store until the service time or the store changes, so listing and checking
+slots only needs a bisect of precomputed minutes.
+"""
+import datetime
+from bisect import bisect_left
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Dict, List, NamedTuple, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+
+from . import models
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from ..store.models import Store
+    from .models import ServiceTime
+
+CACHE_KEY_PREFIX = "service_time_calendar:"
+
+# Cached marker for stores without service time settings.
+NO_SERVICE_TIME = "__no_service_time__"
+
+# Table service has no own gap settings.
+TABLE_SERVICE_TIME_GAP = 15
+
+MINUTES_IN_DAY = 24 * 60
+
+
+class ServiceSettings(NamedTuple):
+    service_time_field: str
+    service_time_key: str
+    time_gap_field: Optional[str]
+    lead_time_field: Optional[str]
+    allow_preorder_field: Optional[str]
+    preorder_day_field: Optional[str]
+    same_day_order_field: Optional[str]
+    status_field: str
+    capacity_field: str
+
+
+# Services by order type, see `settings.ORDER_TYPES`.
+SERVICES = {
+    "delivery": ServiceSettings(
+        service_time_field="dl_service_time",
+        service_time_key="dl",
+        time_gap_field="dl_time_gap",
+        lead_time_field="dl_delivery_time",
+        allow_preorder_field="dl_allow_preorder",
+        preorder_day_field="dl_preorder_day",
+        same_day_order_field="dl_same_day_order",
+        status_field="delivery_status",
+        capacity_field="dl_slot_capacity",
+    ),
+    "pickup": ServiceSettings(
+        service_time_field="pu_service_time",
+        service_time_key="pu",
+        time_gap_field="pu_time_gap",
+        lead_time_field="pu_delivery_time",
+        allow_preorder_field="pu_allow_preorder",
+        preorder_day_field="pu_preorder_day",
+        same_day_order_field="pu_same_day_order",
+        status_field="pickup_status",
+        capacity_field="pu_slot_capacity",
+    ),
+    "dinein": ServiceSettings(
+        service_time_field="table_service_time",
+        service_time_key="tb",
+        time_gap_field=None,
+        lead_time_field=None,
+        allow_preorder_field=None,
+        preorder_day_field=None,
+        same_day_order_field=None,
+        status_field="table_service_status",
+        capacity_field="table_slot_capacity",
+    ),
+}
+
+
+@dataclass
+class ServiceSlots:
+    # minutes to prepare an order, slots sooner than that are not available
+    lead_time: int = 0
+    # maximum number of orders per slot, `None` stands for unlimited
+    capacity: Optional[int] = None
+    # slot times of the following days as minutes after midnight
+    days: List[Tuple[int, ...]] = field(default_factory=list)
+
+
+@dataclass
+class ServiceTimeCalendar:
+    start_date: datetime.date
+    services: Dict[str, ServiceSlots] = field(default_factory=dict)
+
+    def get_slots(
+        self, order_type: str, date: datetime.date, now: datetime.datetime = None
+    ) -> Tuple[int, ...]:
+        """Return available slot times of a day as minutes after midnight."""
+        service = self.services.get(order_type)
+        offset = (date - self.start_date).days
+        if service is None or not 0 <= offset < len(service.days):
+            return ()
+        slots = service.days[offset]
+        now = timezone.localtime(now)
+        if date == now.date():
+            earliest = now.hour * 60 + now.minute + service.lead_time
+            slots = slots[bisect_left(slots, earliest) :]
+        return slots
+
+    def is_slot_available(
+        self, order_type: str, date: datetime.date, time: datetime.time, now=None
+    ) -> bool:
+        slots = self.get_slots(order_type, date, now)
+        minutes = time.hour * 60 + time.minute
+        index = bisect_left(slots, minutes)
+        return index < len(slots) and slots[index] == minutes
+
+    def get_slot_capacity(self, order_type: str) -> Optional[int]:
+        service = self.services.get(order_type)
+        return service.capacity if service else None
+
+
+def format_slot(minutes: int) -> str:
+    return "%02d:%02d" % divmod(minutes, 60)
+
+
+def _parse_time(value: str) -> int:
+    hours, minutes = value.split(":")[:2]
+    return int(hours) * 60 + int(minutes)
+
+
+def _get_opening_hours(service_time: "ServiceTime", service: ServiceSettings):
+    """Return (weekdays, open, close) of every opening hours entry."""
+    value = getattr(service_time, service.service_time_field) or {}
+    opening_hours = []
+    for entry in value.get(service.service_time_key) or []:
+        try:
+            open_time = _parse_time(entry["open"])
+            close_time = _parse_time(entry["close"])
+        except (KeyError, TypeError, ValueError):
+            continue
+        if close_time <= open_time:
+            # opened past midnight, slots of the next day are not supported
+            close_time = MINUTES_IN_DAY - 1
+        weekdays = {
+            index for index, enabled in enumerate(entry.get("days", [])) if enabled
+        }
+        opening_hours.append((weekdays, open_time, close_time))
+    return opening_hours
+
+
+def _get_closed_until(store: Optional["Store"], service: ServiceSettings):
+    """Return the end of an emergency closure of the service, if any."""
+    if store is None:
+        return None
+    closures = [
+        getattr(store, status_field)
+        for status_field in ("webshop_status", service.status_field)
+        if getattr(store, status_field)
+    ]
+    return max(closures) if closures else None
+
+
+def _is_same_day_order_disabled(
+    service_time: "ServiceTime", service: ServiceSettings
+) -> bool:
+    """Check whether preorders of the service can't be placed for the same day.
+
+    The flag only applies to services with preorders, without them orders can
+    only be placed for the same day.
+    """
+    if not (
+        service.allow_preorder_field
+        and getattr(service_time, service.allow_preorder_field)
+    ):
+        return False
+    return not getattr(service_time, service.same_day_order_field)
+
+
+def _build_service_slots(
+    service_time: "ServiceTime",
+    store: Optional["Store"],
+    service: ServiceSettings,
+    start_date: datetime.date,
+) -> ServiceSlots:
+    gap = TABLE_SERVICE_TIME_GAP
+    if service.time_gap_field:
+        gap = getattr(service_time, service.time_gap_field) or gap
+    days_count = 1
+    if service.allow_preorder_field and getattr(
+        service_time, service.allow_preorder_field
+    ):
+        days_count += getattr(service_time, service.preorder_day_field) or 0
+    days_count = min(days_count, settings.SERVICE_TIME_CALENDAR_DAYS)
+    lead_time = 0
+    if service.lead_time_field:
+        lead_time = getattr(service_time, service.lead_time_field) or 0
+
+    opening_hours = _get_opening_hours(service_time, service)
+    closed_until = _get_closed_until(store, service)
+    same_day_order_disabled = _is_same_day_order_disabled(service_time, service)
+    service_slots = ServiceSlots(
+        lead_time=lead_time, capacity=getattr(service_time, service.capacity_field)
+    )
+    for offset in range(days_count):
+        date = start_date + datetime.timedelta(days=offset)
+        slots = set()
+        if offset == 0 and same_day_order_disabled:
+            service_slots.days.append(())
+            continue
+        for weekdays, open_time, close_time in opening_hours:
+            if date.weekday() in weekdays:
+                slots.update(range(open_time, close_time + 1, gap))
+        if closed_until:
+            closed_until_local = timezone.localtime(closed_until)
+            if closed_until_local.date() > date:
+                slots.clear()
+            elif closed_until_local.date() == date:
+                reopening = closed_until_local.hour * 60 + closed_until_local.minute
+                slots = {slot for slot in slots if slot >= reopening}
+        service_slots.days.append(tuple(sorted(slots)))
+    return service_slots
+
+
+def build_service_time_calendar(
+    service_time: "ServiceTime",
+    store: Optional["Store"] = None,
+    start_date: Optional[datetime.date] = None,
+) -> ServiceTimeCalendar:
+    start_date = start_date or timezone.localdate()
+    calendar = ServiceTimeCalendar(start_date=start_date)
+    for order_type, service in SERVICES.items():
+        calendar.services[order_type] = _build_service_slots(
+            service_time, store, service, start_date
+        )
+    return calendar
+
+
+def get_cache_key(store_id) -> str:
+    return f"{CACHE_KEY_PREFIX}{store_id}"
+
+
+def get_service_time_calendar(store: "Store") -> Optional[ServiceTimeCalendar]:
+    """Return the slot calendar of the store starting today.
+
+    `None` is returned when the store has no service time settings. The store
+    may come from the tenant cache, so emergency closures of the calendar are
+    read with the service time instead.
+    """
+    key = get_cache_key(store.pk)
+    today = timezone.localdate()
+    calendar = cache.get(key)
+    if calendar is None or (
+        calendar != NO_SERVICE_TIME and calendar.start_date != today
+    ):
+        service_time = (
+            models.ServiceTime.objects.select_related("store")
+            .filter(store_id=store.pk)
+            .first()
+        )
+        calendar = (
+            build_service_time_calendar(service_time, service_time.store, today)
+            if service_time
+            else NO_SERVICE_TIME
+        )
+        cache.set(key, calendar, settings.SERVICE_TIME_CALENDAR_TIMEOUT)
+    if calendar == NO_SERVICE_TIME:
+        return None
+    return calendar
+
+
+def invalidate_service_time_calendar(store_id):
+    cache.delete(get_cache_key(store_id))
@@ -0,0 +1,219 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from django.db import connection, transaction
+from django.test.utils import CaptureQueriesContext
+
+from ...core.exceptions import SlotCapacityExceeded
+from ...order.models import Order
+from ..capacity import (
+    get_slot_capacity,
+    is_slot_full,
+    release_order_slot,
+    release_slot,
+    reserve_slot,
+)
+from ..models import ServiceTimeSlot
+
+SLOT = ("delivery", "2021-07-05", "11:00")
+
+
+@pytest.fixture
+def service_time_with_capacity(service_time):
+    service_time.dl_slot_capacity = 2
+    service_time.save(update_fields=["dl_slot_capacity"])
+    return service_time
+
+
+def _get_orders_count(store, order_type, expected_date, expected_time):
+    return ServiceTimeSlot.objects.get(
+        store=store,
+        order_type=order_type,
+        expected_date=expected_date,
+        expected_time=expected_time,
+    ).orders_count
+
+
+def test_get_slot_capacity(store, service_time_with_capacity):
+    # when
+    capacity = get_slot_capacity(store, "delivery")
+
+    # then
+    assert capacity == 2
+    assert get_slot_capacity(store, "pickup") is None
+    assert get_slot_capacity(None, "delivery") is None
+
+
+def test_get_slot_capacity_updated_with_service_time(store, service_time):
+    # given
+    assert get_slot_capacity(store, "delivery") is None
+
+    # when
+    service_time.dl_slot_capacity = 5
+    service_time.save(update_fields=["dl_slot_capacity"])
+
+    # then
+    assert get_slot_capacity(store, "delivery") == 5
+
+
+def test_reserve_slot(store, service_time_with_capacity):
+    # when
+    reserve_slot(store, *SLOT)
+    reserve_slot(store, *SLOT)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 2
+    assert is_slot_full(store, *SLOT)
+
+
+def test_reserve_slot_fully_booked(store, service_time_with_capacity):
+    # given
+    reserve_slot(store, *SLOT)
+    reserve_slot(store, *SLOT)
+
+    # when
+    with pytest.raises(SlotCapacityExceeded):
+        reserve_slot(store, *SLOT)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 2
+
+
+def test_reserve_slot_counts_slots_separately(store, service_time_with_capacity):
+    # given
+    reserve_slot(store, *SLOT)
+    reserve_slot(store, *SLOT)
+
+    # when
+    reserve_slot(store, "delivery", "2021-07-05", "11:15")
+    reserve_slot(store, "delivery", "2021-07-06", "11:00")
+
+    # then
+    assert not is_slot_full(store, "delivery", "2021-07-05", "11:15")
+    assert not is_slot_full(store, "delivery", "2021-07-06", "11:00")
+
+
+def test_reserve_slot_unlimited_capacity(store, service_time):
+    # when
+    reserved = reserve_slot(store, *SLOT)
+
+    # then
+    assert reserved is False
+    assert not ServiceTimeSlot.objects.exists()
+    assert not is_slot_full(store, *SLOT)
+
+
+def test_reserve_slot_without_expected_time(store, service_time_with_capacity):
+    # when
+    reserve_slot(store, "delivery", "2021-07-05", None)
+
+    # then
+    assert not ServiceTimeSlot.objects.exists()
+
+
+def test_release_slot(store, service_time_with_capacity):
+    # given
+    reserve_slot(store, *SLOT)
+    reserve_slot(store, *SLOT)
+
+    # when
+    release_slot(store, *SLOT)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 1
+    assert not is_slot_full(store, *SLOT)
+    reserve_slot(store, *SLOT)
+
+
+def test_release_slot_does_not_go_below_zero(store, service_time_with_capacity):
+    # given
+    reserve_slot(store, *SLOT)
+
+    # when
+    release_slot(store, *SLOT)
+    release_slot(store, *SLOT)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 0
+
+
+def _create_slot_order(store, channel, **kwargs):
+    order_type, expected_date, expected_time = SLOT
+    return Order.objects.create(
+        store=store,
+        channel=channel,
+        currency=channel.currency_code,
+        order_type=order_type,
+        expected_date=expected_date,
+        expected_time=expected_time,
+        **kwargs,
+    )
+
+
+def test_release_order_slot(store, channel_USD, service_time_with_capacity):
+    # given
+    reserve_slot(store, *SLOT)
+    order = _create_slot_order(
+        store, channel_USD, slot_reserved=reserve_slot(store, *SLOT)
+    )
+
+    # when
+    release_order_slot(order)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 1
+    assert order.slot_reserved is False
+
+
+def test_release_order_slot_not_reserved_by_order(
+    store, channel_USD, service_time_with_capacity
+):
+    # given
+    reserve_slot(store, *SLOT)
+    order = _create_slot_order(store, channel_USD)
+
+    # when
+    release_order_slot(order)
+
+    # then
+    assert _get_orders_count(store, *SLOT) == 1
+
+
+def _reserve_in_transaction(store):
+    with CaptureQueriesContext(connection) as queries:
+        try:
+            with transaction.atomic():
+                reserve_slot(store, *SLOT)
+            reserved = True
+        except SlotCapacityExceeded:
+            reserved = False
+        finally:
+            connection.close()
+    return reserved, [query["sql"] for query in queries]
+
+
+@pytest.mark.performance
+@pytest.mark.django_db(transaction=True)
+def test_reserve_slot_contention_benchmark(store, service_time):
+    # given
+    capacity = 25
+    completions = 300
+    service_time.dl_slot_capacity = capacity
+    service_time.save(update_fields=["dl_slot_capacity"])
+
+    # when
+    with ThreadPoolExecutor(max_workers=20) as executor:
+        results = list(
+            executor.map(lambda _: _reserve_in_transaction(store), range(completions))
+        )
+
+    # then
+    reserved = [result for result, _queries in results if result]
+    assert len(reserved) == capacity
+    assert _get_orders_count(store, *SLOT) == capacity
+    # A reservation is a conditional update of the slot counter, orders of the
+    # slot aren't counted and no rows are locked before the update.
+    for _reserved, queries in results:
+        assert not any("FOR UPDATE" in sql for sql in queries)
+        assert not any('"order_order"' in sql for sql in queries)
+        assert len([sql for sql in queries if sql.startswith("UPDATE")]) == 1
@@ -0,0 +1,183 @@
+import datetime
+
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ...store.models import Store
+
+from ..slots import (
+    build_service_time_calendar,
+    format_slot,
+    get_service_time_calendar,
+)
+
+# a monday
+START_DATE = datetime.date(2021, 7, 5)
+
+
+def _format_slots(slots):
+    return [format_slot(slot) for slot in slots]
+
+
+def test_build_service_time_calendar(service_time):
+    # when
+    calendar = build_service_time_calendar(service_time, start_date=START_DATE)
+
+    # then
+    delivery = calendar.services["delivery"]
+    assert len(delivery.days) == 3
+    assert _format_slots(delivery.days[1]) == [
+        "10:00",
+        "10:15",
+        "10:30",
+        "10:45",
+        "11:00",
+        "11:15",
+        "11:30",
+        "11:45",
+        "12:00",
+    ]
+    pickup = calendar.services["pickup"]
+    assert len(pickup.days) == 1
+    assert _format_slots(pickup.days[0]) == [
+        "11:00",
+        "11:30",
+        "12:00",
+        "12:30",
+        "13:00",
+        "17:00",
+        "17:30",
+        "18:00",
+    ]
+    assert _format_slots(calendar.services["dinein"].days[0]) == [
+        "12:00",
+        "12:15",
+        "12:30",
+        "12:45",
+        "13:00",
+    ]
+
+
+def test_build_service_time_calendar_closed_weekday(service_time):
+    # given
+    sunday = START_DATE + datetime.timedelta(days=6)
+
+    # when
+    calendar = build_service_time_calendar(service_time, start_date=sunday)
+
+    # then
+    assert calendar.services["pickup"].days == [()]
+    assert calendar.services["delivery"].days[0]
+
+
+def test_build_service_time_calendar_emergency_closure(service_time, store):
+    # given
+    store.delivery_status = timezone.make_aware(datetime.datetime(2021, 7, 6, 11, 10))
+
+    # when
+    calendar = build_service_time_calendar(service_time, store, START_DATE)
+
+    # then
+    delivery = calendar.services["delivery"]
+    assert delivery.days[0] == ()
+    assert _format_slots(delivery.days[1]) == ["11:15", "11:30", "11:45", "12:00"]
+    assert len(delivery.days[2]) == 9
+    assert len(calendar.services["pickup"].days[0]) == 8
+
+
+def test_build_service_time_calendar_same_day_order_disabled(service_time):
+    # given
+    service_time.dl_same_day_order = False
+    service_time.pu_same_day_order = False
+
+    # when
+    calendar = build_service_time_calendar(service_time, start_date=START_DATE)
+
+    # then
+    delivery = calendar.services["delivery"]
+    assert delivery.days[0] == ()
+    assert len(delivery.days[1]) == 9
+    assert len(delivery.days[2]) == 9
+    # pickup has no preorders, its orders are always placed for the same day
+    assert len(calendar.services["pickup"].days[0]) == 8
+
+
+def test_get_slots_skips_slots_within_lead_time(service_time):
+    # given
+    calendar = build_service_time_calendar(service_time, start_date=START_DATE)
+    now = timezone.make_aware(datetime.datetime(2021, 7, 5, 10, 50))
+
+    # when
+    slots = calendar.get_slots("delivery", START_DATE, now)
+
+    # then
+    assert _format_slots(slots) == ["11:30", "11:45", "12:00"]
+    assert calendar.is_slot_available(
+        "delivery", START_DATE, datetime.time(11, 30), now
+    )
+    assert not calendar.is_slot_available(
+        "delivery", START_DATE, datetime.time(11, 15), now
+    )
+    assert not calendar.is_slot_available(
+        "delivery", START_DATE, datetime.time(11, 35), now
+    )
+    assert not calendar.get_slots("delivery", START_DATE - datetime.timedelta(1))
+
+
+@freeze_time("2021-07-05 09:00")
+def test_get_service_time_calendar_from_cache(
+    service_time, store, django_assert_num_queries
+):
+    # given
+    get_service_time_calendar(store)
+
+    # when
+    with django_assert_num_queries(0):
+        calendar = get_service_time_calendar(store)
+
+    # then
+    assert calendar.start_date == timezone.localdate()
+
+
+@freeze_time("2021-07-05 09:00")
+def test_get_service_time_calendar_invalidated_on_changes(service_time, store):
+    # given
+    get_service_time_calendar(store)
+
+    # when
+    service_time.dl_time_gap = 60
+    service_time.save(update_fields=["dl_time_gap"])
+
+    # then
+    calendar = get_service_time_calendar(store)
+    assert len(calendar.services["delivery"].days[0]) == 3
+
+    # when
+    store.delivery_status = timezone.now() + datetime.timedelta(days=1)
+    store.save(update_fields=["delivery_status"])
+
+    # then
+    calendar = get_service_time_calendar(store)
+    assert calendar.services["delivery"].days[0] == ()
+
+
+@freeze_time("2021-07-05 09:00")
+def test_get_service_time_calendar_ignores_stale_store(service_time, store):
+    # given
+    stale_store = Store.objects.get(pk=store.pk)
+    store.delivery_status = timezone.now() + datetime.timedelta(days=1)
+    store.save(update_fields=["delivery_status"])
+
+    # when
+    calendar = get_service_time_calendar(stale_store)
+
+    # then
+    assert calendar.services["delivery"].days[0] == ()
+
+
+def test_get_service_time_calendar_without_service_time(store):
+    # when
+    calendar = get_service_time_calendar(store)
+
+    # then
+    assert calendar is None
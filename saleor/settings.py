@@ -183,6 +183,7 @@ if not SECRET_KEY and DEBUG:
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
     "django.middleware.common.CommonMiddleware",
+    "saleor.core.middleware.request_id",
     "saleor.core.middleware.request_time",
     "saleor.core.middleware.request_set_tenant",
     "saleor.core.middleware.discounts",
@@ -286,6 +287,10 @@ LOGGING = {
             "format": "[{server_time}] {message}",
             "style": "{",
         },
+        "json": {
+            "()": "saleor.core.logging.JsonFormatter",
+            "format": "%(asctime)s %(levelname)s %(name)s %(message)s",
+        },
     },
     'handlers': {
         'file': {
@@ -298,6 +303,21 @@ LOGGING = {
             'formatter': 'django',
             'encoding':'utf8',
         },
+        # formatting and writing events happens in a background thread
+        "events": {
+            "level": "INFO",
+            "()": "saleor.core.logging.QueueingHandler",
+            "target_class": "logging.handlers.TimedRotatingFileHandler",
+            "target_kwargs": {
+                "filename": "logs/events.log",
+                "when": "D",
+                "backupCount": 10,
+                "encoding": "utf8",
+                "delay": True,
+            },
+            "maxsize": int(os.environ.get("LOG_EVENTS_QUEUE_SIZE", 10000)),
+            "formatter": "json",
+        },
     },
     'loggers': {
         'django': {
@@ -305,8 +325,17 @@ LOGGING = {
             'level': 'INFO',
             'propagate': True,
         },
+        "saleor.events": {
+            "handlers": ["events"],
+            "level": "INFO",
+            "propagate": False,
+        },
     },
 }
+
+# Fraction of operations of high-volume paths, like requests, that are logged
+LOG_EVENTS_SAMPLE_RATE = float(os.environ.get("LOG_EVENTS_SAMPLE_RATE", 0.1))
+
 CHANNEL_LAYERS = {"default": {"BACKEND": "channels.layers.InMemoryChannelLayer"}}
 REDIS_CHANNEL = os.environ.get("REDIS_CHANNEL")
 if REDIS_CHANNEL:
@@ -314,7 +343,12 @@ if REDIS_CHANNEL:
         "default": {
             "BACKEND": "channels_redis.core.RedisChannelLayer",
             "CONFIG": {
-                "hosts": [(REDIS_CHANNEL, 6379)],
+                "hosts": [
+                    (REDIS_CHANNEL, int(os.environ.get("REDIS_CHANNEL_PORT", 6379)))
+                ],
+                # bursts of order notifications must not be dropped by busy stores
+                "capacity": int(os.environ.get("REDIS_CHANNEL_CAPACITY", 1000)),
+                "expiry": int(os.environ.get("REDIS_CHANNEL_EXPIRY", 10)),
             },
         },
     }
@@ -491,6 +525,18 @@ VERSATILEIMAGEFIELD_SETTINGS = {
     "create_images_on_demand": get_bool_from_env("CREATE_IMAGES_ON_DEMAND", DEBUG)
 }
 
+# Threads rendering product thumbnails of a batch, 0 renders images serially
+PRODUCT_THUMBNAILS_WORKERS = int(os.environ.get("PRODUCT_THUMBNAILS_WORKERS", 4))
+# Save a WebP copy of every product thumbnail rendition
+PRODUCT_THUMBNAILS_WEBP = get_bool_from_env("PRODUCT_THUMBNAILS_WEBP", True)
+PRODUCT_THUMBNAILS_WEBP_QUALITY = int(
+    os.environ.get("PRODUCT_THUMBNAILS_WEBP_QUALITY", 80)
+)
+# Product media ids rendered by a single thumbnails task
+PRODUCT_THUMBNAILS_BATCH_SIZE = int(
+    os.environ.get("PRODUCT_THUMBNAILS_BATCH_SIZE", 100)
+)
+
 PLACEHOLDER_IMAGES = {
     60: "images/placeholder60x60.png",
     120: "images/placeholder120x120.png",
@@ -530,6 +576,28 @@ CELERY_DEFAULT_QUEUE = APP_QUEUE
 CELERY_CONTENT_ENCODING = "utf-8"
 CELERY_ENABLE_REMOTE_CONTROL = False
 CELERY_SEND_EVENTS = False
+CELERY_BEAT_SCHEDULE = {
+    "delete-expired-checkouts": {
+        "task": "saleor.checkout.tasks.delete_expired_checkouts_task",
+        "schedule": timedelta(
+            seconds=parse(os.environ.get("CHECKOUT_DELETE_EXPIRED_INTERVAL", "1 hour"))
+        ),
+    },
+    "update-marked-products-discounted-prices": {
+        "task": "saleor.product.tasks.update_marked_products_discounted_prices_task",
+        "schedule": timedelta(
+            seconds=parse(
+                os.environ.get("DISCOUNTED_PRICES_UPDATE_INTERVAL", "15 minutes")
+            )
+        ),
+    },
+    "compact-sales-rollups": {
+        "task": "saleor.order.tasks.compact_sales_rollups_task",
+        "schedule": timedelta(
+            seconds=parse(os.environ.get("SALES_ROLLUPS_COMPACT_INTERVAL", "1 hour"))
+        ),
+    },
+}
 # Reason why we need the above is explained in Configuration Gotchas section.
 SQS_QUEUE_NAME = APP_QUEUE
 
@@ -562,6 +630,79 @@ GRAPHENE = {
     "SUBSCRIPTION_PATH": "/graphql"
 }
 
+# Number of parsed and validated GraphQL documents kept by every worker
+GRAPHQL_DOCUMENT_CACHE_SIZE = int(os.environ.get("GRAPHQL_DOCUMENT_CACHE_SIZE", 1000))
+
+# Automatic persisted queries, clients may send a sha256 hash instead of the query
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", True
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", "30 days")
+)
+
+# Cache of near-static storefront resolvers, invalidated on model changes
+RESOLVER_CACHE_ENABLED = get_bool_from_env("RESOLVER_CACHE_ENABLED", True)
+RESOLVER_CACHE_TIMEOUT = parse(os.environ.get("RESOLVER_CACHE_TIMEOUT", "1 day"))
+
+# Compiled postal code rates of store delivery areas, dropped on settings change
+DELIVERY_RATES_CACHE_TIMEOUT = parse(
+    os.environ.get("DELIVERY_RATES_CACHE_TIMEOUT", "1 day")
+)
+
+# Service time slots are precomputed for at most this many days ahead
+SERVICE_TIME_CALENDAR_DAYS = int(os.environ.get("SERVICE_TIME_CALENDAR_DAYS", 14))
+SERVICE_TIME_CALENDAR_TIMEOUT = parse(
+    os.environ.get("SERVICE_TIME_CALENDAR_TIMEOUT", "1 day")
+)
+
+# Threads preparing product batches of CSV and XLSX exports, 0 exports serially
+CSV_EXPORT_WORKERS = int(os.environ.get("CSV_EXPORT_WORKERS", 0))
+
+# Snapshot of active sales, replaced on sale changes and sale start or end dates
+DISCOUNT_SNAPSHOT_TIMEOUT = parse(os.environ.get("DISCOUNT_SNAPSHOT_TIMEOUT", "1 day"))
+DISCOUNT_SNAPSHOT_LOCAL_SIZE = int(os.environ.get("DISCOUNT_SNAPSHOT_LOCAL_SIZE", 1024))
+
+# Checkout lines and valid shipping methods kept between checkout mutations
+CHECKOUT_CACHE_TIMEOUT = parse(os.environ.get("CHECKOUT_CACHE_TIMEOUT", "15 minutes"))
+# Checkouts not changed for this long are deleted, unless their store sets its own TTL
+CHECKOUT_TTL = timedelta(seconds=parse(os.environ.get("CHECKOUT_TTL", "30 days")))
+# Expired checkouts deleted in one transaction
+CHECKOUT_DELETE_BATCH_SIZE = int(os.environ.get("CHECKOUT_DELETE_BATCH_SIZE", 500))
+# Batches deleted by one task run, the task is enqueued again if more are left
+CHECKOUT_DELETE_MAX_BATCHES = int(os.environ.get("CHECKOUT_DELETE_MAX_BATCHES", 20))
+
+# Seconds queued products wait for further sale changes before their discounted
+# prices are updated
+DISCOUNTED_PRICES_UPDATE_DELAY = parse(
+    os.environ.get("DISCOUNTED_PRICES_UPDATE_DELAY", "5 seconds")
+)
+# Products whose discounted prices are updated in one transaction
+DISCOUNTED_PRICES_UPDATE_BATCH_SIZE = int(
+    os.environ.get("DISCOUNTED_PRICES_UPDATE_BATCH_SIZE", 2000)
+)
+# Batches updated by one task run, the task is enqueued again if more are left
+DISCOUNTED_PRICES_UPDATE_MAX_BATCHES = int(
+    os.environ.get("DISCOUNTED_PRICES_UPDATE_MAX_BATCHES", 50)
+)
+
+# Threads posting payloads of an event to its webhooks, 0 posts them serially
+WEBHOOK_DELIVERY_WORKERS = int(os.environ.get("WEBHOOK_DELIVERY_WORKERS", 8))
+# Kept-alive connections per webhook target host
+WEBHOOK_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_POOL_MAXSIZE", 10))
+# Events of webhooks receiving batches are coalesced for this many seconds
+WEBHOOK_BATCH_WINDOW = int(os.environ.get("WEBHOOK_BATCH_WINDOW", 5))
+# A batch is sent before the window passes once it holds this many events
+WEBHOOK_BATCH_MAX_SIZE = int(os.environ.get("WEBHOOK_BATCH_MAX_SIZE", 100))
+
+# Price product pages from variant price ranges stored in product channel listings
+USE_PRECOMPUTED_PRICE_RANGES = get_bool_from_env("USE_PRECOMPUTED_PRICE_RANGES", False)
+
+# Connections over larger querysets return totalCount estimated by the database
+CONNECTION_EXACT_COUNT_LIMIT = int(
+    os.environ.get("CONNECTION_EXACT_COUNT_LIMIT", 10000)
+)
+
 PLUGINS = [
     "saleor.plugins.avatax.plugin.AvataxPlugin",
     "saleor.plugins.vatlayer.plugin.VatlayerPlugin",
@@ -579,6 +720,13 @@ PLUGINS = [
     "saleor.plugins.sendgrid.plugin.SendgridEmailPlugin",
 ]
 
+# Plugins managers are shared between requests of a worker, they are rebuilt when
+# any plugin configuration changes or after the timeout
+PLUGINS_MANAGER_POOL_TIMEOUT = parse(
+    os.environ.get("PLUGINS_MANAGER_POOL_TIMEOUT", "5 minutes")
+)
+PLUGINS_MANAGER_POOL_SIZE = int(os.environ.get("PLUGINS_MANAGER_POOL_SIZE", 256))
+
 # Plugin discovery
 installed_plugins = pkg_resources.iter_entry_points("saleor.plugins")
 for entry_point in installed_plugins:
@@ -629,6 +777,11 @@ if REDIS_URL:
 CACHES = {"default": django_cache_url.config()}
 CACHES["default"]["TIMEOUT"] = parse(os.environ.get("CACHE_TIMEOUT", "7 days"))
 
+# Host to tenant resolution cache, entries of all processes are dropped on store
+# and domain changes
+TENANT_CACHE_TIMEOUT = parse(os.environ.get("TENANT_CACHE_TIMEOUT", "1 hour"))
+TENANT_CACHE_LOCAL_SIZE = int(os.environ.get("TENANT_CACHE_LOCAL_SIZE", 1024))
+
 # Default False because storefront and dashboard don't support expiration of token
 JWT_EXPIRE = get_bool_from_env("JWT_EXPIRE", False)
 JWT_TTL_ACCESS = timedelta(seconds=parse(os.environ.get("JWT_TTL_ACCESS", "5 minutes")))
@@ -637,6 +790,11 @@ JWT_TTL_APP_ACCESS = timedelta(
 )
 JWT_TTL_REFRESH = timedelta(seconds=parse(os.environ.get("JWT_TTL_REFRESH", "30 days")))
 
+# How long an authenticated user and its permissions are kept in the cache
+JWT_PRINCIPAL_CACHE_TIMEOUT = parse(
+    os.environ.get("JWT_PRINCIPAL_CACHE_TIMEOUT", "1 minute")
+)
+
 
 JWT_TTL_REQUEST_EMAIL_CHANGE = timedelta(
     seconds=parse(os.environ.get("JWT_TTL_REQUEST_EMAIL_CHANGE", "1 hour")),
@@ -0,0 +1,69 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save, pre_delete, pre_save
+
+
+class StoreAppConfig(AppConfig):
+    name = "saleor.store"
+
+    def ready(self):
+        from ..graphql.core.resolver_cache import (
+            invalidate_resolver_cache_for_instance,
+        )
+        from .models import CustomDomain, FaviconPwa, Store
+        from .signals import (
+            invalidate_custom_domain_tenant_cache,
+            invalidate_store_service_time_calendar,
+            invalidate_store_tenant_cache,
+            remember_custom_domain,
+            remember_store_domain,
+        )
+
+        # preventing duplicate signals
+        pre_save.connect(
+            remember_store_domain,
+            sender=Store,
+            dispatch_uid="remember_store_domain",
+        )
+        post_save.connect(
+            invalidate_store_tenant_cache,
+            sender=Store,
+            dispatch_uid="invalidate_store_tenant_cache_on_save",
+        )
+        # custom domains are detached from the store once it is deleted,
+        # so hosts have to be collected before the deletion
+        pre_delete.connect(
+            invalidate_store_tenant_cache,
+            sender=Store,
+            dispatch_uid="invalidate_store_tenant_cache_on_delete",
+        )
+        pre_save.connect(
+            remember_custom_domain,
+            sender=CustomDomain,
+            dispatch_uid="remember_custom_domain",
+        )
+        post_save.connect(
+            invalidate_custom_domain_tenant_cache,
+            sender=CustomDomain,
+            dispatch_uid="invalidate_custom_domain_tenant_cache_on_save",
+        )
+        post_delete.connect(
+            invalidate_custom_domain_tenant_cache,
+            sender=CustomDomain,
+            dispatch_uid="invalidate_custom_domain_tenant_cache_on_delete",
+        )
+        post_save.connect(
+            invalidate_store_service_time_calendar,
+            sender=Store,
+            dispatch_uid="invalidate_store_service_time_calendar",
+        )
+        for model in (Store, FaviconPwa):
+            post_save.connect(
+                invalidate_resolver_cache_for_instance,
+                sender=model,
+                dispatch_uid=f"invalidate_{model.__name__}_resolver_cache_on_save",
+            )
+            post_delete.connect(
+                invalidate_resolver_cache_for_instance,
+                sender=model,
+                dispatch_uid=f"invalidate_{model.__name__}_resolver_cache_on_delete",
+            )
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 15:20
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("store", "0021_store_sound_notifications"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="store",
+            name="checkout_ttl",
+            field=models.DurationField(blank=True, null=True),
+        ),
+    ]
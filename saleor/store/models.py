@@ -81,6 +81,9 @@ class Store(MultitenantModelWithMetadata, SeoModel):
         default=0,
     )
 
+    # Checkouts not changed for this long are deleted, CHECKOUT_TTL when not set
+    checkout_ttl = models.DurationField(blank=True, null=True)
+
     objects = StoresQueryset.as_manager()
     translated = TranslationProxy()
 
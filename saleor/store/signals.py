@@ -0,0 +1,42 @@
+from ..servicetime.slots import invalidate_service_time_calendar
+from .tenant_cache import invalidate_hosts, invalidate_store_hosts
+
+
+def remember_store_domain(sender, instance, **kwargs):
+    instance._previous_domain = None
+    if instance.pk:
+        instance._previous_domain = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("domain", flat=True)
+            .first()
+        )
+
+
+def invalidate_store_tenant_cache(sender, instance, **kwargs):
+    invalidate_store_hosts(
+        instance.pk, instance.domain, getattr(instance, "_previous_domain", None)
+    )
+
+
+def remember_custom_domain(sender, instance, **kwargs):
+    instance._previous_domain_custom = None
+    if instance.pk:
+        instance._previous_domain_custom = (
+            sender._base_manager.filter(pk=instance.pk)
+            .values_list("domain_custom", flat=True)
+            .first()
+        )
+
+
+def invalidate_custom_domain_tenant_cache(sender, instance, **kwargs):
+    invalidate_hosts(
+        [
+            instance.domain_custom,
+            getattr(instance, "_previous_domain_custom", None),
+        ]
+    )
+
+
+def invalidate_store_service_time_calendar(sender, instance, **kwargs):
+    # emergency closures (`*_status` fields) are part of the calendar
+    invalidate_service_time_calendar(instance.pk)
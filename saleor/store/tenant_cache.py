@@ -0,0 +1,138 @@
+"""Host to tenant resolution cache.
+
+Every HTTP request resolves its store from the `Origin`/`Host` header. The result
+is kept in the shared Django cache under a version per host, and in a small
+per-process LRU, so warm hosts only read their current version from the cache.
+Signal handlers replace the versions whenever a store domain or a custom domain
+changes, which drops the entries of all processes at once.
+
+Hosts are case-insensitive, they are looked up and cached lowercased.
+"""
+import copy
+import threading
+import uuid
+from typing import TYPE_CHECKING, Iterable, Optional
+
+from cachetools import LRUCache
+from django.conf import settings
+from django.core.cache import cache
+from django_multitenant.utils import unset_current_tenant
+
+from . import models
+
+if TYPE_CHECKING:
+    # flake8: noqa
+    from .models import Store
+
+CACHE_KEY_PREFIX = "tenant_by_host:"
+VERSION_CACHE_KEY_PREFIX = "tenant_by_host_version:"
+
+# Cached marker for hosts that do not belong to any store, so unknown hosts
+# (health checks, bots, the main site) don't hit the database either.
+NO_TENANT = "__no_tenant__"
+
+_local_cache = LRUCache(maxsize=settings.TENANT_CACHE_LOCAL_SIZE)
+_local_cache_lock = threading.Lock()
+
+
+def normalize_host(host: str) -> str:
+    return host.lower()
+
+
+def get_version_cache_key(host: str) -> str:
+    return VERSION_CACHE_KEY_PREFIX + host
+
+
+def get_cache_key(host: str, version: str) -> str:
+    return "%s%s:%s" % (CACHE_KEY_PREFIX, host, version)
+
+
+def _get_version(host: str) -> str:
+    key = get_version_cache_key(host)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, settings.TENANT_CACHE_TIMEOUT)
+        version = cache.get(key)
+    return version
+
+
+def fetch_store_for_host(host: str) -> Optional["Store"]:
+    """Look up the store that serves the given host in the database.
+
+    A store's own domain takes precedence over a verified custom domain.
+    """
+    unset_current_tenant()
+    store = models.Store.objects.filter(domain__iexact=host).first()
+    if store:
+        return store
+    custom_domain = models.CustomDomain.objects.filter(
+        domain_custom__iexact=host, status=True
+    ).first()
+    if custom_domain:
+        return models.Store.objects.filter(
+            id=custom_domain.store_id, custom_domain_enable=True
+        ).first()
+    return None
+
+
+def get_store_for_host(host: str) -> Optional["Store"]:
+    """Return the store serving the given host, using the cache when possible.
+
+    The returned instance is a copy, so callers may not mutate the cached one.
+    """
+    host = normalize_host(host)
+    version = _get_version(host)
+    with _local_cache_lock:
+        entry = _local_cache.get(host)
+    if entry is not None and entry[0] == version:
+        store = entry[1]
+    else:
+        key = get_cache_key(host, version)
+        store = cache.get(key)
+        if store is None:
+            store = fetch_store_for_host(host) or NO_TENANT
+            cache.set(key, store, settings.TENANT_CACHE_TIMEOUT)
+        with _local_cache_lock:
+            _local_cache[host] = (version, store)
+    if store == NO_TENANT:
+        return None
+    return copy.copy(store)
+
+
+def invalidate_hosts(hosts: Iterable[Optional[str]]):
+    """Replace the versions of the given hosts."""
+    hosts = {normalize_host(host) for host in hosts if host}
+    if not hosts:
+        return
+    with _local_cache_lock:
+        for host in hosts:
+            _local_cache.pop(host, None)
+    cache.set_many(
+        {get_version_cache_key(host): uuid.uuid4().hex for host in hosts},
+        settings.TENANT_CACHE_TIMEOUT,
+    )
+
+
+def invalidate_store_hosts(store_id: int, *extra_hosts: Optional[str]):
+    """Drop cached entries of all hosts that may resolve to the given store.
+
+    Base managers are used on purpose, the lookup must not be narrowed down to
+    the tenant of the request that triggered the change.
+    """
+    hosts = set(extra_hosts)
+    hosts.update(
+        models.Store._base_manager.filter(pk=store_id).values_list(
+            "domain", flat=True
+        )
+    )
+    hosts.update(
+        models.CustomDomain._base_manager.filter(store_id=store_id).values_list(
+            "domain_custom", flat=True
+        )
+    )
+    invalidate_hosts(hosts)
+
+
+def clear_local_cache():
+    with _local_cache_lock:
+        _local_cache.clear()
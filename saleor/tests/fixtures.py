@@ -14,6 +14,7 @@ from django.conf import settings
 from django.contrib.auth.models import Group, Permission
 from django.contrib.postgres.search import SearchVector
 from django.contrib.sites.models import Site
+from django.core.cache import cache
 from django.core.files import File
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.db import connection
@@ -22,6 +23,7 @@ from django.template.defaultfilters import truncatechars
 from django.test.utils import CaptureQueriesContext as BaseCaptureQueriesContext
 from django.utils import timezone
 from django_countries import countries
+from django_multitenant.utils import set_current_tenant, unset_current_tenant
 from PIL import Image
 from prices import Money, TaxedMoney, fixed_discount
 
@@ -45,6 +47,7 @@ from ..core.units import MeasurementUnits
 from ..core.utils.editorjs import clean_editor_js
 from ..csv.events import ExportEvents
 from ..csv.models import ExportEvent, ExportFile
+from ..delivery.models import Delivery
 from ..discount import DiscountInfo, DiscountValueType, VoucherType
 from ..discount.models import (
     Sale,
@@ -55,6 +58,9 @@ from ..discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from ..discount.snapshot import (
+    clear_local_cache as clear_discount_snapshot_local_cache,
+)
 from ..giftcard.models import GiftCard
 from ..menu.models import Menu, MenuItem, MenuItemTranslation
 from ..order import OrderLineData, OrderOrigin, OrderStatus
@@ -83,9 +89,13 @@ from ..product.models import (
     CollectionTranslation,
     DigitalContent,
     DigitalContentUrl,
+    Option,
+    OptionValue,
+    OptionValueChannelListing,
     Product,
     ProductChannelListing,
     ProductMedia,
+    ProductOption,
     ProductTranslation,
     ProductType,
     ProductVariant,
@@ -94,6 +104,7 @@ from ..product.models import (
     VariantMedia,
 )
 from ..product.tests.utils import create_image
+from ..servicetime.models import ServiceTime
 from ..shipping.models import (
     ShippingMethod,
     ShippingMethodChannelListing,
@@ -102,6 +113,12 @@ from ..shipping.models import (
     ShippingZone,
 )
 from ..site.models import SiteSettings
+from ..store.models import CustomDomain, Store
+from ..store.tenant_cache import clear_local_cache
+from ..warehouse.management import (
+    deallocate_stock_for_order,
+    update_stocks_quantity_allocated,
+)
 from ..warehouse.models import Allocation, Stock, Warehouse
 from ..webhook.event_types import WebhookEventType
 from ..webhook.models import Webhook, WebhookEvent
@@ -208,6 +225,21 @@ def setup_vatlayer(settings, channel_USD):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_caches():
+    """Start every test with empty caches and without a current tenant.
+
+    Database changes of a test are rolled back without sending the signals that
+    invalidate cached stores, delivery rates, discounts and resolver results. The
+    tenant set by the middleware in a previous test would be assigned to new
+    objects.
+    """
+    cache.clear()
+    clear_local_cache()
+    clear_discount_snapshot_local_cache()
+    unset_current_tenant()
+
+
 @pytest.fixture(autouse=True)
 def setup_dummy_gateways(settings):
     settings.PLUGINS = [
@@ -254,6 +286,83 @@ def site_settings(db, settings) -> SiteSettings:
     return obj
 
 
+@pytest.fixture
+def store(db):
+    return Store.objects.create(name="Pizzeria Mirumee", domain="pizzeria.example.com")
+
+
+@pytest.fixture
+def custom_domain(store):
+    store.custom_domain_enable = True
+    store.save(update_fields=["custom_domain_enable"])
+    return CustomDomain.objects.create(
+        store=store, domain_custom="www.pizzeria.com", status=True
+    )
+
+
+@pytest.fixture
+def delivery(store):
+    return Delivery.objects.create(
+        store=store,
+        delivery_area={
+            "areas": [
+                {
+                    "from": 1000,
+                    "to": 1099,
+                    "customDeliveryFee": 2.5,
+                    "customMinOrder": 15,
+                },
+                {
+                    "from": 1100,
+                    "to": 1199,
+                    "customDeliveryFee": 3.456,
+                    "customMinOrder": "",
+                },
+                {
+                    "from": 2000,
+                    "to": 2999,
+                    "customDeliveryFee": 5,
+                    "customMinOrder": 30,
+                },
+            ]
+        },
+        delivery_fee=Decimal("4.00"),
+        min_order=Decimal("10.00"),
+        from_delivery=Decimal("50.00"),
+        enable_for_big_order=True,
+        enable_custom_delivery_fee=True,
+        enable_minimum_delivery_order_value=True,
+    )
+
+
+@pytest.fixture
+def service_time(store):
+    # open every day, pickup is closed on sundays
+    return ServiceTime.objects.create(
+        store=store,
+        dl_delivery_time=30,
+        dl_time_gap=15,
+        dl_allow_preorder=True,
+        dl_preorder_day=2,
+        dl_same_day_order=True,
+        dl_service_time={
+            "dl": [{"days": [True] * 7, "open": "10:00", "close": "12:00"}]
+        },
+        pu_delivery_time=10,
+        pu_time_gap=30,
+        pu_allow_preorder=False,
+        pu_service_time={
+            "pu": [
+                {"days": [True] * 6 + [False], "open": "11:00", "close": "13:00"},
+                {"days": [True] * 6 + [False], "open": "17:00", "close": "18:00"},
+            ]
+        },
+        table_service_time={
+            "tb": [{"days": [True] * 7, "open": "12:00", "close": "13:00"}]
+        },
+    )
+
+
 @pytest.fixture
 def checkout(db, channel_USD):
     checkout = Checkout.objects.create(
@@ -1301,6 +1410,66 @@ def product(product_type, category, warehouse, channel_USD):
     return product
 
 
+@pytest.fixture
+def product_options(store, channel_USD):
+    """Options of the store with values priced in the channel.
+
+    The store is set as the current tenant, options are sorted per store.
+    """
+    set_current_tenant(store)
+    options = []
+    for name in ("Size", "Toppings"):
+        option = Option.objects.create(name=name, type="single")
+        for index in range(3):
+            option_value = OptionValue.objects.create(
+                option=option, name=f"{name} {index}"
+            )
+            OptionValueChannelListing.objects.create(
+                option_value=option_value,
+                channel=channel_USD,
+                price_amount=Decimal(index),
+                currency=channel_USD.currency_code,
+            )
+        options.append(option)
+    return options
+
+
+@pytest.fixture
+def products_with_options(product_options, product_type_without_variant, channel_USD):
+    category = Category.objects.create(name="Pizzas", slug="pizzas")
+    products = []
+    for index in range(5):
+        product = Product.objects.create(
+            name=f"Pizza {index}",
+            slug=f"pizza-{index}",
+            product_type=product_type_without_variant,
+            category=category,
+        )
+        ProductChannelListing.objects.create(
+            product=product,
+            channel=channel_USD,
+            is_published=True,
+            currency=channel_USD.currency_code,
+            visible_in_listings=True,
+            available_for_purchase=datetime.date(1999, 1, 1),
+        )
+        variant = ProductVariant.objects.create(product=product, sku=f"pizza-{index}")
+        ProductVariantChannelListing.objects.create(
+            variant=variant,
+            channel=channel_USD,
+            price_amount=Decimal(10),
+            currency=channel_USD.currency_code,
+        )
+        ProductOption.objects.bulk_create(
+            [
+                ProductOption(product=product, option=option, sort_order=sort_order)
+                for sort_order, option in enumerate(product_options)
+            ]
+        )
+        products.append(product)
+    return products
+
+
 @pytest.fixture
 def product_with_collections(
     product, published_collection, unpublished_collection, collection
@@ -2290,6 +2459,7 @@ def order_line_with_allocation_in_many_stocks(
             Allocation(order_line=order_line, stock=stocks[1], quantity_allocated=1),
         ]
     )
+    update_stocks_quantity_allocated({stocks[0].pk: 2, stocks[1].pk: 1})
 
     return order_line
 
@@ -2334,6 +2504,7 @@ def order_line_with_one_allocation(
     Allocation.objects.create(
         order_line=order_line, stock=stocks[0], quantity_allocated=1
     )
+    update_stocks_quantity_allocated({stocks[0].pk: 1})
 
     return order_line
 
@@ -2415,6 +2586,7 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    update_stocks_quantity_allocated({stock.pk: line.quantity})
 
     product = Product.objects.create(
         name="Test product 2",
@@ -2462,6 +2634,7 @@ def order_with_lines(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    update_stocks_quantity_allocated({stock.pk: line.quantity})
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_USD
@@ -2584,6 +2757,7 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    update_stocks_quantity_allocated({stock.pk: line.quantity})
 
     product = Product.objects.create(
         name="Test product 2 in PLN channel",
@@ -2631,6 +2805,7 @@ def order_with_lines_channel_PLN(
     Allocation.objects.create(
         order_line=line, stock=stock, quantity_allocated=line.quantity
     )
+    update_stocks_quantity_allocated({stock.pk: line.quantity})
 
     order.shipping_address = order.billing_address.get_copy()
     order.channel = channel_PLN
@@ -2770,6 +2945,7 @@ def fulfillment(fulfilled_order):
 
 @pytest.fixture
 def draft_order(order_with_lines):
+    deallocate_stock_for_order(order_with_lines)
     Allocation.objects.filter(order_line__order=order_with_lines).delete()
     order_with_lines.status = OrderStatus.DRAFT
     order_with_lines.origin = OrderOrigin.DRAFT
@@ -3006,7 +3182,11 @@ def permission_manage_staff():
 
 @pytest.fixture
 def permission_manage_products():
-    return Permission.objects.get(codename="manage_products")
+    return Permission.objects.get(
+        codename="manage_products",
+        content_type__app_label="product",
+        content_type__model="product",
+    )
 
 
 @pytest.fixture
@@ -3064,6 +3244,25 @@ def permission_manage_payments():
     return Permission.objects.get(codename="handle_payments")
 
 
+@pytest.fixture
+def permission_manage_stores():
+    return Permission.objects.get(
+        codename="manage_stores",
+        content_type__app_label="store",
+        content_type__model="store",
+    )
+
+
+@pytest.fixture
+def permission_manage_service_time():
+    return Permission.objects.get(codename="manage_service_time")
+
+
+@pytest.fixture
+def permission_manage_table_service():
+    return Permission.objects.get(codename="manage_table_service")
+
+
 @pytest.fixture
 def permission_group_manage_users(permission_manage_users, staff_users):
     group = Group.objects.create(name="Manage user groups.")
@@ -3825,9 +4024,11 @@ def stock(variant, warehouse):
 
 @pytest.fixture
 def allocation(order_line, stock):
-    return Allocation.objects.create(
+    allocation = Allocation.objects.create(
         order_line=order_line, stock=stock, quantity_allocated=order_line.quantity
     )
+    update_stocks_quantity_allocated({stock.pk: order_line.quantity})
+    return allocation
 
 
 @pytest.fixture
@@ -3878,7 +4079,7 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
-    return Allocation.objects.bulk_create(
+    allocations = Allocation.objects.bulk_create(
         [
             Allocation(
                 order_line=lines[0], stock=stock, quantity_allocated=lines[0].quantity
@@ -3891,6 +4092,10 @@ def allocations(order_list, stock, channel_USD):
             ),
         ]
     )
+    update_stocks_quantity_allocated(
+        {stock.pk: sum(line.quantity for line in lines[:3])}
+    )
+    return allocations
 
 
 @pytest.fixture
@@ -13,8 +13,8 @@ if TYPE_CHECKING:
 
 def _get_available_quantity(stocks: StockQuerySet) -> int:
     results = stocks.aggregate(
-        total_quantity=Coalesce(Sum("quantity", distinct=True), 0),
-        quantity_allocated=Coalesce(Sum("allocations__quantity_allocated"), 0),
+        total_quantity=Coalesce(Sum("quantity"), 0),
+        quantity_allocated=Coalesce(Sum("quantity_allocated"), 0),
     )
     total_quantity = results["total_quantity"]
     quantity_allocated = results["quantity_allocated"]
@@ -1,7 +1,8 @@
-from collections import defaultdict, namedtuple
-from typing import TYPE_CHECKING, Dict, Iterable, List, cast
+from collections import defaultdict
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, cast
 
-from django.db.models import F, Sum
+from django.db.models import F
+from django.db.models.functions import Greatest
 
 from ..core.exceptions import AllocationError, InsufficientStock, InsufficientStockData
 from ..core.tracing import traced_atomic_transaction
@@ -10,10 +11,9 @@ from ..product.models import ProductVariant
 from .models import Allocation, Stock, Warehouse
 
 if TYPE_CHECKING:
-    from ..order.models import Order, OrderLine
-
+    from django.db.models import QuerySet
 
-StockData = namedtuple("StockData", ["pk", "quantity"])
+    from ..order.models import Order, OrderLine
 
 
 @traced_atomic_transaction()
@@ -22,11 +22,10 @@ def allocate_stocks(
 ):
     """Allocate stocks for given `order_lines` in given country.
 
-    Function lock for update all stocks and allocations for variants in
-    given country and order by pk. Next, generate the dictionary
-    ({"stock_pk": "quantity_allocated"}) with actual allocated quantity for stocks.
-    Iterate by stocks and allocate as many items as needed or available in stock
-    for order line, until allocated all required quantity for the order line.
+    Stocks of the variants are iterated by pk and as many items as needed or
+    available are allocated from each of them, until the whole quantity of the order
+    line is allocated. Stocks aren't locked, allocated quantities are reserved with
+    conditional updates of `Stock.quantity_allocated`, see `_reserve_stock_quantity`.
     If there is less quantity in stocks then rise InsufficientStock exception.
     """
     # allocation only applied to order lines with variants with track inventory
@@ -37,47 +36,33 @@ def allocate_stocks(
 
     variants = [line_info.variant for line_info in order_lines_info]
 
-    stocks = list(
-        Stock.objects.select_for_update(of=("self",))
-        .for_country_and_channel(country_code, channel_slug)
+    stocks = (
+        Stock.objects.for_country_and_channel(country_code, channel_slug)
         .filter(product_variant__in=variants)
         .order_by("pk")
-        .values("id", "product_variant", "pk", "quantity")
+        .values("pk", "product_variant", "quantity", "quantity_allocated")
     )
-    stocks_id = (stock.pop("id") for stock in stocks)
-
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock_id__in=stocks_id,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
-    )
-    quantity_allocation_for_stocks: Dict = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated_sum"
-        ]
-
-    variant_to_stocks: Dict[str, List[StockData]] = defaultdict(list)
+    variant_to_stocks: Dict[int, List[Dict[str, int]]] = defaultdict(list)
     for stock_data in stocks:
-        variant = stock_data.pop("product_variant")
-        variant_to_stocks[variant].append(StockData(**stock_data))
+        variant_to_stocks[stock_data.pop("product_variant")].append(stock_data)
 
     insufficient_stock: List[InsufficientStockData] = []
     allocations: List[Allocation] = []
     for line_info in order_lines_info:
         line_info.variant = cast(ProductVariant, line_info.variant)
-        stock_allocations = variant_to_stocks[line_info.variant.pk]
-        insufficient_stock, allocation_items = _create_allocations(
-            line_info,
-            stock_allocations,
-            quantity_allocation_for_stocks,
-            insufficient_stock,
+        line_allocations = _create_allocations(
+            line_info, variant_to_stocks[line_info.variant.pk]
         )
-        allocations.extend(allocation_items)
+        if line_allocations is None:
+            insufficient_stock.append(
+                InsufficientStockData(
+                    variant=line_info.variant, order_line=line_info.line
+                )
+            )
+        else:
+            allocations.extend(line_allocations)
 
+    # Quantities reserved so far are released when the transaction is rolled back.
     if insufficient_stock:
         raise InsufficientStock(insufficient_stock)
 
@@ -86,51 +71,90 @@ def allocate_stocks(
 
 
 def _create_allocations(
-    line_info: "OrderLineData",
-    stocks: List[StockData],
-    quantity_allocation_for_stocks: dict,
-    insufficient_stock: List[InsufficientStockData],
-):
+    line_info: "OrderLineData", stocks: List[Dict[str, int]]
+) -> Optional[List[Allocation]]:
+    """Reserve the quantity of the order line in stocks.
+
+    Return allocations of the reserved quantities or None if stocks don't have
+    enough quantity available.
+    """
     quantity = line_info.quantity
-    quantity_allocated = 0
     allocations = []
     for stock_data in stocks:
-        quantity_allocated_in_stock = quantity_allocation_for_stocks.get(
-            stock_data.pk, 0
-        )
+        while quantity:
+            quantity_to_allocate = min(
+                quantity, stock_data["quantity"] - stock_data["quantity_allocated"]
+            )
+            if quantity_to_allocate <= 0:
+                break
+            if _reserve_stock_quantity(stock_data["pk"], quantity_to_allocate):
+                stock_data["quantity_allocated"] += quantity_to_allocate
+                quantity -= quantity_to_allocate
+                allocations.append(
+                    Allocation(
+                        order_line=line_info.line,
+                        stock_id=stock_data["pk"],
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+            else:
+                # Concurrent checkouts changed the stock, retry with its current
+                # quantities.
+                current_data = (
+                    Stock.objects.filter(pk=stock_data["pk"])
+                    .values("quantity", "quantity_allocated")
+                    .first()
+                )
+                if current_data is None:
+                    break
+                stock_data.update(current_data)
+        if not quantity:
+            return allocations
+    return None
 
-        quantity_available_in_stock = stock_data.quantity - quantity_allocated_in_stock
 
-        quantity_to_allocate = min(
-            (quantity - quantity_allocated), quantity_available_in_stock
-        )
-        if quantity_to_allocate > 0:
-            allocations.append(
-                Allocation(
-                    order_line=line_info.line,
-                    stock_id=stock_data.pk,
-                    quantity_allocated=quantity_to_allocate,
-                )
-            )
+def _reserve_stock_quantity(stock_pk: int, quantity: int) -> bool:
+    """Add the quantity to allocated quantity of the stock if it's available.
+
+    The availability is checked by the update itself, so concurrent reservations
+    can't allocate more than the stock quantity without locking the stock first.
+    """
+    return bool(
+        Stock.objects.filter(
+            pk=stock_pk, quantity__gte=F("quantity_allocated") + quantity
+        ).update(quantity_allocated=F("quantity_allocated") + quantity)
+    )
 
-            quantity_allocated += quantity_to_allocate
-            if quantity_allocated == quantity:
-                return insufficient_stock, allocations
 
-    if not quantity_allocated == quantity:
-        insufficient_stock.append(
-            InsufficientStockData(
-                variant=line_info.variant, order_line=line_info.line  # type: ignore
+def update_stocks_quantity_allocated(quantities: Dict[int, int]):
+    """Add quantities, negative for released ones, to allocated quantities of stocks.
+
+    `quantities` map stock pks to quantities.
+    """
+    # Update stocks in the same order as allocating does to avoid deadlocks.
+    for stock_pk, quantity in sorted(quantities.items()):
+        if quantity:
+            Stock.objects.filter(pk=stock_pk).update(
+                quantity_allocated=Greatest(F("quantity_allocated") + quantity, 0)
             )
-        )
-        return insufficient_stock, []
+
+
+def release_allocations(allocations: "QuerySet[Allocation]"):
+    """Set allocated quantities of allocations to zero and release them in stocks."""
+    released_quantities: Dict[int, int] = defaultdict(int)
+    for stock_pk, quantity_allocated in allocations.filter(
+        quantity_allocated__gt=0
+    ).values_list("stock_id", "quantity_allocated"):
+        released_quantities[stock_pk] -= quantity_allocated
+    allocations.update(quantity_allocated=0)
+    update_stocks_quantity_allocated(released_quantities)
 
 
 @traced_atomic_transaction()
 def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
     """Deallocate stocks for given `order_lines`.
 
-    Function lock for update stocks and allocations related to given `order_lines`.
+    Function lock for update allocations related to given `order_lines`.
     Iterate over allocations sorted by `stock.pk` and deallocate as many items
     as needed of available in stock for order line, until deallocated all required
     quantity for the order line. If there is less quantity in stocks then
@@ -139,14 +163,8 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
     lines = [line_info.line for line_info in order_lines_data]
     lines_allocations = (
         Allocation.objects.filter(order_line__in=lines)
-        .select_related("stock")
-        .select_for_update(
-            of=(
-                "self",
-                "stock",
-            )
-        )
-        .order_by("stock__pk")
+        .select_for_update(of=("self",))
+        .order_by("stock_id")
     )
 
     line_to_allocations: Dict[int, List[Allocation]] = defaultdict(list)
@@ -154,6 +172,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
         line_to_allocations[allocation.order_line_id].append(allocation)
 
     allocations_to_update = []
+    released_quantities: Dict[int, int] = defaultdict(int)
     not_dellocated_lines = []
     for line_info in order_lines_data:
         order_line = line_info.line
@@ -169,6 +188,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
                     allocation.quantity_allocated - quantity_to_deallocate
                 )
                 quantity_dealocated += quantity_to_deallocate
+                released_quantities[allocation.stock_id] -= quantity_to_deallocate
                 allocations_to_update.append(allocation)
                 if quantity_dealocated == quantity:
                     break
@@ -179,6 +199,7 @@ def deallocate_stock(order_lines_data: Iterable["OrderLineData"]):
         raise AllocationError(not_dellocated_lines)
 
     Allocation.objects.bulk_update(allocations_to_update, ["quantity_allocated"])
+    update_stocks_quantity_allocated(released_quantities)
 
 
 @traced_atomic_transaction()
@@ -218,6 +239,7 @@ def increase_stock(
             Allocation.objects.create(
                 order_line=order_line, stock=stock, quantity_allocated=quantity
             )
+        update_stocks_quantity_allocated({stock.pk: quantity})
 
 
 @traced_atomic_transaction()
@@ -226,8 +248,8 @@ def increase_allocations(lines_info: Iterable["OrderLineData"], channel_slug: st
     line_pks = [info.line.pk for info in lines_info]
     allocations = list(
         Allocation.objects.filter(order_line__in=line_pks)
-        .select_related("stock", "order_line")
-        .select_for_update(of=("self", "stock"))
+        .select_related("order_line")
+        .select_for_update(of=("self",))
     )
     # evaluate allocations query to trigger select_for_update lock
     allocation_pks_to_delete = [alloc.pk for alloc in allocations]
@@ -241,6 +263,7 @@ def increase_allocations(lines_info: Iterable["OrderLineData"], channel_slug: st
         # line_info.quantity resembles amount to add, sum it with already allocated.
         line_info.quantity += allocated
 
+    release_allocations(Allocation.objects.filter(pk__in=allocation_pks_to_delete))
     Allocation.objects.filter(pk__in=allocation_pks_to_delete).delete()
 
     allocate_stocks(
@@ -275,9 +298,7 @@ def decrease_stock(order_lines_info: Iterable["OrderLineData"], update_stocks=Tr
     try:
         deallocate_stock(order_lines_info)
     except AllocationError as exc:
-        Allocation.objects.filter(order_line__in=exc.order_lines).update(
-            quantity_allocated=0
-        )
+        release_allocations(Allocation.objects.filter(order_line__in=exc.order_lines))
 
     stocks = (
         Stock.objects.select_for_update(of=("self",))
@@ -293,33 +314,13 @@ def decrease_stock(order_lines_info: Iterable["OrderLineData"], update_stocks=Tr
             str(stock.warehouse_id)
         ] = stock
 
-    quantity_allocation_list = list(
-        Allocation.objects.filter(
-            stock__in=stocks,
-            quantity_allocated__gt=0,
-        )
-        .values("stock")
-        .annotate(Sum("quantity_allocated"))
-    )
-
-    quantity_allocation_for_stocks: Dict[int, int] = defaultdict(int)
-    for allocation in quantity_allocation_list:
-        quantity_allocation_for_stocks[allocation["stock"]] += allocation[
-            "quantity_allocated__sum"
-        ]
-
     if update_stocks:
-        _decrease_stocks_quantity(
-            order_lines_info,
-            variant_and_warehouse_to_stock,
-            quantity_allocation_for_stocks,
-        )
+        _decrease_stocks_quantity(order_lines_info, variant_and_warehouse_to_stock)
 
 
 def _decrease_stocks_quantity(
     order_lines_info: Iterable["OrderLineData"],
     variant_and_warehouse_to_stock: Dict[int, Dict[str, Stock]],
-    quantity_allocation_for_stocks: Dict[int, int],
 ):
     insufficient_stocks: List[InsufficientStockData] = []
     stocks_to_update = []
@@ -337,9 +338,7 @@ def _decrease_stocks_quantity(
             )
             continue
 
-        quantity_allocated = quantity_allocation_for_stocks.get(stock.pk, 0)
-
-        if stock.quantity - quantity_allocated < line_info.quantity:
+        if stock.quantity - stock.quantity_allocated < line_info.quantity:
             insufficient_stocks.append(
                 InsufficientStockData(
                     variant=variant,  # type: ignore
@@ -375,4 +374,4 @@ def deallocate_stock_for_order(order: "Order"):
     allocations = Allocation.objects.filter(
         order_line__order=order, quantity_allocated__gt=0
     ).select_for_update(of=("self",))
-    allocations.update(quantity_allocated=0)
+    release_allocations(allocations)
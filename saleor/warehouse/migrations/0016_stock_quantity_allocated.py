@@ -0,0 +1,29 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("warehouse", "0015_warehouse_store"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="stock",
+            name="quantity_allocated",
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunSQL(
+            """
+            UPDATE warehouse_stock
+            SET quantity_allocated = allocations.quantity_allocated
+            FROM (
+                SELECT stock_id, SUM(quantity_allocated) AS quantity_allocated
+                FROM warehouse_allocation
+                GROUP BY stock_id
+            ) AS allocations
+            WHERE warehouse_stock.id = allocations.stock_id;
+            """,
+            migrations.RunSQL.noop,
+        ),
+    ]
@@ -4,8 +4,7 @@ from typing import Set
 from saleor.core.models import CustomQueryset
 from saleor.store.models import Store
 from django.db import models
-from django.db.models import Exists, F, OuterRef, Sum
-from django.db.models.functions import Coalesce
+from django.db.models import Exists, F, OuterRef
 from django_multitenant.models import TenantModel
 from ..account.models import Address
 from ..channel.models import Channel
@@ -67,8 +66,7 @@ class Warehouse(MultitenantModelWithMetadata):
 class StockQuerySet(models.QuerySet):
     def annotate_available_quantity(self):
         return self.annotate(
-            available_quantity=F("quantity")
-            - Coalesce(Sum("allocations__quantity_allocated"), 0)
+            available_quantity=F("quantity") - F("quantity_allocated")
         )
 
     def for_channel(self, channel_slug: str):
@@ -127,6 +125,9 @@ class Stock(models.Model):
         ProductVariant, null=False, on_delete=models.CASCADE, related_name="stocks"
     )
     quantity = models.PositiveIntegerField(default=0)
+    # Sum of `quantity_allocated` of the stock allocations, kept up to date by
+    # `warehouse.management` so allocating doesn't lock and sum allocations.
+    quantity_allocated = models.PositiveIntegerField(default=0)
 
     objects = StockQuerySet.as_manager()
 
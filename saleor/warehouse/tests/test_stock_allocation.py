@@ -0,0 +1,257 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from decimal import Decimal
+from unittest.mock import patch
+
+import pytest
+from django.db import connection, transaction
+from django.db.models import F, Sum
+from django.test.utils import CaptureQueriesContext
+from prices import Money, TaxedMoney
+
+from ...core.exceptions import InsufficientStock
+from ...order import OrderLineData
+from .. import management
+from ..management import allocate_stocks
+from ..models import Allocation, Stock
+
+COUNTRY_CODE = "US"
+
+
+@pytest.fixture
+def menu_item_stock(products_with_options, warehouse):
+    variant = products_with_options[0].variants.get()
+    return Stock.objects.create(
+        warehouse=warehouse, product_variant=variant, quantity=10
+    )
+
+
+def _create_order_lines(order, variant, count, quantity=1):
+    unit_price = TaxedMoney(net=Money(10, "USD"), gross=Money(10, "USD"))
+    return [
+        order.lines.create(
+            product_name=str(variant.product),
+            variant_name=str(variant),
+            product_sku=variant.sku,
+            is_shipping_required=False,
+            quantity=quantity,
+            variant=variant,
+            unit_price=unit_price,
+            total_price=unit_price * quantity,
+            tax_rate=Decimal("0"),
+        )
+        for _ in range(count)
+    ]
+
+
+def _get_line_data(line):
+    return OrderLineData(line=line, variant=line.variant, quantity=line.quantity)
+
+
+def test_allocate_stocks_updates_quantity_allocated(
+    order, menu_item_stock, channel_USD
+):
+    # given
+    (line,) = _create_order_lines(order, menu_item_stock.product_variant, 1, 4)
+
+    # when
+    allocate_stocks([_get_line_data(line)], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    menu_item_stock.refresh_from_db()
+    assert menu_item_stock.quantity_allocated == 4
+    allocation = Allocation.objects.get(order_line=line)
+    assert allocation.stock == menu_item_stock
+    assert allocation.quantity_allocated == 4
+
+
+def test_allocate_stocks_retries_with_stock_changed_concurrently(
+    order, menu_item_stock, warehouses_with_shipping_zone, channel_USD
+):
+    # given
+    variant = menu_item_stock.product_variant
+    other_stock = Stock.objects.create(
+        warehouse=warehouses_with_shipping_zone[0], product_variant=variant, quantity=5
+    )
+    (line,) = _create_order_lines(order, variant, 1, 4)
+    reserve_stock_quantity = management._reserve_stock_quantity
+
+    def allocate_concurrently(stock_pk, quantity):
+        # Another checkout allocates from the stock after it was read.
+        if stock_pk == menu_item_stock.pk and quantity == 4:
+            Stock.objects.filter(pk=stock_pk).update(quantity_allocated=7)
+        return reserve_stock_quantity(stock_pk, quantity)
+
+    # when
+    with patch.object(
+        management, "_reserve_stock_quantity", side_effect=allocate_concurrently
+    ):
+        allocate_stocks([_get_line_data(line)], COUNTRY_CODE, channel_USD.slug)
+
+    # then
+    menu_item_stock.refresh_from_db()
+    other_stock.refresh_from_db()
+    assert menu_item_stock.quantity_allocated == 10
+    assert other_stock.quantity_allocated == 1
+    assert sorted(
+        Allocation.objects.filter(order_line=line).values_list(
+            "stock_id", "quantity_allocated"
+        )
+    ) == [(menu_item_stock.pk, 3), (other_stock.pk, 1)]
+
+
+def test_allocate_stocks_releases_reserved_quantity_when_insufficient(
+    order, menu_item_stock, channel_USD
+):
+    # given
+    variant = menu_item_stock.product_variant
+    lines = _create_order_lines(order, variant, 1, 6) + _create_order_lines(
+        order, variant, 1, 5
+    )
+
+    # when
+    with pytest.raises(InsufficientStock):
+        allocate_stocks(
+            [_get_line_data(line) for line in lines], COUNTRY_CODE, channel_USD.slug
+        )
+
+    # then
+    menu_item_stock.refresh_from_db()
+    assert menu_item_stock.quantity_allocated == 0
+    assert not Allocation.objects.filter(order_line__in=lines).exists()
+
+
+def _allocate_concurrently(allocate, lines, channel_slug, workers):
+    """Allocate every line in its own transaction, in a pool of threads.
+
+    Return the number of allocated lines.
+    """
+
+    def allocate_lines(lines):
+        allocated_count = 0
+        try:
+            for line in lines:
+                try:
+                    with transaction.atomic():
+                        allocate([_get_line_data(line)], COUNTRY_CODE, channel_slug)
+                    allocated_count += 1
+                except InsufficientStock:
+                    pass
+        finally:
+            connection.close()
+        return allocated_count
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        results = list(
+            executor.map(
+                allocate_lines, [lines[index::workers] for index in range(workers)]
+            )
+        )
+    return sum(results)
+
+
+def test_allocate_stocks_concurrently_does_not_oversell(
+    transactional_db, order, menu_item_stock, channel_USD
+):
+    # given
+    lines = _create_order_lines(order, menu_item_stock.product_variant, 16)
+
+    # when
+    allocated_count = _allocate_concurrently(
+        allocate_stocks, lines, channel_USD.slug, workers=8
+    )
+
+    # then
+    menu_item_stock.refresh_from_db()
+    assert allocated_count == menu_item_stock.quantity == 10
+    assert menu_item_stock.quantity_allocated == 10
+    assert (
+        Allocation.objects.filter(stock=menu_item_stock).aggregate(
+            Sum("quantity_allocated")
+        )["quantity_allocated__sum"]
+        == 10
+    )
+
+
+def _allocate_stocks_with_locks(order_lines_info, country_code, channel_slug):
+    """Allocate stocks the way it was done before `Stock.quantity_allocated`.
+
+    Stocks are locked and their allocations are summed on every allocation.
+    """
+    variants = [line_info.variant for line_info in order_lines_info]
+    stocks = list(
+        Stock.objects.select_for_update(of=("self",))
+        .for_country_and_channel(country_code, channel_slug)
+        .filter(product_variant__in=variants)
+        .order_by("pk")
+        .values("pk", "product_variant", "quantity")
+    )
+    allocated = defaultdict(int)
+    for row in (
+        Allocation.objects.filter(stock_id__in=[stock["pk"] for stock in stocks])
+        .values("stock")
+        .annotate(quantity_allocated_sum=Sum("quantity_allocated"))
+    ):
+        allocated[row["stock"]] += row["quantity_allocated_sum"]
+
+    allocations = []
+    for line_info in order_lines_info:
+        quantity = line_info.quantity
+        for stock in stocks:
+            if stock["product_variant"] != line_info.variant.pk:
+                continue
+            quantity_to_allocate = min(
+                quantity, stock["quantity"] - allocated[stock["pk"]]
+            )
+            if quantity_to_allocate > 0:
+                allocations.append(
+                    Allocation(
+                        order_line=line_info.line,
+                        stock_id=stock["pk"],
+                        quantity_allocated=quantity_to_allocate,
+                    )
+                )
+                quantity -= quantity_to_allocate
+        if quantity:
+            raise InsufficientStock([])
+    Allocation.objects.bulk_create(allocations)
+
+
+@pytest.mark.performance
+def test_allocate_stocks_concurrently_benchmark(
+    transactional_db, order, menu_item_stock, channel_USD
+):
+    # given
+    lines_count = 400
+    workers = 20
+    menu_item_stock.quantity = 300
+    menu_item_stock.save(update_fields=["quantity"])
+    lines = _create_order_lines(order, menu_item_stock.product_variant, lines_count)
+
+    # when
+    with CaptureQueriesContext(connection) as locking_queries:
+        with transaction.atomic():
+            _allocate_stocks_with_locks(
+                [_get_line_data(lines[0])], COUNTRY_CODE, channel_USD.slug
+            )
+    with CaptureQueriesContext(connection) as queries:
+        with transaction.atomic():
+            allocate_stocks([_get_line_data(lines[1])], COUNTRY_CODE, channel_USD.slug)
+    Allocation.objects.all().delete()
+    Stock.objects.update(quantity_allocated=0)
+    count = _allocate_concurrently(allocate_stocks, lines, channel_USD.slug, workers)
+
+    # then
+    menu_item_stock.refresh_from_db()
+    assert count == menu_item_stock.quantity_allocated == 300
+    assert not Stock.objects.filter(quantity_allocated__gt=F("quantity")).exists()
+    # Stocks are no longer locked for the rest of the transaction and their
+    # allocations aren't summed, quantity is reserved with a conditional update.
+    assert any("FOR UPDATE" in query["sql"] for query in locking_queries)
+    statements = [
+        query["sql"].split(" ", 1)[0]
+        for query in queries
+        if "SAVEPOINT" not in query["sql"]
+    ]
+    assert statements == ["SELECT", "UPDATE", "INSERT"]
+    assert not any("FOR UPDATE" in query["sql"] for query in queries)
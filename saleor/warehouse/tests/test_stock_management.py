@@ -15,6 +15,7 @@ from ..management import (
     increase_stock,
 )
 from ..models import Allocation
+from .utils import update_quantity_allocated_for_stock
 
 COUNTRY_CODE = "US"
 
@@ -29,6 +30,7 @@ def test_allocate_stocks(order_line, stock, channel_USD):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 50
     allocation = Allocation.objects.get(order_line=order_line, stock=stock)
     assert allocation.quantity_allocated == 50
 
@@ -182,6 +184,7 @@ def test_deallocate_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     deallocate_stock(
         [
@@ -193,6 +196,7 @@ def test_deallocate_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 100
+    assert stock.quantity_allocated == 0
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 0
 
@@ -203,6 +207,7 @@ def test_deallocate_stock_partially(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     deallocate_stock(
         [
@@ -252,6 +257,7 @@ def test_increase_stock_without_allocate(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     increase_stock(allocation.order_line, stock.warehouse, 50, allocate=False)
 
@@ -267,11 +273,13 @@ def test_increase_stock_with_allocate(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     increase_stock(allocation.order_line, stock.warehouse, 50, allocate=True)
 
     stock.refresh_from_db()
     assert stock.quantity == 150
+    assert stock.quantity_allocated == 130
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 130
 
@@ -304,6 +312,7 @@ def test_increase_allocations(quantity, allocation):
     initially_allocated = 80
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     increase_allocations([order_line_info], order_line.order.channel.slug)
 
@@ -331,6 +340,7 @@ def test_increase_allocation_insufficient_stock(allocation):
     initially_allocated = 80
     allocation.quantity_allocated = initially_allocated
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
 
     with pytest.raises(InsufficientStock):
         increase_allocations([order_line_info], order_line.order.channel.slug)
@@ -351,6 +361,7 @@ def test_decrease_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -366,6 +377,7 @@ def test_decrease_stock(allocation):
 
     stock.refresh_from_db()
     assert stock.quantity == 50
+    assert stock.quantity_allocated == 30
     allocation.refresh_from_db()
     assert allocation.quantity_allocated == 30
 
@@ -377,6 +389,7 @@ def test_decrease_stock_without_stock_update(quantity, expected_allocated, alloc
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -406,10 +419,12 @@ def test_decrease_stock_multiple_lines(allocations):
     stock.save(update_fields=["quantity"])
     allocation_1.quantity_allocated = 80
     allocation_1.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation_1.stock)
     warehouse_pk_1 = allocation_1.stock.warehouse.pk
 
     allocation_2.quantity_allocated = 80
     allocation_2.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation_2.stock)
     warehouse_pk_2 = allocation_2.stock.warehouse.pk
 
     decrease_stock(
@@ -441,6 +456,7 @@ def test_decrease_stock_partially(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
     warehouse_pk = allocation.stock.warehouse.pk
 
     decrease_stock(
@@ -543,6 +559,7 @@ def test_decrease_stock_insufficient_stock(allocation):
     stock.save(update_fields=["quantity"])
     allocation.quantity_allocated = 80
     allocation.save(update_fields=["quantity_allocated"])
+    update_quantity_allocated_for_stock(allocation.stock)
     warehouse_pk = allocation.stock.warehouse.pk
 
     with pytest.raises(InsufficientStock):
@@ -574,3 +591,5 @@ def test_deallocate_stock_for_order(
     allocations = order_line.allocations.all()
     assert allocations[0].quantity_allocated == 0
     assert allocations[1].quantity_allocated == 0
+    assert allocations[0].stock.quantity_allocated == 0
+    assert allocations[1].stock.quantity_allocated == 0
@@ -13,3 +13,9 @@ def get_available_quantity_for_stock(stock):
     """Count how many stock items are available."""
     quantity_allocated = get_quantity_allocated_for_stock(stock)
     return max(stock.quantity - quantity_allocated, 0)
+
+
+def update_quantity_allocated_for_stock(stock):
+    """Set the allocated quantity of stock to the sum of its allocations."""
+    stock.quantity_allocated = get_quantity_allocated_for_stock(stock)
+    stock.save(update_fields=["quantity_allocated"])
@@ -0,0 +1,18 @@
+# Generated by Django 3.2.4 on 2026-10-18 10:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("webhook", "0007_auto_20210319_0945"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="webhook",
+            name="batch_events",
+            field=models.BooleanField(default=False),
+        ),
+    ]
@@ -16,6 +16,7 @@ class Webhook(models.Model):
     target_url = WebhookURLField(max_length=255)
     is_active = models.BooleanField(default=True)
     secret_key = models.CharField(max_length=255, null=True, blank=True)
+    batch_events = models.BooleanField(default=False)
 
     class Meta:
         ordering = ("pk",)
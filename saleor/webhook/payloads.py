@@ -1,10 +1,13 @@
+import copy
 import json
 import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
 from dataclasses import asdict
-from typing import TYPE_CHECKING, Iterable, Optional
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, Optional, Tuple
 
 import graphene
-from django.db.models import F, QuerySet
+from django.db.models import Prefetch, QuerySet, prefetch_related_objects
 
 from ..checkout.models import Checkout
 from ..core.utils import build_absolute_uri
@@ -22,7 +25,7 @@ from ..payment import ChargeStatus
 from ..plugins.webhook.utils import from_payment_app_id
 from ..product import ProductMediaTypes
 from ..product.models import Product
-from ..warehouse.models import Warehouse
+from ..warehouse.models import Allocation, Warehouse
 from .event_types import WebhookEventType
 from .payload_serializers import PayloadSerializer
 from .serializers import (
@@ -75,19 +78,88 @@ ORDER_FIELDS = (
     "undiscounted_total_gross_amount",
 )
 
+FULFILLMENT_LINE_PAYLOAD_RELATED = (
+    "order_line__variant__product__product_type",
+    "stock",
+)
 
-def prepare_order_lines_allocations_payload(line):
-    warehouse_id_quantity_allocated_map = list(
-        line.allocations.values(  # type: ignore
-            "quantity_allocated",
-            warehouse_id=F("stock__warehouse_id"),
-        )
+
+def get_order_payload_prefetch():
+    """Return relations serialized in order payloads.
+
+    Generating the payload of a prefetched order takes the same number of queries
+    regardless of the number of its lines and fulfillments.
+    """
+    return (
+        "channel",
+        "shipping_method",
+        "shipping_address",
+        "billing_address",
+        "payments",
+        "discounts",
+        Prefetch(
+            "lines__allocations",
+            queryset=Allocation.objects.select_related("stock"),
+        ),
+        Prefetch(
+            "fulfillments__lines",
+            queryset=FulfillmentLine.objects.select_related(
+                *FULFILLMENT_LINE_PAYLOAD_RELATED
+            ),
+        ),
     )
-    for item in warehouse_id_quantity_allocated_map:
-        item["warehouse_id"] = graphene.Node.to_global_id(
-            "Warehouse", item["warehouse_id"]
-        )
-    return warehouse_id_quantity_allocated_map
+
+
+_shared_payloads: ContextVar[Optional[Dict[Tuple[str, int], str]]] = ContextVar(
+    "shared_payloads", default=None
+)
+
+
+@contextmanager
+def shared_payloads():
+    """Generate the payload of an object once for all events triggered in the block.
+
+    Objects must not change within the block, all their events get the payload
+    generated for the first one.
+    """
+    token = _shared_payloads.set({}) if _shared_payloads.get() is None else None
+    try:
+        yield
+    finally:
+        if token is not None:
+            _shared_payloads.reset(token)
+
+
+def _get_shared_payload(key: Tuple[str, int], generate: Callable[[], str]) -> str:
+    payloads = _shared_payloads.get()
+    if payloads is None:
+        return generate()
+    if key not in payloads:
+        payloads[key] = generate()
+    return payloads[key]
+
+
+def prefetch_order_for_payload(order: "Order") -> "Order":
+    """Return a copy of the order with the relations of its payload prefetched.
+
+    Relations prefetched before are fetched again, the given order is not changed.
+    """
+    order = copy.copy(order)
+    order._prefetched_objects_cache = {}  # type: ignore
+    prefetch_related_objects([order], *get_order_payload_prefetch())
+    return order
+
+
+def prepare_order_lines_allocations_payload(line):
+    return [
+        {
+            "quantity_allocated": allocation.quantity_allocated,
+            "warehouse_id": graphene.Node.to_global_id(
+                "Warehouse", allocation.stock.warehouse_id
+            ),
+        }
+        for allocation in line.allocations.all()
+    ]
 
 
 def generate_order_lines_payload(lines: Iterable[OrderLine]):
@@ -125,6 +197,13 @@ def generate_order_lines_payload(lines: Iterable[OrderLine]):
 
 
 def generate_order_payload(order: "Order"):
+    return _get_shared_payload(
+        ("Order", order.pk), lambda: _generate_order_payload(order)
+    )
+
+
+def _generate_order_payload(order: "Order"):
+    order = prefetch_order_for_payload(order)
     serializer = PayloadSerializer()
     fulfillment_fields = (
         "status",
@@ -413,9 +492,13 @@ def generate_product_variant_payload(product_variants: Iterable["ProductVariant"
 
 def generate_fulfillment_lines_payload(fulfillment: Fulfillment):
     serializer = PayloadSerializer()
-    lines = FulfillmentLine.objects.prefetch_related(
-        "order_line__variant__product__product_type", "stock"
-    ).filter(fulfillment=fulfillment)
+    if "lines" in getattr(fulfillment, "_prefetched_objects_cache", {}):
+        # Lines of fulfillments of prefetched orders are not fetched again.
+        lines = fulfillment.lines.all()
+    else:
+        lines = FulfillmentLine.objects.select_related(
+            *FULFILLMENT_LINE_PAYLOAD_RELATED
+        ).filter(fulfillment=fulfillment)
     line_fields = ("quantity",)
     return serializer.serialize(
         lines,
@@ -468,7 +551,20 @@ def generate_fulfillment_payload(fulfillment: Fulfillment):
     )
     order = fulfillment.order
     order_country = get_order_country(order)
-    fulfillment_line = fulfillment.lines.first()
+    fulfillment = copy.copy(fulfillment)
+    fulfillment._prefetched_objects_cache = {}  # type: ignore
+    prefetch_related_objects(
+        [fulfillment],
+        Prefetch(
+            "lines",
+            queryset=FulfillmentLine.objects.select_related(
+                *FULFILLMENT_LINE_PAYLOAD_RELATED
+            ),
+        ),
+    )
+    fulfillment_line = min(
+        fulfillment.lines.all(), key=lambda line: line.pk, default=None
+    )
     if fulfillment_line and fulfillment_line.stock:
         warehouse = fulfillment_line.stock.warehouse
     else:
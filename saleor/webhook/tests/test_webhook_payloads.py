@@ -6,6 +6,10 @@ from unittest import mock
 from unittest.mock import ANY
 
 import graphene
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from prices import Money, TaxedMoney
 
 from ...core.utils.json_serializer import CustomJsonEncoder
 from ...discount import DiscountValueType, OrderDiscountType
@@ -14,16 +18,19 @@ from ...order.actions import fulfill_order_lines
 from ...order.models import Order
 from ...plugins.webhook.utils import from_payment_app_id
 from ...product.models import ProductVariant
+from ...warehouse.models import Allocation, Stock
 from ..payloads import (
     ORDER_FIELDS,
     PRODUCT_VARIANT_FIELDS,
     generate_checkout_payload,
     generate_fulfillment_lines_payload,
+    generate_fulfillment_payload,
     generate_invoice_payload,
     generate_list_gateways_payload,
     generate_order_payload,
     generate_payment_payload,
     generate_product_variant_payload,
+    shared_payloads,
 )
 
 
@@ -372,3 +379,116 @@ def test_generate_payment_payload(dummy_webhook_app_payment_data):
         dummy_webhook_app_payment_data.gateway
     ).name
     assert payload == json.dumps(expected_payload, cls=CustomJsonEncoder)
+
+
+@pytest.fixture
+def order_with_fulfilled_lines(order, store, products_with_options, warehouses):
+    # The fixture order has no store, it must belong to the current tenant to be
+    # fetched.
+    Order._base_manager.filter(pk=order.pk).update(store=store)
+    order.store = store
+    order.payments.create(
+        gateway="mirumee.payments.dummy", total=Decimal(100), currency="USD"
+    )
+    fulfillment = order.fulfillments.create(tracking_number="123")
+    for variant in ProductVariant.objects.filter(product__in=products_with_options):
+        unit_price = TaxedMoney(net=Money(10, "USD"), gross=Money(12, "USD"))
+        line = order.lines.create(
+            product_name=variant.product.name,
+            product_sku=variant.sku,
+            is_shipping_required=True,
+            quantity=2,
+            variant=variant,
+            unit_price=unit_price,
+            total_price=unit_price * 2,
+            undiscounted_unit_price=unit_price,
+            undiscounted_total_price=unit_price * 2,
+            tax_rate=Decimal("0.2"),
+        )
+        for warehouse in warehouses:
+            stock = Stock.objects.create(
+                warehouse=warehouse, product_variant=variant, quantity=10
+            )
+            Allocation.objects.create(
+                order_line=line, stock=stock, quantity_allocated=1
+            )
+        fulfillment.lines.create(order_line=line, quantity=1, stock=stock)
+    return order
+
+
+def test_generate_order_payload_queries_do_not_depend_on_lines(
+    order_with_fulfilled_lines, django_assert_max_num_queries
+):
+    # given
+    order = Order.objects.get(pk=order_with_fulfilled_lines.pk)
+
+    # when
+    with django_assert_max_num_queries(10):
+        payload = json.loads(generate_order_payload(order))[0]
+
+    # then
+    assert len(payload["lines"]) == 5
+    assert all(len(line["allocations"]) == 2 for line in payload["lines"])
+    (fulfillment,) = payload["fulfillments"]
+    assert len(fulfillment["lines"]) == 5
+    assert len(payload["payments"]) == 1
+
+
+def test_generate_order_payload_does_not_change_order(order_with_fulfilled_lines):
+    # given
+    order = Order.objects.get(pk=order_with_fulfilled_lines.pk)
+
+    # when
+    generate_order_payload(order)
+
+    # then
+    assert not getattr(order, "_prefetched_objects_cache", {})
+
+
+def test_generate_order_payload_shared_between_events(
+    order_with_fulfilled_lines, django_assert_num_queries
+):
+    # given
+    order = order_with_fulfilled_lines
+    fulfillment = order.fulfillments.get()
+
+    # when
+    with shared_payloads():
+        payload = generate_order_payload(order)
+        with django_assert_num_queries(0):
+            shared_payload = generate_order_payload(order)
+        fulfillment_payload = generate_fulfillment_payload(fulfillment)
+
+    # then
+    assert shared_payload is payload
+    assert json.loads(fulfillment_payload)[0]["order"] == json.loads(payload)[0]
+    order.lines.first().delete()
+    assert generate_order_payload(order) != payload
+
+
+@pytest.mark.performance
+def test_generate_order_payloads_benchmark(order_with_fulfilled_lines):
+    # given
+    order = order_with_fulfilled_lines
+    fulfillment = order.fulfillments.get()
+    invoice = order.invoices.create(number="1")
+    event_payloads = [
+        ("order", lambda: generate_order_payload(order)),
+        ("fulfillment", lambda: generate_fulfillment_payload(fulfillment)),
+        ("invoice", lambda: generate_invoice_payload(invoice)),
+    ]
+
+    # when
+    results = []
+    for event, generate in event_payloads:
+        with CaptureQueriesContext(connection) as queries:
+            for _ in range(20):
+                generate()
+        results.append((event, len(queries) // 20))
+
+    # then
+    assert dict(results) == {
+        "order": 6,
+        "fulfillment": 10,
+        "invoice": 0,
+    }